@@ -14,6 +14,9 @@ Configuration Categories:
     ALERT_THRESHOLDS: Weather alert threshold configuration
     DEFAULTS: Default values for UI components and application settings
     OUTPUT: File paths and logging configuration
+    HISTORY: Persistent history backend, rollup tiers and retention
+    RESAMPLE: Uniform time grids for resampled history
+    ARCHIVE: Segment rotation for the history CSV and text log
     
 Functions:
     validate_config: Comprehensive configuration validation
@@ -191,7 +194,8 @@ CHART = {
     'chart_figure_min_width': 4,       # Minimum width in inches
     'chart_figure_min_height': 2,      # Minimum height in inches
     'chart_dpi': 100,                  # Chart resolution in DPI
-    'chart_rotation_degrees': 45       # X-axis label rotation angle
+    'chart_rotation_degrees': 45,      # X-axis label rotation angle
+    'chart_max_x_labels': 16           # Longer series (hourly and finer tiers) label only this many points
 }
 
 # ================================
@@ -207,6 +211,17 @@ DEFAULTS = {
     "alert_thresholds": ALERT_THRESHOLDS 
 }
 
+# Built-in city aliases (learned aliases from API responses are persisted to OUTPUT["city_index_file"])
+CITY_ALIASES = {
+    "nyc": "New York",
+    "new york city": "New York",
+    "la": "Los Angeles",
+    "sf": "San Francisco",
+    "dc": "Washington",
+    "washington dc": "Washington",
+    "washington, d.c.": "Washington",
+}
+
 # ================================
 # 6. SYSTEM CONFIGURATION
 # ================================
@@ -221,7 +236,9 @@ OUTPUT = {
     "text_file": str(DATA_DIR / "output.txt"),
     "csv_dir": str(DATA_DIR / "csv"),  # WeatherDashboard/data/csv/
     "csv_filename": "weather_data.csv",
-    "csv_backup_dir": str(DATA_DIR / "csv" / "backup")  # For archived data
+    "csv_backup_dir": str(DATA_DIR / "csv" / "backup"),  # For archived data
+    "city_index_file": str(DATA_DIR / "city_index.json"),  # Learned city aliases
+    "watchlist_file": str(DATA_DIR / "watchlist.json")     # Cities collected by the scheduler
 }
 
 LOGGING = {
@@ -249,24 +266,97 @@ def ensure_directories() -> bool:
 
 MEMORY = {
     "max_cities_stored": 50,            # Maximum number of cities to keep in memory
-    "max_entries_per_city": 30,         # Maximum weather entries per city (existing)
-    "max_total_entries": 1000,          # Global maximum entries across all cities
+    "max_entries_per_city": 2880,       # Ring buffer capacity per city (30 days at 15-minute collection)
+    "max_total_entries": 50000,         # Global maximum entries across all cities
+    "lock_stripes": 16,                 # City locks serializing in-memory history writes (cities share them by hash)
     "cleanup_interval_hours": 24,       # Hours between automatic cleanup (existing)
     "minimum_cleanup_interval": 3600,    # 1 hour minimum
     "aggressive_cleanup_threshold": 0.8,  # Trigger aggressive cleanup at 80% of limits
     "max_alert_history_size": 100       # Alert system constant
 }
 
+HISTORY = {
+    "backend": os.getenv("HISTORY_BACKEND", "sqlite"),   # 'sqlite' (indexed) or 'csv' (append-only weather_data.csv)
+    "db_file": str(DATA_DIR / "weather_history.db"),     # SQLite history database
+    "batch_size": 500,                                   # Rows per insert transaction / streamed query batch
+    "migrate_csv": True,                                 # Import the legacy weather_data.csv into SQLite on startup
+    "journal_enabled": True,                             # Journal in-memory history so restarts replay it instead of re-reading storage
+    "journal_file": str(DATA_DIR / "history.journal"),   # Checksummed write-ahead journal of in-memory entries
+    "journal_compact_ratio": 2.0,                        # Compact once records exceed this multiple of live entries...
+    "journal_compact_min_records": 5000,                 # ...and this many records
+    "import_chunk_size": 50000,                          # Rows parsed and written per chunk by bulk history imports
+    "retention_days": {                                  # Days kept per tier (None = forever)
+        "raw": 30,                                       # Individual observations
+        "hourly": 180,                                   # Hourly min/max/mean/count rollups
+        "daily": None                                    # Daily min/max/mean/count rollups
+    },
+    "chart_tier_max_days": {                             # Longest chart range read from each tier (longer ranges use daily)
+        "raw": 2,
+        "hourly": 14
+    }
+}
+
+STATS = {
+    "ewma_half_life_hours": 6,      # Age at which an observation's weight in the rolling EWMA halves
+    "change_window_hours": 3        # Window of the 'change' and 'range' in rolling statistics (the scheduler's volatility window)
+}
+
+RESAMPLE = {
+    "intervals": {                  # Named uniform grid steps, in seconds
+        "15min": 15 * 60,
+        "hourly": 60 * 60,
+        "daily": 24 * 60 * 60
+    },
+    "tier_intervals": {             # Grid each stored history tier is charted on
+        "raw": "15min",
+        "hourly": "hourly",
+        "daily": "daily"
+    },
+    "aggregation": "mean",          # Default per-bin reduction: mean, sum, min, max, first, last or count
+    "gap_policy": "nan",            # Default for bins without samples: nan, ffill or interpolate
+    "chart_gap_policy": "interpolate",  # Empty bins in raw and hourly chart series (daily ones use generated days)
+    "max_bins": 100000              # Largest grid a single resampling request may build
+}
+
+ARCHIVE = {
+    "max_segment_bytes": 5 * 1024 * 1024,   # Rotate output.txt (and weather_data.csv under the 'csv' backend) at this size...
+    "max_segment_age_days": 30,             # ...or after this many days in use (0 disables either limit)
+    "check_interval_seconds": 300           # How often stores trigger a rotation check
+}
+
+WRITER = {
+    "queue_size": 10000,                # Bounded queue; producers block only when it is full
+    "batch_size": 256,                  # Flush after this many queued writes
+    "flush_interval_seconds": 1.0,      # ...or once the oldest queued write is this old
+    "fsync_policy": "batch"             # 'none', 'batch' (fsync each flush) or 'close' (fsync on shutdown)
+}
+
 SCHEDULER = {
     "enabled": True,                    # Master switch for auto-collection
     "default_interval_minutes": 15,     # Default collection interval
     "error_threshold": 5,               # Consecutive failures before notification
-    "retry_attempts": 3,                # Retry failed fetches
-    "retry_delay_seconds": 60,          # Wait between retries
+    "retry_attempts": 3,                # Retries of a failed city before it waits for its next interval
+    "retry_delay_seconds": 60,          # Wait before a failed city's first retry
+    "retry_backoff": 2.0,               # Each further retry waits this many times longer
+    "max_workers": 4,                   # Cities fetched concurrently in a collection cycle
+    "cycle_deadline_seconds": 120,      # Abandon fetches still running after this long
+    "overlap_policy": "skip",           # Ticks a slow cycle overruns: "skip" them, or "merge" into one catch-up cycle
+    "cycle_history_size": 50,           # Per-cycle timing records kept for status display
+    "watchlist_max_cities": 1000,       # Cities the persisted watchlist accepts
     "quiet_hours": {                    # Reduce frequency during off-hours
         "start": "22:00",
         "end": "06:00",
         "interval_multiplier": 2.0      # Double the interval during quiet hours
+    },
+    "adaptive": {                       # Per-city intervals adapted to how fast conditions change
+        "enabled": True,
+        "pressure_drop_hpa": 3.0,       # Pressure falling this much within STATS['change_window_hours'] is changing fast...
+        "temperature_swing_c": 5.0,     # ...as is a temperature range this wide (or an alert threshold crossed)
+        "active_multiplier": 0.5,       # Interval multiplier while changing fast
+        "stable_fraction": 0.25,        # Changes below this fraction of both thresholds count as stable...
+        "stable_multiplier": 2.0,       # ...and stretch the interval by this much
+        "min_interval_minutes": 5,      # Adapted intervals stay within these bounds
+        "max_interval_minutes": 120     # (before quiet hours stretch them)
     }
 }
 
@@ -24,6 +24,7 @@ from WeatherDashboard.utils.logger import Logger
 from WeatherDashboard.utils.rate_limiter import RateLimiter
 from WeatherDashboard.utils.unit_converter import UnitConverter
 from WeatherDashboard.utils.validation_utils import ValidationUtils
+from WeatherDashboard.utils.state_utils import StateUtils
 
 from WeatherDashboard.features.alerts.alert_manager import AlertManager, WeatherAlert
 from WeatherDashboard.services.api_exceptions import (
@@ -77,6 +78,7 @@ class WeatherDashboardController:
         self.rate_limiter = RateLimiter()
         self.unit_converter = UnitConverter()
         self.validation_utils = ValidationUtils()
+        self.state_utils = StateUtils()
         
         # Injected dependencies for testable components
         self.service = data_service
@@ -88,7 +90,9 @@ class WeatherDashboardController:
         
         # Factory for complex objects
         self.view_model_factory = lambda city, data, unit: WeatherViewModel(
-                city, data, unit
+                city, data, unit,
+                visible_metrics=self.state_utils.get_visible_metric_filter(self.state),
+                incremental=True
         )
 
         # Initialize internal service classes
@@ -99,6 +103,9 @@ class WeatherDashboardController:
         self._rate_limit_service = self._RateLimitService(self.error_handler)
         self._theme_service = self._ThemeService(theme, self.error_handler)
         self._ui_service = self._UIService(widgets, ui_handler)
+
+        # Last city rendered in the display, used to re-render from cache on unit switches
+        self._last_display_city: Optional[str] = None
         
     def set_theme(self, theme: str) -> None:
         """Set theme for error handling and future theme system integration."""
@@ -165,6 +172,42 @@ class WeatherDashboardController:
         active_alerts = self._alert_service.get_active_alerts()
         self._ui_service.show_weather_alerts(active_alerts)
 
+    def switch_unit_system(self, unit_system: str) -> bool:
+        """Re-render the current display in a new unit system from cached data.
+        
+        Data is always fetched in metric, so a unit switch only needs the cached
+        canonical observation and history run back through the conversion layer.
+        No network request is made.
+        
+        Args:
+            unit_system: Newly selected unit system ('metric' or 'imperial')
+            
+        Returns:
+            bool: True if the display was re-rendered from cache, False if nothing was cached
+        """
+        city_name = self._last_display_city
+        if not city_name:
+            return False
+
+        try:
+            self.validation_utils.validate_unit_system(unit_system)
+            raw_data = self.service.get_cached_city_data(city_name, unit_system)
+            if not isinstance(raw_data, dict):
+                self.logger.debug(f"No cached data for {city_name}, unit switch needs a fetch")
+                return False
+
+            raw_data["alerts"] = self._alert_service.generate_alerts(raw_data)
+            view_model = self.view_model_factory(city_name, raw_data, unit_system)
+            self._ui_service.update_display(view_model, None, self._data_service.is_simulated_data(raw_data))
+            self._chart_service.update_chart(use_cache=True)
+
+            self.logger.info(f"Switched {city_name} display to {unit_system} from cache")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Failed to switch unit system from cache for {city_name}: {e}")
+            return False
+
 # ================================
 # 2. PRIVATE HELPER METHODS
 # ================================
@@ -213,6 +256,7 @@ class WeatherDashboardController:
                 self.logger.error(f"Error in update_display: {e}")
                 self.logger.error(f"Error type: {type(e)}")
                 raise
+            self._last_display_city = city_name
             
             # Step 7: Log the data
             self._data_service.log_data(city_name, raw_data, unit_system)
@@ -487,7 +531,7 @@ class WeatherDashboardController:
                 **view_model.metrics,
                 "city": view_model.city_name,
                 "date": view_model.date_str
-            })
+            }, view_model.numeric_values)
 
             # Update status bar
             self.widgets.update_status_bar(view_model.city_name, error_exception, simulated)
@@ -555,6 +599,7 @@ class WeatherDashboardController:
             self.config = config
             self.dialog = dialog
             self.validation_utils = ValidationUtils()
+            self.unit_converter = UnitConverter()
             
             # Injected dependencies for testable components
             self.state = state
@@ -563,16 +608,20 @@ class WeatherDashboardController:
             self.error_handler = error_handler
             self.ui_handler = ui_handler
         
-        def update_chart(self) -> None:
+        def update_chart(self, use_cache: bool = False) -> None:
             """Update the chart with historical weather data for the selected city and metric.
         
             Retrieves chart settings, builds data series, and renders the chart
             with comprehensive error handling and recovery.
+
+            Args:
+                use_cache: Build the series from cached canonical data without any network fetch
             """
             try:
                 city, days, metric_key, unit = self._get_chart_settings()
-                x_vals, y_vals = self._build_chart_series(city, days, metric_key, unit)
-                self._render_chart(x_vals, y_vals, metric_key, city, unit)
+                x_vals, y_vals = self._build_chart_series(city, days, metric_key, unit, use_cache)
+                summary = self._get_range_summary(city, days, metric_key, unit)
+                self._render_chart(x_vals, y_vals, metric_key, city, unit, summary)
 
             except KeyError as e:
                 validation_error = ValidationError(str(e))
@@ -623,13 +672,16 @@ class WeatherDashboardController:
 
             return city, days, metric_key, unit
         
-        def _build_chart_series(self, city: str, days: int, metric_key: str, unit: str) -> Tuple[List[str], List[Any]]:
+        def _build_chart_series(self, city: str, days: int, metric_key: str, unit: str, use_cache: bool = False) -> Tuple[List[str], List[Any]]:
             """Build the x and y axis values for the chart based on historical data."""
-            # Get the dataclass result and extract the data entries
-            result = self.data_service.get_historical_data(city, days, unit)
-
-            # Handle both dataclass and direct list returns
-            if hasattr(result, 'data_entries'):
+            # Get the dataclass result with the series already converted into per-metric columns
+            result = self.data_service.get_historical_data(city, days, unit, use_cache=use_cache, columnar=True)
+
+            # Handle columnar results, plain dataclass results and direct list returns
+            columns = getattr(result, 'columns', None)
+            if isinstance(columns, dict):
+                data = result.data_entries
+            elif hasattr(result, 'data_entries'):
                 data = result.data_entries  # Extract the list from the dataclass
             elif isinstance(result, list):
                 data = result  # Direct list return
@@ -643,17 +695,30 @@ class WeatherDashboardController:
                     "{resource} '{name}' not found", resource="Historical data", name=city)
                 raise ValueError(f"Historical data '{city}' not found")
 
-            if not all(metric_key in d for d in data):
-                self.logger.warn(f"Warning: Some data entries are missing '{metric_key}'")
-                print(f"Warning: Some data entries are missing '{metric_key}'")
+            dates = list(columns['date']) if isinstance(columns, dict) else [d['date'] for d in data]
+            date_format = self._date_label_format(dates)
+            if isinstance(columns, dict):
+                x_vals = [d.strftime(date_format) for d in dates]  # Dynamic axis values
+                if metric_key in columns:
+                    y_vals = columns[metric_key].tolist()
+                else:
+                    self.logger.warn(f"Warning: Some data entries are missing '{metric_key}'")
+                    y_vals = []
+            else:
+                if not all(metric_key in d for d in data):
+                    self.logger.warn(f"Warning: Some data entries are missing '{metric_key}'")
+                    print(f"Warning: Some data entries are missing '{metric_key}'")
 
-            x_vals = [d['date'].strftime("%Y-%m-%d") for d in data]  # Dynamic axis values
-            y_vals = [d[metric_key] for d in data if metric_key in d]
+                x_vals = [d.strftime(date_format) for d in dates]  # Dynamic axis values
+                y_vals = [d[metric_key] for d in data if metric_key in d]
             
             # ADD CURRENT WEATHER AS LAST POINT
             try:
-                # Get current weather data for the city using the correct method
-                current_weather = self.data_service.get_city_data(city, unit)  # Returns Dict[str, Any]
+                # Get current weather data for the city (cached copy on unit switches, no refetch)
+                if use_cache:
+                    current_weather = self.data_service.get_cached_city_data(city, unit)
+                else:
+                    current_weather = self.data_service.get_city_data(city, unit)  # Returns Dict[str, Any]
                 if current_weather is None:
                     self.logger.warn(f"Failed to get city data for {city}")
                     return x_vals, y_vals
@@ -686,7 +751,7 @@ class WeatherDashboardController:
                     else:
                         self.logger.warn(f"Current weather data is not a dictionary for {city}")
                         current_date = datetime.now()
-                    x_vals.append(current_date.strftime("%Y-%m-%d"))
+                    x_vals.append(current_date.strftime(date_format))
                     y_vals.append(formatted_value)
                     
                     self.logger.info(f"Added current weather data to chart: {metric_key} = {current_weather[metric_key]}")
@@ -699,7 +764,29 @@ class WeatherDashboardController:
             
             return x_vals, y_vals
         
-        def _render_chart(self, x_vals: List[str], y_vals: List[Any], metric_key: str, city: str, unit: str) -> None:
+        def _date_label_format(self, dates: List[datetime]) -> str:
+            """Return the x-axis label format: the date for daily series, month, day and time for finer tiers."""
+            days = {d.date() for d in dates}
+            return "%Y-%m-%d" if len(days) == len(dates) else "%m-%d %H:%M"
+
+        def _get_range_summary(self, city: str, days: int, metric_key: str, unit: str) -> Optional[str]:
+            """Return the chart subtitle with the metric's mean over the range, or None if there are no readings.
+            
+            The mean comes from the in-memory readings of the range (window
+            aggregates over prefix sums), not from the plotted daily points.
+            """
+            try:
+                summary = self.data_service.get_range_summary(city, days, metric_key, unit)
+                if not summary:
+                    return None
+                unit_label = self.unit_converter.get_unit_label(metric_key, unit)
+                return f"{days}-day mean {summary['mean']:.1f} {unit_label} ({summary['count']} readings)"
+            except Exception as e:
+                self.logger.warn(f"Failed to summarize chart range for {city}: {e}")
+                return None
+
+        def _render_chart(self, x_vals: List[str], y_vals: List[Any], metric_key: str, city: str, unit: str,
+                          summary: Optional[str] = None) -> None:
             """Render the chart with the provided x and y values.
             
             Args:
@@ -708,9 +795,10 @@ class WeatherDashboardController:
                 metric_key: Weather metric being charted
                 city: City name for chart title
                 unit: Unit system for labeling
+                summary: Optional range summary shown under the title
             """
             try:
-                self.ui_handler.update_chart_components(x_vals, y_vals, metric_key, city, unit)
+                self.ui_handler.update_chart_components(x_vals, y_vals, metric_key, city, unit, summary=summary)
             except Exception as e:
                 self.logger.error(f"Failed to render chart: {e}")
                 raise ChartRenderingError(f"Failed to render chart for {city}: {e}")
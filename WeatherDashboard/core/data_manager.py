@@ -14,8 +14,12 @@ Classes:
     WeatherDataManager: Main data management class with API integration and fallback handling
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable
+from collections import OrderedDict
 import threading
+from datetime import datetime
+
+import numpy as np
 
 from WeatherDashboard import config
 from WeatherDashboard.utils.utils import Utils
@@ -39,6 +43,9 @@ class WeatherDataManager:
     Attributes:
         api_service: Weather API service for external data fetching
         weather_data: Dictionary storing weather data by city key
+        _canonical_current: Last metric (canonical) observation by city key, least recently used first
+        _canonical_history: Last metric (canonical) historical series and its day count by city key,
+            least recently used first. Both keep at most MEMORY['max_cities_stored'] cities
         _last_cleanup: Timestamp of last data cleanup operation
         _cleanup_interval_hours: Hours between automatic cleanup operations (from config)
     """
@@ -64,6 +71,11 @@ class WeatherDataManager:
         # Internal state
         self.history_service = WeatherHistoryService()
 
+        # Canonical (metric) caches for re-rendering in another unit system without network
+        self._canonical_current: OrderedDict = OrderedDict()  # City key -> observation
+        self._canonical_history: OrderedDict = OrderedDict()  # City key -> (num_days, series)
+        self._cache_lock = threading.Lock()  # Scheduler workers fill the caches alongside the UI thread
+
 # ================================  
 # 2. DATA FETCHING & HISTORY
 # ================================
@@ -88,14 +100,19 @@ class WeatherDataManager:
         self.logger.info(f"Fetching current weather for {city}")
         
         try:
-            weather_data = self.api_service.fetch_current(city, cancel_event)
+            weather_data = dict(self.api_service.fetch_current(city, cancel_event))
+            weather_data.setdefault('date', datetime.now())
+
+            # Keep the canonical observation (minus one-shot error info) so unit switches can be served from cache
+            canonical = {k: v for k, v in weather_data.items() if k not in ('api_error', 'error_type')}
+            self._cache_put(self._canonical_current, self.utils.city_key(city), canonical)
 
             # All API and fallback data is assumed to be in metric units and converted downstream.
             # If this changes in future (e.g., new fallback with imperial), update convert_units().
             converted_data = self.convert_units(weather_data, unit_system)
 
-            # Store latest call
-            self.store_current_weather(city, converted_data, unit_system)
+            # Store latest call in canonical units, so stored history never mixes unit systems
+            self.store_current_weather(city, canonical, unit_system)
             self.logger.info(f"Current weather fetched for {city}")
             
             return converted_data
@@ -105,15 +122,77 @@ class WeatherDataManager:
             raise
 
     def get_historical(self, city: str, num_days: int) -> List[Dict[str, Any]]:
-        """Generate historical weather data for a city."""
-        return self.history_service.get_historical(city, num_days)
+        """Return historical weather data for a city from the tier suited to the range (stored history, gap-filled)."""
+        history = self.history_service.get_historical(city, num_days)
+        self._cache_put(self._canonical_history, self.utils.city_key(city), (num_days, history))
+        return history
+
+    def _cache_put(self, cache: OrderedDict, key: str, value: Any) -> None:
+        """Store a canonical cache entry as most recently used, evicting the least recently used past the city cap."""
+        with self._cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > self.config.MEMORY['max_cities_stored']:
+                cache.popitem(last=False)
+
+    def _cache_get(self, cache: OrderedDict, key: str) -> Any:
+        """Return a canonical cache entry (None if absent), marking it most recently used."""
+        with self._cache_lock:
+            if key not in cache:
+                return None
+            cache.move_to_end(key)
+            return cache[key]
+
+    def get_cached_current(self, city: str, unit_system: str) -> Optional[Dict[str, Any]]:
+        """Return the last canonical observation for a city converted to unit_system.
+
+        Serves unit-system switches without a network round trip.
+
+        Args:
+            city: City name to look up
+            unit_system: Target unit system ('metric' or 'imperial')
+
+        Returns:
+            Optional[Dict[str, Any]]: Converted copy of the cached observation, or None if not cached
+        """
+        cached = self._cache_get(self._canonical_current, self.utils.city_key(city))
+        if cached is None:
+            return None
+        return self.convert_units(cached, unit_system)
+
+    def get_cached_historical(self, city: str, num_days: int) -> Optional[List[Dict[str, Any]]]:
+        """Return the last canonical historical series for a city if it was built for num_days.
+
+        Ranges are charted from different tiers (see select_history_tier), so a
+        series is only reused for the same range, never sliced to a shorter one.
+
+        Args:
+            city: City name to look up
+            num_days: Number of days required
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: Cached metric entries, or None if not cached for this range
+        """
+        cached = self._cache_get(self._canonical_history, self.utils.city_key(city))
+        if cached is None or cached[0] != num_days:
+            return None
+        return cached[1]
 
     def get_recent_data(self, city: str, days_back: int = 7) -> List[Dict[str, Any]]:
         """Return recent weather data for a city from the last N days."""
         return self.history_service.get_recent_data(city, days_back)
 
+    def get_rolling_stats(self, city: str, metric: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Return running summary statistics (mean, variance, min/max, EWMA, change) for a city's recent history."""
+        return self.history_service.get_rolling_stats(city, metric)
+
+    def get_window_aggregates(self, city: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                              metrics: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Return per-metric sum, count and mean of a city's history over [start, end), answered from prefix sums."""
+        return self.history_service.get_window_aggregates(city, start, end, metrics)
+
     def store_current_weather(self, city: str, weather_data: Dict[str, Any], unit_system: str = "metric") -> None:
-        """Store current weather data for historical tracking."""
+        """Store current weather data (metric units) for historical tracking; unit_system only formats the text log."""
         self.history_service.store_current_weather(city, weather_data, unit_system)
 
 # ================================
@@ -146,7 +225,32 @@ class WeatherDataManager:
         unit_config = self.config.UNITS.get("metric_units", {})
         
         # Define converter functions mapping
-        converters = {
+        converters = self._get_field_converters()
+
+        conversion_errors: List[str] = []  # Track conversion failures
+
+        # Apply conversions using config-defined units
+        for field, converter_func in converters.items():
+            if field in data and data[field] is not None and field in unit_config:
+                try:
+                    from_unit = unit_config[field]["metric"]  # Always convert from metric
+                    to_unit = unit_config[field]["imperial"]  # To imperial
+                    converted[field] = converter_func(data[field], from_unit, to_unit)
+                except (ValueError, TypeError, KeyError) as e:
+                    self.logger.warn(self.config.ERROR_MESSAGES['conversion'].format(field=field, from_unit="metric", to_unit="imperial", reason=str(e)))
+                    conversion_errors.append(field)
+                    # Keep original value if conversion fails
+        
+        
+        if conversion_errors: # Track which fields failed conversion
+            converted['_conversion_warnings'] = f"Some units could not be converted: {', '.join(conversion_errors)}"
+            self.logger.error(self.config.ERROR_MESSAGES['conversion'].format(field=f"fields: {', '.join(conversion_errors)}", from_unit="metric", to_unit="imperial", reason="conversion failed"))
+
+        return converted
+
+    def _get_field_converters(self) -> Dict[str, Callable[[Any, str, str], Any]]:
+        """Return the converter function for each unit-bearing weather field."""
+        return {
             'temperature': self.unit_converter.convert_temperature,
             'pressure': self.unit_converter.convert_pressure,
             'wind_speed': self.unit_converter.convert_wind_speed,
@@ -165,24 +269,67 @@ class WeatherDataManager:
             'wind_chill': self.unit_converter.convert_wind_chill,
             'dew_point': self.unit_converter.convert_dew_point
         }
+
+    def to_columns(self, entries: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """Turn a list of weather entries into per-field columns.
         
-        conversion_errors: List[str] = []  # Track conversion failures
+        Numeric fields become float64 arrays with missing values as NaN; all other
+        fields (dates, condition text) become object arrays. Every column has one
+        element per entry, so columns stay aligned with each other.
+        
+        Args:
+            entries: Weather data dictionaries, typically a historical series
+            
+        Returns:
+            Dict[str, np.ndarray]: Column arrays keyed by field name
+        """
+        fields: Dict[str, None] = {}
+        for entry in entries:
+            fields.update(dict.fromkeys(entry))
 
-        # Apply conversions using config-defined units
-        for field, converter_func in converters.items():
-            if field in data and data[field] is not None and field in unit_config:
-                try:
-                    from_unit = unit_config[field]["metric"]  # Always convert from metric
-                    to_unit = unit_config[field]["imperial"]  # To imperial
-                    converted[field] = converter_func(data[field], from_unit, to_unit)
-                except (ValueError, TypeError, KeyError) as e:
-                    self.logger.warn(self.config.ERROR_MESSAGES['conversion'].format(field=field, from_unit="metric", to_unit="imperial", reason=str(e)))
-                    conversion_errors.append(field)
-                    # Keep original value if conversion fails
+        columns = {}
+        for field in fields:
+            values = [entry.get(field) for entry in entries]
+            if all(value is None or (isinstance(value, (int, float)) and not isinstance(value, bool)) for value in values):
+                columns[field] = np.array(values, dtype=float)
+            else:
+                columns[field] = np.array(values, dtype=object)
+        return columns
+
+    def convert_columns(self, columns: Dict[str, np.ndarray], unit_system: str) -> Dict[str, np.ndarray]:
+        """Convert per-field columns to the selected unit system in one vectorized pass.
         
+        Columnar counterpart of convert_units: each unit-bearing column is converted
+        with a single array operation instead of one dictionary copy per entry.
+        Values match convert_units exactly, and NaN (missing) entries stay NaN.
         
-        if conversion_errors: # Track which fields failed conversion
-            converted['_conversion_warnings'] = f"Some units could not be converted: {', '.join(conversion_errors)}"
+        Args:
+            columns: Column arrays in metric units, as produced by to_columns
+            unit_system: Target unit system ('metric' or 'imperial')
+            
+        Returns:
+            Dict[str, np.ndarray]: New column mapping with converted arrays
+        """
+        self.validation_utils.validate_unit_system(unit_system)
+
+        converted = dict(columns)
+        if unit_system == "metric":
+            return converted
+
+        unit_config = self.config.UNITS.get("metric_units", {})
+        conversion_errors: List[str] = []
+
+        for field, converter_func in self._get_field_converters().items():
+            values = columns.get(field)
+            if values is None or field not in unit_config or values.dtype.kind != 'f':
+                continue
+            try:
+                converted[field] = converter_func(values, unit_config[field]["metric"], unit_config[field]["imperial"])
+            except (ValueError, TypeError, KeyError) as e:
+                self.logger.warn(self.config.ERROR_MESSAGES['conversion'].format(field=field, from_unit="metric", to_unit="imperial", reason=str(e)))
+                conversion_errors.append(field)
+
+        if conversion_errors:
             self.logger.error(self.config.ERROR_MESSAGES['conversion'].format(field=f"fields: {', '.join(conversion_errors)}", from_unit="metric", to_unit="imperial", reason="conversion failed"))
 
         return converted
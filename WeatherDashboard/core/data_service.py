@@ -11,8 +11,9 @@ Classes:
 
 from dataclasses import dataclass
 from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime
+from datetime import datetime, timedelta
 import threading
+import time
 
 from WeatherDashboard.utils.logger import Logger
 from WeatherDashboard.utils.validation_utils import ValidationUtils
@@ -24,7 +25,10 @@ class HistoricalDataResult:
     """Type-safe container for historical weather data results.
     
     Contains historical weather data with metadata about
-    the request and data quality.
+    the request and data quality. Columnar requests carry per-metric
+    arrays in ``columns`` (converted to ``unit_system``) and leave
+    ``data_entries`` as the unconverted source entries. If the columns
+    cannot be built, ``columns`` is None and ``data_entries`` are converted.
     """
     city_name: str
     data_entries: List[Dict[str, Any]]
@@ -36,11 +40,12 @@ class HistoricalDataResult:
 
     # Rich service layer metadata
     operation_status: str = "success"
-    processing_time_ms: Optional[int] = None
+    processing_time_ms: Optional[float] = None
     data_completeness: float = 1.0  # Percentage of requested days with data
     cache_hits: int = 0
     api_calls_made: int = 0
     errors: List[str] = None
+    columns: Optional[Dict[str, Any]] = None  # Per-metric np.ndarray columns (columnar requests only)
     
     def __post_init__(self):
         """Validate dataclass after initialization."""
@@ -190,49 +195,82 @@ class WeatherDataService:
             self.logger.error(f"Failed to get city data for {city_name}: {e}")
             raise
 
-    def get_historical_data(self, city_name: str, num_days: int, unit_system: str) -> HistoricalDataResult:
+    def get_cached_city_data(self, city_name: str, unit_system: str) -> Optional[Dict[str, Any]]:
+        """Get the last fetched weather data for a city from cache, converted to unit_system.
+        
+        Used for unit-system switches, which only need a re-render of data already fetched.
+        
+        Args:
+            city_name: Raw city name input (will be normalized)
+            unit_system: Target unit system ('metric' or 'imperial')
+            
+        Returns:
+            Optional[Dict[str, Any]]: Weather data dictionary, or None if the city has not been fetched yet
+        """
+        try:
+            normalized_city, normalized_unit = self._validate_inputs(city_name, unit_system)
+        except ValueError as e:
+            raise ValidationError(str(e))
+        
+        return self.data_manager.get_cached_current(normalized_city, normalized_unit)
+
+    def get_historical_data(self, city_name: str, num_days: int, unit_system: str, use_cache: bool = False, columnar: bool = False) -> HistoricalDataResult:
         """Get historical weather data for a city with unit conversion.
         
         Retrieves historical weather data through data manager and applies
         unit conversion to match the requested unit system. Handles validation
         of input parameters and provides consistent data formatting.
         
+        The columnar path turns the series into per-metric arrays once and
+        converts each array in a single vectorized operation, instead of
+        copying and converting every entry dictionary.
+        
         Args:
             city: Target city name for historical data
             days: Number of days of historical data to retrieve
             unit_system: Target unit system for data formatting
+            use_cache: Reuse the last canonical series for the city when available
+            columnar: Return converted per-metric arrays in ``columns`` instead of converted entries
             
         Returns:
             HistoricalDataResult: Type-safe container with historical data and metadata
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter()
 
         try:
             # Validate inputs
             normalized_city, normalized_unit = self._validate_inputs(city_name, unit_system)
             
-            # Get raw historical data
-            raw_data = self.data_manager.get_historical(normalized_city, num_days)
+            # Get raw historical data (cached canonical series first when requested)
+            raw_data = self.data_manager.get_cached_historical(normalized_city, num_days) if use_cache else None
+            cache_hits = 1 if raw_data is not None else 0
+            if raw_data is None:
+                raw_data = self.data_manager.get_historical(normalized_city, num_days)
             
             # Determine if conversion is needed
-            source_unit = "metric"  # Same as generator's output
+            source_unit = "metric"  # Stored history and generated days are both metric
             conversion_applied = normalized_unit != source_unit
             
-            # Apply unit conversion if needed
+            # Apply unit conversion if needed (columns first; entries if that fails)
             errors = []
-            if conversion_applied:
+            columns = None
+            converted_data = raw_data
+            if columnar:
                 try:
-                    converted_data = [self.data_manager.convert_units(d, normalized_unit) for d in raw_data]
+                    columns = self.data_manager.convert_columns(self.data_manager.to_columns(raw_data), normalized_unit)
                 except Exception as e:
+                    self.logger.warn(f"Columnar unit conversion failed for {normalized_city}, converting entries instead: {e}")
                     errors.append(f"Unit conversion error: {str(e)}")
-                    converted_data = raw_data
-            else:
-                converted_data = raw_data
+            if columns is None and conversion_applied:
+                try:
+                    converted_data = [self.data_manager.convert_units(d, normalized_unit) for d in raw_data]
+                except Exception as e:
+                    # Never hand back metric values labelled with the requested unit
+                    raise ValueError(f"Unit conversion to {normalized_unit} failed: {e}") from e
             
-            processing_time = int((datetime.now() - start_time).total_seconds() * 1000)
-
-            # Calculate data completeness
-            data_completeness = len(converted_data) / num_days if num_days > 0 else 0.0
+            # Calculate data completeness (days or bins filled in by generated or gap-filled data do not count)
+            real_entries = sum(1 for entry in raw_data if not (isinstance(entry, dict) and entry.get('gap_filled')))
+            data_completeness = min(1.0, real_entries / len(raw_data)) if raw_data else 0.0
             
             # Determine operation status
             operation_status = "success"
@@ -251,16 +289,15 @@ class WeatherDataService:
                 timestamp=datetime.now(),
                 # SERVICE LAYER METADATA FIELDS:
                 operation_status=operation_status,
-                processing_time_ms=processing_time,
+                processing_time_ms=self._elapsed_ms(start_time),
                 data_completeness=data_completeness,
-                cache_hits=0,  # need cache implementation to track this
+                cache_hits=cache_hits,
                 api_calls_made=0,  # need API tracking to count this
-                errors=errors
+                errors=errors,
+                columns=columns
             )
         
         except Exception as e:
-            processing_time = int((datetime.now() - start_time).total_seconds() * 1000)
-
             return HistoricalDataResult(
                 city_name=city_name,
                 data_entries=[],
@@ -271,13 +308,46 @@ class WeatherDataService:
                 timestamp=datetime.now(),
                 # SERVICE LAYER METADATA FIELDS:
                 operation_status="failed",
-                processing_time_ms=processing_time,
+                processing_time_ms=self._elapsed_ms(start_time),
                 data_completeness=0.0,
                 cache_hits=0,
                 api_calls_made=0,
                 errors=[f"Operation error: {str(e)}"]
             )
 
+    def get_range_summary(self, city_name: str, num_days: int, metric_key: str, unit_system: str) -> Optional[Dict[str, Any]]:
+        """Get the mean of one metric over a chart range from the city's in-memory history.
+        
+        Answered from the history buffer's prefix sums, so switching ranges
+        costs the same whatever the number of readings they cover. The range
+        starts at midnight ``num_days - 1`` days ago, like the chart series.
+        
+        Args:
+            city_name: Raw city name input (will be normalized)
+            num_days: Number of days in the range, including today
+            metric_key: Metric to summarize
+            unit_system: Target unit system for the mean
+            
+        Returns:
+            Optional[Dict[str, Any]]: 'mean' (in unit_system) and 'count' of readings, or None if
+                the range holds no readings of the metric
+        """
+        try:
+            normalized_city, normalized_unit = self._validate_inputs(city_name, unit_system)
+        except ValueError as e:
+            raise ValidationError(str(e))
+        
+        start = datetime.combine(datetime.now().date() - timedelta(days=num_days - 1), datetime.min.time())
+        aggregates = self.data_manager.get_window_aggregates(normalized_city, start, None, [metric_key]).get(metric_key)
+        if not aggregates:
+            return None
+        mean = self.data_manager.convert_units({metric_key: aggregates['mean']}, normalized_unit)[metric_key]
+        return {'mean': mean, 'count': aggregates['count']}
+
+    def _elapsed_ms(self, start_time: float) -> float:
+        """Return milliseconds elapsed since a time.perf_counter() reading."""
+        return round((time.perf_counter() - start_time) * 1000, 3)
+
     def write_to_log(self, city: str, data: Dict[str, Any], unit: str) -> LoggingResult:
         """Write weather data to the log file.
         
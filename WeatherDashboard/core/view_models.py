@@ -10,13 +10,30 @@ Classes:
 """
 
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Optional, Tuple
+from collections import OrderedDict
 from datetime import datetime
+import threading
 
 from WeatherDashboard import config, styles
 from WeatherDashboard.utils.utils import Utils
 from WeatherDashboard.utils.unit_converter import UnitConverter
 
+# Shared formatting helpers - stateless, so one instance serves every view model
+_SHARED_UTILS = Utils()
+_SHARED_UNIT_CONVERTER = UnitConverter()
+
+# Enhanced displays: (metric whose visibility shows it, raw fields it is built from)
+ENHANCED_DISPLAY_SOURCES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    'enhanced_temperature': ('temperature', ('temperature', 'feels_like')),
+    'temp_range': ('temp_min', ('temp_min', 'temp_max')),
+    'enhanced_conditions': ('conditions', ('conditions', 'weather_icon')),
+    'enhanced_wind': ('wind_speed', ('wind_speed', 'wind_direction', 'wind_gust')),
+}
+
+# Displays that depend on more than raw data (icons follow the active theme) and are never reused
+_NON_REUSABLE_DISPLAYS = {'enhanced_conditions'}
+
 
 @dataclass
 class WeatherDisplayData:
@@ -95,41 +112,102 @@ class WeatherViewModel:
     information suitable for UI display. Encapsulates all formatting logic
     for easy testing, maintenance, and future extension.
     
+    Formatting is lazy: date, status and metrics are built on first access.
+    When visible metrics are given, only those metrics (and the enhanced
+    displays they drive) are formatted. In incremental mode, fields whose raw
+    values are unchanged since the previous view model for the same city
+    reuse that view model's formatted strings.
+    
     Attributes:
         city_name: Formatted city name for display
         unit_system: Unit system for value formatting
         raw_data: Original raw weather data
+        visible_metrics: Metric keys to format, or None for all metrics
         date_str: Formatted date string
         status: Status text including fallback and warning information
         metrics: Dictionary of formatted metric values
+        numeric_values: Typed numeric values behind the displayed metrics
     """
+
+    # Most recent formatted view model per city, used by incremental mode. View models
+    # are built on the UI and scheduler threads, so the LRU cache is shared under a lock.
+    _previous_by_city: 'OrderedDict[str, WeatherViewModel]' = OrderedDict()
+    _previous_lock = threading.Lock()
     
-    def __init__(self, city: str, data: Dict[str, Any], unit_system: str) -> None:
-        """Initialize the weather view model with formatted display data.
-        
-        Processes raw weather data into display-ready format on initialization
-        for efficient access to formatted values throughout the UI.
+    def __init__(self, city: str, data: Dict[str, Any], unit_system: str,
+                 visible_metrics: Optional[Iterable[str]] = None, incremental: bool = False) -> None:
+        """Initialize the weather view model.
         
         Args:
             city: City name for display
             data: Raw weather data dictionary
             unit_system: Unit system for value formatting ('metric' or 'imperial')
+            visible_metrics: Metric keys currently shown (None formats every metric)
+            incremental: Reuse unchanged formatted fields from the previous view model for this city
         """
         # Direct imports for stable utilities
         self.config = config
         self.styles = styles
-        self.utils = Utils()
-        self.unit_converter = UnitConverter()
+        self.utils = _SHARED_UTILS
+        self.unit_converter = _SHARED_UNIT_CONVERTER
 
         # Instance data
         self.city_name: str = city
         self.unit_system: str = unit_system
         self.raw_data: Dict[str, Any] = data
+        self.visible_metrics: Optional[frozenset] = frozenset(visible_metrics) if visible_metrics is not None else None
+        self.incremental: bool = incremental
+        
+        # Formatted data, built on first access
+        self._date_str: Optional[str] = None
+        self._status: Optional[str] = None
+        self._metrics: Optional[Dict[str, str]] = None
+        self._numeric_values: Optional[Dict[str, Optional[float]]] = None
+
+    @property
+    def date_str(self) -> str:
+        """Formatted date string (built on first access)."""
+        if self._date_str is None:
+            self._date_str = self._format_date()
+        return self._date_str
+
+    @property
+    def status(self) -> str:
+        """Formatted status text (built on first access)."""
+        if self._status is None:
+            self._status = self._format_status()
+        return self._status
+
+    @property
+    def metrics(self) -> Dict[str, str]:
+        """Formatted metric values (built on first access)."""
+        if self._metrics is None:
+            self._metrics = self._format_metrics()
+        return self._metrics
+
+    @property
+    def numeric_values(self) -> Dict[str, Optional[float]]:
+        """Typed numeric values behind the displayed metrics (built on first access).
         
-        # Process all display data on initialization
-        self.date_str: str = self._format_date()
-        self.status: str = self._format_status()
-        self.metrics: Dict[str, str] = self._format_metrics()
+        Keyed by metric key in the display unit system, with None for missing or
+        non-numeric values. Lets the UI color metrics without re-parsing display text.
+        """
+        if self._numeric_values is None:
+            self._numeric_values = self._extract_numeric_values()
+        return self._numeric_values
+
+    def _extract_numeric_values(self) -> Dict[str, Optional[float]]:
+        """Collect numeric raw values for visible metrics (plus feels-like for temperature)."""
+        keys = [metric_key for metric_key in self.config.METRICS if self._is_visible(metric_key)]
+        if self._is_visible('temperature') and 'feels_like' not in keys:
+            keys.append('feels_like')
+
+        numeric_values = {}
+        for metric_key in keys:
+            value = self.raw_data.get(metric_key)
+            is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+            numeric_values[metric_key] = float(value) if is_number else None
+        return numeric_values
 
     def _format_date(self) -> str:
         """Format the date for display.
@@ -165,25 +243,75 @@ class WeatherViewModel:
     def _format_metrics(self) -> Dict[str, str]:
         """Format weather metrics with enhanced display combinations.
         
+        Formats visible metrics only (all metrics when no visibility is given).
+        In incremental mode, a field keeps the previous view model's string when
+        every raw value it is built from is unchanged and the unit system matches.
+        
         Returns:
             Dict[str, str]: Dictionary mapping metric keys to formatted display values
         """        
+        previous = self._get_previous() if self.incremental else None
         metrics = {}
 
-        # Process ALL individual metrics first
+        # Process individual metrics first
         for metric_key in self.config.METRICS:
+            if not self._is_visible(metric_key):
+                continue
+            if previous is not None and self._can_reuse(previous, metric_key, (metric_key,)):
+                metrics[metric_key] = previous._metrics[metric_key]
+                continue
             raw_value = self.raw_data.get(metric_key)
-            display_val = self.unit_converter.format_value(metric_key, raw_value, self.unit_system)
-            metrics[metric_key] = display_val
+            metrics[metric_key] = self.unit_converter.format_value(metric_key, raw_value, self.unit_system)
         
         # Add enhanced combination displays
-        metrics['enhanced_temperature'] = self._format_enhanced_display('temperature')
-        metrics['temp_range'] = self._format_enhanced_display('temp_range')
-        metrics['enhanced_conditions'] = self._format_enhanced_display('conditions')
-        metrics['enhanced_wind'] = self._format_enhanced_display('wind')
+        display_types = {'enhanced_temperature': 'temperature', 'temp_range': 'temp_range',
+                         'enhanced_conditions': 'conditions', 'enhanced_wind': 'wind'}
+        for display_key, (driving_metric, sources) in ENHANCED_DISPLAY_SOURCES.items():
+            if not self._is_visible(driving_metric):
+                continue
+            if (previous is not None and display_key not in _NON_REUSABLE_DISPLAYS
+                    and self._can_reuse(previous, display_key, sources)):
+                metrics[display_key] = previous._metrics[display_key]
+                continue
+            metrics[display_key] = self._format_enhanced_display(display_types[display_key])
+
+        if self.incremental:
+            self._remember()
         
         return metrics
 
+    def _is_visible(self, metric_key: str) -> bool:
+        """Check whether a metric should be formatted for this view model."""
+        return self.visible_metrics is None or metric_key in self.visible_metrics
+
+    def _get_previous(self) -> Optional['WeatherViewModel']:
+        """Return the previous formatted view model for this city in the same unit system."""
+        city_key = self.utils.city_key(self.city_name)
+        with WeatherViewModel._previous_lock:
+            previous = WeatherViewModel._previous_by_city.get(city_key)
+            if previous is not None:
+                WeatherViewModel._previous_by_city.move_to_end(city_key)
+        if previous is None or previous._metrics is None or previous.unit_system != self.unit_system:
+            return None
+        return previous
+
+    def _can_reuse(self, previous: 'WeatherViewModel', key: str, sources: Tuple[str, ...]) -> bool:
+        """Check whether a previously formatted field is still valid for the current raw data."""
+        if key not in previous._metrics:
+            return False
+        return all(self.raw_data.get(field) == previous.raw_data.get(field) for field in sources)
+
+    def _remember(self) -> None:
+        """Record this view model as the latest for its city, evicting the least recently used past the city memory limit."""
+        city_key = self.utils.city_key(self.city_name)
+        max_cities = self.config.MEMORY.get('max_cities_stored', 50)
+        with WeatherViewModel._previous_lock:
+            cache = WeatherViewModel._previous_by_city
+            cache[city_key] = self
+            cache.move_to_end(city_key)
+            while len(cache) > max_cities:
+                cache.popitem(last=False)
+
     def _format_enhanced_display(self, display_type: str) -> str:
         """Format complex metric displays with enhanced user-friendly presentation.
 
@@ -2,11 +2,25 @@
 Weather history storage and data gathering system
 
 Modules:
+    history_buffer: Columnar per-city ring buffers for in-memory history
+    history_import: Chunked bulk import of external CSV datasets into history
+    history_journal: Crash-safe write-ahead journal replayed into in-memory history
+    history_resample: Vectorized resampling of irregular history onto uniform time grids
     history_service: Data organization, storage and access
+    history_stats: Incremental per-city summary statistics of in-memory history
+    history_store: Persistent history backends (SQLite, CSV)
     scheduler_service: Data gathering and scheduling
+    watchlist: Persisted watchlist of cities collected by the scheduler
 """
 
 __all__ = [
+    "history_buffer",
+    "history_import",
+    "history_journal",
+    "history_resample",
     "history_service",
-    "scheduler_service"
+    "history_stats",
+    "history_store",
+    "scheduler_service",
+    "watchlist"
 ]
\ No newline at end of file
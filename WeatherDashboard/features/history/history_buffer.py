@@ -0,0 +1,543 @@
+"""
+Columnar ring buffers for in-memory weather history.
+
+Each city's recent observations live in fixed-capacity, array-backed
+columns: an epoch-seconds timestamp column plus one float64 column per
+numeric history metric (NaN for missing values). Appending and evicting the
+oldest entry are O(1), and windows of a column are returned as read-only
+numpy views without copying. Fields without a numeric column (condition
+text, source flags, derived values) are kept per entry alongside.
+
+Each column is stored twice over ("mirrored") so the live region is always
+one contiguous slice, even after the ring wraps. Storage grows by doubling
+up to the capacity, so memory per city is bounded by
+``2 * capacity * (3 * len(NUMERIC_FIELDS) + 2) * 8`` bytes plus the per-entry
+extras.
+
+Alongside the columns, every slot holds the running (inclusive prefix) sum
+and count of each metric's non-missing values up to that entry. The sum or
+mean over any time window is then two binary searches for its bounds and a
+subtraction of two prefix rows, however many entries it spans. Eviction
+only advances the ring's start; prefixes are rebased to zero whenever the
+storage is compacted or reallocated.
+
+Readers on other threads take a ``view()``: an immutable snapshot sharing the
+buffer's storage. Appends to free slots never touch a view's entries; before
+the buffer overwrites a slot a view still covers (eviction at capacity,
+compaction) it copies its live entries to fresh storage (copy-on-write), so
+views stay valid without readers ever holding a lock.
+
+Classes:
+    HistoryView: Read-only, point-in-time view of a buffer's entries
+    CityHistoryBuffer: Fixed-capacity columnar ring buffer of one city's entries
+"""
+
+from typing import Dict, List, Any, Optional, Iterator, Union, Tuple
+from datetime import datetime
+import math
+import sys
+
+import numpy as np
+
+from .history_store import HISTORY_FIELDS
+
+
+# Metrics stored as float64 columns, and those read back as ints when whole
+NUMERIC_FIELDS = tuple(field for field, field_type in HISTORY_FIELDS.items() if field_type in (int, float))
+INTEGER_FIELDS = frozenset(field for field in NUMERIC_FIELDS if HISTORY_FIELDS[field] is int)
+FIELD_POSITIONS = {field: position for position, field in enumerate(NUMERIC_FIELDS)}  # Column of each metric in prefix rows
+INITIAL_ALLOCATION = 32  # Entries allocated for a new city before doubling
+
+
+class HistoryView:
+    """Read-only, point-in-time view of a city's history entries.
+
+    Returned by ``CityHistoryBuffer.view``. Shares the buffer's storage
+    without copying; the buffer copies its own storage away before
+    overwriting anything a view covers, so a view never changes and can be
+    read from any thread without locking. Behaves like a read-only sequence
+    of weather data dictionaries in insertion order (``len``, indexing,
+    slicing, iteration), rebuilt from the columns on access. Charting code
+    should use ``column``/``timestamps``, which return views into the storage.
+
+    Attributes:
+        version: Buffer version the view was taken at
+    """
+
+    def __init__(self, timestamps: np.ndarray, columns: Dict[str, np.ndarray], extras: np.ndarray,
+                 sums: np.ndarray, counts: np.ndarray, start: int, count: int, ordered: bool, version: int) -> None:
+        """Initialize a view over live positions [start, start + count) of mirrored storage."""
+        self.version = version
+
+        # Internal state
+        self._timestamps = timestamps
+        self._columns = columns
+        self._extras = extras
+        self._sums = sums      # Prefix sums of non-missing values, one row per slot (FIELD_POSITIONS order)
+        self._counts = counts  # Prefix counts of non-missing values, likewise
+        self._start = start
+        self._count = count
+        self._ordered = ordered
+
+# ================================
+# 1. COLUMN ACCESS (ZERO-COPY)
+# ================================
+    def timestamps(self) -> np.ndarray:
+        """Return the epoch-seconds timestamps, oldest first, as a read-only view."""
+        return self._view(self._timestamps, 0, self._count)
+
+    def column(self, field: str) -> np.ndarray:
+        """Return a numeric metric column, oldest first, as a read-only view (NaN where missing).
+
+        Raises:
+            KeyError: If the field has no numeric column
+        """
+        return self._view(self._columns[field], 0, self._count)
+
+    def snapshot(self) -> Tuple[np.ndarray, Dict[str, np.ndarray], List[Dict[str, Any]]]:
+        """Return copies of the timestamps, numeric columns and extras, oldest first (the inverse of CityHistoryBuffer.extend)."""
+        live = slice(self._start, self._start + self._count)
+        columns = {field: column[live].copy() for field, column in self._columns.items()}
+        return self._timestamps[live].copy(), columns, list(self._extras[live])
+
+    def oldest_timestamp(self) -> Optional[float]:
+        """Epoch seconds of the oldest entry in insertion order (the next to be evicted), or None if empty."""
+        return float(self._timestamps[self._start]) if self._count else None
+
+    @property
+    def ordered(self) -> bool:
+        """True while entries have been appended in time order."""
+        return self._ordered
+
+    def window_bounds(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> tuple:
+        """Return (first, stop) entry positions for an inclusive time range, or None if entries are unordered.
+
+        Binary search over the timestamp column; only possible while entries
+        were appended in time order.
+        """
+        if not self._ordered:
+            return None
+        timestamps = self.timestamps()
+        first = 0 if start is None else int(np.searchsorted(timestamps, start.timestamp(), side='left'))
+        stop = self._count if end is None else int(np.searchsorted(timestamps, end.timestamp(), side='right'))
+        return first, max(first, stop)
+
+    def columns(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict[str, np.ndarray]:
+        """Return 'timestamp' and every numeric column for a time range.
+
+        Views into the buffer when entries are time-ordered; filtered copies otherwise.
+        """
+        bounds = self.window_bounds(start, end)
+        if bounds is not None:
+            first, stop = bounds
+            result = {'timestamp': self._view(self._timestamps, first, stop)}
+            result.update((field, self._view(column, first, stop)) for field, column in self._columns.items())
+            return result
+
+        mask = self._range_mask(start, end)
+        result = {'timestamp': self.timestamps()[mask]}
+        result.update((field, self.column(field)[mask]) for field in self._columns)
+        return result
+
+    def _view(self, array: np.ndarray, first: int, stop: int) -> np.ndarray:
+        """Read-only view of live positions [first, stop)."""
+        view = array[self._start + first:self._start + stop]
+        view.flags.writeable = False
+        return view
+
+    def _range_mask(self, start: Optional[datetime], end: Optional[datetime]) -> np.ndarray:
+        """Boolean mask of entries within an inclusive time range."""
+        timestamps = self.timestamps()
+        mask = np.ones(self._count, dtype=bool)
+        if start is not None:
+            mask &= timestamps >= start.timestamp()
+        if end is not None:
+            mask &= timestamps <= end.timestamp()
+        return mask
+
+# ================================
+# 2. WINDOW AGGREGATES
+# ================================
+    def window_totals(self, field: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Tuple[float, int]:
+        """Return the sum and count of a metric's non-missing values dated in [start, end).
+
+        While entries are time-ordered this is two binary searches for the
+        bounds and two prefix-row lookups, whatever the window size; an
+        unordered buffer falls back to a masked scan.
+
+        Raises:
+            KeyError: If the field has no numeric column
+        """
+        position = FIELD_POSITIONS[field]
+        timestamps = self.timestamps()
+        if not self._ordered:
+            mask = np.ones(self._count, dtype=bool)
+            if start is not None:
+                mask &= timestamps >= start.timestamp()
+            if end is not None:
+                mask &= timestamps < end.timestamp()
+            values = self.column(field)[mask]
+            values = values[~np.isnan(values)]
+            return float(values.sum()), int(values.size)
+
+        first = 0 if start is None else int(np.searchsorted(timestamps, start.timestamp(), side='left'))
+        stop = self._count if end is None else int(np.searchsorted(timestamps, end.timestamp(), side='left'))
+        if stop <= first:
+            return 0.0, 0
+        first_slot, last_slot = self._start + first, self._start + stop - 1
+        first_value = float(self._columns[field][first_slot])
+        present = not math.isnan(first_value)
+        total = self._sums[last_slot, position] - self._sums[first_slot, position] + (first_value if present else 0.0)
+        count = self._counts[last_slot, position] - self._counts[first_slot, position] + present
+        return float(total), int(count)
+
+    def window_mean(self, field: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Optional[float]:
+        """Return the mean of a metric's values dated in [start, end), or None if it has none there."""
+        total, count = self.window_totals(field, start, end)
+        return total / count if count else None
+
+# ================================
+# 3. ENTRY ACCESS
+# ================================
+    def entries_since(self, start: datetime) -> List[Dict[str, Any]]:
+        """Return the entries dated at or after ``start``, oldest first."""
+        bounds = self.window_bounds(start)
+        if bounds is not None:
+            return [self._entry(position) for position in range(*bounds)]
+        return [self._entry(int(position)) for position in np.flatnonzero(self._range_mask(start, None))]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for position in range(self._count):
+            yield self._entry(position)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(index, slice):
+            return [self._entry(position) for position in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("history buffer index out of range")
+        return self._entry(index)
+
+    def __repr__(self) -> str:
+        return f"HistoryView(entries={self._count}, version={self.version})"
+
+    def _entry(self, position: int) -> Dict[str, Any]:
+        """Rebuild the weather data dictionary at a live position."""
+        slot = self._start + position
+        entry = {'date': datetime.fromtimestamp(self._timestamps[slot])}
+        entry.update(self._extras[slot])
+        for field, column in self._columns.items():
+            value = float(column[slot])
+            if not math.isnan(value):
+                entry[field] = int(value) if field in INTEGER_FIELDS and value.is_integer() else value
+        return entry
+
+
+class CityHistoryBuffer(HistoryView):
+    """Fixed-capacity ring buffer of one city's weather entries, stored by column.
+
+    Supports the same read API as HistoryView directly on the live buffer
+    (for the thread that owns it); other threads should read through
+    ``view()``. Not thread-safe: callers serialize mutations.
+
+    Attributes:
+        capacity: Maximum number of entries; appending beyond it evicts the oldest
+        version: Incremented by every mutation
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty buffer.
+
+        Args:
+            capacity: Maximum number of entries kept
+
+        Raises:
+            ValueError: If capacity is not positive
+        """
+        if capacity < 1:
+            raise ValueError(f"Capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.version = 0
+
+        # Internal state
+        self._allocated = 0
+        self._start = 0       # Slot of the oldest entry, in [0, _allocated)
+        self._count = 0
+        self._ordered = True  # Timestamps non-decreasing in insertion order (enables binary search)
+        self._timestamps = np.empty(0, dtype=np.float64)
+        self._columns: Dict[str, np.ndarray] = {}
+        self._extras = np.empty(0, dtype=object)
+        self._extras_bytes = 0  # Estimated size of the live entries' extras dictionaries
+        self._shared: Optional[Tuple[int, int]] = None  # Storage positions [lo, hi) covered by views handed out
+        self._allocate(min(capacity, INITIAL_ALLOCATION))
+
+# ================================
+# 4. MUTATION
+# ================================
+    def append(self, entry: Dict[str, Any]) -> int:
+        """Add an entry, evicting the oldest one if the buffer is full.
+
+        Args:
+            entry: Weather data dictionary with a datetime 'date'
+
+        Returns:
+            int: Number of entries evicted (0 or 1)
+        """
+        if self._count == self._allocated and self._allocated < self.capacity:
+            self._allocate(min(self.capacity, self._allocated * 2))
+        self._claim((self._start + self._count) % self._allocated)  # The next free slot, or the oldest entry's when full
+        self.version += 1
+
+        evicted = 0
+        if self._count < self._allocated:
+            slot = (self._start + self._count) % self._allocated
+            self._count += 1
+        else:
+            slot = self._start
+            self._start = (self._start + 1) % self._allocated
+            self._extras_bytes -= sys.getsizeof(self._extras[slot])
+            evicted = 1
+
+        timestamp = entry['date'].timestamp()
+        if self._count > 1 and self._ordered:
+            previous = self._timestamps[self._start + self._count - 2]
+            self._ordered = timestamp >= previous
+        self._write(slot, timestamp, entry)
+        return evicted
+
+    def extend(self, timestamps: np.ndarray, columns: Dict[str, np.ndarray], extras: List[Dict[str, Any]]) -> int:
+        """Bulk-append entries given by column, oldest first (one vectorized write per column).
+
+        Args:
+            timestamps: Epoch-seconds timestamps
+            columns: Numeric columns keyed by metric (missing or unknown metrics are ignored; NaN where absent)
+            extras: Per-entry dictionaries of non-numeric fields
+
+        Returns:
+            int: Number of entries evicted or skipped to stay within capacity
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        incoming = len(timestamps)
+        skipped = max(0, incoming - self.capacity)
+        if skipped:
+            timestamps, extras = timestamps[skipped:], extras[skipped:]
+            columns = {field: column[skipped:] for field, column in columns.items()}
+        count = len(timestamps)
+        if not count:
+            return skipped
+
+        evicted = self.drop_oldest(max(0, self._count + count - self.capacity))
+        if self._allocated < self._count + count:
+            size = self._allocated
+            while size < self._count + count:
+                size *= 2
+            self._allocate(min(self.capacity, size))
+
+        if self._ordered:
+            follows = not self._count or timestamps[0] >= self._timestamps[self._start + self._count - 1]
+            self._ordered = bool(follows and np.all(np.diff(timestamps) >= 0))
+
+        slots = (self._start + self._count + np.arange(count)) % self._allocated
+        if self._claim(slots):
+            slots = (self._start + self._count + np.arange(count)) % self._allocated
+        self.version += 1
+        extras_array = np.empty(count, dtype=object)
+        extras_array[:] = extras
+        values = np.column_stack([np.asarray(columns[field], dtype=np.float64) if field in columns else np.full(count, np.nan)
+                                  for field in self._columns])
+        present = ~np.isnan(values)
+        sums = np.cumsum(np.where(present, values, 0.0), axis=0)
+        counts = np.cumsum(present, axis=0)
+        if self._count:
+            previous = self._start + self._count - 1
+            sums += self._sums[previous]
+            counts += self._counts[previous]
+        for target in (slots, slots + self._allocated):
+            self._timestamps[target] = timestamps
+            for position, column in enumerate(self._columns.values()):
+                column[target] = values[:, position]
+            self._extras[target] = extras_array
+            self._sums[target] = sums
+            self._counts[target] = counts
+        self._count += count
+        self._extras_bytes += sum(sys.getsizeof(entry_extras) for entry_extras in extras)
+        return skipped + evicted
+
+    def drop_oldest(self, count: int = 1) -> int:
+        """Evict up to ``count`` of the oldest entries (O(count) bookkeeping, no data movement).
+
+        Returns:
+            int: Number of entries evicted
+        """
+        count = max(0, min(count, self._count))
+        if count:
+            self.version += 1
+            self._extras_bytes -= sum(sys.getsizeof(extras) for extras in self._extras[self._start:self._start + count])
+            self._start = (self._start + count) % self._allocated
+            self._count -= count
+            if not self._count:
+                self._start = 0
+                self._ordered = True
+        return count
+
+    def retain(self, keep: np.ndarray) -> int:
+        """Keep only the entries where ``keep`` is True, preserving order.
+
+        Args:
+            keep: Boolean mask with one element per entry (oldest first)
+
+        Returns:
+            int: Number of entries removed
+        """
+        keep = np.asarray(keep, dtype=bool)
+        removed = self._count - int(keep.sum())
+        if not removed:
+            return 0
+        kept = np.flatnonzero(keep)
+        if kept.size and kept[0] == removed and kept[-1] == self._count - 1:
+            return self.drop_oldest(removed)  # Only a prefix goes: no compaction needed
+
+        self._claim(np.arange(kept.size))
+        self.version += 1
+        live = slice(self._start, self._start + self._count)
+        timestamps = self._timestamps[live][kept]
+        columns = {field: column[live][kept] for field, column in self._columns.items()}
+        extras = self._extras[live][kept]
+        size = self._allocated
+        for target in (slice(0, kept.size), slice(size, size + kept.size)):
+            self._timestamps[target] = timestamps
+            for field, column in self._columns.items():
+                column[target] = columns[field]
+            self._extras[target] = extras
+        self._start = 0
+        self._count = int(kept.size)
+        self._rebuild_prefixes()
+        self._ordered = bool(np.all(np.diff(timestamps) >= 0))
+        self._extras_bytes = sum(sys.getsizeof(entry_extras) for entry_extras in extras)
+        return removed
+
+    def drop_older_than(self, timestamp: float) -> int:
+        """Evict entries dated before an epoch-seconds timestamp.
+
+        O(log n + evicted) while entries are time-ordered; a full filter otherwise.
+
+        Returns:
+            int: Number of entries evicted
+        """
+        if self._ordered:
+            return self.drop_oldest(int(np.searchsorted(self.timestamps(), timestamp, side='left')))
+        return self.retain(self.timestamps() >= timestamp)
+
+    def _allocate(self, size: int) -> None:
+        """(Re)allocate mirrored storage for ``size`` entries, compacting live entries to the front."""
+        live = slice(self._start, self._start + self._count)
+        old_timestamps = self._timestamps[live]
+        old_columns = {field: column[live] for field, column in self._columns.items()}
+        old_extras = self._extras[live]
+
+        self._timestamps = np.empty(2 * size, dtype=np.float64)
+        self._columns = {field: np.full(2 * size, np.nan) for field in NUMERIC_FIELDS}
+        self._extras = np.empty(2 * size, dtype=object)
+        self._sums = np.zeros((2 * size, len(NUMERIC_FIELDS)))
+        self._counts = np.zeros((2 * size, len(NUMERIC_FIELDS)), dtype=np.int64)
+        for target in (slice(0, self._count), slice(size, size + self._count)):
+            self._timestamps[target] = old_timestamps
+            for field in old_columns:
+                self._columns[field][target] = old_columns[field]
+            self._extras[target] = old_extras
+        self._allocated = size
+        self._start = 0
+        self._shared = None  # Fresh storage: no view refers to it yet
+        self._rebuild_prefixes()
+
+    def _rebuild_prefixes(self) -> None:
+        """Recompute the prefix rows of the live entries from zero (storage compacted to the front)."""
+        if not self._count:
+            return
+        live = slice(0, self._count)
+        values = np.column_stack([column[live] for column in self._columns.values()])
+        present = ~np.isnan(values)
+        sums = np.cumsum(np.where(present, values, 0.0), axis=0)
+        counts = np.cumsum(present, axis=0)
+        for target in (live, slice(self._allocated, self._allocated + self._count)):
+            self._sums[target] = sums
+            self._counts[target] = counts
+
+    def _write(self, slot: int, timestamp: float, entry: Dict[str, Any]) -> None:
+        """Write one entry to a slot and its mirror."""
+        extras = {}
+        for key, value in entry.items():
+            if key == 'date':
+                continue
+            if key in self._columns and isinstance(value, (int, float)) and not isinstance(value, bool):
+                continue
+            extras[key] = value
+
+        self._extras_bytes += sys.getsizeof(extras)
+        row = [np.nan if field in extras or entry.get(field) is None else entry[field] for field in self._columns]
+        for index in (slot, slot + self._allocated):
+            self._timestamps[index] = timestamp
+            for column, value in zip(self._columns.values(), row):
+                column[index] = value
+            self._extras[index] = extras
+
+        # Extend the prefix rows from the previous newest entry (the one before this slot)
+        present = [value == value for value in row]  # False for NaN
+        sums = np.array([value if valid else 0.0 for value, valid in zip(row, present)], dtype=np.float64)
+        counts = np.array(present, dtype=np.int64)
+        if self._count > 1:
+            previous = self._start + self._count - 2
+            sums += self._sums[previous]
+            counts += self._counts[previous]
+        for index in (slot, slot + self._allocated):
+            self._sums[index] = sums
+            self._counts[index] = counts
+
+# ================================
+# 5. COPY-ON-WRITE VIEWS
+# ================================
+    def view(self) -> HistoryView:
+        """Return an immutable view of the current entries (O(1), no copying).
+
+        The view shares this buffer's storage; later mutations copy the
+        storage first if they would overwrite an entry the view covers.
+        """
+        if self._count:
+            lo, hi = self._start, self._start + self._count
+            if self._shared is not None:
+                lo, hi = min(lo, self._shared[0]), max(hi, self._shared[1])
+            self._shared = (lo, hi)
+        return HistoryView(self._timestamps, self._columns, self._extras, self._sums, self._counts,
+                           self._start, self._count, self._ordered, self.version)
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated memory held: allocated column storage plus live extras dictionaries."""
+        columns = sum(column.nbytes for column in self._columns.values()) + self._sums.nbytes + self._counts.nbytes
+        return self._timestamps.nbytes + columns + self._extras.nbytes + self._extras_bytes
+
+    def _claim(self, slots: Union[int, np.ndarray]) -> bool:
+        """Make slots (and their mirrors) safe to overwrite, copying storage away from views that cover them.
+
+        Returns:
+            bool: True if the storage was copied (slot numbers computed before the call are stale)
+        """
+        if self._shared is None:
+            return False
+        lo, hi = self._shared
+        if isinstance(slots, int):
+            if not (lo <= slots < hi or lo <= slots + self._allocated < hi):
+                return False
+        else:
+            mirrors = slots + self._allocated
+            if not np.any(((slots >= lo) & (slots < hi)) | ((mirrors >= lo) & (mirrors < hi))):
+                return False
+        self._allocate(self._allocated)
+        return True
+
+    def __repr__(self) -> str:
+        return f"CityHistoryBuffer(capacity={self.capacity}, entries={self._count})"
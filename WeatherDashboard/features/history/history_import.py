@@ -0,0 +1,321 @@
+"""
+Bulk import of external weather datasets into persistent history.
+
+Streams large CSV files (comparison-directory datasets or exported
+weather_data.csv files) into the history backend in chunks: rows are read
+with a plain csv reader, columns are mapped to history metrics with
+CSVMetricMapper, parsed and unit-converted as numpy arrays, and each city's
+share of a chunk is written with one ``append_columns`` call (one
+transaction, rollups computed by column). Progress and throughput are
+reported after every chunk.
+
+Classes:
+    HistoryImporter: Chunked, vectorized CSV importer for a history store
+"""
+
+from typing import Dict, List, Any, Optional, Callable, Tuple
+from pathlib import Path
+from datetime import datetime
+import csv
+import sqlite3
+import time
+
+import numpy as np
+
+from WeatherDashboard import config
+from WeatherDashboard.utils.logger import Logger
+from WeatherDashboard.utils.unit_converter import UnitConverter
+from WeatherDashboard.features.comparison.csv_metric_mapper import CSVMetricMapper
+from WeatherDashboard.features.comparison.csv_normalizer import CSVNormalizer
+from WeatherDashboard.features.comparison.csv_data_service import CSVDataService
+
+from .history_store import HistoryStore, HISTORY_FIELDS, CSV_HEADERS, TIMESTAMP_FORMAT
+
+
+# Mapper metric names stored under a different history field
+METRIC_ALIASES = {'weather_main': 'conditions'}
+DATE_KEYWORDS = ('date', 'time', 'datetime', 'timestamp')
+CITY_KEYWORDS = ('city', 'location', 'place', 'town', 'station')
+
+# Header hints of non-metric units: (metric kinds, header substrings, conversion to the stored metric unit)
+TEMPERATURE_FIELDS = ('temperature', 'feels_like', 'temp_min', 'temp_max')
+UNIT_HINTS: Tuple[tuple, ...] = (
+    (TEMPERATURE_FIELDS, ('_f', 'fahrenheit'), ('temperature', None)),
+    (('wind_speed', 'wind_gust'), ('mph',), ('wind_speed', None)),
+    (('wind_speed', 'wind_gust'), ('kmh', 'kph', 'km_h'), (None, 1 / 3.6)),
+    (('wind_speed', 'wind_gust'), ('knot', 'kt'), (None, 0.514444)),
+    (('pressure',), ('inhg',), ('pressure', None)),
+    (('visibility',), ('mile', '_mi'), (None, 1609.344)),
+    (('visibility',), ('_km',), (None, 1000.0)),
+    (('rain', 'snow'), ('inch', '_in'), ('rain', None)),
+)
+
+
+class HistoryImporter:
+    """Import large CSV datasets into a history store in chunks.
+
+    Two layouts are recognised: the native weather_data.csv layout (stored
+    as-is, already in metric units) and arbitrary datasets such as those in
+    the comparison directory, whose columns are mapped with CSVMetricMapper
+    and converted from the units named in their headers (``avg_temp_F``,
+    ``wind_mph``, ``precip_in``...). Files already imported unchanged are
+    skipped when the backend tracks imports.
+
+    Attributes:
+        history_store: Destination backend
+        key_func: Maps city names to canonical city keys
+        chunk_size: Rows parsed and written per chunk
+    """
+
+    def __init__(self, history_store: HistoryStore, key_func: Callable[[str], str], chunk_size: Optional[int] = None) -> None:
+        """Initialize the importer.
+
+        Args:
+            history_store: Destination backend
+            key_func: Maps city names to canonical city keys
+            chunk_size: Optional rows per chunk. Defaults to config.HISTORY['import_chunk_size']
+        """
+        # Direct imports for stable utilities
+        self.logger = Logger()
+        self.config = config
+        self.unit_converter = UnitConverter()
+        self.mapper = CSVMetricMapper()
+
+        self.history_store = history_store
+        self.key_func = key_func
+        self.chunk_size = chunk_size or self.config.HISTORY['import_chunk_size']
+
+        # Internal state
+        self._date_formats = CSVNormalizer().date_formats
+        self._city_keys: Dict[str, str] = {}  # Resolve each distinct spelling once
+
+# ================================
+# 1. IMPORT ENTRY POINTS
+# ================================
+    def import_directory(self, directory: Optional[str] = None,
+                         progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """Import every CSV file in a directory (defaults to the comparison directory).
+
+        Returns:
+            List[Dict[str, Any]]: One import summary per file (see import_file)
+        """
+        data_service = CSVDataService(directory)
+        return [self.import_file(str(data_service.comparison_dir / filename), progress=progress)
+                for filename in data_service.get_available_csv_files()]
+
+    def import_file(self, csv_path: str, default_city: Optional[str] = None, source: str = 'imported',
+                    progress: Optional[Callable[[Dict[str, Any]], None]] = None, force: bool = False) -> Dict[str, Any]:
+        """Stream one CSV file into the history store.
+
+        Args:
+            csv_path: File to import
+            default_city: City for files without a city column
+            source: Source label for rows of non-native files (native files keep their own)
+            progress: Optional callback receiving the running summary after each chunk
+            force: Import even if this file version was imported before
+
+        Returns:
+            Dict[str, Any]: Summary with 'file', 'status' ('imported', 'skipped' or 'error'),
+                'rows_read', 'rows_imported', 'rows_skipped', 'bytes_read', 'bytes_total',
+                'seconds', 'rows_per_second' and 'error' (if any)
+        """
+        csv_file = Path(csv_path)
+        summary: Dict[str, Any] = {
+            'file': str(csv_file), 'status': 'imported', 'rows_read': 0, 'rows_imported': 0, 'rows_skipped': 0,
+            'bytes_read': 0, 'bytes_total': 0, 'seconds': 0.0, 'rows_per_second': 0.0, 'error': None,
+        }
+        started = time.perf_counter()
+        try:
+            summary['bytes_total'] = csv_file.stat().st_size
+            if not force and self.history_store.is_imported(csv_file):
+                summary['status'] = 'skipped'
+                return summary
+
+            with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+                reader = csv.reader(f)
+                headers = next(reader, None)
+                if not headers:
+                    raise ValueError("file has no header row")
+                layout = self._plan_layout([header.strip() for header in headers], default_city, source)
+
+                while True:
+                    chunk = [row for _, row in zip(range(self.chunk_size), reader)]
+                    if not chunk:
+                        break
+                    imported = self._import_chunk(chunk, layout)
+                    summary['rows_read'] += len(chunk)
+                    summary['rows_imported'] += imported
+                    summary['rows_skipped'] += len(chunk) - imported
+                    summary['bytes_read'] = f.buffer.tell()
+                    self._update_rate(summary, started)
+                    if progress:
+                        progress(dict(summary))
+
+            self.history_store.record_import(csv_file, summary['rows_imported'])
+        except (OSError, UnicodeDecodeError, csv.Error, sqlite3.Error, ValueError) as e:
+            summary['status'], summary['error'] = 'error', str(e)
+            self.logger.error(f"Failed to import history from {csv_file}: {e}")
+
+        self._update_rate(summary, started)
+        if summary['status'] == 'imported':
+            self.logger.info(
+                f"Imported {summary['rows_imported']} history rows from {csv_file.name} in {summary['seconds']:.2f}s "
+                f"({summary['rows_per_second']:.0f} rows/s, {summary['rows_skipped']} skipped)"
+            )
+        return summary
+
+    @staticmethod
+    def _update_rate(summary: Dict[str, Any], started: float) -> None:
+        """Refresh elapsed time and throughput in a running summary."""
+        summary['seconds'] = time.perf_counter() - started
+        summary['rows_per_second'] = summary['rows_read'] / summary['seconds'] if summary['seconds'] else 0.0
+
+# ================================
+# 2. COLUMN MAPPING
+# ================================
+    def _plan_layout(self, headers: List[str], default_city: Optional[str], source: str) -> Dict[str, Any]:
+        """Work out where timestamps, cities and metrics are in a file, and how to convert them.
+
+        Raises:
+            ValueError: If the file has no date column, or no city column and no default city
+        """
+        positions = {header: position for position, header in enumerate(headers)}
+        if {'timestamp', 'city'} <= set(headers) and set(headers) <= set(CSV_HEADERS):
+            # Native weather_data.csv layout: metric units, per-row source
+            return {
+                'width': len(headers), 'date': positions['timestamp'], 'city': positions['city'], 'default_city': default_city,
+                'source': source, 'source_column': positions.get('source'),
+                'metrics': {field: (positions[field], None) for field in HISTORY_FIELDS if field in positions},
+            }
+
+        date_column = next((header for header in headers if any(keyword in header.lower() for keyword in DATE_KEYWORDS)), None)
+        if date_column is None:
+            raise ValueError(f"no date column in headers {headers}")
+        city_column = next((header for header in headers if any(keyword in header.lower() for keyword in CITY_KEYWORDS)), None)
+        if city_column is None and not default_city:
+            raise ValueError("no city column; pass default_city")
+
+        metrics: Dict[str, tuple] = {}
+        for header, metric in self.mapper.map_csv_columns(headers).items():
+            field = METRIC_ALIASES.get(metric, metric)
+            if field not in HISTORY_FIELDS:
+                continue
+            if field in metrics:
+                self.logger.debug(f"Ignoring column '{header}': '{field}' is already imported from another column")
+                continue
+            metrics[field] = (positions[header], self._conversion(header, field))
+        return {
+            'width': len(headers), 'date': positions[date_column], 'city': positions[city_column] if city_column else None,
+            'default_city': default_city, 'source': source, 'source_column': None, 'metrics': metrics,
+        }
+
+    def _conversion(self, header: str, field: str) -> Optional[Callable[[np.ndarray], np.ndarray]]:
+        """Return the vectorized conversion of a column's header unit to the stored metric unit, if any."""
+        header_lower = header.lower()
+        for fields, hints, (kind, factor) in UNIT_HINTS:
+            if field in fields and any(hint in header_lower for hint in hints):
+                if kind is not None:
+                    return self.unit_converter.conversion_config[kind]['imperial_to_metric']
+                return lambda values, factor=factor: values * factor
+        return None
+
+# ================================
+# 3. CHUNK PARSING
+# ================================
+    def _import_chunk(self, chunk: List[List[str]], layout: Dict[str, Any]) -> int:
+        """Parse one chunk by column and write each city's rows with one append_columns call.
+
+        Returns:
+            int: Rows written (rows without a parsable date or city are skipped)
+        """
+        width = max(layout['width'], max(len(row) for row in chunk))
+        columns = list(zip(*(row + [''] * (width - len(row)) for row in chunk)))
+
+        timestamps = self._parse_timestamps(columns[layout['date']])
+        if layout['city'] is not None:
+            cities = np.char.strip(np.asarray(columns[layout['city']], dtype=str))
+        else:
+            cities = np.full(len(chunk), layout['default_city'])
+        sources = (np.asarray(columns[layout['source_column']], dtype=str) if layout['source_column'] is not None
+                   else np.full(len(chunk), layout['source']))
+        valid = (timestamps != '') & (cities != '')
+
+        values: Dict[str, np.ndarray] = {}
+        for field, (position, conversion) in layout['metrics'].items():
+            if HISTORY_FIELDS[field] is str:
+                values[field] = np.char.strip(np.asarray(columns[position], dtype=str))
+                continue
+            parsed = self._parse_numbers(columns[position])
+            values[field] = conversion(parsed) if conversion else parsed
+
+        imported = 0
+        groups, inverse = np.unique(np.char.add(np.char.add(cities, '\x1f'), sources), return_inverse=True)
+        for group_index, group in enumerate(groups.tolist()):
+            mask = (inverse == group_index) & valid
+            if not mask.any():
+                continue
+            city, source = group.split('\x1f', 1)
+            imported += self.history_store.append_columns(
+                self._city_key(city), city, timestamps[mask], {field: column[mask] for field, column in values.items()},
+                source or layout['source']
+            )
+        return imported
+
+    def _parse_timestamps(self, texts: tuple) -> np.ndarray:
+        """Parse a date column into 'YYYY-MM-DD HH:MM:SS' strings ('' where unparsable).
+
+        ISO dates are parsed in one numpy call; other layouts fall back to the
+        first CSVNormalizer date format that fits the first value.
+        """
+        stripped = np.char.strip(np.asarray(texts, dtype=str))
+        try:
+            parsed = stripped.astype('datetime64[s]')
+            if np.isnat(parsed).any():
+                raise ValueError("blank dates")
+            return np.char.replace(np.datetime_as_string(parsed, unit='s'), 'T', ' ').astype('U19')
+        except ValueError:
+            pass
+
+        sample = next((text for text in stripped.tolist() if text), '')
+        date_format = next((fmt for fmt in self._date_formats if self._parses(sample, fmt)), TIMESTAMP_FORMAT)
+        result = np.full(len(stripped), '', dtype='U19')
+        for position, text in enumerate(stripped.tolist()):
+            try:
+                result[position] = datetime.strptime(text, date_format).strftime(TIMESTAMP_FORMAT)
+            except ValueError:
+                continue  # Blank or malformed: the row is skipped
+        return result
+
+    @staticmethod
+    def _parses(text: str, date_format: str) -> bool:
+        """Return True if a date string fits a strptime format."""
+        try:
+            datetime.strptime(text, date_format)
+            return True
+        except ValueError:
+            return False
+
+    @staticmethod
+    def _parse_numbers(texts: tuple) -> np.ndarray:
+        """Parse a numeric column into float64 (NaN for blanks and unparsable values)."""
+        strings = np.char.strip(np.asarray(texts, dtype=str))
+        strings[strings == ''] = 'nan'
+        try:
+            return strings.astype(np.float64)
+        except ValueError:
+            result = np.full(len(strings), np.nan)
+            for position, text in enumerate(strings.tolist()):
+                try:
+                    result[position] = float(text)
+                except ValueError:
+                    continue
+            return result
+
+    def _city_key(self, city: str) -> str:
+        """Canonical key of a city name (the name itself if it cannot be resolved)."""
+        if city not in self._city_keys:
+            try:
+                self._city_keys[city] = self.key_func(city)
+            except ValueError:
+                self._city_keys[city] = city
+        return self._city_keys[city]
@@ -0,0 +1,375 @@
+"""
+Crash-safe write-ahead journal for in-memory weather history.
+
+Every entry is queued for a compact binary journal, as a framed record
+(a length and CRC32 header followed by the payload), before it enters the
+in-memory history. Queued records are written by group commit: the
+background writer calls ``commit()``, which appends everything queued since
+the last commit through one open file handle and fsyncs once. A crash can
+therefore lose only the entries queued since the last commit (about one
+WRITER['flush_interval_seconds']), and no store waits on disk.
+Only values that round-trip through JSON unchanged are journaled. On startup
+the history service replays the journal to rebuild its per-city buffers
+without re-reading the history backend. A record torn by a
+crash fails its length or checksum and the journal is truncated back to the
+last good record.
+
+Compaction rewrites the journal with only the entries still held in memory,
+as one columnar snapshot record per city (raw float64 columns plus a table
+of distinct non-numeric extras), so replaying it is a handful of array
+copies rather than one decode per entry.
+
+Classes:
+    HistoryJournal: Append-only checksummed journal with group commit, replay and compaction
+"""
+
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple
+from pathlib import Path
+from datetime import datetime
+import json
+import numpy as np
+import os
+import struct
+import threading
+import zlib
+
+from WeatherDashboard import config
+from WeatherDashboard.utils.logger import Logger
+
+
+JOURNAL_MAGIC = b"WHJ\x01"          # File signature and format version
+RECORD_HEADER = struct.Struct('<II')  # Payload length, CRC32 of the payload
+SNAPSHOT_HEADER = struct.Struct('<I')  # Length of a snapshot record's JSON header
+MAX_RECORD_BYTES = 256 * 1024 * 1024  # Larger lengths can only come from a torn or corrupt header
+ENTRY_RECORD = b'E'                   # One entry: JSON [city_key, timestamp, fields]
+SNAPSHOT_RECORD = b'C'                # One city's buffer by column, written by compaction
+JSON_SCALARS = (str, int, float, bool)  # Field value types journaled as-is (plus None)
+
+
+class HistoryJournal:
+    """Append-only, checksummed journal of in-memory history entries.
+
+    Records are queued by ``enqueue`` (cheap enough to call under a lock,
+    before the entry enters memory), written by ``commit`` (one write and one
+    fsync per group) and read back in order by ``replay``, which yields
+    ``('entry', city_key, entry)`` for single entries and
+    ``('columns', city_key, (timestamps, columns, extras))`` for compacted
+    city snapshots.
+
+    Attributes:
+        journal_file: Path to the journal
+        fsync: Whether commits and compactions are fsynced before returning
+        entry_count: Entries recorded in the journal, committed or queued (live and superseded)
+    """
+
+    def __init__(self, journal_file: Optional[str] = None, fsync: Optional[bool] = None) -> None:
+        """Initialize the journal.
+
+        Args:
+            journal_file: Optional journal path. Defaults to HISTORY['journal_file']
+            fsync: Optional fsync switch. Defaults to True under WRITER['fsync_policy'] 'batch'
+        """
+        # Direct imports for stable utilities
+        self.logger = Logger()
+        self.config = config
+
+        self.journal_file = Path(journal_file or self.config.HISTORY['journal_file'])
+        self.fsync = self.config.WRITER['fsync_policy'] == 'batch' if fsync is None else fsync
+        self.entry_count = 0
+
+        # Internal state
+        self._lock = threading.Lock()
+        self._pending: List[bytes] = []  # Records queued for the next group commit
+        self._file: Optional[Any] = None  # Append handle kept open between commits
+        self._compaction_tail: Optional[List[bytes]] = None  # Records queued while a compaction is taking its snapshots
+
+# ================================
+# 1. RECORD ENCODING
+# ================================
+    @staticmethod
+    def encode(city_key: str, entry: Dict[str, Any]) -> bytes:
+        """Encode one history entry as a framed, checksummed record.
+
+        Args:
+            city_key: Canonical city key the entry belongs to
+            entry: Weather data dictionary with a datetime 'date' (fields are filtered by journal_fields)
+
+        Returns:
+            bytes: Record header followed by the JSON payload
+        """
+        fields = HistoryJournal.journal_fields(entry)
+        payload = ENTRY_RECORD + json.dumps([city_key, entry['date'].timestamp(), fields], separators=(',', ':')).encode('utf-8')
+        return HistoryJournal._frame(payload)
+
+    @staticmethod
+    def journal_fields(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the fields of an entry (other than 'date') that replay returns unchanged.
+
+        Strings, numbers, booleans and None are kept; NumPy numbers become the
+        equivalent Python numbers. Values of any other type (datetimes, alert
+        objects, containers) are left out rather than turned into strings.
+        """
+        fields = {}
+        for field, value in entry.items():
+            if field == 'date':
+                continue
+            if isinstance(value, (np.integer, np.floating, np.bool_)):
+                value = value.item()
+            if value is None or isinstance(value, JSON_SCALARS):
+                fields[field] = value
+        return fields
+
+    @staticmethod
+    def encode_columns(city_key: str, timestamps: np.ndarray, columns: Dict[str, np.ndarray], extras: List[Dict[str, Any]]) -> bytes:
+        """Encode one city's buffer contents (as returned by CityHistoryBuffer.snapshot) as a snapshot record.
+
+        Columns are stored as raw little-endian float64; extras (filtered by
+        journal_fields) as a table of distinct dictionaries plus one uint32
+        index per entry.
+        """
+        table: List[Dict[str, Any]] = []
+        positions: Dict[tuple, int] = {}
+        indexes = np.empty(len(extras), dtype='<u4')
+        for position, entry_extras in enumerate(extras):
+            kept = HistoryJournal.journal_fields(entry_extras)
+            identity = tuple(kept.items())
+            if identity not in positions:
+                positions[identity] = len(table)
+                table.append(kept)
+            indexes[position] = positions[identity]
+
+        fields = list(columns)
+        header = json.dumps({'key': city_key, 'count': len(timestamps), 'fields': fields, 'extras': table},
+                            separators=(',', ':')).encode('utf-8')
+        arrays = [np.asarray(timestamps, dtype='<f8')] + [np.asarray(columns[field], dtype='<f8') for field in fields]
+        payload = b"".join([SNAPSHOT_RECORD, SNAPSHOT_HEADER.pack(len(header)), header]
+                           + [array.tobytes() for array in arrays] + [indexes.tobytes()])
+        return HistoryJournal._frame(payload)
+
+    @staticmethod
+    def decode(payload: bytes) -> Tuple[str, str, Any]:
+        """Decode a record payload into (kind, city_key, data).
+
+        Raises:
+            ValueError: If the payload is not a known record type or is malformed
+        """
+        kind, body = payload[:1], memoryview(payload)[1:]
+        if kind == ENTRY_RECORD:
+            city_key, timestamp, fields = json.loads(bytes(body))
+            entry = {'date': datetime.fromtimestamp(timestamp)}
+            entry.update(fields)
+            return 'entry', city_key, entry
+        if kind != SNAPSHOT_RECORD:
+            raise ValueError(f"unknown record type {kind!r}")
+
+        (header_length,) = SNAPSHOT_HEADER.unpack_from(body, 0)
+        offset = SNAPSHOT_HEADER.size + header_length
+        header = json.loads(bytes(body[SNAPSHOT_HEADER.size:offset]))
+        count = header['count']
+        if len(body) != offset + count * (8 * (len(header['fields']) + 1) + 4):
+            raise ValueError("snapshot record size does not match its header")
+
+        def read(dtype: str, size: int) -> np.ndarray:
+            nonlocal offset
+            array = np.frombuffer(body, dtype=dtype, count=count, offset=offset).astype(dtype[1:])
+            offset += count * size
+            return array
+
+        timestamps = read('<f8', 8)
+        columns = {field: read('<f8', 8) for field in header['fields']}
+        table = header['extras']
+        extras = [table[index] for index in read('<u4', 4).tolist()]
+        return 'columns', header['key'], (timestamps, columns, extras)
+
+    @staticmethod
+    def _frame(payload: bytes) -> bytes:
+        """Prefix a payload with its length and CRC32."""
+        return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+# ================================
+# 2. APPEND AND REPLAY
+# ================================
+    def enqueue(self, records: Iterable[bytes]) -> bool:
+        """Queue encoded records for the next group commit (no I/O).
+
+        Returns:
+            bool: True if the queue was empty, so the caller should schedule a commit
+        """
+        records = list(records)
+        if not records:
+            return False
+        with self._lock:
+            was_empty = not self._pending
+            self._pending.extend(records)
+            self.entry_count += len(records)
+            if self._compaction_tail is not None:
+                self._compaction_tail.extend(records)
+        return was_empty
+
+    def commit(self) -> int:
+        """Write every queued record in one append, fsynced once when enabled (the group commit).
+
+        Returns:
+            int: Number of records written
+        """
+        with self._lock:
+            records, self._pending = self._pending, []
+            if not records:
+                return 0
+            try:
+                f = self._open()
+                f.write(b"".join(records))
+                f.flush()
+                self._sync(f)
+            except OSError:
+                self._close_file()  # Reopened by the next commit
+                raise
+        return len(records)
+
+    def append_many(self, records: Iterable[bytes]) -> int:
+        """Append encoded records (with anything already queued), returning once they are written.
+
+        Returns:
+            int: Number of records written
+        """
+        self.enqueue(records)
+        return self.commit()
+
+    def close(self) -> None:
+        """Commit queued records and close the journal file (call after the last enqueue)."""
+        try:
+            self.commit()
+        finally:
+            with self._lock:
+                self._close_file()
+
+    def replay(self) -> Iterator[Tuple[str, str, Any]]:
+        """Yield (kind, city_key, data) for every intact record, oldest first.
+
+        Reading stops at the first torn or corrupt record, and the journal is
+        truncated there so later appends follow the last good record.
+        """
+        with self._lock:
+            if not self.journal_file.exists():
+                self.entry_count = 0
+                return
+            with open(self.journal_file, 'rb') as f:
+                data = f.read()
+        if not data:
+            return
+
+        if not data.startswith(JOURNAL_MAGIC):
+            self.logger.warn(f"Discarding history journal {self.journal_file} with an unknown format")
+            self._truncate(0)
+            return
+
+        offset, count = len(JOURNAL_MAGIC), 0
+        while offset < len(data):
+            if offset + RECORD_HEADER.size > len(data):
+                break
+            length, checksum = RECORD_HEADER.unpack_from(data, offset)
+            start, stop = offset + RECORD_HEADER.size, offset + RECORD_HEADER.size + length
+            if length > MAX_RECORD_BYTES or stop > len(data):
+                break
+            payload = data[start:stop]
+            if zlib.crc32(payload) != checksum:
+                break
+            try:
+                record = self.decode(payload)
+            except (ValueError, TypeError, KeyError, IndexError, OverflowError, OSError, struct.error) as e:
+                self.logger.warn(f"Unreadable history journal record at byte {offset}: {e}")
+                break
+            offset = stop
+            count += len(record[2][0]) if record[0] == 'columns' else 1
+            yield record
+
+        self.entry_count = count
+        if offset < len(data):
+            self.logger.warn(f"History journal {self.journal_file} truncated at byte {offset} ({len(data) - offset} bytes of torn or corrupt records)")
+            self._truncate(offset)
+
+# ================================
+# 3. COMPACTION
+# ================================
+    def needs_compaction(self, live_entries: int) -> bool:
+        """Return True once superseded records outweigh the live history (HISTORY['journal_compact_*'])."""
+        settings = self.config.HISTORY
+        return self.entry_count > max(settings['journal_compact_min_records'], live_entries * settings['journal_compact_ratio'])
+
+    def compact(self, snapshots: Iterable[Tuple[str, np.ndarray, Dict[str, np.ndarray], List[Dict[str, Any]]]]) -> int:
+        """Atomically replace the journal with one snapshot record per city.
+
+        ``snapshots`` may be a lazy iterable reading live memory: records
+        appended while it is consumed are written again after the snapshots,
+        so an entry journaled but not yet in a snapshot is not lost (replay
+        skips the ones a snapshot already holds).
+
+        Args:
+            snapshots: (city_key, timestamps, columns, extras) for every city still held in memory
+
+        Returns:
+            int: Number of entries in the compacted journal
+        """
+        with self._lock:
+            self._compaction_tail = []
+        try:
+            records, entries = [], 0
+            for city_key, timestamps, columns, extras in snapshots:
+                records.append(self.encode_columns(city_key, timestamps, columns, extras))
+                entries += len(timestamps)
+            with self._lock:
+                tail = self._compaction_tail
+                self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+                temp_file = self.journal_file.with_suffix(self.journal_file.suffix + '.tmp')
+                with open(temp_file, 'wb') as f:
+                    f.write(JOURNAL_MAGIC)
+                    f.write(b"".join(records + tail))
+                    self._sync(f)
+                self._close_file()
+                os.replace(temp_file, self.journal_file)
+                self._pending = []  # Queued before the snapshots (so in them) or during them (so in the tail)
+                superseded, self.entry_count = self.entry_count - entries - len(tail), entries + len(tail)
+        finally:
+            with self._lock:
+                self._compaction_tail = None
+        self.logger.info(f"Compacted history journal to {entries} entries in {len(records)} city snapshots ({max(0, superseded)} superseded entries dropped)")
+        return entries
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the journal's entry count and size in bytes."""
+        size = self.journal_file.stat().st_size if self.journal_file.exists() else 0
+        return {'entries': self.entry_count, 'bytes': size}
+
+    def _open(self) -> Any:
+        """Return the open append handle, opening the journal (and writing its signature) if needed (caller holds the lock)."""
+        if self._file is None:
+            self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.journal_file, 'ab')
+            if not self._file.tell():
+                self._file.write(JOURNAL_MAGIC)
+        return self._file
+
+    def _close_file(self) -> None:
+        """Close the append handle if open (caller holds the lock)."""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError as e:
+                self.logger.error(f"Could not close history journal {self.journal_file}: {e}")
+            self._file = None
+
+    def _sync(self, f: Any) -> None:
+        """Flush a written journal file to disk when fsync is enabled."""
+        if self.fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _truncate(self, size: int) -> None:
+        """Cut the journal back to a byte offset (dropping torn records)."""
+        with self._lock:
+            self._close_file()
+            try:
+                with open(self.journal_file, 'r+b') as f:
+                    f.truncate(size)
+            except OSError as e:
+                self.logger.error(f"Could not truncate history journal {self.journal_file}: {e}")
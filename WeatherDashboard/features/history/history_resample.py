@@ -0,0 +1,205 @@
+"""
+Resampling of irregular weather history onto uniform time grids.
+
+Scheduled collection drifts, manual refreshes add extra samples and failed
+fetches leave holes, so stored history is irregular in time. Charts,
+city comparisons and forecasting need series on one shared grid instead:
+one value per 15 minutes, hour or day. Samples are assigned to grid bins
+and reduced per bin (mean, sum, min, max, first, last or count), then empty
+bins are left missing, forward-filled or linearly interpolated. Everything
+is done with whole-array NumPy operations (bincount, ufunc.reduceat,
+cumulative maxima, interp); nothing loops per sample or per bin in Python.
+
+Bins are aligned to the local clock (a daily bin runs from local midnight),
+using the UTC offset in effect at the start of the grid. Callers holding
+naive wall-clock times pass them as UTC seconds with ``utc_offset=0``, so
+bins stay on local midnights and hours across DST changes.
+
+Classes:
+    HistoryResampler: Aggregates column data onto uniform time grids
+"""
+
+from typing import Dict, Any, Optional, Tuple, Union
+from datetime import datetime
+
+import numpy as np
+
+from WeatherDashboard import config
+
+
+AGGREGATIONS = ('mean', 'sum', 'min', 'max', 'first', 'last', 'count')
+GAP_POLICIES = ('nan', 'ffill', 'interpolate')
+REDUCERS = {'sum': np.add, 'min': np.minimum, 'max': np.maximum}
+
+
+class HistoryResampler:
+    """Aggregate irregular column data onto uniform time grids.
+
+    Attributes:
+        aggregation: Default per-bin reduction (one of AGGREGATIONS)
+        gap_policy: Default treatment of bins without samples (one of GAP_POLICIES)
+    """
+
+    def __init__(self, aggregation: Optional[str] = None, gap_policy: Optional[str] = None) -> None:
+        """Initialize the resampler.
+
+        Args:
+            aggregation: Optional default reduction. Defaults to config.RESAMPLE['aggregation']
+            gap_policy: Optional default gap treatment. Defaults to config.RESAMPLE['gap_policy']
+
+        Raises:
+            ValueError: If the aggregation or gap policy is unknown
+        """
+        # Direct imports for stable utilities
+        self.config = config
+
+        self.aggregation = self._choose(aggregation, self.config.RESAMPLE['aggregation'], AGGREGATIONS, 'aggregation')
+        self.gap_policy = self._choose(gap_policy, self.config.RESAMPLE['gap_policy'], GAP_POLICIES, 'gap policy')
+
+    def step_seconds(self, interval: Union[str, float]) -> float:
+        """Return the grid step of a named interval (RESAMPLE['intervals']) or a number of seconds.
+
+        Raises:
+            ValueError: If the interval is unknown or not positive
+        """
+        if isinstance(interval, (int, float)) and not isinstance(interval, bool):
+            seconds = float(interval)
+        elif interval in self.config.RESAMPLE['intervals']:
+            seconds = float(self.config.RESAMPLE['intervals'][interval])
+        else:
+            raise ValueError(f"Unknown resampling interval: {interval!r}")
+        if seconds <= 0:
+            raise ValueError(f"Resampling interval must be positive: {interval!r}")
+        return seconds
+
+# ================================
+# 1. RESAMPLING
+# ================================
+    def resample(self, timestamps: np.ndarray, columns: Dict[str, np.ndarray], interval: Union[str, float],
+                 start: Optional[datetime] = None, end: Optional[datetime] = None,
+                 aggregation: Optional[str] = None, gap_policy: Optional[str] = None,
+                 utc_offset: Optional[float] = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Aggregate samples onto a uniform grid.
+
+        Passing the same ``start`` and ``end`` for several cities puts all
+        their series on the same grid. Samples need not be in time order.
+
+        Args:
+            timestamps: Sample times as epoch seconds
+            columns: Sample values keyed by metric, aligned with timestamps (NaN where missing;
+                non-numeric columns are skipped)
+            interval: Grid step: a name from RESAMPLE['intervals'] ('15min', 'hourly', 'daily') or seconds
+            start: Optional grid start, rounded down to a bin boundary (default: the earliest sample's bin)
+            end: Optional exclusive end; the grid runs through the bin containing it (default: the latest sample's bin)
+            aggregation: Optional per-bin reduction overriding the default
+            gap_policy: Optional gap treatment overriding the default ('count' columns are never filled)
+            utc_offset: Optional seconds added to times to reach the clock bins align to
+                (default: the local UTC offset at the grid start)
+
+        Returns:
+            Tuple[np.ndarray, Dict[str, np.ndarray]]: Bin start times (epoch seconds) and one float64
+                column per metric with one value per bin (NaN for empty bins left unfilled)
+
+        Raises:
+            ValueError: If the interval, aggregation or gap policy is invalid, or the grid
+                would exceed RESAMPLE['max_bins']
+        """
+        step = self.step_seconds(interval)
+        aggregation = self._choose(aggregation, self.aggregation, AGGREGATIONS, 'aggregation')
+        gap_policy = self._choose(gap_policy, self.gap_policy, GAP_POLICIES, 'gap policy')
+
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        order = None
+        if timestamps.size > 1 and np.any(timestamps[1:] < timestamps[:-1]):
+            order = np.argsort(timestamps, kind='stable')
+            timestamps = timestamps[order]
+
+        start_seconds = start.timestamp() if start is not None else (timestamps[0] if timestamps.size else None)
+        end_seconds = end.timestamp() if end is not None else None
+        if start_seconds is None or (end_seconds is not None and end_seconds <= start_seconds):
+            return np.empty(0), {}
+
+        # Bin numbers count steps on the local clock
+        offset = self._utc_offset(start_seconds) if utc_offset is None else utc_offset
+        first_bin = int(np.floor((start_seconds + offset) / step))
+        if end_seconds is not None:
+            stop_bin = int(np.ceil((end_seconds + offset) / step))
+        else:
+            stop_bin = int(np.floor((timestamps[-1] + offset) / step)) + 1 if timestamps.size else first_bin
+        size = max(stop_bin - first_bin, 0)
+        if size > self.config.RESAMPLE['max_bins']:
+            raise ValueError(f"Resampling grid of {size} bins exceeds the limit of {self.config.RESAMPLE['max_bins']}")
+        grid = np.arange(first_bin, stop_bin, dtype=np.float64) * step - offset
+
+        positions = np.floor((timestamps + offset) / step).astype(np.int64) - first_bin
+        inside = (positions >= 0) & (positions < size)
+        if start is not None:
+            inside &= timestamps >= start_seconds
+        if end_seconds is not None:
+            inside &= timestamps < end_seconds
+        positions = positions[inside]
+
+        resampled = {}
+        for field, column in columns.items():
+            column = np.asarray(column)
+            if column.dtype.kind not in 'fiub':
+                continue
+            column = column.astype(np.float64)
+            if order is not None:
+                column = column[order]
+            column = column[inside]
+            valid = ~np.isnan(column)
+            values = self._aggregate(column[valid], positions[valid], size, aggregation)
+            resampled[field] = values if aggregation == 'count' else self._fill_gaps(values, grid, gap_policy)
+        return grid, resampled
+
+    def _aggregate(self, values: np.ndarray, positions: np.ndarray, size: int, aggregation: str) -> np.ndarray:
+        """Reduce values per bin; positions are bin indexes in non-decreasing order."""
+        if aggregation == 'count':
+            return np.bincount(positions, minlength=size).astype(np.float64)
+        result = np.full(size, np.nan)
+        if not values.size:
+            return result
+        if aggregation == 'mean':
+            counts = np.bincount(positions, minlength=size)
+            sums = np.bincount(positions, weights=values, minlength=size)
+            filled = counts > 0
+            result[filled] = sums[filled] / counts[filled]
+            return result
+
+        # Samples are grouped by bin: reduce each run of equal positions
+        starts = np.flatnonzero(np.r_[True, positions[1:] != positions[:-1]])
+        bins = positions[starts]
+        if aggregation == 'first':
+            result[bins] = values[starts]
+        elif aggregation == 'last':
+            result[bins] = values[np.r_[starts[1:], values.size] - 1]
+        else:
+            result[bins] = REDUCERS[aggregation].reduceat(values, starts)
+        return result
+
+    def _fill_gaps(self, values: np.ndarray, grid: np.ndarray, gap_policy: str) -> np.ndarray:
+        """Apply a gap policy to empty (NaN) bins; bins before the first value (and after the last, when interpolating) stay NaN."""
+        filled = ~np.isnan(values)
+        if gap_policy == 'nan' or not filled.any() or filled.all():
+            return values
+        if gap_policy == 'ffill':
+            source = np.where(filled, np.arange(values.size), 0)
+            np.maximum.accumulate(source, out=source)
+            return values[source]
+        return np.interp(grid, grid[filled], values[filled], left=np.nan, right=np.nan)
+
+# ================================
+# 2. HELPERS
+# ================================
+    def _choose(self, value: Optional[str], default: str, allowed: Tuple[str, ...], name: str) -> str:
+        """Return value (or the default when None) after checking it is allowed."""
+        chosen = default if value is None else value
+        if chosen not in allowed:
+            raise ValueError(f"Unknown {name}: {chosen!r} (expected one of {', '.join(allowed)})")
+        return chosen
+
+    def _utc_offset(self, seconds: float) -> float:
+        """Local UTC offset in seconds at an epoch time."""
+        offset = datetime.fromtimestamp(seconds).astimezone().utcoffset()
+        return offset.total_seconds() if offset is not None else 0.0
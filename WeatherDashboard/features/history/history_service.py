@@ -9,18 +9,39 @@ Classes:
     WeatherHistoryService: Main service for historical weather data operations
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, Callable
+from collections import OrderedDict
 import csv
+import heapq
+import itertools
+import sqlite3
+import threading
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
 
 from WeatherDashboard import config, dialog
 from WeatherDashboard.utils.logger import Logger
 from WeatherDashboard.utils.utils import Utils
 from WeatherDashboard.utils.unit_converter import UnitConverter
+from WeatherDashboard.utils.background_writer import BackgroundWriter
+from WeatherDashboard.utils.segment_archive import SegmentArchive
 
 from WeatherDashboard.services.weather_service import WeatherAPIService
-from WeatherDashboard.services.api_exceptions import WeatherDashboardError
+
+from .history_buffer import CityHistoryBuffer, HistoryView, NUMERIC_FIELDS
+from .history_journal import HistoryJournal
+from .history_stats import RollingStats
+from .history_resample import HistoryResampler
+from .history_import import HistoryImporter
+from .history_store import (
+    HistoryStore, SQLiteHistoryStore, CSVHistoryStore, PendingHistoryRows, HISTORY_TIERS, ROLLUP_FIELDS, CSV_HEADERS,
+    create_history_store, to_history_row, from_history_row, iter_csv_tail, iter_archived_rows, read_csv_header
+)
+
+
+WALL_CLOCK_EPOCH = datetime(1970, 1, 1)  # Naive local times are resampled as seconds since this wall-clock instant
 
 
 class WeatherHistoryService:
@@ -34,7 +55,14 @@ class WeatherHistoryService:
         api_service: Weather API service for data generation
         utils: Utility functions for data processing
         logger: Logger for operation tracking
-        weather_data: Dictionary storing weather data by city key
+        weather_data: Columnar ring buffer of recent entries per city key. Each
+            buffer is mutated only under its city's stripe lock; other threads
+            read through the copy-on-write views returned by _read_view
+        history_store: Persistent history backend (config.HISTORY['backend'])
+        writer: Background writer batching history rows and text log entries. Reads
+            never wait for it: rows it has not written yet are merged in from
+            the pending tail it writes through
+        journal: Write-ahead journal of in-memory entries replayed on restart (None if disabled)
     """
     
     def __init__(self) -> None:
@@ -49,13 +77,40 @@ class WeatherHistoryService:
         self.dialog = dialog
         self.utils = Utils()
         self.unit_converter = UnitConverter()
+        self.resampler = HistoryResampler()
 
         # Injected dependencies for testable components
         self.api_service = WeatherAPIService()
 
         # Internal state
-        self.weather_data = {}
+        self.weather_data: Dict[str, CityHistoryBuffer] = {}
         self._last_cleanup = datetime.now()  # Track when we last cleaned up data
+        self._memory_lock = threading.RLock()  # Guards the city dict and shared accounting (always taken last)
+        self._city_locks = [threading.Lock() for _ in range(self.config.MEMORY["lock_stripes"])]  # Striped by city key
+        self._views: Dict[str, tuple] = {}  # City key -> (buffer, last published HistoryView of it)
+        self._stats: Dict[str, RollingStats] = {}  # City key -> running statistics of the entries stored in memory
+        self._total_entries = 0   # Running count of in-memory entries across cities
+        self._total_bytes = 0     # Running estimate of in-memory bytes across cities
+        self._eviction_heap: List[tuple] = []      # (oldest timestamp, city key), lazily corrected
+        self._eviction_index: Dict[str, float] = {}  # City key -> timestamp of its live heap entry
+        self._recent_cities: OrderedDict = OrderedDict()  # City keys, least recently stored first
+        self._last_retention: Optional[datetime] = None   # Last per-tier retention pass on stored history
+        self.history_store: HistoryStore = create_history_store(self.utils.city_key)
+        self.writer = BackgroundWriter(on_error=self.logger.error)
+        self._pending_rows = PendingHistoryRows(lambda: self.history_store)  # Rows queued on the writer, readable before written
+        self.journal: Optional[HistoryJournal] = HistoryJournal() if self.config.HISTORY.get('journal_enabled', True) else None
+        self._journal_compaction_pending = False
+        self._csv_store: Optional[CSVHistoryStore] = None     # Read view of a weather_data.csv the backend does not own
+        self._text_archive: Optional[SegmentArchive] = None
+        self._last_rotation_check: Optional[datetime] = None
+        self.writer.call(self._migrate_legacy_csv)  # Off the startup path
+
+    def _migrate_legacy_csv(self) -> None:
+        """Import the legacy weather_data.csv into the SQLite store (rows not stored yet; runs on the writer thread)."""
+        if not isinstance(self.history_store, SQLiteHistoryStore) or not self.config.HISTORY.get('migrate_csv', True):
+            return
+        legacy_csv = Path(self.config.OUTPUT["csv_dir"]) / self.config.OUTPUT["csv_filename"]
+        self.history_store.import_csv(str(legacy_csv), self.utils.city_key)
 
 # ================================
 # 1. DATA STORAGE
@@ -63,12 +118,15 @@ class WeatherHistoryService:
     def store_current_weather(self, city: str, weather_data: Dict[str, Any], unit_system: str = "metric") -> None:
         """Store current weather data with timestamp for historical tracking.
         
-        Stores data in both memory (for fast access) and CSV (for persistence).
-        Also writes to text log for debugging purposes.
+        Stores data in memory (for fast access) and queues the history row and
+        text log entry on the background writer, so the caller never waits on disk.
+        Stored history is always in metric units, whatever the display unit
+        system, so charts, rollups and statistics never mix °C and °F.
         
         Args:
             city: City name for the weather data
-            weather_data: Weather data dictionary to store
+            weather_data: Weather data dictionary to store, in metric units
+            unit_system: Unit system the text log entry is written in ('metric' or 'imperial')
         """
         # Validate inputs
         if not city or not city.strip():
@@ -78,112 +136,280 @@ class WeatherHistoryService:
         if unit_system not in ['metric', 'imperial']:
             raise ValueError("Unit system must be 'metric' or 'imperial'")
 
-        # Check if cleanup is needed
-        if self._should_perform_cleanup() or self._simple_memory_check():
-            self.cleanup_old_data()
-            self._last_cleanup = datetime.now()
-
         key = self.utils.city_key(city)
-        existing_data = self.weather_data.setdefault(key, [])
         
         # Add timestamp if not present
         if 'date' not in weather_data:
             weather_data['date'] = datetime.now()
 
-        # Always store data from scheduler, but limit memory usage
-        existing_data.append(weather_data)
-        
-        # Limit stored data to prevent memory issues (keep last 30 entries per city)
-        max_entries = self.config.MEMORY["max_entries_per_city"]
-        if len(existing_data) > max_entries:
-            existing_data[:] = existing_data[-max_entries:]  # Keep only the most recent entries
-        
-        # Store in CSV for persistence
-        self._store_to_csv(city, weather_data)
-        
-        # Write to text log
+        # Periodic retention pass (costs only what it evicts); one caller claims it
+        with self._memory_lock:
+            cleanup_due = self._should_perform_cleanup()
+            if cleanup_due:
+                self._last_cleanup = datetime.now()
+        if cleanup_due:
+            self.cleanup_old_data()
+
+        self._add_to_memory(key, weather_data, journal=True)
+
+        # Prune stored history tiers on the first store and then once per cleanup interval
+        if self._last_retention is None or self._last_retention != self._last_cleanup:
+            self._last_retention = self._last_cleanup
+            self.apply_history_retention()
+
+        self._maybe_rotate_segments()
+
+        # Queue for the history backend (persistence) and text log (debugging)
+        data_buffer = self.weather_data.get(key)
+        entry_count = len(data_buffer) if data_buffer is not None else 0
+        self._store_to_history(city, weather_data, lambda _: self.logger.info(f"Stored weather data for {city} - {entry_count} entries"))
         self._write_to_text_log(city, weather_data, unit_system)
-        
-        self.logger.info(f"Stored weather data for {city} - {len(existing_data)} entries")
+        if self.utils.city_index.dirty:
+            self.writer.call(self.utils.city_index.flush)  # Aliases learned by the fetch, off the fetch path
     
-    def _store_to_csv(self, city: str, weather_data: Dict[str, Any]) -> None:
-        """Store weather data to CSV file for robust data handling.
+    def _add_to_memory(self, key: str, weather_data: Dict[str, Any], journal: bool = False) -> None:
+        """Append an entry to a city's ring buffer, keeping the eviction index and memory caps in step.
+
+        Args:
+            key: Canonical city key
+            weather_data: Entry to store
+            journal: Queue the entry for the journal first (new entries, not replayed ones)
+        """
+        journal = journal and self.journal is not None
+        commit_due = False
+        with self._city_lock(key):
+            if journal:
+                commit_due = self._journal_entry(key, weather_data)
+            # Always store data from scheduler; a full buffer evicts its oldest entry in O(1)
+            was_empty = not self._city_buffer(key)
+            self._update_city(key, lambda data_buffer: data_buffer.append(weather_data), touch=True)
+            if was_empty:
+                self._index_city(key)
+            self._stats[key].add(weather_data)
+
+        if commit_due:
+            self.writer.call(self._commit_journal)  # Group commit on the writer thread, outside the stripe lock
+        if journal:
+            self._maybe_compact_journal()
+        if self._simple_memory_check():
+            self._enforce_memory_limits()
+
+    def _load_columns(self, key: str, timestamps: Any, columns: Dict[str, Any], extras: List[Dict[str, Any]]) -> None:
+        """Bulk-load a city's entries by column (journal snapshots), keeping the eviction index and caps in step."""
+        with self._city_lock(key):
+            self._city_buffer(key)
+            self._update_city(key, lambda data_buffer: data_buffer.extend(timestamps, columns, extras), touch=True)
+            self._index_city(key)
+            if key in self._stats:
+                self._stats[key].add_columns(timestamps, columns)
+
+        if self._simple_memory_check():
+            self._enforce_memory_limits()
+
+    def _journal_entry(self, key: str, weather_data: Dict[str, Any]) -> bool:
+        """Queue an entry for the journal before it enters memory (caller holds the city lock).
+
+        Only the encoding happens here; the write and fsync are the group
+        commit run by _commit_journal on the writer thread. Queuing under the
+        stripe lock keeps compaction snapshots and carried-over records
+        consistent. An entry that cannot be encoded is logged and still kept
+        in memory.
+
+        Returns:
+            bool: True if a group commit must be scheduled for the queued entry
+        """
+        try:
+            return self.journal.enqueue([self.journal.encode(key, weather_data)])
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            self.logger.error(f"Failed to journal history entry for {key}: {e}")
+            return False
+
+    def _commit_journal(self) -> None:
+        """Write the entries queued for the journal in one append and fsync (runs on the writer thread)."""
+        try:
+            self.journal.commit()
+        except OSError as e:
+            self.logger.error(f"Failed to commit history journal entries: {e}")
+
+    def _maybe_compact_journal(self) -> None:
+        """Queue a journal compaction once it holds more entries than HISTORY['journal_compact_*'] allow."""
+        with self._memory_lock:
+            due = not self._journal_compaction_pending and self.journal.needs_compaction(self._total_entries)
+            if due:
+                self._journal_compaction_pending = True
+        if due:
+            self.writer.call(self._compact_journal)
+
+    def _compact_journal(self) -> None:
+        """Rewrite the journal with the entries currently in memory (runs on the writer thread).
+
+        Snapshots are taken lazily, one lock stripe at a time, while the
+        journal carries over records queued in the meantime. An entry
+        queued before the compaction started holds its stripe lock until
+        it is in memory, so it is either in a snapshot or carried over
+        (committed or not); replay skips entries that end up in both.
+        """
+        def snapshots() -> Iterator[tuple]:
+            for city_lock in self._city_locks:
+                with city_lock:  # Current contents, not a possibly stale published view
+                    with self._memory_lock:
+                        keys = [key for key in self.weather_data if self._city_lock(key) is city_lock]
+                    taken = [(key,) + self.weather_data[key].snapshot() for key in keys if self.weather_data.get(key)]
+                yield from taken
+
+        try:
+            self.journal.compact(snapshots())
+        finally:
+            self._journal_compaction_pending = False
+
+    def restore_from_journal(self) -> int:
+        """Rebuild in-memory history from the journal (call once at startup, before new data is stored).
+
+        Compacted city snapshots are bulk-loaded into the ring buffers; later
+        entries are replayed through the same buffers, caps and retention as
+        live stores. Nothing is written to the history backend again.
+
+        Returns:
+            int: Number of entries restored
+        """
+        if self.journal is None:
+            return 0
+        started = datetime.now()
+        snapshot_timestamps: Dict[str, Any] = {}  # City key -> snapshot timestamps (array, then set once needed)
+        restored = replayed_entries = 0
+        for kind, key, data in self.journal.replay():
+            if kind == 'columns':
+                self._load_columns(key, *data)
+                snapshot_timestamps[key] = data[0]
+                restored += len(data[0])
+                continue
+            if key in snapshot_timestamps:
+                if not isinstance(snapshot_timestamps[key], set):
+                    snapshot_timestamps[key] = set(snapshot_timestamps[key].tolist())
+                if data['date'].timestamp() in snapshot_timestamps[key]:
+                    continue  # Appended both before and after the compaction snapshot
+            self._add_to_memory(key, data)
+            restored += 1
+            replayed_entries += 1
+        if restored:
+            self.cleanup_old_data()
+            if replayed_entries > self.config.HISTORY['journal_compact_min_records'] and not self._journal_compaction_pending:
+                self._journal_compaction_pending = True
+                self.writer.call(self._compact_journal)  # Next restart bulk-loads snapshots instead
+            else:
+                self._maybe_compact_journal()
+            elapsed_ms = (datetime.now() - started).total_seconds() * 1000
+            self.logger.info(f"Restored {restored} history entries for {len(self.weather_data)} cities from journal in {elapsed_ms:.0f} ms")
+        return restored
+
+    def _maybe_rotate_segments(self) -> None:
+        """Queue a segment rotation check once per config.ARCHIVE['check_interval_seconds']."""
+        now = datetime.now()
+        interval = timedelta(seconds=self.config.ARCHIVE['check_interval_seconds'])
+        if self._last_rotation_check is not None and now - self._last_rotation_check < interval:
+            return
+        self._last_rotation_check = now
+        self.writer.call(self._rotate_segments)
+
+    def _rotate_segments(self) -> None:
+        """Archive the history CSV and text log into gzip segments if they reached their limits.
+
+        Runs on the background writer thread, between batches, so no append
+        is in flight while a file is moved. The text log rotates under every
+        backend; the history CSV only exists under the CSV backend. The
+        default SQLite backend is bounded by per-tier retention
+        (HISTORY['retention_days']) instead.
+        """
+        if isinstance(self.history_store, CSVHistoryStore):
+            self.history_store.rotate_if_needed()
+        text_archive = self._get_text_archive()
+        if text_archive.should_rotate():
+            text_archive.rotate()
+
+    def _get_text_archive(self) -> SegmentArchive:
+        """Return the segment archive for the text log (OUTPUT['text_file'])."""
+        text_file = Path(self.config.OUTPUT["text_file"])
+        if self._text_archive is None or self._text_archive.active_file != text_file:
+            self._text_archive = SegmentArchive(text_file)
+        return self._text_archive
+
+    def _store_to_history(self, city: str, weather_data: Dict[str, Any], on_written: Optional[Callable[[int], None]] = None) -> None:
+        """Queue weather data for the persistent history backend.
         
         Args:
             city: City name for the weather data
             weather_data: Weather data dictionary to store
+            on_written: Optional callback run on the writer thread once the row is stored
         """
-        # Use the CSV directory configuration
-        csv_file = Path(self.config.OUTPUT["csv_dir"]) / "weather_data.csv"
-
-        # Ensure directory exists
-        csv_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Define CSV headers based on weather data structure
-        headers = [
-            'timestamp', 'city', 'temperature', 'humidity', 'pressure', 'wind_speed',
-            'wind_direction', 'conditions', 'feels_like', 'temp_min', 'temp_max',
-            'wind_gust', 'visibility', 'cloud_cover', 'rain', 'snow', 'uv_index',
-            'air_quality_index', 'source'
-        ]
-        
-        # Prepare row data
-        row_data = {
-            'timestamp': weather_data.get('date', datetime.now()).strftime("%Y-%m-%d %H:%M:%S"),
-            'city': city,
-            'temperature': weather_data.get('temperature'),
-            'humidity': weather_data.get('humidity'),
-            'pressure': weather_data.get('pressure'),
-            'wind_speed': weather_data.get('wind_speed'),
-            'wind_direction': weather_data.get('wind_direction'),
-            'conditions': weather_data.get('conditions'),
-            'feels_like': weather_data.get('feels_like'),
-            'temp_min': weather_data.get('temp_min'),
-            'temp_max': weather_data.get('temp_max'),
-            'wind_gust': weather_data.get('wind_gust'),
-            'visibility': weather_data.get('visibility'),
-            'cloud_cover': weather_data.get('cloud_cover'),
-            'rain': weather_data.get('rain'),
-            'snow': weather_data.get('snow'),
-            'uv_index': weather_data.get('uv_index'),
-            'air_quality_index': weather_data.get('air_quality_index'),
-            'source': 'simulated' if self.utils.is_fallback(weather_data) else 'api'
-        }
-        
-        try:
-            # Create file with headers if it doesn't exist
-            file_exists = csv_file.exists()
-            
-            with open(csv_file, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=headers)
-                
-                if not file_exists:
-                    writer.writeheader()
-                
-                writer.writerow(row_data)
-                
-        except (OSError, IOError, PermissionError) as e:
-            self.logger.error(f"Failed to write CSV data for {city}: {e}")
+        source = 'simulated' if self.utils.is_fallback(weather_data) else 'api'
+        rows = [(self.utils.city_key(city), to_history_row(self.utils.city_display_name(city), weather_data, source))]
+        self._pending_rows.add(rows)
+        self.writer.append_rows(self._pending_rows, rows, on_written)
 
 # ================================
 # 2. DATA ACCESS
 # ================================    
     def get_historical(self, city: str, num_days: int) -> List[Dict[str, Any]]:
-        """Generate historical weather data for a city.
+        """Return a city's chart series for the last N days (today included) from the tier suited to the span.
+        
+        The tier comes from select_history_tier (HISTORY['chart_tier_max_days']):
+        short ranges chart raw observations on a 15-minute grid or hourly
+        rollups, longer ones daily rollups, all resampled onto the range's
+        grid by get_tiered_columns (the mean is under each metric's name,
+        with '<metric>_min', '<metric>_max' and 'samples').
+        
+        Daily series have one entry per day; only days with no stored
+        observations are filled from the fallback generator. Finer series
+        have one entry per bin; empty bins are filled by
+        RESAMPLE['chart_gap_policy'] (bins it cannot fill keep no metric
+        values, so the chart shows a gap). A finer range with no stored
+        observations at all is generated per day, like an empty daily range.
         
         Args:
-            city: Target city name for data generation
-            num_days: Number of days of historical data to generate
+            city: Target city name (aliases resolve to the same city)
+            num_days: Number of days of historical data to return
             
         Returns:
-            List[Dict[str, Any]]: Generated historical weather data
+            List[Dict[str, Any]]: Entries in date order; 'gap_filled' is True for generated days
+                ('source' 'simulated') and filled or empty bins, False for stored data
         """
-        return self.api_service.fallback.generate(city, num_days)
+        tier = self.select_history_tier(num_days)
+        gap_policy = self.config.RESAMPLE['chart_gap_policy'] if tier != 'daily' else None
+        try:
+            columns = self.get_tiered_columns(city, num_days, tier, gap_policy=gap_policy)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            self.logger.warn(f"Stored history unavailable for {city}, using generated data: {e}")
+            columns = {}
+
+        if tier != 'daily' and np.any(columns.get('samples', ())):
+            series = self._grid_entries(columns, keep_gaps=True)
+            for entry in series:
+                entry.update(source='live', gap_filled=not entry['samples'])
+            self.logger.info(f"Historical data for {city}: {tier} tier, {len(series) - sum(e['gap_filled'] for e in series)} of {len(series)} bins stored")
+            return series
+
+        stored = {entry['date'].date(): entry for entry in self._grid_entries(columns)} if columns else {}
+        today = datetime.now().date()
+        generated: Optional[List[Dict[str, Any]]] = None
+        series = []
+        for index in range(num_days):
+            day = today - timedelta(days=num_days - 1 - index)
+            entry = stored.get(day)
+            if entry is not None:
+                series.append(dict(entry, source='live', gap_filled=False))
+                continue
+            if generated is None:
+                generated = self.api_service.fallback.generate(city, num_days)  # Same day alignment as the loop
+            series.append(dict(generated[index], source='simulated', gap_filled=True))
+        
+        if stored:
+            self.logger.info(f"Historical data for {city}: {len(series) - sum(e['gap_filled'] for e in series)} of {num_days} days from stored history")
+        return series
 
     def get_recent_data(self, city: str, days_back: int = 7) -> List[Dict[str, Any]]:
         """Return recent weather data for a city from the last N days.
         
-        Stored in local memory, fast, limited to 30 entries.
+        Stored in local memory, fast, limited to MEMORY['max_entries_per_city'] entries.
 
         Args:
             city: Target city name for data retrieval
@@ -192,117 +418,457 @@ class WeatherHistoryService:
         Returns:
             List[Dict[str, Any]]: Recent weather data entries for the specified time period
         """
-        city_data = self.weather_data.get(self.utils.city_key(city), [])
-        cutoff_date = datetime.now().date() - timedelta(days=days_back)
+        city_data = self._read_view(self.utils.city_key(city))
+        if city_data is None:
+            return []
+        return city_data.entries_since(self._recent_cutoff(days_back))
+
+    def get_recent_columns(self, city: str, days_back: int = 7) -> Dict[str, Any]:
+        """Return recent in-memory data for a city as per-metric columns for charting.
         
-        return [
-            entry for entry in city_data 
-            if entry.get('date', datetime.now()).date() >= cutoff_date
-        ]
+        Columnar counterpart of get_recent_data: 'timestamp' (epoch seconds) plus
+        one float64 column per numeric metric, NaN where missing. Columns are
+        read-only views into a copy-on-write snapshot of the city's buffer (no
+        copying, and never changed by later stores) when entries were stored
+        in time order.
+
+        Args:
+            city: Target city name for data retrieval
+            days_back: Number of days to look back (default 7)
+
+        Returns:
+            Dict[str, np.ndarray]: Column arrays keyed by field name (empty if the city has no data)
+        """
+        city_data = self._read_view(self.utils.city_key(city))
+        if city_data is None:
+            return {}
+        return city_data.columns(self._recent_cutoff(days_back))
+
+    def get_rolling_stats(self, city: str, metric: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Return running summary statistics of a city's in-memory history, without scanning it.
+        
+        Maintained in O(1) per stored entry (see RollingStats) over every
+        entry stored for the city since it entered memory, including journal
+        replay. 'change' is the difference between the last and first values
+        in the STATS['change_window_hours'] before the city's latest entry,
+        and 'range' the spread of the values in that window.
+        Read under the city's stripe lock, so a concurrent store is either
+        fully counted or not at all.
+
+        Args:
+            city: Target city name
+            metric: Optional single metric to report
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Per metric: 'count', 'mean', 'variance', 'std', 'min', 'max',
+                'ewma', 'last', 'last_time', 'change' and 'range' (both None with fewer than two values in the window)
+        """
+        key = self.utils.city_key(city)
+        with self._city_lock(key):
+            stats = self._stats.get(key)
+            return stats.summary(metric) if stats is not None else {}
+
+    def get_window_aggregates(self, city: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                              metrics: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Return the sum, count and mean of each metric over a half-open [start, end) window of in-memory history.
+        
+        Answered from the buffer's prefix sums: two binary searches and a
+        subtraction per metric, so changing the window costs the same
+        whatever the volume of data it covers.
+
+        Args:
+            city: Target city name
+            start: Optional inclusive window start (default: oldest entry)
+            end: Optional exclusive window end (default: after the newest entry)
+            metrics: Optional metrics to report (default: every numeric metric)
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Per metric with at least one value in the window: 'sum', 'count' and 'mean'
+        """
+        city_data = self._read_view(self.utils.city_key(city))
+        if city_data is None:
+            return {}
+        result = {}
+        for field in metrics or NUMERIC_FIELDS:
+            if field not in NUMERIC_FIELDS:
+                continue
+            total, count = city_data.window_totals(field, start, end)
+            if count:
+                result[field] = {'sum': total, 'count': count, 'mean': total / count}
+        return result
+
+    def _recent_cutoff(self, days_back: int) -> datetime:
+        """Start of the day ``days_back`` days ago (the recent-data window start)."""
+        return datetime.combine(datetime.now().date() - timedelta(days=days_back), datetime.min.time())
+
+    def get_history_range(self, city: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Return stored observations for a city within an inclusive time range.
+        
+        Args:
+            city: Target city name (aliases resolve to the same city)
+            start: Optional earliest timestamp
+            end: Optional latest timestamp
+            
+        Returns:
+            List[Dict[str, Any]]: Stored weather data entries in time order, including rows still queued for the store
+        """
+        city_key = self.utils.city_key(city)
+
+        def query_range(pending: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            stored = self.history_store.query_range(city_key, start, end)
+            return list(heapq.merge(stored, self._pending_entries(pending, start, end, {entry['date'] for entry in stored}),
+                                    key=lambda entry: entry['date']))
+        return self._pending_rows.read(city_key, query_range)
+
+    def iter_history(self, city: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Stream stored observations for a city in time order without loading them all.
+        
+        Rows still queued for the store when the stored ones run out follow them.
+        """
+        city_key = self.utils.city_key(city)
+        yield from self.history_store.iter_range(city_key, start, end)
+        yield from self._pending_rows.read(city_key, lambda pending: self._pending_entries(pending, start, end))
+
+    def _pending_entries(self, rows: List[Dict[str, Any]], start: Optional[datetime] = None,
+                         end: Optional[datetime] = None, stored: Optional[set] = None) -> List[Dict[str, Any]]:
+        """Entries, in time order, of rows queued for the store that fall within an inclusive range.
+        
+        Rows timestamped like a stored entry (``stored`` dates) or an earlier
+        queued row are left out, as the SQLite store will skip them.
+        """
+        seen = set(stored or ()) if isinstance(self.history_store, SQLiteHistoryStore) else None
+        entries = []
+        for entry in map(from_history_row, rows):
+            if (start is not None and entry['date'] < start) or (end is not None and entry['date'] > end):
+                continue
+            if seen is not None:
+                if entry['date'] in seen:
+                    continue
+                seen.add(entry['date'])
+            entries.append(entry)
+        return sorted(entries, key=lambda entry: entry['date'])
+
+    def get_recent_history(self, city: str, days_back: int = 7) -> List[Dict[str, Any]]:
+        """Return stored observations for a city from the last N days (same cutoff as get_recent_data)."""
+        cutoff = datetime.combine(datetime.now().date() - timedelta(days=days_back), datetime.min.time())
+        return self.get_history_range(city, start=cutoff)
+
+    def get_tiered_history(self, city: str, num_days: int, tier: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return a city's stored history for the last N days from the tier suited to the span.
+        
+        Short spans read raw observations; longer ones read hourly or daily
+        rollups (the mean under each metric's name, plus '<metric>_min',
+        '<metric>_max' and 'samples'), so long-range charts stay cheap as
+        collection runs around the clock.
+        
+        Args:
+            city: Target city name (aliases resolve to the same city)
+            num_days: Number of days to cover, including today
+            tier: Optional tier override ('raw', 'hourly' or 'daily')
+            
+        Returns:
+            List[Dict[str, Any]]: Entries in time order
+            
+        Raises:
+            ValueError: If the tier is unknown
+        """
+        tier = tier or self.select_history_tier(num_days)
+        if tier not in HISTORY_TIERS:
+            raise ValueError(f"Unknown history tier '{tier}'. Must be one of {HISTORY_TIERS}")
+        start = datetime.combine(datetime.now().date() - timedelta(days=num_days - 1), datetime.min.time())
+        if tier == 'raw':
+            return self.get_history_range(city, start)
+        city_key = self.utils.city_key(city)
+        return self._pending_rows.read(city_key, lambda pending: self.history_store.query_rollups(city_key, tier, start, pending=pending))
+
+    def get_tiered_columns(self, city: str, num_days: int, tier: Optional[str] = None,
+                           end: Optional[datetime] = None, gap_policy: Optional[str] = None) -> Dict[str, Any]:
+        """Return a city's stored history for the last N days on the uniform grid of its tier.
+        
+        Entries from get_tiered_history are resampled onto the tier's
+        RESAMPLE['tier_intervals'] bins, on the local wall clock, in one
+        vectorized pass per reduction: the mean under each metric's name,
+        the extremes under '<metric>_min' and '<metric>_max', and the
+        observation count under 'samples'. Every bin of the range is present;
+        bins without live observations have 0 samples, NaN extremes and
+        means filled by the gap policy (NaN by default).
+        
+        Args:
+            city: Target city name (aliases resolve to the same city)
+            num_days: Number of days to cover, including today
+            tier: Optional tier override ('raw', 'hourly' or 'daily')
+            end: Optional exclusive grid end (default: the current time)
+            gap_policy: Optional treatment of empty bins in the means: 'nan', 'ffill' or 'interpolate'
+                (default RESAMPLE['gap_policy'])
+            
+        Returns:
+            Dict[str, np.ndarray]: 'date' (bin start datetimes), 'samples' and the float64 metric columns
+            
+        Raises:
+            ValueError: If the tier or gap policy is unknown
+        """
+        tier = tier or self.select_history_tier(num_days)
+        entries = [entry for entry in self.get_tiered_history(city, num_days, tier) if entry.get('source') != 'simulated']
+        start = datetime.combine(datetime.now().date() - timedelta(days=num_days - 1), datetime.min.time())
+        end = end or datetime.now()
+
+        def column(field: str) -> np.ndarray:
+            return np.array([entry.get(field) for entry in entries], dtype=np.float64)  # None -> NaN
+
+        timestamps = np.array([(entry['date'] - WALL_CLOCK_EPOCH).total_seconds() for entry in entries], dtype=np.float64)
+        means = {field: column(field) for field in ROLLUP_FIELDS}
+        if tier == 'raw':
+            minima, maxima, samples = means, means, np.ones(len(entries))
+        else:
+            minima = {field: column(f'{field}_min') for field in ROLLUP_FIELDS}
+            maxima = {field: column(f'{field}_max') for field in ROLLUP_FIELDS}
+            samples = column('samples')
+
+        bounds = dict(start=start.replace(tzinfo=timezone.utc), end=end.replace(tzinfo=timezone.utc), utc_offset=0.0)
+        interval = self.config.RESAMPLE['tier_intervals'][tier]
+        grid, columns = self.resampler.resample(timestamps, means, interval, aggregation='mean', gap_policy=gap_policy, **bounds)
+        for suffix, values, aggregation in (('_min', minima, 'min'), ('_max', maxima, 'max')):
+            _, extremes = self.resampler.resample(timestamps, values, interval, aggregation=aggregation, gap_policy='nan', **bounds)
+            columns.update((f'{field}{suffix}', extreme) for field, extreme in extremes.items())
+        _, counts = self.resampler.resample(timestamps, {'samples': samples}, interval, aggregation='sum', gap_policy='nan', **bounds)
+        columns['samples'] = np.nan_to_num(counts.get('samples', np.zeros(grid.size))).astype(np.int64)
+        columns['date'] = np.array([WALL_CLOCK_EPOCH + timedelta(seconds=float(seconds)) for seconds in grid], dtype=object)
+        return columns
+
+    def _grid_entries(self, columns: Dict[str, Any], keep_gaps: bool = False) -> List[Dict[str, Any]]:
+        """Turn get_tiered_columns output into one entry per bin with samples (every bin with keep_gaps; NaN left out)."""
+        entries = []
+        samples = columns.get('samples', np.empty(0, dtype=np.int64))
+        for index in (range(samples.size) if keep_gaps else np.flatnonzero(samples)):
+            entry = {'date': columns['date'][index], 'samples': int(samples[index])}
+            for field in ROLLUP_FIELDS:
+                if not np.isnan(columns[field][index]):
+                    entry[field] = float(columns[field][index])
+                if not np.isnan(columns[f'{field}_min'][index]):
+                    entry[f'{field}_min'] = float(columns[f'{field}_min'][index])
+                    entry[f'{field}_max'] = float(columns[f'{field}_max'][index])
+            entries.append(entry)
+        return entries
+
+    def select_history_tier(self, num_days: int) -> str:
+        """Pick the finest tier whose chart limit and retention period cover a span of N days."""
+        retention = self.config.HISTORY['retention_days']
+        chart_limits = self.config.HISTORY['chart_tier_max_days']
+        for tier in HISTORY_TIERS[:-1]:
+            kept_days = retention.get(tier)
+            if num_days <= chart_limits.get(tier, 0) and (kept_days is None or num_days <= kept_days):
+                return tier
+        return HISTORY_TIERS[-1]
+
+    def apply_history_retention(self) -> None:
+        """Queue per-tier retention of stored history (config.HISTORY['retention_days']) on the background writer."""
+        def prune() -> None:
+            deleted = self.history_store.apply_retention(self.config.HISTORY['retention_days'])
+            if any(deleted.values()):
+                self.logger.info(f"History retention removed {deleted}")
+        self.writer.call(prune)
+
+    def import_history(self, path: Optional[str] = None, default_city: Optional[str] = None,
+                       progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """Bulk-import external CSV datasets into stored history.
+
+        Args:
+            path: A CSV file, or a directory of them. Defaults to the comparison directory
+            default_city: City for files without a city column
+            progress: Optional callback receiving each file's running summary after every chunk
+
+        Returns:
+            List[Dict[str, Any]]: One import summary per file (see HistoryImporter.import_file)
+        """
+        importer = HistoryImporter(self.history_store, self.utils.city_key)
+        if path is None or Path(path).is_dir():
+            return importer.import_directory(path, progress)
+        return [importer.import_file(path, default_city, progress=progress)]
+
+    def get_stored_cities(self) -> List[str]:
+        """Return one display name per city with stored history (or rows queued for the store)."""
+        def list_cities(pending: List[Dict[str, Any]]) -> List[str]:
+            cities = self.history_store.list_cities()
+            known = {self.utils.city_key(city) for city in cities}
+            for row in pending:
+                key = self.utils.city_key(row['city'])
+                if key not in known:
+                    known.add(key)
+                    cities.append(row['city'])
+            return cities
+        return self._pending_rows.read(None, list_cities)
+
+    def export_history_csv(self, csv_path: Optional[str] = None) -> int:
+        """Export stored history in the weather_data.csv layout for compatibility.
+        
+        Args:
+            csv_path: Destination path. Defaults to OUTPUT['csv_dir']/weather_data_export.csv
+            
+        Returns:
+            int: Number of rows written
+        """
+        destination = csv_path or str(Path(self.config.OUTPUT["csv_dir"]) / "weather_data_export.csv")
+
+        def export(pending: List[Dict[str, Any]]) -> int:
+            written = self.history_store.export_csv(destination)
+            if pending:  # Rows still queued for the store follow the stored ones
+                with open(destination, 'a', newline='', encoding='utf-8') as f:
+                    csv.writer(f).writerows(['' if row.get(column) is None else row[column] for column in CSV_HEADERS] for row in pending)
+            return written + len(pending)
+        written = self._pending_rows.read(None, export)
+        self.logger.info(f"Exported {written} history rows to {destination}")
+        return written
+
+    def close(self) -> None:
+        """Drain queued writes, commit the journal, save learned city aliases and release the history backend (call on application shutdown)."""
+        self.writer.close()
+        if self.journal is not None:
+            try:
+                self.journal.close()
+            except OSError as e:
+                self.logger.error(f"Failed to commit history journal entries on close: {e}")
+        self.utils.city_index.flush()
+        self.history_store.close()
 
     def get_recent_data_from_csv(self, city: str, days_back: int = 7) -> List[Dict[str, Any]]:
-        """Get recent weather data from CSV file.
+        """Get recent weather data from a weather_data.csv file (legacy or exported layout).
+        
+        This reads the file the CSV history backend writes (HISTORY['backend']
+        'csv'); under the default SQLite backend it only sees legacy or
+        exported files. The dashboard itself reads history through the
+        configured backend (get_history_range, get_recent_history), so this
+        is for callers that want the CSV file specifically. Values are parsed
+        like the backend's own rows, so integer fields written as floats
+        ('61.0') are read too.
+        
+        Rows are appended in time order, so the file is read backwards from
+        the end and reading stops at the first row before the cutoff date:
+        cost follows the size of the window, not the size of the file. When
+        the window reaches back past the active file, only the archived
+        segments overlapping it are decompressed.
         
         Args:
             city: Target city name for data retrieval
             days_back: Number of days to look back (default 7)
             
         Returns:
-            List[Dict[str, Any]]: Recent weather data entries from CSV
+            List[Dict[str, Any]]: Recent weather data entries from CSV, oldest first
         """
         # Use the config CSV directory configuration
         csv_file = Path(self.config.OUTPUT["csv_dir"]) / "weather_data.csv"
+        archive = self._get_csv_store(csv_file).archive
+        cutoff_date = datetime.now().date() - timedelta(days=days_back)
+        archived_segments = archive.segments(cutoff_date.isoformat())
         
-        if not csv_file.exists():
+        if not csv_file.exists() and not archived_segments:
             return []
         
-        cutoff_date = datetime.now().date() - timedelta(days=days_back)
         recent_data = []
+        target_key = self.utils.city_key(city)
+        row_keys: Dict[str, str] = {}  # Resolve each distinct spelling once
         
         try:
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-
-                # Validate CSV structure
-                expected_fields = ['timestamp', 'city', 'temperature', 'humidity', 'pressure', 'wind_speed']
-                actual_fields = reader.fieldnames or []
+            # Validate CSV structure
+            expected_fields = ['timestamp', 'city', 'temperature', 'humidity', 'pressure', 'wind_speed']
+            if csv_file.exists():
+                actual_fields = read_csv_header(csv_file)
                 missing_fields = [field for field in expected_fields if field not in actual_fields]
 
                 if missing_fields:
                     self.logger.error(f"CSV file missing required fields: {missing_fields}")
                     return []
 
-                for row in reader:
-                    # Validate required fields
-                    required_fields = ['timestamp', 'city']
-                    for field in required_fields:
-                        if field not in row:
-                            self.logger.warn(f"Missing required field '{field}' in CSV row for {city}")
-                            continue
+            # Active file newest first, then the older archived rows (also newest first)
+            rows = iter_csv_tail(csv_file, cutoff_date.isoformat()) if csv_file.exists() else iter(())
+            if archived_segments:
+                rows = itertools.chain(rows, reversed(list(iter_archived_rows(archive, cutoff_date.isoformat()))))
 
-                    # Filter by city
-                    if row['city'] != city:
-                        continue
-
-                    # Parse timestamp
+            for row in rows:
+                # Filter by canonical city (aliases and older spellings match too)
+                row_city = row.get('city')
+                if not row_city:
+                    self.logger.warn(f"Missing required field 'city' in CSV row for {city}")
+                    continue
+                if row_city not in row_keys:
                     try:
-                        row_date = datetime.strptime(row['timestamp'], "%Y-%m-%d %H:%M:%S").date()
-                        if row_date >= cutoff_date:
-                            # Convert back to dictionary format
-                            data_entry = {
-                                'date': datetime.strptime(row['timestamp'], "%Y-%m-%d %H:%M:%S"),
-                                'temperature': float(row['temperature']) if row['temperature'] != '' else None,
-                                'humidity': int(row['humidity']) if row['humidity'] != '' else None,
-                                'pressure': int(row['pressure']) if row['pressure'] != '' else None,
-                                'wind_speed': float(row['wind_speed']) if row['wind_speed'] != '' else None,
-                                'wind_direction': float(row['wind_direction']) if row['wind_direction'] != '' else None,
-                                'conditions': row['conditions'] if row['conditions'] != '' else None,
-                                'feels_like': float(row['feels_like']) if row['feels_like'] != '' else None,
-                                'temp_min': float(row['temp_min']) if row['temp_min'] != '' else None,
-                                'temp_max': float(row['temp_max']) if row['temp_max'] != '' else None,
-                                'wind_gust': float(row['wind_gust']) if row['wind_gust'] != '' else None,
-                                'visibility': float(row['visibility']) if row['visibility'] != '' else None,
-                                'cloud_cover': int(row['cloud_cover']) if row['cloud_cover'] != '' else None,
-                                'rain': float(row['rain']) if row['rain'] != '' else None,
-                                'snow': float(row['snow']) if row['snow'] != '' else None,
-                                'uv_index': float(row['uv_index']) if row['uv_index'] != '' else None,
-                                'air_quality_index': int(row['air_quality_index']) if row['air_quality_index'] != '' else None,
-                            }
-                            recent_data.append(data_entry)
-
-                    except (ValueError, KeyError) as e:
-                        self.logger.warn(f"Error parsing CSV row for {city}: {e}")
-                        continue
+                        row_keys[row_city] = self.utils.city_key(row_city)
+                    except ValueError:
+                        row_keys[row_city] = row_city
+                if row_keys[row_city] != target_key:
+                    continue
+
+                # Parse with the backend's row reader (rows reaching here are already inside the window)
+                try:
+                    data_entry = from_history_row(row)
+                    recent_data.append(data_entry)
+
+                except (ValueError, KeyError) as e:
+                    self.logger.warn(f"Error parsing CSV row for {city}: {e}")
+                    continue
                         
-        except (OSError, IOError, PermissionError) as e:
+        except (OSError, IOError, PermissionError, UnicodeDecodeError, EOFError, csv.Error) as e:
             self.logger.error(f"Failed to read CSV data for {city}: {e}")
             return []
         
+        recent_data.reverse()  # Tail reads are newest first
         return recent_data
     
     def get_all_cities_from_csv(self) -> List[str]:
         """Get list of all cities that have data in the CSV file.
         
+        Reads the CSV's city manifest sidecar (caught up or rebuilt from the
+        file only when it is stale or unreadable) and the per-city summaries of
+        its archived segments, instead of scanning every row.
+        
+        Like get_recent_data_from_csv, this sees the file the CSV backend
+        writes; under the default SQLite backend only legacy or exported
+        files. City listing in the dashboard goes through get_stored_cities,
+        which reads the configured backend's own city summary.
+        
         Returns:
-            List[str]: List of unique city names
+            List[str]: List of unique city names (one per canonical city)
         """
         csv_file = Path(self.config.OUTPUT["csv_dir"]) / "weather_data.csv"
+        csv_store = self._get_csv_store(csv_file)
         
-        if not csv_file.exists():
+        if not csv_file.exists() and not csv_store.archive.segments():
             return []
         
-        cities = set()
         try:
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if 'city' in row and row['city']:
-                        cities.add(row['city'])
+            return csv_store.list_cities()
         except (OSError, IOError, PermissionError) as e:
             self.logger.error(f"Failed to read CSV file: {e}")
             return []
+    
+    def get_csv_city_stats(self, city: str) -> Optional[Dict[str, Any]]:
+        """Get first/last timestamps and row count for a city in the CSV file and its archived segments.
         
-        return list(cities)
+        Args:
+            city: City name (any alias)
+            
+        Returns:
+            Optional[Dict[str, Any]]: Summary with 'city', 'first_timestamp', 'last_timestamp'
+                and 'row_count', or None if the CSV has no rows for the city
+        """
+        csv_file = Path(self.config.OUTPUT["csv_dir"]) / "weather_data.csv"
+        csv_store = self._get_csv_store(csv_file)
+        
+        if not csv_file.exists() and not csv_store.archive.segments():
+            return None
+        
+        try:
+            return csv_store.get_city_stats().get(self.utils.city_key(city))
+        except (OSError, IOError, PermissionError) as e:
+            self.logger.error(f"Failed to read CSV file: {e}")
+            return None
+    
+    def _get_csv_store(self, csv_file: Path) -> CSVHistoryStore:
+        """Return a CSV reader (manifest plus segment archive) for a CSV file, shared with the CSV backend when it writes that file."""
+        if isinstance(self.history_store, CSVHistoryStore) and self.history_store.csv_file == csv_file:
+            return self.history_store
+        if self._csv_store is None or self._csv_store.csv_file != csv_file:
+            self._csv_store = CSVHistoryStore(self.utils.city_key, str(csv_file))
+        return self._csv_store
     
     def _safe_float_parse(self, value: str) -> Optional[float]:
         """Safely parse float value from CSV."""
@@ -326,47 +892,53 @@ class WeatherHistoryService:
 # 3. DATA TEXT FILE FOR BACKUP
 # ================================    
     def _write_to_text_log(self, city: str, data: Dict[str, Any], unit_system: str) -> None:
-        """Write formatted weather data to text log for debugging.
+        """Queue a formatted weather data entry for the text log.
         
-        Creates a formatted text log entry with timestamp, city, and all weather metrics
-        in the specified unit system. Handles file I/O errors gracefully
+        The entry is formatted and written on the background writer thread;
+        write failures are logged there instead of raised to the caller.
         
         Args:
             city: City name for the weather data
             weather_data: Weather data dictionary to text log
             unit_system: Unit system for formatting ('metric' or 'imperial')
         """
-        try:
-            text_entry = self._format_data_for_logging(city, data, unit_system)
-            with open(self.config.OUTPUT["text_file"], "a", encoding="utf-8") as f:
-                f.write(text_entry)
+        snapshot = dict(data)
+        fallback_text = "Simulated" if self.utils.is_fallback(data) else "Live"
 
-            fallback_text = "Simulated" if self.utils.is_fallback(data) else "Live"
+        def render() -> str:
+            text_entry = self._format_data_for_logging(city, snapshot, unit_system)
             self.logger.info(f"Weather data written for {self.utils.city_key(city)} - {fallback_text}")
-            
-        except (OSError, IOError, PermissionError) as e:
-            # Raise as custom exception for controller to handle via error_handler
-            self.dialog.dialog_manager.show_theme_aware_dialog('error', 'file_error', 
-                "Failed to write {info} to {file}: {reason}", 
-                info="weather data", file=self.config.OUTPUT["text_file"], reason=str(e))
-            raise WeatherDashboardError(f"Failed to write weather data to {self.config.OUTPUT['text_file']}: {e}")
-        except Exception as e:
-            raise WeatherDashboardError(f"Unexpected error writing weather data: {e}")
+            return text_entry
+
+        self.writer.append_text(self.config.OUTPUT["text_file"], render)
 
     def _format_data_for_logging(self, city: str, weather_data: Dict[str, Any], unit_system: str) -> str:
-        """Format weather data for text file logging."""
+        """Format metric weather data for text file logging in the given unit system."""
         timestamp = weather_data.get('date', datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
         lines = [
             f"\n\nTime: {timestamp}",
             f"City: {self.utils.city_key(city)}",
             f"Unit System: {unit_system}",
-            f"Temperature: {self.unit_converter.format_value('temperature', weather_data.get('temperature'), unit_system)}",
-            f"Humidity: {self.unit_converter.format_value('humidity', weather_data.get('humidity'), unit_system)}",
-            f"Pressure: {self.unit_converter.format_value('pressure', weather_data.get('pressure'), unit_system)}",
-            f"Wind Speed: {self.unit_converter.format_value('wind_speed', weather_data.get('wind_speed'), unit_system)}",
+            f"Temperature: {self._format_log_value('temperature', weather_data, unit_system)}",
+            f"Humidity: {self._format_log_value('humidity', weather_data, unit_system)}",
+            f"Pressure: {self._format_log_value('pressure', weather_data, unit_system)}",
+            f"Wind Speed: {self._format_log_value('wind_speed', weather_data, unit_system)}",
             f"Conditions: {weather_data.get('conditions', '--')}"
         ]
         return "\n".join(lines)
+
+    def _format_log_value(self, field: str, weather_data: Dict[str, Any], unit_system: str) -> str:
+        """Format one metric field of weather data, converted to imperial units if requested."""
+        value = weather_data.get(field)
+        converters = {
+            'temperature': self.unit_converter.convert_temperature,
+            'pressure': self.unit_converter.convert_pressure,
+            'wind_speed': self.unit_converter.convert_wind_speed,
+        }
+        if unit_system == 'imperial' and field in converters and isinstance(value, (int, float)):
+            units = self.config.UNITS['metric_units'][field]
+            value = converters[field](value, units['metric'], units['imperial'])
+        return self.unit_converter.format_value(field, value, unit_system)
     
 # ================================
 # 4. MEMORY MANAGEMENT
@@ -374,38 +946,223 @@ class WeatherHistoryService:
     def cleanup_old_data(self, days_to_keep: int = 30) -> None:
         """Remove old weather data and manage memory usage.
         
+        Walks the eviction index from the oldest entry forward, so the cost is
+        proportional to what is evicted rather than to everything in memory.
+        Per-city limits are enforced by each buffer's capacity.
+        
         Args:
             days_to_keep: Number of days of data to retain (default 30)
         """
-        cutoff_date = datetime.now() - timedelta(days=days_to_keep)
+        cutoff_timestamp = (datetime.now() - timedelta(days=days_to_keep)).timestamp()
+        drop_expired = lambda data_buffer: data_buffer.drop_older_than(cutoff_timestamp)
         
-        # Remove old entries and enforce per-city limits
-        for city_key, data_list in self.weather_data.items():
-            # Filter by date
-            recent_data = [
-                entry for entry in data_list 
-                if entry.get('date', datetime.now()) >= cutoff_date
-            ]
-            # Enforce per-city entry limit
-            max_entries = self.config.MEMORY["max_entries_per_city"]
-            self.weather_data[city_key] = recent_data[-max_entries:]
+        while True:
+            with self._memory_lock:
+                if not self._eviction_heap or self._eviction_heap[0][0] >= cutoff_timestamp:
+                    break
+                oldest = self._pop_oldest_city()
+            if oldest is not None:
+                self._evict_oldest(oldest, drop_expired)
+            
+        # Out-of-order buffers can hold old entries behind a newer oldest entry
+        with self._memory_lock:
+            unordered = [key for key, data_buffer in self.weather_data.items() if not data_buffer.ordered]
+        for key in unordered:
+            self._modify_city(key, drop_expired)
+
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """Report in-memory history usage overall and by city.
         
-        # Remove empty city entries
-        empty_cities = [city for city, data in self.weather_data.items() if not data]
-        for city in empty_cities:
-            del self.weather_data[city]
+        Returns:
+            Dict[str, Any]: 'total_entries', 'estimated_bytes', 'cities_stored', 'limits'
+                and 'cities' (per city key: 'entries', 'capacity', 'estimated_bytes',
+                'oldest' and 'newest' entry dates)
+        """
+        cities = {}
+        for key in self._city_keys():
+            data_buffer, city_data = self.weather_data.get(key), self._read_view(key)
+            if data_buffer is None or city_data is None:
+                continue
+            timestamps = city_data.timestamps()
+            cities[key] = {
+                'entries': len(city_data),
+                'capacity': data_buffer.capacity,
+                'estimated_bytes': data_buffer.nbytes,
+                'oldest': datetime.fromtimestamp(timestamps.min()) if len(timestamps) else None,
+                'newest': datetime.fromtimestamp(timestamps.max()) if len(timestamps) else None,
+            }
+        with self._memory_lock:
+            return {
+                'total_entries': self._total_entries,
+                'estimated_bytes': self._total_bytes,
+                'cities_stored': len(self.weather_data),
+                'limits': {
+                    'max_cities_stored': self.config.MEMORY["max_cities_stored"],
+                    'max_entries_per_city': self.config.MEMORY["max_entries_per_city"],
+                    'max_total_entries': self.config.MEMORY["max_total_entries"],
+                },
+                'cities': cities,
+            }
 
     def _simple_memory_check(self) -> bool:
-        """Check if memory limits are exceeded.
+        """Check if memory limits are exceeded (O(1) from the running counters).
         
         Returns:
             bool: True if cleanup is needed due to memory limits
         """
-        total_entries = sum(len(entries) for entries in self.weather_data.values())
-        cities_count = len(self.weather_data)
+        return (len(self.weather_data) > self.config.MEMORY["max_cities_stored"] or 
+                self._total_entries > self.config.MEMORY["max_total_entries"])
+
+    def _enforce_memory_limits(self) -> None:
+        """Evict least recently stored cities and globally oldest entries until within the caps.
+
+        Each victim is chosen under the memory lock and evicted under its
+        own city lock, so no thread ever holds two city locks.
+        """
+        drop_one = lambda data_buffer: data_buffer.drop_oldest(1)
+        while True:
+            with self._memory_lock:
+                if len(self.weather_data) > self.config.MEMORY["max_cities_stored"] and self._recent_cities:
+                    key, oldest = next(iter(self._recent_cities)), None
+                elif self._total_entries > self.config.MEMORY["max_total_entries"] and self._eviction_heap:
+                    key, oldest = None, self._pop_oldest_city()
+                    if oldest is None:
+                        continue
+                else:
+                    break
+            if oldest is not None:
+                self._evict_oldest(oldest, drop_one)
+            else:
+                with self._city_lock(key), self._memory_lock:
+                    self._remove_city(key)
+
+    def _city_lock(self, key: str) -> threading.Lock:
+        """Return the stripe lock serializing mutations of a city's buffer.
+
+        Lock order: at most one city lock at a time, then the memory lock.
+        """
+        return self._city_locks[hash(key) % len(self._city_locks)]
+
+    def _city_keys(self) -> List[str]:
+        """Return the keys of the cities currently held in memory."""
+        with self._memory_lock:
+            return list(self.weather_data)
+
+    def _city_buffer(self, key: str) -> CityHistoryBuffer:
+        """Return a city's buffer, creating it if needed (caller holds the city lock)."""
+        data_buffer = self.weather_data.get(key)
+        if data_buffer is None:
+            data_buffer = CityHistoryBuffer(self.config.MEMORY["max_entries_per_city"])
+            with self._memory_lock:
+                self.weather_data[key] = data_buffer
+                self._views[key] = (data_buffer, data_buffer.view())  # Readers never find a buffer without a view
+                self._stats[key] = RollingStats()
+                self._total_bytes += data_buffer.nbytes
+        return data_buffer
+
+    def _read_view(self, key: str) -> Optional[HistoryView]:
+        """Return a snapshot of a city's entries without waiting on writers.
+
+        Publishes a fresh copy-on-write view when the buffer changed and its
+        city lock is free; while a store is in progress the last published
+        view (the state before that store) is returned instead.
+
+        Returns:
+            Optional[HistoryView]: The city's entries, or None if it has none in memory
+        """
+        data_buffer = self.weather_data.get(key)
+        if data_buffer is None:
+            return None
+        published = self._views.get(key)
+        if published is not None and published[0] is data_buffer and published[1].version == data_buffer.version:
+            return published[1]
+
+        city_lock = self._city_lock(key)
+        if city_lock.acquire(blocking=False):
+            try:
+                if self.weather_data.get(key) is data_buffer:
+                    city_data = data_buffer.view()
+                    self._views[key] = (data_buffer, city_data)
+                    return city_data
+            finally:
+                city_lock.release()
+        return published[1] if published is not None else None
+
+    def _modify_city(self, key: str, operation: Callable[[CityHistoryBuffer], Any]) -> None:
+        """Apply an operation to a city's buffer under its lock, if the city is still in memory."""
+        with self._city_lock(key):
+            if key in self.weather_data:
+                self._update_city(key, operation)
+
+    def _update_city(self, key: str, operation: Callable[[CityHistoryBuffer], Any], touch: bool = False) -> None:
+        """Apply an operation to a city's buffer, keeping the running counters in step (caller holds the city lock).
+
+        Args:
+            key: City key of a buffer in memory
+            operation: Mutation applied to the buffer
+            touch: Also mark the city as the most recently stored
+        """
+        data_buffer = self.weather_data[key]
+        entries_before, bytes_before = len(data_buffer), data_buffer.nbytes
+        operation(data_buffer)
+        with self._memory_lock:
+            self._total_entries += len(data_buffer) - entries_before
+            self._total_bytes += data_buffer.nbytes - bytes_before
+            if not data_buffer:
+                self._remove_city(key)
+            elif touch:
+                self._recent_cities[key] = None
+                self._recent_cities.move_to_end(key)
+
+    def _remove_city(self, key: str) -> None:
+        """Drop a city's buffer and its accounting (caller holds the city and memory locks; its heap entry is discarded lazily)."""
+        data_buffer = self.weather_data.pop(key, None)
+        if data_buffer is not None:
+            self._total_entries -= len(data_buffer)
+            self._total_bytes -= data_buffer.nbytes
+        self._recent_cities.pop(key, None)
+        self._eviction_index.pop(key, None)
+        self._views.pop(key, None)
+        self._stats.pop(key, None)
+
+    def _index_city(self, key: str) -> None:
+        """(Re)enter a city in the eviction heap under its oldest entry's timestamp."""
+        with self._memory_lock:
+            data_buffer = self.weather_data.get(key)
+            if data_buffer is None:
+                return
+            oldest = data_buffer.oldest_timestamp()
+            if self._eviction_index.get(key) != oldest:
+                self._eviction_index[key] = oldest
+                heapq.heappush(self._eviction_heap, (oldest, key))
+
+    def _pop_oldest_city(self) -> Optional[tuple]:
+        """Pop the heap's oldest (timestamp, city key), returning None if the entry was superseded.
+        
+        Called under the memory lock; the buffer itself is checked by
+        _evict_oldest under the city's lock.
+        """
+        timestamp, key = heapq.heappop(self._eviction_heap)
+        if self._eviction_index.get(key) != timestamp:
+            return None  # Superseded entry or removed city
+        del self._eviction_index[key]
+        return timestamp, key
+
+    def _evict_oldest(self, oldest: tuple, operation: Callable[[CityHistoryBuffer], Any]) -> None:
+        """Apply an eviction to the city popped from the heap, then re-index it.
         
-        return (cities_count > self.config.MEMORY["max_cities_stored"] or 
-                total_entries > self.config.MEMORY["max_total_entries"])
+        Heap entries are not updated when a buffer evicts on append; a popped
+        entry whose timestamp no longer matches the city's oldest entry is
+        re-pushed with the current value instead of being acted on.
+        """
+        timestamp, key = oldest
+        with self._city_lock(key):
+            data_buffer = self.weather_data.get(key)
+            if data_buffer is None:
+                return
+            if data_buffer.oldest_timestamp() == timestamp:
+                self._update_city(key, operation)
+            self._index_city(key)
 
     def _should_perform_cleanup(self) -> bool:
         """Check if cleanup should be performed based on time interval.
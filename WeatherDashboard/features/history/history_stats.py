@@ -0,0 +1,249 @@
+"""
+Incremental summary statistics for in-memory weather history.
+
+Each city keeps running aggregates for every numeric history metric: count,
+Welford mean and variance, minimum, maximum, a time-decayed exponentially
+weighted moving average (EWMA) and the latest value. Storing an entry costs
+a few float operations per metric it carries, so summary statistics cost
+the same regardless of how much history has been seen.
+Bulk loads (journal snapshots) are merged with Chan's parallel update and a
+closed-form EWMA instead of replaying entries one by one.
+
+The EWMA decays with elapsed time rather than per sample, so irregular
+collection intervals weigh observations by age: an observation loses half
+its weight every ``STATS['ewma_half_life_hours']``.
+
+The 'change' and 'range' over the last ``STATS['change_window_hours']``
+are kept incrementally too: each metric holds its (timestamp, value) pairs
+inside the window, in time order, and drops the ones that fall out of it as
+newer entries arrive, so reading them never scans the history.
+
+Classes:
+    RollingStats: Running statistics of one city's numeric metrics
+"""
+
+from typing import Dict, List, Any, Optional
+from datetime import datetime
+import bisect
+import math
+
+import numpy as np
+
+from WeatherDashboard import config
+
+from .history_buffer import NUMERIC_FIELDS, FIELD_POSITIONS
+
+
+STATE_FIELDS = ('count', 'mean', 'm2', 'minimum', 'maximum', 'ewma', 'ewma_time', 'last', 'last_time')
+
+
+class RollingStats:
+    """Running statistics of one city's numeric metrics, updated in O(1) per entry.
+
+    The state is a tuple of per-metric lists (aligned with NUMERIC_FIELDS)
+    plus the per-metric change windows. Updates and reads must be
+    serialized by the caller (the history service holds the city's stripe
+    lock for both).
+
+    Attributes:
+        half_life_seconds: Age at which an observation's EWMA weight halves
+        change_window_seconds: Span before the newest entry that 'change' covers
+    """
+
+    def __init__(self, half_life_hours: Optional[float] = None, change_window_hours: Optional[float] = None) -> None:
+        """Initialize empty statistics.
+
+        Args:
+            half_life_hours: Optional EWMA half-life. Defaults to config.STATS['ewma_half_life_hours'] (0 tracks the last value)
+            change_window_hours: Optional 'change' window. Defaults to config.STATS['change_window_hours']
+        """
+        hours = config.STATS['ewma_half_life_hours'] if half_life_hours is None else half_life_hours
+        self.half_life_seconds = hours * 3600.0
+        window = config.STATS['change_window_hours'] if change_window_hours is None else change_window_hours
+        self.change_window_seconds = window * 3600.0
+
+        # Internal state: one list per STATE_FIELDS name
+        size = len(NUMERIC_FIELDS)
+        self._state = tuple([0] * size if name == 'count' else [0.0 if name in ('mean', 'm2') else math.nan] * size
+                            for name in STATE_FIELDS)
+        self._newest = -math.inf  # Timestamp of the newest entry with any metric
+        self._window_times: List[List[float]] = [[] for _ in range(size)]   # Per metric, time order
+        self._window_values: List[List[float]] = [[] for _ in range(size)]
+
+# ================================
+# 1. UPDATES
+# ================================
+    def add(self, entry: Dict[str, Any]) -> None:
+        """Add one weather data dictionary (with a datetime 'date') to every metric it has a value for."""
+        present = [(position, float(value)) for position, value in enumerate(entry.get(field) for field in NUMERIC_FIELDS)
+                   if isinstance(value, (int, float)) and not isinstance(value, bool) and value == value]
+        if not present:
+            return
+        timestamp = entry['date'].timestamp()
+        count, mean, m2, minimum, maximum, ewma, ewma_time, last, last_time = (values[:] for values in self._state)
+
+        for position, value in present:
+            # Welford step
+            count[position] += 1
+            delta = value - mean[position]
+            mean[position] += delta / count[position]
+            m2[position] += delta * (value - mean[position])
+            if not value >= minimum[position]:  # NaN minimum/maximum: first value
+                minimum[position] = value
+            if not value <= maximum[position]:
+                maximum[position] = value
+
+            # Time-decayed EWMA (late arrivals carry no weight)
+            if ewma[position] != ewma[position]:
+                ewma[position], ewma_time[position] = value, timestamp
+            elif timestamp > ewma_time[position]:
+                decay = self._decay(timestamp - ewma_time[position])
+                ewma[position] = decay * ewma[position] + (1.0 - decay) * value
+                ewma_time[position] = timestamp
+
+            if not timestamp < last_time[position]:
+                last[position], last_time[position] = value, timestamp
+
+        self._state = (count, mean, m2, minimum, maximum, ewma, ewma_time, last, last_time)
+        self._newest = max(self._newest, timestamp)
+        for position, value in present:
+            times = self._window_times[position]
+            index = len(times) if not times or timestamp >= times[-1] else bisect.bisect_right(times, timestamp)
+            times.insert(index, timestamp)
+            self._window_values[position].insert(index, value)
+        self._prune_windows()
+
+    def add_columns(self, timestamps: np.ndarray, columns: Dict[str, np.ndarray]) -> None:
+        """Merge a batch of entries given by column, oldest first (as held by CityHistoryBuffer).
+
+        Args:
+            timestamps: Epoch-seconds timestamps
+            columns: Numeric columns keyed by metric (NaN where missing; unknown metrics are ignored)
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if not len(timestamps):
+            return
+        count, mean, m2, minimum, maximum, ewma, ewma_time, last, last_time = (values[:] for values in self._state)
+        effective_times = np.maximum.accumulate(timestamps)  # Out-of-order entries do not move the EWMA clock back
+
+        for field, column in columns.items():
+            position = FIELD_POSITIONS.get(field)
+            if position is None:
+                continue
+            column = np.asarray(column, dtype=np.float64)
+            valid = ~np.isnan(column)
+            batch_count = int(valid.sum())
+            if not batch_count:
+                continue
+            values, times = column[valid], effective_times[valid]
+
+            # Chan et al.: merge the batch's mean and M2 into the running ones
+            batch_mean = float(values.mean())
+            batch_m2 = float(((values - batch_mean) ** 2).sum())
+            total = int(count[position]) + batch_count
+            delta = batch_mean - mean[position]
+            m2[position] += batch_m2 + delta * delta * count[position] * batch_count / total
+            mean[position] += delta * batch_count / total
+            count[position] = total
+            minimum[position] = float(np.fmin(minimum[position], values.min()))
+            maximum[position] = float(np.fmax(maximum[position], values.max()))
+
+            # Closed-form EWMA: value i keeps weight (1 - decay_i) * decay(t_last - t_i)
+            seeded = not math.isnan(ewma[position])
+            start = max(ewma_time[position], times[0]) if seeded else times[0]
+            times = np.maximum(times, start)
+            decay = self._decay(np.diff(times, prepend=start))
+            if not seeded:
+                decay[0] = 0.0  # The first value seeds the average
+            carried = float(self._decay(times[-1] - start)) * ewma[position] if seeded else 0.0
+            ewma[position] = carried + float(((1.0 - decay) * self._decay(times[-1] - times) * values).sum())
+            ewma_time[position] = float(times[-1])
+
+            # Latest value by timestamp (the last of equal timestamps wins)
+            newest = len(timestamps) - 1 - int(np.argmax(np.where(valid, timestamps, -np.inf)[::-1]))
+            if not timestamps[newest] < last_time[position]:
+                last[position], last_time[position] = float(column[newest]), float(timestamps[newest])
+
+        self._state = (count, mean, m2, minimum, maximum, ewma, ewma_time, last, last_time)
+
+        # Change windows: only the batch's entries that can still fall inside one
+        newest = max(self._newest, float(timestamps.max()))
+        self._newest = newest
+        recent = timestamps >= newest - self.change_window_seconds
+        for field, column in columns.items():
+            position = FIELD_POSITIONS.get(field)
+            if position is None:
+                continue
+            column = np.asarray(column, dtype=np.float64)
+            keep = recent & ~np.isnan(column)
+            if not keep.any():
+                continue
+            times = np.concatenate([self._window_times[position], timestamps[keep]])
+            values = np.concatenate([self._window_values[position], column[keep]])
+            order = np.argsort(times, kind='stable')
+            self._window_times[position] = times[order].tolist()
+            self._window_values[position] = values[order].tolist()
+        self._prune_windows()
+
+    def _prune_windows(self) -> None:
+        """Drop window values older than change_window_seconds before the newest entry."""
+        cutoff = self._newest - self.change_window_seconds
+        for times, values in zip(self._window_times, self._window_values):
+            if times and times[0] < cutoff:
+                stale = bisect.bisect_left(times, cutoff)
+                del times[:stale]
+                del values[:stale]
+
+    def _decay(self, elapsed: Any) -> Any:
+        """EWMA weight kept by the previous average after ``elapsed`` seconds (float or array)."""
+        if self.half_life_seconds <= 0:
+            return elapsed * 0.0
+        if isinstance(elapsed, float):
+            return 2.0 ** (-elapsed / self.half_life_seconds)
+        return np.exp2(-np.asarray(elapsed) / self.half_life_seconds)
+
+# ================================
+# 2. READING
+# ================================
+    def summary(self, metric: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Return the statistics of every metric seen (or of one metric).
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Per metric: 'count', 'mean', 'variance' (sample),
+                'std', 'min', 'max', 'ewma', 'last', 'last_time' (datetime), 'change'
+                (latest minus earliest value in the change window) and 'range' (highest minus
+                lowest value in it); both None with fewer than two values in the window
+        """
+        count, mean, m2, minimum, maximum, ewma, _, last, last_time = self._state
+        fields = NUMERIC_FIELDS if metric is None else [field for field in (metric,) if field in FIELD_POSITIONS]
+        result = {}
+        for field in fields:
+            position = FIELD_POSITIONS[field]
+            samples = int(count[position])
+            if not samples:
+                continue
+            variance = float(m2[position]) / (samples - 1) if samples > 1 else 0.0
+            result[field] = {
+                'count': samples,
+                'mean': float(mean[position]),
+                'variance': variance,
+                'std': math.sqrt(max(variance, 0.0)),
+                'min': float(minimum[position]),
+                'max': float(maximum[position]),
+                'ewma': float(ewma[position]),
+                'last': float(last[position]),
+                'last_time': datetime.fromtimestamp(float(last_time[position])),
+                'change': self._change(position),
+                'range': self._range(position),
+            }
+        return result
+
+    def _change(self, position: int) -> Optional[float]:
+        """Return the latest minus the earliest value in a metric's change window, or None with fewer than two."""
+        values = self._window_values[position]
+        return float(values[-1] - values[0]) if len(values) > 1 else None
+
+    def _range(self, position: int) -> Optional[float]:
+        """Return the highest minus the lowest value in a metric's change window, or None with fewer than two."""
+        values = self._window_values[position]
+        return float(max(values) - min(values)) if len(values) > 1 else None
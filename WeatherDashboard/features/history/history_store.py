@@ -0,0 +1,1409 @@
+"""
+Persistent history storage backends.
+
+This module provides the pluggable persistence layer behind
+WeatherHistoryService. Observations are stored as flat rows (one per
+observation) and read back as weather data dictionaries, either as lists or
+as streaming iterators over a time range.
+
+Observations can also be read as hourly and daily rollups (min/max/mean and
+sample count per metric) so long ranges stay cheap to chart, with a
+separate retention period per tier (raw, hourly, daily).
+
+Backends:
+    SQLiteHistoryStore: Uniquely indexed on (city_key, timestamp) for flat
+        query time as history grows; batched transactional inserts that skip
+        observations already stored, rollups maintained incrementally on
+        insert, per-tier retention, legacy CSV import and CSV export
+    CSVHistoryStore: Original append-only weather_data.csv file, with a
+        CityManifest sidecar for city listing and size/age rotation into
+        gzip segments that queries read transparently
+
+Classes:
+    CityManifest: Incrementally maintained per-city summary of a history CSV
+    PendingHistoryRows: Rows queued for a store, readable before they are written
+
+Functions:
+    create_history_store: Build the backend selected in config.HISTORY
+    to_history_row: Flatten weather data into a storable row
+    from_history_row: Rebuild weather data from a stored row
+    parse_timestamp: Fixed-format timestamp decoder
+    read_csv_header: Column names of a CSV file
+    iter_csv_tail: Read a time-ordered history CSV backwards from the end
+    iter_archived_rows: Stream rows from the archived segments of a history CSV
+    rollup_bucket: Bucket start of a timestamp in a rollup tier
+    accumulate_rollups: Fold rows into per-bucket min/max/sum/count aggregates
+    accumulate_rollup_columns: Vectorized accumulate_rollups for one city's columns
+    iter_column_rows: Rows from one city's columns (the bulk append layout)
+"""
+
+from typing import Dict, List, Any, Optional, Iterator, Iterable, Callable
+from abc import ABC, abstractmethod
+from pathlib import Path
+from datetime import datetime, timedelta
+import csv
+import json
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from WeatherDashboard import config
+from WeatherDashboard.utils.logger import Logger
+from WeatherDashboard.utils.segment_archive import SegmentArchive
+
+
+# Stored metric columns and the type each is read back as
+HISTORY_FIELDS: Dict[str, type] = {
+    'temperature': float,
+    'humidity': int,
+    'pressure': float,
+    'wind_speed': float,
+    'wind_direction': float,
+    'conditions': str,
+    'feels_like': float,
+    'temp_min': float,
+    'temp_max': float,
+    'wind_gust': float,
+    'visibility': float,
+    'cloud_cover': int,
+    'rain': float,
+    'snow': float,
+    'uv_index': float,
+    'air_quality_index': int,
+}
+
+CSV_HEADERS = ['timestamp', 'city'] + list(HISTORY_FIELDS) + ['source']
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+TAIL_BLOCK_SIZE = 64 * 1024  # Bytes read per backward seek when tailing a history CSV
+
+# Rollup tiers: (timestamp prefix length, suffix completing the bucket start), finest first
+ROLLUP_TIERS: Dict[str, tuple] = {
+    'hourly': (13, ':00:00'),
+    'daily': (10, ' 00:00:00'),
+}
+HISTORY_TIERS = ('raw',) + tuple(ROLLUP_TIERS)
+ROLLUP_VERSION = 3  # Bump to rebuild stored rollups when their definition changes (3: duplicate observations removed)
+ROLLUP_FIELDS = tuple(field for field, field_type in HISTORY_FIELDS.items() if field_type is not str)
+
+
+def parse_timestamp(text: str) -> datetime:
+    """Decode a 'YYYY-MM-DD HH:MM:SS' timestamp.
+
+    Slices the fixed-width fields directly (several times faster than
+    strptime) and falls back to strptime for anything else.
+
+    Raises:
+        ValueError: If the text is not a valid timestamp
+    """
+    if len(text) == 19 and text[4] == '-' and text[7] == '-' and text[10] == ' ' and text[13] == ':' and text[16] == ':':
+        return datetime(int(text[0:4]), int(text[5:7]), int(text[8:10]),
+                        int(text[11:13]), int(text[14:16]), int(text[17:19]))
+    return datetime.strptime(text, TIMESTAMP_FORMAT)
+
+
+def read_csv_header(csv_file: Path) -> List[str]:
+    """Return the column names from a CSV file's header row."""
+    with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+        return next(csv.reader(f), [])
+
+
+def iter_csv_tail(csv_file: Path, min_timestamp: str, block_size: Optional[int] = None) -> Iterator[Dict[str, str]]:
+    """Yield history CSV rows newest first, stopping at the first row older than min_timestamp.
+
+    Rows are appended in time order, so a recent-window query only reads the
+    blocks covering that window. Timestamps are compared as fixed-format
+    strings ("2024-03-01" sorts before "2024-03-01 00:00:00"), so rows are
+    not parsed until they are known to be in range. Fields must not contain
+    embedded newlines (the history writer never produces them).
+
+    Only CSV files are read this way: CSVHistoryStore range queries (the
+    'csv' backend) and WeatherHistoryService.get_recent_data_from_csv. The
+    default SQLite backend answers the same windows from its
+    (city_key, timestamp) index and never writes weather_data.csv.
+
+    Args:
+        csv_file: History CSV with a header row and a 'timestamp' column
+        min_timestamp: Oldest timestamp (or date prefix) to include
+        block_size: Bytes to read per backward seek (defaults to TAIL_BLOCK_SIZE)
+
+    Yields:
+        Dict[str, str]: Raw CSV rows keyed by the file's header
+    """
+    with open(csv_file, 'rb') as f:
+        header_line = f.readline()
+        header_end = f.tell()
+        fieldnames = next(csv.reader([header_line.decode('utf-8')]), [])
+        if 'timestamp' not in fieldnames:
+            return
+
+        block_size = block_size or TAIL_BLOCK_SIZE
+        position = f.seek(0, os.SEEK_END)
+        remainder = b''
+        while position > header_end:
+            read_size = min(block_size, position - header_end)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b'\n')
+            # The first piece may be the end of an earlier line, unless the header has been reached
+            remainder = lines.pop(0) if position > header_end else b''
+
+            for raw_line in reversed(lines):
+                line = raw_line.rstrip(b'\r')
+                if not line:
+                    continue
+                row = dict(zip(fieldnames, next(csv.reader([line.decode('utf-8')]))))
+                if row.get('timestamp', '') < min_timestamp:
+                    return
+                yield row
+
+            if position <= header_end and not remainder:
+                return
+
+
+def iter_archived_rows(archive: SegmentArchive, min_timestamp: Optional[str] = None,
+                       max_timestamp: Optional[str] = None) -> Iterator[Dict[str, str]]:
+    """Yield rows from a history CSV's archived segments, oldest first.
+
+    Only segments whose recorded time range overlaps the bounds are opened;
+    each is decompressed as it streams.
+
+    Args:
+        archive: Segment archive of the history CSV
+        min_timestamp: Optional oldest timestamp (or date prefix) to include
+        max_timestamp: Optional newest timestamp to include
+
+    Yields:
+        Dict[str, str]: Raw CSV rows keyed by the segment's header
+    """
+    for segment in archive.segments(min_timestamp, max_timestamp):
+        with archive.open_segment(segment) as f:
+            for row in csv.DictReader(f):
+                timestamp = row.get('timestamp', '')
+                if (min_timestamp is None or timestamp >= min_timestamp) and (max_timestamp is None or timestamp <= max_timestamp):
+                    yield row
+
+
+def to_history_row(city: str, weather_data: Dict[str, Any], source: str) -> Dict[str, Any]:
+    """Flatten a weather data dictionary into a storable row.
+
+    Args:
+        city: City display name
+        weather_data: Weather data dictionary (must carry a 'date' or the current time is used)
+        source: Data source label ('api' or 'simulated')
+
+    Returns:
+        Dict[str, Any]: Row keyed by CSV_HEADERS
+    """
+    row = {
+        'timestamp': weather_data.get('date', datetime.now()).strftime(TIMESTAMP_FORMAT),
+        'city': city,
+        'source': source
+    }
+    for field in HISTORY_FIELDS:
+        row[field] = weather_data.get(field)
+    return row
+
+
+def from_history_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild a weather data dictionary from a stored row.
+
+    Args:
+        row: Row keyed by CSV_HEADERS (values may be strings, numbers, '' or None)
+
+    Returns:
+        Dict[str, Any]: Weather data with a datetime 'date' and typed metric values
+
+    Raises:
+        ValueError: If the timestamp or a metric value cannot be parsed
+    """
+    entry: Dict[str, Any] = {'date': parse_timestamp(row['timestamp'])}
+    for field, field_type in HISTORY_FIELDS.items():
+        value = row.get(field)
+        if value is None or value == '':
+            entry[field] = None
+        elif field_type is int:
+            entry[field] = int(float(value))
+        else:
+            entry[field] = field_type(value)
+    if row.get('source'):
+        entry['source'] = 'simulated' if row['source'] == 'simulated' else 'live'
+    return entry
+
+
+def rollup_bucket(timestamp: str, tier: str) -> str:
+    """Return the start of the rollup bucket holding a 'YYYY-MM-DD HH:MM:SS' timestamp.
+
+    Raises:
+        KeyError: If the tier is unknown
+    """
+    length, suffix = ROLLUP_TIERS[tier]
+    return timestamp[:length] + suffix
+
+
+def accumulate_rollups(rows: Iterable[tuple], aggregates: Dict[tuple, list]) -> None:
+    """Fold (city_key, row) pairs into rollup aggregates for every tier.
+
+    Simulated (fallback) observations are left out, so rollups only describe
+    real collected weather.
+
+    Args:
+        rows: (city_key, row) pairs with a 'timestamp' string and metric values
+            (numbers or numeric strings; blanks and non-numeric values are skipped)
+        aggregates: {(tier, city_key, bucket, metric): [min, max, sum, count]}, updated in place
+    """
+    for city_key, row in rows:
+        if row.get('source') == 'simulated':
+            continue
+        timestamp = str(row['timestamp'])
+        buckets = [(tier, rollup_bucket(timestamp, tier)) for tier in ROLLUP_TIERS]
+        for field in ROLLUP_FIELDS:
+            value = row.get(field)
+            if value is None or value == '':
+                continue
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+            for tier, bucket in buckets:
+                stats = aggregates.get((tier, city_key, bucket, field))
+                if stats is None:
+                    aggregates[(tier, city_key, bucket, field)] = [value, value, value, 1]
+                else:
+                    if value < stats[0]:
+                        stats[0] = value
+                    if value > stats[1]:
+                        stats[1] = value
+                    stats[2] += value
+                    stats[3] += 1
+
+
+def accumulate_rollup_columns(city_key: str, timestamps: np.ndarray, columns: Dict[str, np.ndarray],
+                              aggregates: Dict[tuple, list]) -> None:
+    """Fold one city's observations, given by column, into rollup aggregates for every tier.
+
+    Vectorized counterpart of accumulate_rollups: buckets are found with one
+    sort per tier and reduced per metric with NaN-aware ufuncs.
+
+    Args:
+        city_key: Canonical city key of every observation
+        timestamps: 'YYYY-MM-DD HH:MM:SS' strings
+        columns: Float metric columns keyed by field (NaN where missing; non-rollup fields are ignored)
+        aggregates: {(tier, city_key, bucket, metric): [min, max, sum, count]}, updated in place
+    """
+    timestamps = np.asarray(timestamps, dtype='U19')
+    if not len(timestamps):
+        return
+    for tier, (length, suffix) in ROLLUP_TIERS.items():
+        buckets, inverse = np.unique(timestamps.astype(f'U{length}'), return_inverse=True)
+        order = np.argsort(inverse, kind='stable')
+        starts = np.flatnonzero(np.r_[True, np.diff(inverse[order]) != 0])
+        bucket_texts = np.char.add(buckets, suffix)
+        for field in ROLLUP_FIELDS:
+            if field not in columns:
+                continue
+            values = np.asarray(columns[field], dtype=np.float64)[order]
+            valid = ~np.isnan(values)
+            counts = np.add.reduceat(valid, starts)
+            filled = np.flatnonzero(counts)
+            if not filled.size:
+                continue
+            totals = np.add.reduceat(np.where(valid, values, 0.0), starts)[filled]
+            minimums = np.fmin.reduceat(values, starts)[filled]
+            maximums = np.fmax.reduceat(values, starts)[filled]
+            for bucket, minimum, maximum, total, count in zip(bucket_texts[filled].tolist(), minimums.tolist(), maximums.tolist(),
+                                                              totals.tolist(), counts[filled].tolist()):
+                key = (tier, city_key, bucket, field)
+                stats = aggregates.get(key)
+                if stats is None:
+                    aggregates[key] = [minimum, maximum, total, count]
+                else:
+                    stats[0] = min(stats[0], minimum)
+                    stats[1] = max(stats[1], maximum)
+                    stats[2] += total
+                    stats[3] += count
+
+
+def iter_column_rows(city: str, timestamps: np.ndarray, columns: Dict[str, np.ndarray], source: str) -> Iterator[Dict[str, Any]]:
+    """Yield rows (see to_history_row) from one city's observations given by column.
+
+    Args:
+        city: City display name
+        timestamps: 'YYYY-MM-DD HH:MM:SS' strings
+        columns: Metric columns keyed by field (float arrays with NaN, or string arrays with '' for missing)
+        source: Data source label for every row
+    """
+    values = {field: _column_values(columns[field], field_type) for field, field_type in HISTORY_FIELDS.items() if field in columns}
+    for position, timestamp in enumerate(np.asarray(timestamps).tolist()):
+        row = {'timestamp': timestamp, 'city': city, 'source': source}
+        for field in HISTORY_FIELDS:
+            row[field] = values[field][position] if field in values else None
+        yield row
+
+
+def _column_values(column: np.ndarray, field_type: type) -> List[Any]:
+    """Convert a metric column to Python values, with None where missing."""
+    if field_type is str:
+        return [value if value else None for value in np.asarray(column).tolist()]
+    values = np.asarray(column, dtype=np.float64).tolist()
+    if field_type is int:
+        return [None if value != value else int(value) for value in values]
+    return [None if value != value else value for value in values]
+
+
+def _fold_pending_rollups(buckets: Dict[str, Dict[str, tuple]], city_key: str, tier: str,
+                          pending: Iterable[Dict[str, Any]], start: Optional[datetime], end: Optional[datetime]) -> None:
+    """Fold rows not yet stored into {bucket: {metric: (min, max, sum, count)}} for one tier, in place."""
+    aggregates: Dict[tuple, list] = {}
+    accumulate_rollups(((city_key, row) for row in pending), aggregates)
+    start_text = rollup_bucket(start.strftime(TIMESTAMP_FORMAT), tier) if start is not None else ''
+    end_text = end.strftime(TIMESTAMP_FORMAT) if end is not None else None
+    for (row_tier, _, bucket, field), (minimum, maximum, total, count) in aggregates.items():
+        if row_tier != tier or bucket < start_text or (end_text is not None and bucket > end_text):
+            continue
+        stored = buckets.setdefault(bucket, {}).get(field)
+        if stored is not None:
+            minimum, maximum = min(minimum, stored[0]), max(maximum, stored[1])
+            total, count = total + stored[2], count + stored[3]
+        buckets[bucket][field] = (minimum, maximum, total, count)
+
+
+def _rollup_entries(buckets: Dict[str, Dict[str, tuple]]) -> List[Dict[str, Any]]:
+    """Turn {bucket: {metric: (min, max, sum, count)}} into rollup entries in time order.
+
+    Each entry has 'date' (bucket start), 'samples' (observations in the
+    bucket), the mean under each metric's own name (so rollups chart like raw
+    entries) and '<metric>_min' / '<metric>_max'.
+    """
+    entries = []
+    for bucket in sorted(buckets):
+        entry: Dict[str, Any] = {'date': parse_timestamp(bucket), 'samples': 0}
+        for field, (minimum, maximum, total, count) in buckets[bucket].items():
+            entry[field] = total / count
+            entry[f'{field}_min'] = minimum
+            entry[f'{field}_max'] = maximum
+            entry['samples'] = max(entry['samples'], count)
+        entries.append(entry)
+    return entries
+
+
+class HistoryStore(ABC):
+    """Interface for persistent history backends.
+
+    Rows are addressed by canonical city key; timestamps are naive local
+    datetimes. ``start``/``end`` bounds are inclusive and optional. A backend
+    must implement the abstract methods before it can be instantiated.
+    """
+
+    def append(self, city_key: str, row: Dict[str, Any]) -> None:
+        """Store a single row (see to_history_row)."""
+        self.append_many([(city_key, row)])
+
+    @abstractmethod
+    def append_many(self, rows: Iterable[tuple]) -> int:
+        """Store (city_key, row) pairs, returning the number stored."""
+
+    def append_columns(self, city_key: str, city: str, timestamps: np.ndarray, columns: Dict[str, np.ndarray], source: str) -> int:
+        """Store one city's observations given by column (bulk imports), returning the number stored.
+
+        Args:
+            city_key: Canonical city key
+            city: City display name
+            timestamps: 'YYYY-MM-DD HH:MM:SS' strings
+            columns: Metric columns keyed by field (see iter_column_rows)
+            source: Data source label for every row
+        """
+        return self.append_many((city_key, row) for row in iter_column_rows(city, timestamps, columns, source))
+
+    def sync(self) -> None:
+        """Force stored rows to disk (the background writer calls this per its fsync policy; no-op by default)."""
+
+    def is_imported(self, csv_file: Path) -> bool:
+        """Return True if this exact file version was already imported (backends without tracking never skip)."""
+        return False
+
+    def record_import(self, csv_file: Path, row_count: int) -> None:
+        """Remember that a file version was imported (no-op for backends without tracking)."""
+
+    @abstractmethod
+    def iter_range(self, city_key: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Stream a city's entries in time order."""
+
+    def query_range(self, city_key: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Return a city's entries in time order."""
+        return list(self.iter_range(city_key, start, end))
+
+    def query_rollups(self, city_key: str, tier: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                      pending: Iterable[Dict[str, Any]] = ()) -> List[Dict[str, Any]]:
+        """Return a city's hourly or daily rollups whose bucket starts within the range.
+
+        The default computes them from raw entries on read; backends that
+        maintain rollups on insert override this.
+
+        Args:
+            city_key: Canonical city key
+            tier: 'hourly' or 'daily'
+            start: Optional inclusive lower bound (widened to its bucket start)
+            end: Optional inclusive upper bound on bucket starts
+            pending: The city's rows not yet stored (see to_history_row), folded into their buckets
+
+        Raises:
+            ValueError: If the tier is not a rollup tier
+        """
+        if tier not in ROLLUP_TIERS:
+            raise ValueError(f"Unknown rollup tier '{tier}'. Must be one of {tuple(ROLLUP_TIERS)}")
+        if start is not None:
+            start = parse_timestamp(rollup_bucket(start.strftime(TIMESTAMP_FORMAT), tier))
+        aggregates: Dict[tuple, list] = {}
+        accumulate_rollups(
+            ((city_key, dict(entry, timestamp=entry['date'].strftime(TIMESTAMP_FORMAT))) for entry in self.iter_range(city_key, start)),
+            aggregates
+        )
+        buckets: Dict[str, Dict[str, tuple]] = {}
+        end_text = end.strftime(TIMESTAMP_FORMAT) if end is not None else None
+        for (row_tier, _, bucket, field), stats in aggregates.items():
+            if row_tier == tier and (end_text is None or bucket <= end_text):
+                buckets.setdefault(bucket, {})[field] = tuple(stats)
+        _fold_pending_rollups(buckets, city_key, tier, pending, start, end)
+        return _rollup_entries(buckets)
+
+    def apply_retention(self, retention_days: Dict[str, Optional[int]], now: Optional[datetime] = None) -> Dict[str, int]:
+        """Delete data older than each tier's retention period (None keeps a tier forever).
+
+        Returns:
+            Dict[str, int]: Rows deleted per tier (the default backend keeps everything)
+        """
+        return {}
+
+    @abstractmethod
+    def list_cities(self) -> List[str]:
+        """Return one display name per stored city."""
+
+    @abstractmethod
+    def export_csv(self, csv_path: str) -> int:
+        """Write every stored row to a CSV file in the weather_data.csv layout, returning the row count."""
+
+    def close(self) -> None:
+        """Release backend resources."""
+
+
+# ================================
+# 1. SQLITE BACKEND
+# ================================
+class SQLiteHistoryStore(HistoryStore):
+    """Indexed SQLite history backend.
+
+    Range queries use the (city_key, timestamp) index, so their cost depends
+    on the rows returned rather than the total history size. The index is
+    unique: a row for a city and timestamp already stored is skipped, so
+    re-importing a grown or edited file only adds its new rows. A small
+    ``cities`` table is maintained on insert so city listings never scan
+    observations, and hourly/daily aggregates are upserted into ``rollups``
+    in the same transaction as the raw rows, for inserted rows only.
+
+    Attributes:
+        db_file: Path to the SQLite database
+        batch_size: Rows per insert transaction and per streamed fetch
+    """
+
+    def __init__(self, db_file: Optional[str] = None, batch_size: Optional[int] = None) -> None:
+        """Open (and create if needed) the history database.
+
+        Args:
+            db_file: Optional database path. Defaults to config.HISTORY['db_file']
+            batch_size: Optional batch size. Defaults to config.HISTORY['batch_size']
+        """
+        # Direct imports for stable utilities
+        self.logger = Logger()
+        self.config = config
+
+        self.db_file = Path(db_file or self.config.HISTORY['db_file'])
+        self.batch_size = batch_size or self.config.HISTORY['batch_size']
+
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        # Shared by UI, worker and scheduler threads; access is serialized by _lock
+        self._connection = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self._lock = threading.RLock()
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """Create tables and indexes if they do not exist."""
+        metric_columns = ", ".join(
+            f"{field} {'TEXT' if field_type is str else 'REAL'}" for field, field_type in HISTORY_FIELDS.items()
+        )
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            # Sync the WAL on every commit, so sync() has nothing left to do
+            self._connection.execute("PRAGMA synchronous=FULL")
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS observations ("
+                f"city_key TEXT NOT NULL, city TEXT NOT NULL, timestamp TEXT NOT NULL, "
+                f"{metric_columns}, source TEXT)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cities ("
+                "city_key TEXT PRIMARY KEY, city TEXT NOT NULL, first_timestamp TEXT, last_timestamp TEXT, row_count INTEGER NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS imported_files ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime REAL, row_count INTEGER, imported_at TEXT)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS rollups ("
+                "tier TEXT NOT NULL, city_key TEXT NOT NULL, bucket TEXT NOT NULL, metric TEXT NOT NULL, "
+                "min_value REAL, max_value REAL, total REAL, samples INTEGER NOT NULL, "
+                "PRIMARY KEY (tier, city_key, bucket, metric)) WITHOUT ROWID"
+            )
+            if self._connection.execute("PRAGMA user_version").fetchone()[0] < ROLLUP_VERSION:
+                self._remove_duplicates()
+                self._rebuild_rollups()
+                self._connection.execute(f"PRAGMA user_version = {ROLLUP_VERSION}")
+            self._connection.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_observations_city_timestamp ON observations (city_key, timestamp)"
+            )
+
+    def _remove_duplicates(self) -> None:
+        """Keep the first row per (city_key, timestamp) and recount city stats (databases from before the unique index)."""
+        with self._lock, self._connection:
+            self._connection.execute("DROP INDEX IF EXISTS idx_observations_city_time")
+            removed = self._connection.execute(
+                "DELETE FROM observations WHERE rowid NOT IN (SELECT MIN(rowid) FROM observations GROUP BY city_key, timestamp)"
+            ).rowcount
+            if removed:
+                self._connection.execute(
+                    "UPDATE cities SET row_count = (SELECT COUNT(*) FROM observations WHERE observations.city_key = cities.city_key)"
+                )
+                self.logger.info(f"Removed {removed} duplicate history observations")
+
+    def _rebuild_rollups(self) -> None:
+        """Recompute every rollup from the stored observations (older databases, or a new ROLLUP_VERSION)."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM rollups")
+            for tier, (length, suffix) in ROLLUP_TIERS.items():
+                for field in ROLLUP_FIELDS:
+                    self._connection.execute(
+                        f"INSERT INTO rollups SELECT ?, city_key, substr(timestamp, 1, {length}) || ?, ?, "
+                        f"MIN({field}), MAX({field}), SUM({field}), COUNT({field}) FROM observations "
+                        f"WHERE {field} IS NOT NULL AND source IS NOT 'simulated' "
+                        f"GROUP BY city_key, substr(timestamp, 1, {length})",
+                        (tier, suffix, field)
+                    )
+
+    INSERT_SQL = (
+        f"INSERT OR IGNORE INTO observations (city_key, {', '.join(CSV_HEADERS)}) "
+        f"VALUES ({', '.join('?' for _ in range(len(CSV_HEADERS) + 1))})"
+    )
+    CITIES_SQL = (
+        "INSERT INTO cities (city_key, city, first_timestamp, last_timestamp, row_count) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT(city_key) DO UPDATE SET "
+        "first_timestamp = MIN(first_timestamp, excluded.first_timestamp), "
+        "last_timestamp = MAX(last_timestamp, excluded.last_timestamp), "
+        "row_count = row_count + excluded.row_count"
+    )
+    ROLLUPS_SQL = (
+        "INSERT INTO rollups (tier, city_key, bucket, metric, min_value, max_value, total, samples) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(tier, city_key, bucket, metric) DO UPDATE SET "
+        "min_value = MIN(min_value, excluded.min_value), max_value = MAX(max_value, excluded.max_value), "
+        "total = total + excluded.total, samples = samples + excluded.samples"
+    )
+
+    def append_many(self, rows: Iterable[tuple]) -> int:
+        """Insert (city_key, row) pairs in batched transactions.
+
+        Rows whose city and timestamp are already stored are skipped; city
+        stats and rollups count only the rows actually inserted.
+
+        Args:
+            rows: Iterable of (city_key, row) pairs (see to_history_row)
+
+        Returns:
+            int: Number of rows inserted
+        """
+        insert_sql, cities_sql, rollups_sql = self.INSERT_SQL, self.CITIES_SQL, self.ROLLUPS_SQL
+        total = 0
+        batch: List[tuple] = []
+
+        def flush() -> int:
+            city_stats: Dict[str, list] = {}
+            rollups: Dict[tuple, list] = {}
+            with self._lock, self._connection:
+                for city_key, row, values in batch:
+                    if not self._connection.execute(insert_sql, values).rowcount:
+                        continue  # Already stored
+                    accumulate_rollups(((city_key, row),), rollups)
+                    timestamp = str(row['timestamp'])
+                    stats = city_stats.setdefault(city_key, [row['city'], timestamp, timestamp, 0])
+                    stats[1] = min(stats[1], timestamp)
+                    stats[2] = max(stats[2], timestamp)
+                    stats[3] += 1
+                self._connection.executemany(cities_sql, [
+                    (key, name, first, last, count) for key, (name, first, last, count) in city_stats.items()
+                ])
+                self._connection.executemany(rollups_sql, [key + tuple(stats) for key, stats in rollups.items()])
+            batch.clear()
+            return sum(stats[3] for stats in city_stats.values())
+
+        for city_key, row in rows:
+            batch.append((city_key, row, tuple([city_key] + [self._to_db_value(row.get(column)) for column in CSV_HEADERS])))
+            if len(batch) >= self.batch_size:
+                total += flush()
+        if batch:
+            total += flush()
+        return total
+
+    def append_columns(self, city_key: str, city: str, timestamps: np.ndarray, columns: Dict[str, np.ndarray], source: str) -> int:
+        """Insert one city's observations given by column in a single transaction.
+
+        Timestamps already stored for the city (or repeated within the
+        columns) are dropped first, so city stats (from the column extremes)
+        and rollups (from accumulate_rollup_columns) cover only the inserted
+        rows and nothing is aggregated row by row.
+        """
+        with self._lock, self._connection:
+            timestamps = np.asarray(timestamps, dtype='U19')
+            if not len(timestamps):
+                return 0
+            stored = [row[0] for row in self._connection.execute(
+                "SELECT timestamp FROM observations WHERE city_key = ? AND timestamp BETWEEN ? AND ?",
+                (city_key, min(timestamps.tolist()), max(timestamps.tolist()))
+            )]
+            _, first = np.unique(timestamps, return_index=True)
+            keep = np.zeros(len(timestamps), dtype=bool)
+            keep[first] = True
+            keep &= ~np.isin(timestamps, np.asarray(stored, dtype='U19'))
+            return self._insert_columns(city_key, city, timestamps[keep], {field: np.asarray(column)[keep] for field, column in columns.items()}, source)
+
+    def _insert_columns(self, city_key: str, city: str, timestamps: np.ndarray, columns: Dict[str, np.ndarray], source: str) -> int:
+        """Insert new observations given by column, with their city stats and rollups (caller holds the transaction)."""
+        count = len(timestamps)
+        if not count:
+            return 0
+        values = []
+        timestamp_texts = timestamps.tolist()
+        for column in CSV_HEADERS:
+            if column == 'timestamp':
+                values.append(timestamp_texts)
+            elif column in ('city', 'source'):
+                values.append([city if column == 'city' else source] * count)
+            elif column in columns:
+                values.append(_column_values(columns[column], HISTORY_FIELDS[column]))
+            else:
+                values.append([None] * count)
+
+        rollups: Dict[tuple, list] = {}
+        if source != 'simulated':
+            accumulate_rollup_columns(city_key, timestamps, columns, rollups)
+        self._connection.executemany(self.INSERT_SQL, zip([city_key] * count, *values))
+        self._connection.execute(self.CITIES_SQL, (city_key, city, min(timestamp_texts), max(timestamp_texts), count))
+        self._connection.executemany(self.ROLLUPS_SQL, [key + tuple(stats) for key, stats in rollups.items()])
+        return count
+
+    def is_imported(self, csv_file: Path) -> bool:
+        """Return True if this file, at its current size and mtime, was already imported.
+
+        A changed file is imported again; rows already stored are skipped on insert.
+        """
+        stat = Path(csv_file).stat()
+        with self._lock:
+            previous = self._connection.execute(
+                "SELECT size, mtime FROM imported_files WHERE path = ?", (str(Path(csv_file).resolve()),)
+            ).fetchone()
+        return previous == (stat.st_size, stat.st_mtime)
+
+    def record_import(self, csv_file: Path, row_count: int) -> None:
+        """Remember a file's current size and mtime so an unchanged file is not imported twice."""
+        stat = Path(csv_file).stat()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO imported_files (path, size, mtime, row_count, imported_at) VALUES (?, ?, ?, ?, ?)",
+                (str(Path(csv_file).resolve()), stat.st_size, stat.st_mtime, row_count, datetime.now().strftime(TIMESTAMP_FORMAT))
+            )
+
+    @staticmethod
+    def _to_db_value(value: Any) -> Any:
+        """Store empty CSV cells as NULL."""
+        return None if value == '' else value
+
+    def iter_range(self, city_key: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Stream a city's entries in time order, fetching batch_size rows at a time.
+
+        Args:
+            city_key: Canonical city key
+            start: Optional inclusive lower bound
+            end: Optional inclusive upper bound
+
+        Yields:
+            Dict[str, Any]: Weather data entries
+        """
+        # Keyset pagination: each batch is a short indexed query, so no cursor stays open across yields
+        sql = f"SELECT rowid, {', '.join(CSV_HEADERS)} FROM observations WHERE city_key = ? AND (timestamp, rowid) > (?, ?)"
+        params: List[Any] = []
+        if end is not None:
+            sql += " AND timestamp <= ?"
+            params.append(end.strftime(TIMESTAMP_FORMAT))
+        sql += " ORDER BY timestamp, rowid LIMIT ?"
+
+        last_timestamp = start.strftime(TIMESTAMP_FORMAT) if start is not None else ''
+        last_rowid = -1
+        while True:
+            with self._lock:
+                rows = self._connection.execute(sql, [city_key, last_timestamp, last_rowid] + params + [self.batch_size]).fetchall()
+            for rowid, *values in rows:
+                yield from_history_row(dict(zip(CSV_HEADERS, values)))
+            if len(rows) < self.batch_size:
+                break
+            last_rowid, last_timestamp = rows[-1][0], rows[-1][1]
+
+    def list_cities(self) -> List[str]:
+        """Return one display name per stored city from the cities table."""
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT city FROM cities ORDER BY city_key")]
+
+    def get_city_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-city first/last timestamps and row counts keyed by city key."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT city_key, city, first_timestamp, last_timestamp, row_count FROM cities"
+            ).fetchall()
+        return {
+            key: {'city': city, 'first_timestamp': first, 'last_timestamp': last, 'row_count': count}
+            for key, city, first, last, count in rows
+        }
+
+    def query_rollups(self, city_key: str, tier: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                      pending: Iterable[Dict[str, Any]] = ()) -> List[Dict[str, Any]]:
+        """Return a city's stored hourly or daily rollups whose bucket starts within the range.
+
+        Rows in ``pending`` (not yet stored) are folded into their buckets,
+        except those the insert will skip as already stored.
+
+        Raises:
+            ValueError: If the tier is not a rollup tier
+        """
+        if tier not in ROLLUP_TIERS:
+            raise ValueError(f"Unknown rollup tier '{tier}'. Must be one of {tuple(ROLLUP_TIERS)}")
+        sql = "SELECT bucket, metric, min_value, max_value, total, samples FROM rollups WHERE tier = ? AND city_key = ?"
+        params: List[Any] = [tier, city_key]
+        if start is not None:
+            sql += " AND bucket >= ?"
+            params.append(rollup_bucket(start.strftime(TIMESTAMP_FORMAT), tier))
+        if end is not None:
+            sql += " AND bucket <= ?"
+            params.append(end.strftime(TIMESTAMP_FORMAT))
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+
+        buckets: Dict[str, Dict[str, tuple]] = {}
+        for bucket, field, minimum, maximum, total, samples in rows:
+            buckets.setdefault(bucket, {})[field] = (minimum, maximum, total, samples)
+        _fold_pending_rollups(buckets, city_key, tier, self._unstored(city_key, pending), start, end)
+        return _rollup_entries(buckets)
+
+    def _unstored(self, city_key: str, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return the rows an insert would keep: the first per timestamp, and none already stored."""
+        rows = list(rows)
+        if not rows:
+            return rows
+        timestamps = [str(row['timestamp']) for row in rows]
+        with self._lock:
+            seen = {row[0] for row in self._connection.execute(
+                f"SELECT timestamp FROM observations WHERE city_key = ? AND timestamp IN ({', '.join('?' for _ in timestamps)})",
+                [city_key] + timestamps
+            )}
+        unstored = []
+        for timestamp, row in zip(timestamps, rows):
+            if timestamp not in seen:
+                seen.add(timestamp)
+                unstored.append(row)
+        return unstored
+
+    def apply_retention(self, retention_days: Dict[str, Optional[int]], now: Optional[datetime] = None) -> Dict[str, int]:
+        """Delete raw rows and rollups older than each tier's retention period.
+
+        Deletes run per city so they use the (city_key, timestamp) and rollup
+        primary-key indexes. City stats keep describing the raw rows that remain.
+
+        Args:
+            retention_days: Days to keep per tier ('raw', 'hourly', 'daily'); None keeps a tier forever
+            now: Optional reference time (defaults to now)
+
+        Returns:
+            Dict[str, int]: Rows deleted per tier
+        """
+        now = now or datetime.now()
+        deleted: Dict[str, int] = {}
+        with self._lock, self._connection:
+            city_keys = [row[0] for row in self._connection.execute("SELECT city_key FROM cities")]
+            for tier in HISTORY_TIERS:
+                days = retention_days.get(tier)
+                if days is None:
+                    continue
+                cutoff = (now - timedelta(days=days)).strftime(TIMESTAMP_FORMAT)
+                deleted[tier] = 0
+                for city_key in city_keys:
+                    if tier == 'raw':
+                        count = self._connection.execute(
+                            "DELETE FROM observations WHERE city_key = ? AND timestamp < ?", (city_key, cutoff)
+                        ).rowcount
+                        if count:
+                            self._connection.execute(
+                                "UPDATE cities SET row_count = row_count - ?, "
+                                "first_timestamp = (SELECT MIN(timestamp) FROM observations WHERE city_key = ?) "
+                                "WHERE city_key = ?", (count, city_key, city_key)
+                            )
+                    else:
+                        count = self._connection.execute(
+                            "DELETE FROM rollups WHERE tier = ? AND city_key = ? AND bucket < ?",
+                            (tier, city_key, rollup_bucket(cutoff, tier))
+                        ).rowcount
+                    deleted[tier] += count
+        return deleted
+
+    def import_csv(self, csv_path: str, key_func: Callable[[str], str]) -> int:
+        """Import a weather_data.csv file, skipping it if already imported unchanged.
+
+        A file that has changed since its last import adds only the rows not
+        stored yet.
+
+        Args:
+            csv_path: Path to a CSV in the weather_data.csv layout
+            key_func: Maps the CSV's city names to canonical city keys
+
+        Returns:
+            int: Number of rows imported (0 if skipped or unreadable)
+        """
+        csv_file = Path(csv_path)
+        if not csv_file.exists() or self.is_imported(csv_file):
+            return 0
+
+        city_keys: Dict[str, str] = {}  # Resolve each distinct spelling once
+
+        def rows() -> Iterator[tuple]:
+            with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+                for row in csv.DictReader(f):
+                    city = row.get('city')
+                    if not city or not row.get('timestamp'):
+                        continue
+                    if city not in city_keys:
+                        try:
+                            city_keys[city] = key_func(city)
+                        except ValueError:
+                            city_keys[city] = city
+                    yield city_keys[city], {column: row.get(column) for column in CSV_HEADERS}
+
+        try:
+            imported = self.append_many(rows())
+        except (OSError, csv.Error, sqlite3.Error) as e:
+            self.logger.error(f"Failed to import history CSV {csv_file}: {e}")
+            return 0
+
+        self.record_import(csv_file, imported)
+        self.logger.info(f"Imported {imported} history rows from {csv_file}")
+        return imported
+
+    def export_csv(self, csv_path: str) -> int:
+        """Write every stored row to a CSV in the weather_data.csv layout.
+
+        Args:
+            csv_path: Destination file path (overwritten)
+
+        Returns:
+            int: Number of rows written
+        """
+        destination = Path(csv_path)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+
+        sql = f"SELECT rowid, {', '.join(CSV_HEADERS)} FROM observations WHERE rowid > ? ORDER BY rowid LIMIT ?"
+        written = 0
+        last_rowid = -1
+        with open(destination, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADERS)
+            while True:
+                with self._lock:
+                    rows = self._connection.execute(sql, (last_rowid, self.batch_size)).fetchall()
+                if not rows:
+                    break
+                writer.writerows(['' if value is None else value for value in values] for _, *values in rows)
+                written += len(rows)
+                last_rowid = rows[-1][0]
+        return written
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+# ================================
+# 2. CSV CITY MANIFEST
+# ================================
+class CityManifest:
+    """Sidecar summary of the cities in a history CSV.
+
+    Keeps, per canonical city key, a display name, first/last timestamps and
+    a row count in ``<csv name>.cities.json``, together with the CSV size and
+    first data row it describes. Appends update it incrementally; rows added
+    by another writer are caught up by reading only the bytes past the
+    recorded size. A missing or corrupt manifest, or a CSV that shrank or was
+    rewritten, triggers a full rebuild.
+
+    Used by the CSV backend only (HISTORY['backend'] 'csv'). The default
+    SQLite backend keeps the same per-city summary in its ``cities`` table,
+    updated in the insert transaction.
+
+    Attributes:
+        csv_file: History CSV being summarized
+        manifest_file: Sidecar JSON path
+        key_func: Maps stored city names to canonical city keys
+    """
+
+    VERSION = 1
+
+    def __init__(self, csv_file: Path, key_func: Callable[[str], str], manifest_file: Optional[Path] = None) -> None:
+        """Initialize the manifest (nothing is read until first use).
+
+        Args:
+            csv_file: History CSV being summarized
+            key_func: Maps stored city names to canonical city keys
+            manifest_file: Optional sidecar path. Defaults to <csv stem>.cities.json beside the CSV
+        """
+        # Direct imports for stable utilities
+        self.logger = Logger()
+
+        self.csv_file = Path(csv_file)
+        self.manifest_file = Path(manifest_file) if manifest_file else self.csv_file.with_name(f"{self.csv_file.stem}.cities.json")
+        self.key_func = key_func
+
+        # Internal state
+        self._lock = threading.RLock()
+        self._cities: Dict[str, Dict[str, Any]] = {}
+        self._csv_size: Optional[int] = None  # Bytes of the CSV covered by _cities (None = not loaded)
+        self._csv_head = ''                   # First data row, to detect a rewritten file
+
+    def get_city_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return {city_key: {'city', 'first_timestamp', 'last_timestamp', 'row_count'}}."""
+        with self._lock:
+            self.refresh()
+            return {key: dict(entry) for key, entry in self._cities.items()}
+
+    def get(self, city_key: str) -> Optional[Dict[str, Any]]:
+        """Return one city's summary, or None if the CSV has no rows for it."""
+        with self._lock:
+            self.refresh()
+            entry = self._cities.get(city_key)
+            return dict(entry) if entry else None
+
+    def list_cities(self) -> List[str]:
+        """Return one display name per city (merging keys that now resolve to the same city)."""
+        with self._lock:
+            self.refresh()
+            names = [entry['city'] for entry in self._cities.values()]
+        cities: Dict[str, str] = {}
+        for name in names:
+            cities.setdefault(self._key(name), name)
+        return list(cities.values())
+
+    def record(self, rows: List[Dict[str, Any]], size_before: int, size_after: int) -> None:
+        """Fold rows just appended to the CSV into the manifest and save it.
+
+        Args:
+            rows: Rows written by the append
+            size_before: CSV size before the append
+            size_after: CSV size after the append
+        """
+        with self._lock:
+            if self._csv_size is None:
+                self._load()
+            if self._csv_size != size_before:
+                self.refresh()  # Out of sync (other writer or first use): catch up from disk
+                return
+            if size_before == 0:
+                self._csv_head = self._read_head()
+            self._apply(rows)
+            self._csv_size = size_after
+            self._save()
+
+    def refresh(self) -> None:
+        """Bring the manifest up to date with the CSV, rebuilding it if it cannot be trusted."""
+        with self._lock:
+            size = self.csv_file.stat().st_size if self.csv_file.exists() else 0
+            if self._csv_size is None:
+                self._load()
+            if self._csv_size == size and (size == 0 or self._csv_head == self._read_head()):
+                return
+            if self._csv_size is None or size < self._csv_size or self._csv_head != self._read_head():
+                self.rebuild()
+                return
+            try:
+                self._scan(self._csv_size)
+            except (OSError, UnicodeDecodeError, csv.Error, ValueError) as e:
+                self.logger.warn(f"City manifest catch-up failed, rebuilding: {e}")
+                self.rebuild()
+                return
+            self._save()
+
+    def rebuild(self) -> None:
+        """Rebuild the manifest with a full scan of the CSV."""
+        with self._lock:
+            self._cities = {}
+            self._csv_size = 0
+            self._csv_head = self._read_head()
+            if self.csv_file.exists():
+                try:
+                    self._scan(0)
+                except (OSError, UnicodeDecodeError, csv.Error, ValueError) as e:
+                    self.logger.error(f"Failed to rebuild city manifest from {self.csv_file}: {e}")
+                    self._cities = {}
+                    self._csv_size = None  # Try again on next use
+                    return
+            self._save()
+
+    def _key(self, city: str) -> str:
+        """Canonical key for a stored city name (the name itself if it cannot be keyed)."""
+        try:
+            return self.key_func(city)
+        except ValueError:
+            return city
+
+    def _apply(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Fold rows into the per-city summaries."""
+        keys: Dict[str, str] = {}
+        for row in rows:
+            city = row.get('city')
+            timestamp = str(row.get('timestamp') or '')
+            if not city:
+                continue
+            if city not in keys:
+                keys[city] = self._key(city)
+            entry = self._cities.get(keys[city])
+            if entry is None:
+                self._cities[keys[city]] = {'city': city, 'first_timestamp': timestamp, 'last_timestamp': timestamp, 'row_count': 1}
+                continue
+            entry['row_count'] += 1
+            if timestamp and (not entry['first_timestamp'] or timestamp < entry['first_timestamp']):
+                entry['first_timestamp'] = timestamp
+            if timestamp > entry['last_timestamp']:
+                entry['last_timestamp'] = timestamp
+
+    def _scan(self, offset: int) -> None:
+        """Fold CSV rows from a byte offset (0 = whole file) into the summaries."""
+        fieldnames = read_csv_header(self.csv_file)
+        with open(self.csv_file, 'rb') as f:
+            if offset:
+                f.seek(offset - 1)
+                if f.read(1) != b'\n':
+                    raise ValueError(f"recorded size {offset} is not at a row boundary")
+            else:
+                f.readline()  # Header
+            text = f.read().decode('utf-8')
+            self._csv_size = f.tell()
+        self._apply(csv.DictReader(text.splitlines(), fieldnames=fieldnames))
+
+    def _read_head(self) -> str:
+        """Return the first data row of the CSV ('' if there is none)."""
+        if not self.csv_file.exists():
+            return ''
+        try:
+            with open(self.csv_file, 'rb') as f:
+                f.readline()
+                return f.readline().decode('utf-8', errors='replace').rstrip('\r\n')
+        except OSError:
+            return ''
+
+    def _load(self) -> None:
+        """Load the saved manifest, leaving it unloaded (to be rebuilt) if missing or corrupt."""
+        if not self.manifest_file.exists():
+            return
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+            if payload.get('version') != self.VERSION:
+                raise ValueError(f"unsupported version {payload.get('version')}")
+            cities = payload['cities']
+            for entry in cities.values():
+                if not isinstance(entry['city'], str) or not isinstance(entry['row_count'], int):
+                    raise ValueError("malformed city entry")
+            self._cities = cities
+            self._csv_size = int(payload['csv_size'])
+            self._csv_head = str(payload.get('csv_head', ''))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            self.logger.warn(f"Rebuilding unreadable city manifest {self.manifest_file}: {e}")
+            self._cities = {}
+            self._csv_size = None
+
+    def _save(self) -> None:
+        """Atomically write the manifest (failures are logged; the CSV stays authoritative)."""
+        payload = {'version': self.VERSION, 'csv_size': self._csv_size, 'csv_head': self._csv_head, 'cities': self._cities}
+        try:
+            self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.manifest_file.with_suffix('.json.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(temp_file, self.manifest_file)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warn(f"Failed to save city manifest {self.manifest_file}: {e}")
+
+
+# ================================
+# 3. CSV BACKEND
+# ================================
+class CSVHistoryStore(HistoryStore):
+    """Append-only CSV history backend (the original weather_data.csv layout).
+
+    Range queries with a start bound read the file backwards from the end
+    (iter_csv_tail); other queries scan the whole file. City listing and
+    stats come from the CityManifest sidecar. When the file reaches the
+    config.ARCHIVE size or age limit, ``rotate_if_needed`` moves it into a
+    gzip segment; queries reaching back past the active file stream the
+    overlapping segments first. Kept for deployments that want a plain text
+    history file.
+
+    Attributes:
+        csv_file: Path to the history CSV
+        key_func: Maps stored city names to canonical city keys
+        manifest: Per-city summary of the active CSV
+        archive: Compressed segments rotated out of the CSV
+    """
+
+    def __init__(self, key_func: Callable[[str], str], csv_file: Optional[str] = None, archive_dir: Optional[str] = None) -> None:
+        """Initialize the CSV backend.
+
+        Args:
+            key_func: Maps stored city names to canonical city keys
+            csv_file: Optional CSV path. Defaults to OUTPUT['csv_dir']/OUTPUT['csv_filename']
+            archive_dir: Optional segment directory. Defaults to OUTPUT['csv_backup_dir'],
+                or a 'backup' directory beside a custom csv_file
+        """
+        # Direct imports for stable utilities
+        self.logger = Logger()
+        self.config = config
+
+        self.key_func = key_func
+        self.csv_file = Path(csv_file) if csv_file else Path(self.config.OUTPUT["csv_dir"]) / self.config.OUTPUT["csv_filename"]
+        if archive_dir is None:
+            archive_dir = self.csv_file.parent / "backup" if csv_file else self.config.OUTPUT["csv_backup_dir"]
+        self.manifest = CityManifest(self.csv_file, key_func)
+        self.archive = SegmentArchive(self.csv_file, Path(archive_dir))
+        self._lock = threading.Lock()
+
+    def append_many(self, rows: Iterable[tuple]) -> int:
+        """Append rows to the CSV, writing the header for a new file."""
+        rows = [row for _, row in rows]
+        if not rows:
+            return 0
+        with self._lock:
+            self.csv_file.parent.mkdir(parents=True, exist_ok=True)
+            size_before = self.csv_file.stat().st_size if self.csv_file.exists() else 0
+            with open(self.csv_file, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
+                if not size_before:
+                    writer.writeheader()
+                writer.writerows(rows)
+            self.manifest.record(rows, size_before, self.csv_file.stat().st_size)
+        return len(rows)
+
+    def sync(self) -> None:
+        """Fsync the active CSV."""
+        with self._lock:
+            if not self.csv_file.exists():
+                return
+            fd = os.open(self.csv_file, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def rotate_if_needed(self, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """Archive the active CSV as a compressed segment if it reached its size or age limit.
+
+        The segment records the file's time range and per-city stats, so
+        listings and range queries keep covering archived rows.
+
+        Returns:
+            Optional[Dict[str, Any]]: The new segment's manifest entry, or None if no rotation was due
+        """
+        with self._lock:
+            if not self.archive.should_rotate(now):
+                return None
+            stats = self.manifest.get_city_stats()
+            summary: Dict[str, Any] = {'cities': stats, 'rows': sum(entry['row_count'] for entry in stats.values())}
+            if stats:
+                summary['first_timestamp'] = min(entry['first_timestamp'] for entry in stats.values())
+                summary['last_timestamp'] = max(entry['last_timestamp'] for entry in stats.values())
+            segment = self.archive.rotate(summary, now)
+            self.manifest.rebuild()
+            return segment
+
+    def _iter_rows(self) -> Iterator[Dict[str, str]]:
+        """Stream raw rows from every archived segment, then the active CSV."""
+        yield from iter_archived_rows(self.archive)
+        if not self.csv_file.exists():
+            return
+        with open(self.csv_file, 'r', encoding='utf-8', newline='') as f:
+            yield from csv.DictReader(f)
+
+    def _iter_rows_since(self, start: Optional[datetime]) -> Iterator[Dict[str, str]]:
+        """Stream raw rows in time order, reading only overlapping segments and the tail of the active file."""
+        if start is None:
+            yield from self._iter_rows()
+            return
+        min_timestamp = start.strftime(TIMESTAMP_FORMAT)
+        yield from iter_archived_rows(self.archive, min_timestamp)
+        if self.csv_file.exists():
+            # Tail rows arrive newest first; the window is bounded by the query, so reversing it is cheap
+            yield from reversed(list(iter_csv_tail(self.csv_file, min_timestamp)))
+
+    def iter_range(self, city_key: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Stream a city's entries (a tail read when a start bound is given, otherwise a full scan)."""
+        city_keys: Dict[str, str] = {}
+        for row in self._iter_rows_since(start):
+            city = row.get('city')
+            if not city:
+                continue
+            if city not in city_keys:
+                try:
+                    city_keys[city] = self.key_func(city)
+                except ValueError:
+                    city_keys[city] = city
+            if city_keys[city] != city_key:
+                continue
+            try:
+                entry = from_history_row(row)
+            except (ValueError, KeyError) as e:
+                self.logger.warn(f"Skipping unreadable history row for {city}: {e}")
+                continue
+            if (start is None or entry['date'] >= start) and (end is None or entry['date'] <= end):
+                yield entry
+
+    def list_cities(self) -> List[str]:
+        """Return one display name per stored city from the manifest and archived segment summaries."""
+        cities: Dict[str, str] = {}
+        for entry in self.get_city_stats().values():
+            try:
+                key = self.key_func(entry['city'])
+            except ValueError:
+                key = entry['city']
+            cities.setdefault(key, entry['city'])
+        return list(cities.values())
+
+    def get_city_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-city first/last timestamps and row counts keyed by city key, across segments and the active CSV."""
+        combined: Dict[str, Dict[str, Any]] = {}
+        sources = [segment.get('cities') or {} for segment in self.archive.segments()] + [self.manifest.get_city_stats()]
+        for stats in sources:
+            for key, entry in stats.items():
+                current = combined.get(key)
+                if current is None:
+                    combined[key] = dict(entry)
+                    continue
+                current['row_count'] += entry['row_count']
+                current['first_timestamp'] = min(current['first_timestamp'], entry['first_timestamp'])
+                current['last_timestamp'] = max(current['last_timestamp'], entry['last_timestamp'])
+        return combined
+
+    def export_csv(self, csv_path: str) -> int:
+        """Copy the history rows (archived segments included) to another CSV file."""
+        destination = Path(csv_path)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        written = 0
+        with open(destination, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_HEADERS, extrasaction='ignore')
+            writer.writeheader()
+            for row in self._iter_rows():
+                writer.writerow(row)
+                written += 1
+        return written
+
+
+def create_history_store(key_func: Callable[[str], str], backend: Optional[str] = None) -> HistoryStore:
+    """Build the history backend selected in config.HISTORY['backend'].
+
+    Args:
+        key_func: Maps city names to canonical city keys
+        backend: Optional override ('sqlite' or 'csv')
+
+    Returns:
+        HistoryStore: Configured backend
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    backend = backend or config.HISTORY['backend']
+    if backend == 'sqlite':
+        return SQLiteHistoryStore()
+    if backend == 'csv':
+        return CSVHistoryStore(key_func)
+    raise ValueError(f"Unknown history backend '{backend}'. Must be 'sqlite' or 'csv'")
+
+
+# ================================
+# 4. ROWS QUEUED FOR A STORE
+# ================================
+class PendingHistoryRows:
+    """Rows queued for a history store but not yet written, readable without waiting for the writer.
+
+    The background writer is handed this object in place of the store: its
+    ``append_many`` writes through to the store and drops the rows from the
+    pending tail under the same lock ``read`` holds. A reader therefore sees
+    every row exactly once, in the store or in the tail, without flushing
+    the writer's queue.
+
+    Attributes:
+        get_store: Returns the history store rows are written to (looked up per write,
+            so the owner can swap its backend)
+    """
+
+    def __init__(self, get_store: Callable[[], HistoryStore]) -> None:
+        """Track rows queued for the store returned by ``get_store``."""
+        self.get_store = get_store
+
+        # Internal state
+        self._rows: Dict[str, List[Dict[str, Any]]] = {}  # City key -> queued rows, oldest first
+        self._lock = threading.Lock()
+
+    def add(self, rows: Iterable[tuple]) -> None:
+        """Record (city_key, row) pairs about to be queued for the store."""
+        with self._lock:
+            for city_key, row in rows:
+                self._rows.setdefault(city_key, []).append(row)
+
+    def append_many(self, rows: Iterable[tuple]) -> int:
+        """Store queued (city_key, row) pairs and drop them from the tail (called by the writer, in queue order)."""
+        rows = list(rows)
+        counts: Dict[str, int] = {}
+        for city_key, _ in rows:
+            counts[city_key] = counts.get(city_key, 0) + 1
+        with self._lock:
+            try:
+                return self.get_store().append_many(rows)
+            finally:
+                # Failed rows are dropped too: the writer has reported them and will not retry
+                for city_key, count in counts.items():
+                    queued = self._rows.get(city_key, [])
+                    del queued[:count]
+                    if not queued:
+                        self._rows.pop(city_key, None)
+
+    def sync(self) -> None:
+        """Force the store's written rows to disk."""
+        self.get_store().sync()
+
+    def read(self, city_key: Optional[str], query: Callable[[List[Dict[str, Any]]], Any]) -> Any:
+        """Run a store query against a consistent snapshot of the queued rows.
+
+        Args:
+            city_key: City whose queued rows to pass (None for every city's)
+            query: Called with the queued rows, oldest first per city; it reads the store
+                while no queued row can be written, so none is seen twice or missed
+
+        Returns:
+            Any: The query's result
+        """
+        with self._lock:
+            if city_key is None:
+                rows = [row for queued in self._rows.values() for row in queued]
+            else:
+                rows = list(self._rows.get(city_key, ()))
+            return query(rows)
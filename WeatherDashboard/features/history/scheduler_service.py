@@ -4,38 +4,93 @@ Weather Data Collection Scheduler
 Automatically collects weather data at configurable intervals to support
 24/7 weather monitoring and historical data building. Integrates with
 history service for data storage and memory management.
+
+Scheduled cities are the default city, the display city and a persisted
+watchlist of any number of cities, each with its own interval. A min-heap
+keyed on next-due time holds one entry per city; the loop sleeps until the
+earliest one, dispatches every city then due and pushes each back one
+interval after its own fetch finishes. Cities entering the schedule together are spread evenly
+across their interval (with a random phase), so requests arrive at a
+steady rate instead of in bursts. Watchlist changes wake the loop, which
+reconciles the heap without restarting.
+
+Each collection cycle fans its cities out over a bounded worker pool
+(SCHEDULER['max_workers']) and the loop returns to the heap at once;
+finished fetches wake it to handle their results, so one slow or hanging
+city never holds up cities due later. Fetches still running at
+SCHEDULER['cycle_deadline_seconds'] are cancelled and treated as timed
+out; a city whose earlier fetch has not finished is not fetched again.
+Each city's ticks stay on a fixed grid: when its fetch overruns its next
+tick, that tick is skipped or merged into one immediate catch-up fetch
+(SCHEDULER['overlap_policy']). Per-cycle timings are kept for status display.
+
+A city whose fetch fails or times out is pushed back onto the heap alone,
+SCHEDULER['retry_delay_seconds'] later (growing by 'retry_backoff' per
+attempt), without delaying any other city. After 'retry_attempts' failed
+retries it gives up and returns to its regular interval grid.
+
+After each fetch a city's next interval adapts to its conditions
+(SCHEDULER['adaptive']): it shrinks while its rolling statistics show
+conditions changing fast (falling pressure, temperature swings) or an alert
+threshold crossed, and stretches while conditions are stable. Intervals are also
+stretched by SCHEDULER['quiet_hours']['interval_multiplier'] during quiet hours.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple, List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
+import heapq
+import itertools
+import random
 import threading
+import time
 
 from WeatherDashboard import config
 from WeatherDashboard.utils.logger import Logger
+from WeatherDashboard.utils.state_utils import StateUtils
+from WeatherDashboard.utils.utils import Utils
 from WeatherDashboard.core.view_models import WeatherViewModel
 
 from .history_service import WeatherHistoryService
+from .watchlist import Watchlist
+
 
+# Alert types checked for adaptive intervals: alert type -> history field
+ALERT_FIELDS = {
+    'temperature_high': 'temperature',
+    'temperature_low': 'temperature',
+    'wind_speed_high': 'wind_speed',
+    'pressure_low': 'pressure',
+    'heavy_rain': 'rain',
+    'heavy_snow': 'snow',
+}
 
 class WeatherDataScheduler:
     """Manages automatic weather data collection for 24/7 monitoring.
     
-    Provides scheduled data collection for both default and display cities,
-    with error handling, status tracking, and UI integration.
+    Provides scheduled data collection for the default city, the display
+    city and watchlist cities, with error handling, status tracking, and UI
+    integration.
     
     Attributes:
         history_service: Service for data storage and retrieval
         data_manager: Service for data fetching and processing
         state_manager: Application state manager
         ui_handler: UI update handler
+        watchlist: Persisted watched cities with per-city intervals
         enabled: Whether scheduler is currently enabled
         is_running: Whether scheduler thread is active
-        next_fetch_time: Timestamp of next scheduled fetch
+        next_fetch_time: Timestamp of the earliest scheduled fetch
         error_counts: Track consecutive errors per city
+        city_intervals: Adapted interval in minutes applied after each city's last fetch
+        cycle_history: Timing records of the most recent collection cycles, oldest first
+        last_cycle: Timing record of the latest collection cycle (None before the first)
+        overrun_ticks: Ticks skipped or merged because a cycle ran past them
     """
     
     def __init__(self, history_service: WeatherHistoryService, data_manager: Any,
-                 state_manager: Any, ui_handler: Any):
+                 state_manager: Any, ui_handler: Any, watchlist: Optional[Watchlist] = None):
         """Initialize the weather data scheduler.
         
         Args:
@@ -43,16 +98,20 @@ class WeatherDataScheduler:
             data_manager: Service for data fetching and processing
             state_manager: Application state manager for current city/unit info
             ui_handler: UI update handler for display updates
+            watchlist: Optional watchlist (defaults to the one persisted at OUTPUT['watchlist_file'])
         """
         # Direct imports for stable utilities
         self.logger = Logger()
         self.config = config
+        self.state_utils = StateUtils()
+        self.utils = Utils()
         
         # Injected dependencies for testable components
         self.history_service = history_service
         self.data_manager = data_manager
         self.state_manager = state_manager
         self.ui_handler = ui_handler
+        self.watchlist = watchlist if watchlist is not None else Watchlist(self._city_key)
         
         # Scheduler state
         self.enabled = self.config.SCHEDULER["enabled"]
@@ -61,18 +120,40 @@ class WeatherDataScheduler:
         self.error_threshold = self.config.SCHEDULER["error_threshold"]
         self.retry_attempts = self.config.SCHEDULER["retry_attempts"]
         self.retry_delay_seconds = self.config.SCHEDULER["retry_delay_seconds"]
+        self.retry_backoff = self.config.SCHEDULER["retry_backoff"]
         self.quiet_hours = self.config.SCHEDULER["quiet_hours"]
+        self.max_workers = self.config.SCHEDULER["max_workers"]
+        self.cycle_deadline_seconds = self.config.SCHEDULER["cycle_deadline_seconds"]
+        self.overlap_policy = self.config.SCHEDULER["overlap_policy"]
+        self.adaptive = self.config.SCHEDULER["adaptive"]
         
         # Threading
         self.scheduler_thread = None
         self.stop_event = threading.Event()
         self.is_running = False
+        self._pool: Optional[ThreadPoolExecutor] = None  # Fetch workers, created on first use
+        self._in_flight: set = set()                      # City keys with a fetch still running
+        self._in_flight_lock = threading.Lock()
+        self._cycles: List[Dict[str, Any]] = []           # Dispatched cycles with fetches not yet handled
+        self._wakeup = threading.Event()                  # Set to make the loop re-check its schedule now
+        
+        # Schedule (touched only by the scheduler loop)
+        self._due_heap: List[tuple] = []                  # (due time, sequence, city key), lazily corrected
+        self._due: Dict[str, datetime] = {}               # City key -> due time of its live heap entry
+        self._targets: Dict[str, Tuple[str, float]] = {}  # City key -> (name, interval minutes) being scheduled
+        self._retries: Dict[str, Tuple[int, datetime]] = {}  # City key -> (retries so far, regular tick being retried)
+        self._sequence = itertools.count()
+        self._random = random.Random()
         
         # Status tracking
         self.next_fetch_time = None
         self.error_counts = {}
         self.last_fetch_time = None
         self.fetch_count = 0
+        self.cycle_history = deque(maxlen=self.config.SCHEDULER["cycle_history_size"])
+        self.last_cycle: Optional[Dict[str, Any]] = None
+        self.overrun_ticks = 0
+        self.city_intervals: Dict[str, float] = {}  # City key -> interval (minutes) applied after its last fetch
 
     def start_scheduler(self) -> None:
         """Start the automatic data collection scheduler."""
@@ -81,11 +162,12 @@ class WeatherDataScheduler:
             
         self.enabled = True
         self.stop_event.clear()
+        self._wakeup.clear()
         self.is_running = True
 
-        # Set initial next fetch time if not already set
-        if not self.next_fetch_time:
-            self.next_fetch_time = datetime.now() + timedelta(minutes=self.interval_minutes)
+        # Spread every city afresh over its interval rather than bursting overdue ones
+        self._due_heap, self._due, self._targets, self._retries = [], {}, {}, {}
+        self._cycles = []
         
         self.scheduler_thread = threading.Thread(target=self._scheduler_loop, daemon=True)
         self.scheduler_thread.start()
@@ -104,13 +186,21 @@ class WeatherDataScheduler:
         # Stop countdown timer
         self._stop_countdown_timer()
         
-        # Signal the scheduler thread to stop
+        # Signal the scheduler thread to stop and abandon fetches in progress
         if hasattr(self, 'stop_event'):
             self.stop_event.set()
+        self._wakeup.set()
+        for cycle in list(self._cycles):
+            cycle['cancel_event'].set()
         
         # Wait for scheduler thread to finish
         if hasattr(self, 'scheduler_thread') and self.scheduler_thread.is_alive():
             self.scheduler_thread.join(timeout=5)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        with self._in_flight_lock:
+            self._in_flight.clear()  # Cancelled fetches never release their cities
         
         self.logger.info("Weather data scheduler stopped")
 
@@ -149,47 +239,380 @@ class WeatherDataScheduler:
             self._countdown_job = None
 
     def _scheduler_loop(self) -> None:
-        """Main scheduler loop - runs every interval."""
-        # Wait for the first interval before starting data collection
-        self.stop_event.wait(self.interval_minutes * 60)
-
+        """Main scheduler loop - dispatches cities as they come due and handles fetches as they finish.
+        
+        The loop never waits on a fetch: due cities are handed to the worker
+        pool and the loop goes straight back to the heap, waking when the
+        next city is due, a fetch completes or a cycle reaches its deadline.
+        """
         while not self.stop_event.is_set():
             try:
-                self._collect_data_for_scheduled_cities()
-                self.last_fetch_time = datetime.now()
-                self.fetch_count += 1
+                self._wakeup.clear()
+                self._sync_schedule(datetime.now())
+                self._collect_cycles()
+                due = self._pop_due(datetime.now())
+                if due:
+                    self._dispatch_due(due)
                 
-                # Trigger memory cleanup after data collection
-                self.history_service.cleanup_old_data()
-                
-                # Calculate next fetch time
-                self.next_fetch_time = self.last_fetch_time + timedelta(minutes=self.interval_minutes)
+                # Sleep until the earliest due city or cycle deadline, a fetch finishing or a watchlist change
+                self.next_fetch_time = self._due_heap[0][0] if self._due_heap else None
                 self._update_status_display()
-                
-                # Wait for next interval
-                self.stop_event.wait(self.interval_minutes * 60)
+                self._wakeup.wait(min([self._seconds_until(self.next_fetch_time)] +
+                                      [max(0.0, cycle['deadline'] - time.monotonic()) for cycle in self._cycles]))
                 
             except Exception as e:
                 self.logger.error(f"Scheduler error: {e}")
-                # Wait shorter time on error, then retry
-                self.stop_event.wait(60)  # 1 minute
+                # Wait the retry delay, then retry
+                self.stop_event.wait(self.retry_delay_seconds)
+
+    def _scheduled_cities(self) -> Dict[str, Tuple[str, float]]:
+        """Return (name, interval minutes) by city key for every city to collect: watchlist, default and display city."""
+        cities = {key: (name, interval or self.interval_minutes) for key, name, interval in self.watchlist.items()}
+        cities.setdefault(self._city_key(self.default_city), (self.default_city, self.interval_minutes))
+        display_city = self.state_manager.city.get()
+        if display_city and display_city.strip():
+            cities.setdefault(self._city_key(display_city), (display_city, self.interval_minutes))
+        return cities
+
+    def _sync_schedule(self, now: datetime) -> None:
+        """Reconcile the due heap with the cities to collect, without disturbing cities already scheduled.
+        
+        Cities no longer scheduled are dropped (their heap entries are
+        skipped lazily). Cities new to the schedule, or whose interval
+        changed, are spread evenly over their interval with a random phase,
+        so a large watchlist loaded or extended at once is fetched at a
+        steady rate.
+        """
+        targets = self._scheduled_cities()
+        for key in [key for key in self._due if key not in targets or targets[key][1] != self._targets.get(key, (None, None))[1]]:
+            del self._due[key]
+            self._retries.pop(key, None)
+        new_keys: Dict[float, List[str]] = {}  # Interval minutes -> cities entering the schedule
+        for key, (_, interval_minutes) in targets.items():
+            if key not in self._due:
+                new_keys.setdefault(interval_minutes, []).append(key)
+        for interval_minutes, keys in new_keys.items():
+            phase = self._random.random()
+            for rank, key in enumerate(keys):
+                self._push(key, now + timedelta(minutes=interval_minutes) * ((rank + phase) / len(keys)))
+        self._targets = targets
+
+    def _push(self, key: str, due: datetime) -> None:
+        """Schedule a city at ``due``, superseding any earlier entry for it."""
+        self._due[key] = due
+        heapq.heappush(self._due_heap, (due, next(self._sequence), key))
+
+    def _pop_due(self, now: datetime) -> Dict[str, datetime]:
+        """Remove and return the scheduled due time of every city due at ``now``, earliest first."""
+        due: Dict[str, datetime] = {}
+        while self._due_heap and self._due_heap[0][0] <= now:
+            when, _, key = heapq.heappop(self._due_heap)
+            if self._due.get(key) == when:  # Skip entries superseded or dropped since pushed
+                due[key] = when
+        return due
+
+    def _reschedule(self, due: Dict[str, datetime], finished: datetime, failed: Optional[set] = None,
+                    skipped: Optional[set] = None) -> None:
+        """Push the collected cities back one interval after their scheduled times, or retry failed ones.
+        
+        A city being retried that was skipped because its timed-out fetch is
+        still in flight keeps its retry state and is tried again one retry
+        delay later, without using up an attempt.
+        
+        Args:
+            due: Scheduled time of each city collected, by city key
+            finished: When the cities' fetches finished
+            failed: Names of the cities whose fetch failed or timed out
+            skipped: Names of the cities skipped because their earlier fetch is still in flight
+        """
+        failed = failed or set()
+        skipped = skipped or set()
+        overrun_before = self.overrun_ticks
+        for key, scheduled in due.items():
+            if self._due.get(key) != scheduled:
+                continue  # Dropped or rescheduled by a watchlist change while its fetch ran
+            name, interval_minutes = self._targets[key]
+            if name in skipped and key in self._retries:
+                retries = self._retries[key][0]
+                self._push(key, finished + timedelta(seconds=self._retry_delay(retries - 1, interval_minutes)))
+                continue
+            retries, regular_tick = self._retries.pop(key, (0, scheduled))
+            if name in failed:
+                if retries < self.retry_attempts:
+                    self._retries[key] = (retries + 1, regular_tick)
+                    self._push(key, finished + timedelta(seconds=self._retry_delay(retries, interval_minutes)))
+                    continue
+                self.logger.warn(f"Auto-fetch for {name} still failing after {retries} retries; waiting for its next interval")
+            self.city_intervals[key] = self._effective_interval(name, interval_minutes, finished)
+            self._push(key, self._next_tick(regular_tick, finished, self.city_intervals[key]))
+        if self.overrun_ticks > overrun_before:
+            action = "catching up now" if self.overlap_policy == 'merge' else "skipping them"
+            self.logger.warn(f"Collection cycle overran {self.overrun_ticks - overrun_before} scheduled tick(s); {action}")
+
+    def _retry_delay(self, retries: int, interval_minutes: float) -> float:
+        """Seconds before retry number ``retries + 1``: exponential backoff, at most one interval."""
+        return min(self.retry_delay_seconds * self.retry_backoff ** retries, interval_minutes * 60)
+
+    def _effective_interval(self, city: str, interval_minutes: float, now: datetime) -> float:
+        """Return a city's next interval: its base interval scaled by volatility, then by quiet hours."""
+        minutes = interval_minutes
+        if self.adaptive["enabled"]:
+            minutes *= self._volatility_multiplier(city, now)
+            lower = min(interval_minutes, self.adaptive["min_interval_minutes"])  # Never clamp past the base interval
+            upper = max(interval_minutes, self.adaptive["max_interval_minutes"])
+            minutes = min(max(minutes, lower), upper)
+        if self._in_quiet_hours(now):
+            minutes *= self.quiet_hours["interval_multiplier"]
+        return minutes
+
+    def _in_quiet_hours(self, now: datetime) -> bool:
+        """Return True if ``now`` falls in the quiet hours window (which may wrap past midnight)."""
+        try:
+            start = datetime.strptime(self.quiet_hours["start"], "%H:%M").time()
+            end = datetime.strptime(self.quiet_hours["end"], "%H:%M").time()
+        except (KeyError, TypeError, ValueError):
+            return False
+        current = now.time()
+        if start <= end:
+            return start <= current < end
+        return current >= start or current < end
+
+    def _volatility_multiplier(self, city: str, now: datetime) -> float:
+        """Return the interval multiplier for how fast a city's recent observations are changing.
+        
+        Reads the city's rolling statistics, whose 'change' and 'range' cover
+        the STATS['change_window_hours'] before its latest entry, so nothing is
+        scanned. A pressure fall or temperature range at least the configured
+        threshold, or latest values crossing an alert threshold, poll faster
+        ('active_multiplier'); changes below 'stable_fraction' of both
+        thresholds back off ('stable_multiplier'); anything in between, or too
+        little recent history to tell, keeps the base interval. Stored history
+        is always metric, so it is compared with the metric thresholds directly.
+        """
+        stats = self.history_service.get_rolling_stats(city)
+        latest = max((summary['last_time'] for summary in stats.values()), default=None)
+        if latest is None or latest < now - timedelta(hours=self.config.STATS['change_window_hours']):
+            return 1.0
+
+        if self._alert_active(stats):
+            return self.adaptive["active_multiplier"]
+
+        scores = []
+        pressure_change = stats.get('pressure', {}).get('change')
+        if pressure_change is not None:
+            scores.append(-pressure_change / self.adaptive["pressure_drop_hpa"])
+        temperature_range = stats.get('temperature', {}).get('range')
+        if temperature_range is not None:
+            scores.append(temperature_range / self.adaptive["temperature_swing_c"])
+        if not scores:
+            return 1.0
+        if max(scores) >= 1.0:
+            return self.adaptive["active_multiplier"]
+        if max(scores) < self.adaptive["stable_fraction"]:
+            return self.adaptive["stable_multiplier"]
+        return 1.0
+
+    def _alert_active(self, stats: Dict[str, Dict[str, Any]]) -> bool:
+        """Return True if a metric's latest value crosses any ALERT_FIELDS alert threshold."""
+        for alert_type, field in ALERT_FIELDS.items():
+            definition = self.config.ALERT_DEFINITIONS.get(alert_type)
+            if definition is None or field not in stats:
+                continue
+            threshold = self.config.ALERT_THRESHOLDS[definition['threshold_key']]
+            if definition['check_function'](stats[field]['last'], threshold):
+                return True
+        return False
+
+    def _next_tick(self, scheduled: datetime, finished: datetime, interval_minutes: Optional[float] = None) -> datetime:
+        """Return the tick after ``scheduled``, resolving ticks the cycle finishing at ``finished`` overran.
+        
+        Ticks stay on the interval grid. Under the 'skip' overlap policy the
+        overrun ticks are dropped and collection resumes at the next grid tick;
+        under 'merge' they collapse into one catch-up fetch run immediately.
+        """
+        interval = timedelta(minutes=interval_minutes or self.interval_minutes)
+        next_tick = scheduled + interval
+        if next_tick > finished:
+            return next_tick
+
+        missed = (finished - next_tick) // interval + 1
+        self.overrun_ticks += missed
+        if self.overlap_policy == 'merge':
+            return finished
+        return next_tick + missed * interval
+
+    def _seconds_until(self, when: Optional[datetime]) -> float:
+        """Seconds from now until ``when`` (a full interval when unset, never negative)."""
+        if when is None:
+            return self.interval_minutes * 60
+        return max(0.0, (when - datetime.now()).total_seconds())
+
+    def _dispatch_due(self, due: Dict[str, datetime]) -> None:
+        """Hand the cities now due to the worker pool as one collection cycle."""
+        # Keyed by canonical city so aliases ("NYC" vs "New York") are fetched once
+        cities = {key: self._targets[key][0] for key in due}
+        display_key = self._city_key(self.state_manager.city.get())
+        self._dispatch_cycle(cities, display_key, due)
 
-    def _collect_data_for_scheduled_cities(self) -> None:
-        """Collect data for both default and display cities."""
-        cities_to_fetch = set()
+    def _collect_cycles(self) -> None:
+        """Handle finished and overdue fetches of every dispatched cycle, closing the cycles that are done."""
+        for cycle in list(self._cycles):
+            if self._collect_cycle(cycle) is None:
+                continue
+            self.last_fetch_time = datetime.now()
+            self.fetch_count += 1
+            
+            # Trigger memory cleanup after data collection
+            self.history_service.cleanup_old_data()
+
+    def _run_collection_cycle(self, cities: Dict[str, str], display_key: Optional[str] = None) -> Dict[str, Any]:
+        """Fetch cities in parallel and wait, at most until the cycle deadline, for the cycle to finish.
         
-        # Always fetch default city
-        cities_to_fetch.add(self.default_city)
+        Blocking counterpart of the scheduler loop's dispatch, for one-off
+        collections on the calling thread.
         
-        # Add display city if different from default
-        current_display_city = self.state_manager.city.get()
+        Args:
+            cities: City names keyed by canonical city key
+            display_key: Key of the city shown in the UI, if any
+            
+        Returns:
+            Dict[str, Any]: The cycle's timing record (see _collect_cycle)
+        """
+        cycle = self._dispatch_cycle(cities, display_key)
+        wait(cycle['futures'], timeout=self.cycle_deadline_seconds)
+        return self._collect_cycle(cycle, expire=True)
 
-        if current_display_city != self.default_city:
-            cities_to_fetch.add(current_display_city)
+    def _dispatch_cycle(self, cities: Dict[str, str], display_key: Optional[str] = None,
+                        due: Optional[Dict[str, datetime]] = None) -> Dict[str, Any]:
+        """Submit one collection cycle's fetches to the worker pool without waiting for them.
+        
+        Cities whose earlier fetch is still in flight are skipped. Each
+        completed fetch sets the loop's wakeup event so its result is
+        handled promptly.
         
-        # Fetch data sequentially
-        for city in cities_to_fetch:
-            self._fetch_city_data(city, update_display=(city == current_display_city))
+        Args:
+            cities: City names keyed by canonical city key
+            display_key: Key of the city shown in the UI, if any
+            due: Scheduled time of each city by key, for cities to push back
+                onto the heap as they finish (None for one-off collections)
+            
+        Returns:
+            Dict[str, Any]: The pending cycle, tracked in ``_cycles`` until collected
+        """
+        unit = self.state_manager.unit.get()
+        cycle = {
+            'started': datetime.now(),
+            'monotonic': time.monotonic(),
+            'deadline': time.monotonic() + self.cycle_deadline_seconds,
+            'cancel_event': threading.Event(),  # Cancels this cycle's fetches at its deadline
+            'futures': {},
+            'due': due or {},
+            'display_key': display_key,
+            'total': len(cities),
+            'city_seconds': {},
+            'failed': [],
+            'timed_out': [],
+            'skipped': [],
+        }
+        with self._in_flight_lock:
+            for key, city in cities.items():
+                if key in self._in_flight:
+                    cycle['skipped'].append(city)
+                    continue
+                self._in_flight.add(key)
+                future = self._executor().submit(self._timed_fetch, key, city, unit, cycle['cancel_event'])
+                cycle['futures'][future] = (key, city)
+        for future in list(cycle['futures']):
+            future.add_done_callback(lambda _: self._wakeup.set())
+        if cycle['skipped']:
+            self.logger.warn(f"Previous fetch still running, skipping: {', '.join(cycle['skipped'])}")
+            skipped = {key: when for key, when in cycle['due'].items() if cities[key] in cycle['skipped']}
+            self._reschedule(skipped, datetime.now(), skipped=set(cycle['skipped']))
+        self._cycles.append(cycle)
+        return cycle
+
+    def _collect_cycle(self, cycle: Dict[str, Any], expire: bool = False) -> Optional[Dict[str, Any]]:
+        """Handle a cycle's finished fetches, and its unfinished ones once past the deadline.
+        
+        Results are handled on the calling thread (display update for the
+        cycle's display city, error counting for failures), and each city
+        is pushed back onto the heap as soon as its own fetch is resolved.
+        Fetches still running at the deadline are cancelled and reported as
+        timed out.
+        
+        Args:
+            cycle: A pending cycle from _dispatch_cycle
+            expire: Treat the deadline as reached now
+            
+        Returns:
+            Optional[Dict[str, Any]]: Once every fetch is resolved, the timing
+                record: 'started', 'duration_seconds', 'city_seconds' (per
+                completed city), 'slowest_city', 'failed', 'timed_out' and
+                'skipped'; None while fetches are still pending
+        """
+        futures, due = cycle['futures'], cycle['due']
+        for future in [future for future in futures if future.done()]:
+            key, city = futures.pop(future)
+            weather_data, error, cycle['city_seconds'][city] = future.result()
+            if error is not None:
+                cycle['failed'].append(city)
+                self._handle_fetch_error(city, error)
+            else:
+                self.error_counts.pop(f"{key}_errors", None)  # Errors are counted while consecutive
+                if key == cycle['display_key']:
+                    self._update_city_display(city, weather_data)
+            if key in due:
+                self._reschedule({key: due[key]}, datetime.now(), {city} if error is not None else None)
+        
+        if futures and (expire or time.monotonic() >= cycle['deadline']):
+            cycle['cancel_event'].set()
+            cycle['timed_out'] = [city for _, city in futures.values()]
+            self.logger.warn(f"Collection cycle deadline of {self.cycle_deadline_seconds}s reached, abandoning: {', '.join(cycle['timed_out'])}")
+            self._reschedule({key: due[key] for key, _ in futures.values() if key in due}, datetime.now(), set(cycle['timed_out']))
+            futures.clear()
+        if futures:
+            return None
+
+        city_seconds = cycle['city_seconds']
+        record = {
+            'started': cycle['started'],
+            'duration_seconds': time.monotonic() - cycle['monotonic'],
+            'city_seconds': city_seconds,
+            'slowest_city': max(city_seconds, key=city_seconds.get) if city_seconds else None,
+            'failed': cycle['failed'],
+            'timed_out': cycle['timed_out'],
+            'skipped': cycle['skipped'],
+        }
+        if cycle in self._cycles:
+            self._cycles.remove(cycle)
+        self.cycle_history.append(record)
+        self.last_cycle = record
+        self.logger.info(f"Collection cycle: {len(city_seconds)} of {cycle['total']} cities in {record['duration_seconds']:.2f}s")
+        return record
+
+    def _timed_fetch(self, key: str, city: str, unit: str, cancel_event: threading.Event) -> Tuple[Optional[Dict[str, Any]], Optional[Exception], float]:
+        """Fetch one city on a worker thread; returns (weather data, error, seconds taken)."""
+        started = time.monotonic()
+        try:
+            return self.data_manager.fetch_current(city, unit, cancel_event), None, time.monotonic() - started
+        except Exception as e:
+            return None, e, time.monotonic() - started
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.discard(key)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        """Return the fetch worker pool, creating it on first use."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="SchedulerFetch")
+        return self._pool
+
+    def _city_key(self, city: str) -> str:
+        """Return the canonical key for a city, falling back to the raw name if invalid."""
+        try:
+            return self.utils.city_key(city)
+        except ValueError:
+            return city
 
     def _fetch_city_data(self, city: str, update_display: bool = False) -> None:
         """Fetch data for a single city."""
@@ -201,16 +624,23 @@ class WeatherDataScheduler:
             )
             
             if update_display:
-                # Update UI for display city
-                view_model = WeatherViewModel(city, weather_data, self.state_manager.unit.get())
-                self.ui_handler.update_display(view_model, None, False)
+                self._update_city_display(city, weather_data)
                 
         except Exception as e:
             self._handle_fetch_error(city, e)
 
+    def _update_city_display(self, city: str, weather_data: Dict[str, Any]) -> None:
+        """Update the UI with freshly fetched data for the display city."""
+        view_model = WeatherViewModel(
+            city, weather_data, self.state_manager.unit.get(),
+            visible_metrics=self.state_utils.get_visible_metric_filter(self.state_manager),
+            incremental=True
+        )
+        self.ui_handler.update_display(view_model, None, False)
+
     def _handle_fetch_error(self, city: str, error: Exception) -> None:
         """Handle fetch errors with threshold-based notifications."""
-        error_key = f"{city}_errors"
+        error_key = f"{self._city_key(city)}_errors"
         self.error_counts[error_key] = self.error_counts.get(error_key, 0) + 1
         
         # Log silently
@@ -227,6 +657,23 @@ class WeatherDataScheduler:
         self.logger.error(error_msg)
         # Could add UI notification here later
 
+    def add_to_watchlist(self, city: str, interval_minutes: Optional[float] = None) -> str:
+        """Watch a city (or change its interval); a running scheduler picks it up without restarting.
+        
+        Raises:
+            ValueError: If the name or interval is invalid, or the watchlist is full
+        """
+        key = self.watchlist.add(city, interval_minutes)
+        self._wakeup.set()
+        return key
+
+    def remove_from_watchlist(self, city: str) -> bool:
+        """Stop watching a city; returns False if it was not watched."""
+        removed = self.watchlist.remove(city)
+        if removed:
+            self._wakeup.set()
+        return removed
+
     def handle_manual_update(self, city: str) -> None:
         """Handle manual update button click - adds extra data point."""
         if not self.enabled:
@@ -245,7 +692,12 @@ class WeatherDataScheduler:
                 'next_fetch_time': self.next_fetch_time,
                 'last_fetch_time': self.last_fetch_time,
                 'fetch_count': self.fetch_count,
-                'interval_minutes': self.interval_minutes
+                'interval_minutes': self.interval_minutes,
+                'last_cycle_seconds': self.last_cycle['duration_seconds'] if self.last_cycle else None,
+                'overrun_ticks': self.overrun_ticks,
+                'scheduled_cities': len(self._due),
+                'quiet_hours_active': self._in_quiet_hours(datetime.now()),
+                'retries_pending': len(self._retries)
             }
             self.ui_handler.update_scheduler_status(status_info)
 
@@ -259,5 +711,12 @@ class WeatherDataScheduler:
             'fetch_count': self.fetch_count,
             'interval_minutes': self.interval_minutes,
             'default_city': self.default_city,
-            'current_display_city': self.state_manager.city.get()
+            'current_display_city': self.state_manager.city.get(),
+            'last_cycle': self.last_cycle,
+            'overrun_ticks': self.overrun_ticks,
+            'scheduled_cities': len(self._due),
+            'watchlist': self.watchlist.items(),
+            'quiet_hours_active': self._in_quiet_hours(datetime.now()),
+            'city_intervals': dict(self.city_intervals),
+            'retries_pending': len(self._retries)
         }
\ No newline at end of file
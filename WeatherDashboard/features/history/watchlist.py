@@ -0,0 +1,145 @@
+"""
+Persistent watchlist of cities collected by the scheduler.
+
+Each watched city has an optional collection interval of its own (None
+follows the scheduler's default). The list is kept in insertion order,
+keyed by canonical city key so aliases ("NYC", "New York") are watched
+once, and persisted as JSON between sessions with an atomic replace.
+
+Classes:
+    Watchlist: Thread-safe, persisted set of watched cities with per-city intervals
+"""
+
+from typing import Dict, Any, Optional, Callable, List, Tuple
+from pathlib import Path
+import json
+import os
+import threading
+
+from WeatherDashboard import config
+from WeatherDashboard.utils.logger import Logger
+
+
+class Watchlist:
+    """Thread-safe, persisted set of watched cities with per-city intervals.
+
+    Attributes:
+        watch_file: Path to the persisted JSON watchlist
+        max_cities: Largest number of cities the watchlist accepts
+    """
+
+    def __init__(self, key_func: Callable[[str], str], watch_file: Optional[str] = None) -> None:
+        """Initialize the watchlist.
+
+        Args:
+            key_func: Maps a city name to its canonical key (e.g. Utils.city_key)
+            watch_file: Optional custom path for the watchlist file.
+                        Defaults to config.OUTPUT['watchlist_file']
+        """
+        # Direct imports for stable utilities
+        self.logger = Logger()
+        self.config = config
+
+        self.watch_file = Path(watch_file or self.config.OUTPUT["watchlist_file"])
+        self.max_cities = self.config.SCHEDULER["watchlist_max_cities"]
+
+        # Internal state (loaded lazily on first use)
+        self._key_func = key_func
+        self._cities: Dict[str, Dict[str, Any]] = {}  # City key -> {'name', 'interval_minutes'}
+        self._loaded = False
+        self._lock = threading.RLock()
+
+# ================================
+# 1. MEMBERSHIP
+# ================================
+    def add(self, city: str, interval_minutes: Optional[float] = None) -> str:
+        """Watch a city, or change the interval of a watched city, and persist the list.
+
+        Args:
+            city: City name
+            interval_minutes: Optional collection interval (None follows the scheduler default)
+
+        Returns:
+            str: Canonical key of the city
+
+        Raises:
+            ValueError: If the name or interval is invalid, or the watchlist is full
+        """
+        if not isinstance(city, str) or not city.strip():
+            raise ValueError("City name is required")
+        if interval_minutes is not None and not (isinstance(interval_minutes, (int, float)) and interval_minutes > 0):
+            raise ValueError(f"Interval must be a positive number of minutes: {interval_minutes!r}")
+
+        key = self._key_func(city)
+        self._ensure_loaded()
+        with self._lock:
+            if key not in self._cities and len(self._cities) >= self.max_cities:
+                raise ValueError(f"Watchlist is full ({self.max_cities} cities)")
+            self._cities[key] = {'name': city.strip(), 'interval_minutes': interval_minutes}
+            self.save()
+        return key
+
+    def remove(self, city: str) -> bool:
+        """Stop watching a city and persist the list; returns False if it was not watched."""
+        key = self._key_func(city)
+        self._ensure_loaded()
+        with self._lock:
+            if self._cities.pop(key, None) is None:
+                return False
+            self.save()
+        return True
+
+    def items(self) -> List[Tuple[str, str, Optional[float]]]:
+        """Return (key, name, interval_minutes) for every watched city, in the order added."""
+        self._ensure_loaded()
+        with self._lock:
+            return [(key, entry['name'], entry['interval_minutes']) for key, entry in self._cities.items()]
+
+    def __contains__(self, city: str) -> bool:
+        """Return True if the city (under any alias) is watched."""
+        self._ensure_loaded()
+        return self._key_func(city) in self._cities
+
+    def __len__(self) -> int:
+        """Return the number of watched cities."""
+        self._ensure_loaded()
+        return len(self._cities)
+
+# ================================
+# 2. PERSISTENCE
+# ================================
+    def save(self) -> bool:
+        """Persist the watchlist to disk.
+
+        Returns:
+            bool: True if the watchlist was written, False otherwise
+        """
+        with self._lock:
+            payload = {'cities': [dict(entry, key=key) for key, entry in self._cities.items()]}
+        try:
+            self.watch_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.watch_file.with_suffix('.json.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, indent=2, ensure_ascii=False)
+            os.replace(temp_file, self.watch_file)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.error(f"Failed to save watchlist: {e}")
+            return False
+
+    def _ensure_loaded(self) -> None:
+        """Load the persisted watchlist on first use."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if self.watch_file.exists():
+                try:
+                    with open(self.watch_file, 'r', encoding='utf-8') as f:
+                        payload = json.load(f)
+                    for entry in payload.get('cities', []):
+                        self._cities[entry['key']] = {'name': entry['name'], 'interval_minutes': entry.get('interval_minutes')}
+                except (OSError, json.JSONDecodeError, AttributeError, KeyError, TypeError) as e:
+                    self.logger.warn(f"Ignoring unreadable watchlist {self.watch_file}: {e}")
+            self._loaded = True
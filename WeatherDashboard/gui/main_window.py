@@ -43,6 +43,7 @@ class WeatherDashboardMain:
     Attributes:
         root: Main tkinter window
         _operation_lock: Threading lock for operation state protection
+        _pending_unit_switch: Unit switch made during a fetch, applied when the fetch completes
         state: Application state manager
         widgets: Unified widget manager
         data_manager: Weather data management service
@@ -81,11 +82,17 @@ class WeatherDashboardMain:
         self.root = root
         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
         self._operation_lock = threading.Lock()
+        self._pending_unit_switch = False
         self._setup_window_constraints()
         
         # Injected dependencies for testable core components
         self.state = state_manager or WeatherDashboardState()
         self.data_manager = data_manager or WeatherDataManager()
+
+        # Warm in-memory history from the journal before the scheduler adds to it
+        history_service = getattr(self.data_manager, 'history_service', None)
+        if history_service is not None and hasattr(history_service, 'restore_from_journal'):
+            history_service.restore_from_journal()
         
         # Create scheduler
         self.scheduler_service = WeatherDataScheduler(
@@ -172,6 +179,9 @@ class WeatherDashboardMain:
                 if alert_widget:
                     alert_widget.set_click_callback(self.show_alerts)
 
+        # Unit system switches re-render from cached data instead of refetching
+        self.state.unit.trace_add('write', self._on_unit_changed)
+
     def _initialize_csv_comparison(self) -> None:
         """Initialize CSV comparison tab functionality."""
         if not self.csv_data_manager:
@@ -311,7 +321,7 @@ class WeatherDashboardMain:
             **view_model.metrics,
             "city": view_model.city_name,
             "date": view_model.date_str
-        })
+        }, view_model.numeric_values)
         self.widgets.update_status_bar(view_model.city_name, error_exception, simulated)
         self.widgets.update_alerts(view_model.raw_data)
 
@@ -321,7 +331,8 @@ class WeatherDashboardMain:
             self.widgets.status_bar_widgets.update_scheduler_status(status_info)
 
     def update_chart_components(self, x_vals: Optional[List[str]] = None, y_vals: Optional[List[Any]] = None, metric_key: Optional[str] = None,
-                                city: Optional[str] = None, unit: Optional[str] = None, clear: bool = False) -> None:
+                                city: Optional[str] = None, unit: Optional[str] = None, clear: bool = False,
+                                summary: Optional[str] = None) -> None:
         """Update chart-related components.
         
         Args:
@@ -331,11 +342,12 @@ class WeatherDashboardMain:
             city: City name for chart title
             unit: Unit system for labeling
             clear: Whether to clear the chart instead of updating it
+            summary: Optional range summary shown under the chart title
         """
         if clear:
             self.widgets.clear_chart_with_error_message()
         elif x_vals is not None and y_vals is not None:
-            self.widgets.update_chart_display(x_vals, y_vals, metric_key, city, unit)
+            self.widgets.update_chart_display(x_vals, y_vals, metric_key, city, unit, summary=summary)
         
         # Always update dropdown options unless explicitly clearing
         if not clear and self.widgets.control_widgets:
@@ -439,6 +451,32 @@ class WeatherDashboardMain:
             except Exception as recovery_error:
                 self.logger.error(f"Recovery refresh also failed: {recovery_error}")
 
+    def _on_unit_changed(self, *args) -> None:
+        """Handle unit system selection changes by re-rendering from cached data.
+        
+        A fetch in progress renders its result in the unit system selected
+        when it started, so a switch made meanwhile is recorded and applied
+        once the fetch completes (see _apply_pending_unit_switch).
+        """
+        with self._operation_lock:
+            if getattr(self, '_operation_in_progress', False):
+                self._pending_unit_switch = True
+                return
+
+        try:
+            unit_system = self.state.get_current_unit_system()
+            if not self.controller.switch_unit_system(unit_system):
+                self.logger.debug("No cached data for unit switch - will apply on next update")
+        except Exception as e:
+            self.logger.error(f"Error switching unit system: {e}")
+
+    def _apply_pending_unit_switch(self) -> None:
+        """Re-render in the selected unit system if it changed while the last fetch was running."""
+        with self._operation_lock:
+            pending, self._pending_unit_switch = self._pending_unit_switch, False
+        if pending:
+            self._on_unit_changed()
+
     def on_update_clicked_async(self) -> None:
         """Handle the update button click event with async weather fetching.
         
@@ -539,6 +577,11 @@ class WeatherDashboardMain:
             # Stop scheduler
             if hasattr(self, 'scheduler_service'):
                 self.scheduler_service.stop_scheduler()
+            
+            # Drain queued history rows and text log entries
+            history_service = getattr(self.data_manager, 'history_service', None)
+            if history_service is not None and hasattr(history_service, 'close'):
+                history_service.close()
                 
         except Exception as e:
             self.logger.error(f"Error during shutdown: {e}")
@@ -615,6 +658,7 @@ class WeatherDashboardMain:
             
             if success:
                 self.controller.update_chart()
+            self._apply_pending_unit_switch()
         
         # Load initial data asynchronously
         self.async_operations.fetch_weather_async(
@@ -643,6 +687,7 @@ class WeatherDashboardMain:
         # UI reset can happen immediately
         if self.widgets.control_widgets:
             self.widgets.control_widgets.set_loading_state(False)
+        self._apply_pending_unit_switch()
     
     def _handle_async_complete(self, success: bool, next_callback: Optional[callable] = None) -> None:
         """Handle completion of async operations."""
@@ -650,4 +695,5 @@ class WeatherDashboardMain:
             self.widgets.control_widgets.set_loading_state(False)
         
         if next_callback: # Optional callback to execute after cleanup
-            next_callback(success)
\ No newline at end of file
+            next_callback(success)
+        self._apply_pending_unit_switch()
\ No newline at end of file
@@ -24,6 +24,7 @@ import requests
 
 from WeatherDashboard import config, dialog
 from WeatherDashboard.utils.logger import Logger
+from WeatherDashboard.utils.utils import Utils
 from WeatherDashboard.utils.api_utils import ApiUtils
 from WeatherDashboard.utils.derived_metrics import DerivedMetricsCalculator
 
@@ -149,6 +150,9 @@ class WeatherDataParser:
     unit conversion, and formatting.
     """
 
+    # Shared calculator - stateless, so one instance serves every observation
+    _calculator = DerivedMetricsCalculator()
+
     @staticmethod
     def parse_weather_data(weather_data: Dict[str, Any], uv_data: Optional[Dict[str, Any]] = None, air_quality_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Parse weather data using centralized API utilities."""
@@ -166,9 +170,7 @@ class WeatherDataParser:
     def _calculate_derived_metrics(data: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate all derived metrics from base weather data."""
         derived = {}
-
-        # Create instance for calculations
-        calculator = DerivedMetricsCalculator()
+        calculator = WeatherDataParser._calculator
         
         # Get base values with safe defaults
         temp_c = data.get('temperature', 20)  # Already in Celsius
@@ -345,6 +347,7 @@ class WeatherAPIService:
         self.config = config
         self.dialog = dialog
         self.logger = Logger()
+        self.utils = Utils()
 
         # API configuration
         self.weather_api = self.config.API_BASE_URL
@@ -381,6 +384,7 @@ class WeatherAPIService:
         try:
             # Fetch main weather data
             weather_data = self._api_client.fetch_weather_data(city, cancel_event)
+            self._learn_city(city, weather_data)
             
             # Extract coordinates for additional API calls
             coords = weather_data.get("coord", {})
@@ -437,6 +441,18 @@ class WeatherAPIService:
             current_data.update(self._data_parser._calculate_derived_metrics(current_data))
             current_data['source'] = 'simulated'
             return current_data
+
+    def _learn_city(self, city: str, weather_data: Dict[str, Any]) -> None:
+        """Teach the city index the API's name, country and id for the requested city."""
+        try:
+            self.utils.city_index.learn(
+                city,
+                weather_data.get('name'),
+                (weather_data.get('sys') or {}).get('country'),
+                weather_data.get('id')
+            )
+        except Exception as e:
+            self.logger.warn(f"Could not update city index for {city}: {e}")
     
 
 # ================================
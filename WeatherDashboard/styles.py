@@ -116,6 +116,10 @@ def STATUS_BAR_CONFIG() -> Dict[str, Any]:
     """Get status bar configuration from theme manager."""
     return get_status_bar_config()
 
+def CURRENT_THEME() -> Theme:
+    """Get the active theme from theme manager."""
+    return theme_manager.get_current_theme()
+
 def METRIC_COLOR_RANGES() -> Dict[str, Any]:
     """Get metric color ranges from theme manager."""
     return get_metric_color_ranges()
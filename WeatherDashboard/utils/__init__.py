@@ -17,6 +17,9 @@ Modules:
     validation_utils: Centralized validation utilities
     widget_utils: Centralized widget positioning and creation utilities
     preferences_utils: User Preferences Manager
+    city_index: City name canonicalization and alias index
+    background_writer: Background batched writer for files and history rows
+    segment_archive: Segment rotation and gzip archival for append-only files
 """
 
 __all__ = [
@@ -30,5 +33,8 @@ __all__ = [
     "state_utils",
     "validation_utils",
     "widget_utils",
-    "preferences_utils"
+    "preferences_utils",
+    "city_index",
+    "background_writer",
+    "segment_archive"
 ]
\ No newline at end of file
@@ -0,0 +1,257 @@
+"""
+Background batched writer for append-only outputs.
+
+This module moves file appends and history inserts off the calling thread.
+Callers enqueue work on a bounded queue; a single daemon thread batches it
+and flushes on size or time, opening each file once per batch and handing
+history rows to their store in one call (one transaction for SQLite).
+
+Maintenance tasks that must not race those writes (such as history
+retention) can be queued to run on the same thread.
+
+Classes:
+    BackgroundWriter: Bounded-queue writer thread with size/time flushing and fsync policy
+"""
+
+from typing import Dict, List, Any, Optional, Callable, Iterable, Union
+import os
+import queue
+import threading
+import time
+
+from WeatherDashboard import config
+from WeatherDashboard.utils.logger import Logger
+
+
+class BackgroundWriter:
+    """Batch appends and history rows on a single background thread.
+
+    The thread starts on first use. ``flush()`` waits until everything
+    submitted so far is written; ``close()`` drains the queue and stops the
+    thread (call it on application shutdown). Writes submitted after
+    ``close()`` (a scheduled store racing shutdown) are reported to
+    ``on_error`` and dropped.
+
+    Attributes:
+        batch_size: Items per flush when the queue is busy
+        flush_interval: Longest time (seconds) an item waits before being written
+        fsync_policy: 'none' (leave to the OS), 'batch' (fsync after each flush)
+            or 'close' (fsync files once on close). Applies to text files and to
+            stores with a ``sync()`` method alike
+        on_error: Callback receiving error messages (defaults to Logger().error)
+    """
+
+    FSYNC_POLICIES = ('none', 'batch', 'close')
+
+    def __init__(self, batch_size: Optional[int] = None, flush_interval: Optional[float] = None,
+                 max_queue_size: Optional[int] = None, fsync_policy: Optional[str] = None,
+                 on_error: Optional[Callable[[str], None]] = None) -> None:
+        """Initialize the writer (settings default to config.WRITER).
+
+        Raises:
+            ValueError: If fsync_policy is unknown
+        """
+        # Direct imports for stable utilities
+        self.config = config
+        self.logger = Logger()
+
+        settings = self.config.WRITER
+        self.batch_size = batch_size or settings['batch_size']
+        self.flush_interval = flush_interval if flush_interval is not None else settings['flush_interval_seconds']
+        self.fsync_policy = fsync_policy or settings['fsync_policy']
+        if self.fsync_policy not in self.FSYNC_POLICIES:
+            raise ValueError(f"fsync policy must be one of {self.FSYNC_POLICIES}, got '{self.fsync_policy}'")
+        self.on_error = on_error or self.logger.error
+
+        # Internal state
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size or settings['queue_size'])
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._touched_files: set = set()
+        self._touched_stores: Dict[int, Any] = {}
+        self._closed = False
+
+# ================================
+# 1. SUBMISSION (CALLER THREAD)
+# ================================
+    def append_text(self, path: str, text: Union[str, Callable[[], str]]) -> None:
+        """Queue text to append to a file.
+
+        Args:
+            path: File to append to
+            text: Text, or a zero-argument callable rendering it on the writer thread
+        """
+        self._submit(('text', path, text))
+
+    def append_rows(self, store: Any, rows: List[tuple], on_written: Optional[Callable[[int], None]] = None) -> None:
+        """Queue rows for a history store's ``append_many``.
+
+        Args:
+            store: Object with an ``append_many(rows)`` method (and optionally ``sync()``,
+                called per the fsync policy)
+            rows: Rows in the store's format
+            on_written: Optional callback receiving the number of rows written
+        """
+        self._submit(('rows', store, rows, on_written))
+
+    def call(self, task: Callable[[], None]) -> None:
+        """Queue a maintenance task to run on the writer thread after earlier writes.
+
+        Args:
+            task: Zero-argument callable; exceptions go to on_error
+        """
+        self._submit(('task', task))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything submitted so far has been written.
+
+        Returns:
+            bool: True if the writer caught up within the timeout
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(('barrier', done))
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Drain pending writes and stop the writer thread."""
+        self._closed = True
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(('stop',))
+            self._thread.join(timeout)
+        if self.fsync_policy == 'close':
+            self._fsync_files(self._touched_files)
+            self._sync_stores(self._touched_stores.values())
+        self._touched_files.clear()
+        self._touched_stores.clear()
+
+    @property
+    def pending(self) -> int:
+        """Approximate number of queued items."""
+        return self._queue.qsize()
+
+    def _submit(self, item: tuple) -> None:
+        """Queue an item, starting the thread on first use (blocks only when the queue is full).
+
+        Items submitted after close() are reported and dropped.
+        """
+        if self._closed:
+            self.on_error(f"Dropped {item[0]} write submitted after the background writer closed")
+            return
+        if self._thread is None or not self._thread.is_alive():
+            with self._start_lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="BackgroundWriter", daemon=True)
+                    self._thread.start()
+        self._queue.put(item)
+
+# ================================
+# 2. WRITER THREAD
+# ================================
+    def _run(self) -> None:
+        """Collect items into batches and flush on size, time, barriers and stop."""
+        batch: List[tuple] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is not None and item[0] in ('text', 'rows', 'task'):
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) < self.batch_size:
+                    continue
+
+            if batch:
+                self._write_batch(batch)
+                batch = []
+            deadline = None
+
+            if item is None:
+                continue
+            if item[0] == 'barrier':
+                item[1].set()
+            elif item[0] == 'stop':
+                return
+
+    def _write_batch(self, batch: List[tuple]) -> None:
+        """Write one batch: each file opened once, each store called once, order preserved per target.
+
+        Tasks run after the batch's writes.
+        """
+        texts: Dict[str, List[str]] = {}
+        stores: Dict[int, list] = {}
+        tasks: List[Callable[[], None]] = []
+        for item in batch:
+            if item[0] == 'task':
+                tasks.append(item[1])
+            elif item[0] == 'text':
+                _, path, text = item
+                try:
+                    texts.setdefault(path, []).append(text() if callable(text) else text)
+                except Exception as e:
+                    self.on_error(f"Could not render entry for {path}: {e}")
+            else:
+                _, store, rows, on_written = item
+                entry = stores.setdefault(id(store), [store, [], []])
+                entry[1].extend(rows)
+                if on_written:
+                    entry[2].append((on_written, len(rows)))
+
+        for store, rows, callbacks in stores.values():
+            try:
+                store.append_many(rows)
+            except Exception as e:
+                self.on_error(f"Failed to write {len(rows)} history rows: {e}")
+                continue
+            if hasattr(store, 'sync'):
+                if self.fsync_policy == 'batch':
+                    self._sync_stores([store])
+                self._touched_stores[id(store)] = store
+            for callback, count in callbacks:
+                try:
+                    callback(count)
+                except Exception as e:
+                    self.on_error(f"History write callback failed: {e}")
+
+        for path, chunks in texts.items():
+            try:
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write("".join(chunks))
+                    if self.fsync_policy == 'batch':
+                        f.flush()
+                        os.fsync(f.fileno())
+                self._touched_files.add(path)
+            except (OSError, IOError, PermissionError) as e:
+                self.on_error(f"Failed to write {len(chunks)} entries to {path}: {e}")
+
+        for task in tasks:
+            try:
+                task()
+            except Exception as e:
+                self.on_error(f"Background task failed: {e}")
+
+    def _fsync_files(self, paths: set) -> None:
+        """Flush written files to disk."""
+        for path in paths:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                self.on_error(f"Could not fsync {path}: {e}")
+
+    def _sync_stores(self, stores: Iterable[Any]) -> None:
+        """Flush written store rows to disk."""
+        for store in stores:
+            try:
+                store.sync()
+            except Exception as e:
+                self.on_error(f"Could not sync history store: {e}")
@@ -0,0 +1,233 @@
+"""
+City name canonicalization for the Weather Dashboard application.
+
+This module maps user-entered city names, aliases and country-qualified
+variants ("NYC", "new york", "New York, US") onto a single canonical key so
+that caches, the history store and the scheduler treat them as one city.
+The index is seeded from configuration, learned from API responses
+(name + country + id) and persisted as JSON between sessions. Learning only
+marks the index dirty; ``flush`` writes it later (the history service runs
+it on its background writer and at shutdown), so fetches never wait on disk.
+
+Classes:
+    CityIndex: Persistent alias index resolving city names to canonical keys
+"""
+
+from typing import Dict, Any, Optional
+from pathlib import Path
+import json
+import os
+import threading
+
+from WeatherDashboard import config
+
+from .logger import Logger
+
+
+class CityIndex:
+    """Resolve city names to canonical storage keys.
+
+    Keys keep the historical ``city_key`` format (lowercase, spaces become
+    underscores), so cities that were never aliased keep their existing keys.
+
+    Attributes:
+        index_file: Path to the persisted JSON index
+        aliases: Normalized alias text -> canonical key
+        cities: Canonical key -> {'name', 'country', 'id'} learned from the API
+        ids: API city id (as string) -> canonical key
+    """
+
+    def __init__(self, index_file: Optional[str] = None) -> None:
+        """Initialize the city index.
+
+        Args:
+            index_file: Optional custom path for the index file.
+                        Defaults to data/city_index.json
+        """
+        # Direct imports for stable utilities
+        self.logger = Logger()
+        self.config = config
+
+        self.index_file = Path(index_file or self.config.OUTPUT["city_index_file"])
+
+        # Internal state (loaded lazily on first lookup)
+        self.aliases: Dict[str, str] = {}
+        self.cities: Dict[str, Dict[str, Any]] = {}
+        self.ids: Dict[str, str] = {}
+        self._loaded = False
+        self._dirty = False  # Learned changes not yet written by flush()
+        self._lock = threading.RLock()
+
+# ================================
+# 1. LOOKUP
+# ================================
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Normalize free text for alias matching (trimmed, single-spaced, lowercase)."""
+        return " ".join(name.split()).lower()
+
+    @staticmethod
+    def basic_key(name: str) -> str:
+        """Return the plain storage key for a name without alias resolution."""
+        return name.strip().title().lower().replace(" ", "_")
+
+    def resolve(self, name: str) -> str:
+        """Resolve a city name to its canonical key.
+
+        Checks the alias index first, then a "City, CC" variant against
+        learned cities, and finally falls back to the plain key of the name
+        (with any country qualifier dropped).
+
+        Args:
+            name: City name as entered or reported
+
+        Returns:
+            str: Canonical city key
+        """
+        self._ensure_loaded()
+        normalized = self.normalize(name)
+
+        with self._lock:
+            canonical = self.aliases.get(normalized)
+            if canonical:
+                return canonical
+
+            if ',' not in name:
+                return self.basic_key(name)
+
+            city_part, _, country_part = name.partition(',')
+            base_key = self.aliases.get(self.normalize(city_part), self.basic_key(city_part))
+            country = country_part.strip().upper()
+            learned_country = self.cities.get(base_key, {}).get('country')
+            if learned_country and country and learned_country != country:
+                # Same name, different country: keep the cities apart
+                return f"{base_key},{country.lower()}"
+            return base_key
+
+    def display_name(self, name: str) -> str:
+        """Return the API-reported name for a city, or the title-cased input if unknown."""
+        key = self.resolve(name)
+        with self._lock:
+            learned = self.cities.get(key)
+        return learned['name'] if learned and learned.get('name') else name.strip().title()
+
+# ================================
+# 2. LEARNING & PERSISTENCE
+# ================================
+    def learn(self, query: str, name: Optional[str], country: Optional[str] = None, city_id: Optional[Any] = None) -> str:
+        """Record an API response so the query and its variants share one key.
+
+        The API city id wins over names: if the id is already known, the
+        query becomes an alias of the existing canonical key.
+
+        Args:
+            query: City name the user requested
+            name: City name reported by the API
+            country: ISO country code reported by the API
+            city_id: API city id
+
+        Returns:
+            str: Canonical key the query now resolves to
+        """
+        if not isinstance(name, str) or not name.strip():
+            return self.resolve(query)
+
+        self._ensure_loaded()
+        with self._lock:
+            id_key = str(city_id) if city_id is not None else None
+            canonical = self.ids.get(id_key) if id_key else None
+            if canonical is None:
+                canonical = self.aliases.get(self.normalize(name), self.basic_key(name))
+                # Same name already learned for another country
+                known_country = self.cities.get(canonical, {}).get('country')
+                if known_country and country and known_country != country.upper():
+                    canonical = f"{canonical},{country.lower()}"
+
+            record = dict(self.cities.get(canonical, {}))
+            record.update({k: v for k, v in (('name', name), ('country', country and country.upper()), ('id', city_id)) if v is not None})
+            changed = record != self.cities.get(canonical)
+            self.cities[canonical] = record
+            if id_key and self.ids.get(id_key) != canonical:
+                self.ids[id_key] = canonical
+                changed = True
+
+            variants = [query, name]
+            if country:
+                variants += [f"{query}, {country}", f"{name}, {country}"]
+            for variant in variants:
+                normalized = self.normalize(variant)
+                current = self.aliases.get(normalized)
+                if current == canonical or (current is not None and current in self.cities):
+                    continue  # Already mapped, or claimed by another learned city
+                self.aliases[normalized] = canonical
+                changed = True
+
+            if changed:
+                self._dirty = True
+            return canonical
+
+    def add_alias(self, alias: str, city_name: str) -> None:
+        """Register an alias for a city without persisting it (used for configured seeds)."""
+        with self._lock:
+            self.aliases.setdefault(self.normalize(alias), self.basic_key(city_name))
+
+    @property
+    def dirty(self) -> bool:
+        """True if learned changes have not been written to disk yet."""
+        return self._dirty
+
+    def flush(self) -> bool:
+        """Persist the index if it has unsaved changes (safe to call from any thread).
+
+        Returns:
+            bool: True if the index was written, False if it was clean or the write failed
+        """
+        with self._lock:
+            if not self._dirty:
+                return False
+            self._dirty = False
+        if self.save():
+            return True
+        with self._lock:
+            self._dirty = True  # Retry on the next flush
+        return False
+
+    def save(self) -> bool:
+        """Persist the learned index to disk.
+
+        Returns:
+            bool: True if the index was written, False otherwise
+        """
+        with self._lock:
+            payload = {'aliases': dict(self.aliases), 'cities': dict(self.cities), 'ids': dict(self.ids)}
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.index_file.with_suffix('.json.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, indent=2, ensure_ascii=False)
+            os.replace(temp_file, self.index_file)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.error(f"Failed to save city index: {e}")
+            return False
+
+    def _ensure_loaded(self) -> None:
+        """Load configured aliases and the persisted index on first use."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            for alias, city_name in self.config.CITY_ALIASES.items():
+                self.add_alias(alias, city_name)
+
+            if self.index_file.exists():
+                try:
+                    with open(self.index_file, 'r', encoding='utf-8') as f:
+                        payload = json.load(f)
+                    self.aliases.update(payload.get('aliases', {}))
+                    self.cities.update(payload.get('cities', {}))
+                    self.ids.update(payload.get('ids', {}))
+                except (OSError, json.JSONDecodeError, AttributeError) as e:
+                    self.logger.warn(f"Ignoring unreadable city index {self.index_file}: {e}")
+            self._loaded = True
@@ -6,11 +6,19 @@ Eliminates duplication and provides consistent color determination patterns.
 """
 
 import re
-from typing import Any, Optional
+import math
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
 
 from WeatherDashboard import styles
 from WeatherDashboard.utils.logger import Logger
 
+# Compiled threshold table: (ascending thresholds, colors, thresholds_sorted)
+ColorTable = Tuple[Tuple[float, ...], Tuple[str, ...], bool]
+
+# Color tables compiled once per theme: {theme: {metric_key: {'metric': table, 'imperial': table} or None}}
+_COMPILED_COLOR_TABLES: Dict[Any, Dict[str, Optional[Dict[str, ColorTable]]]] = {}
+
 
 class ColorUtils:
     """Color utility functions for weather dashboard styling with hybrid dependency injection."""
@@ -26,6 +34,9 @@ class ColorUtils:
     def get_metric_color(self, metric_key: str, value: Any, unit_system: str) -> str:
         """Centralized color determination for metric values.
         
+        Looks the value up in the metric's precompiled threshold table for the
+        active theme (a bisect over ascending thresholds).
+        
         Args:
             metric_key: The metric to get color for
             value: Current metric value
@@ -37,10 +48,10 @@ class ColorUtils:
         if value is None:
             return "darkslategray"
         
-        # Use styles surface layer to get live theme configuration
+        # Use styles surface layer to get the compiled tables for the live theme
         try:
-            color_config = self.styles.METRIC_COLOR_RANGES().get(metric_key)
-            if not color_config:
+            metric_tables = self._get_color_tables().get(metric_key)
+            if not metric_tables:
                 self.logger.debug(f"No color config found for metric: {metric_key}")
                 return "darkslategray"
         except (AttributeError, TypeError) as e:
@@ -48,23 +59,101 @@ class ColorUtils:
             self.logger.warn(f"METRIC_COLOR_RANGES not available, using fallback for {metric_key}: {e}")
             return "darkslategray"
         
-        # Choose appropriate ranges based on unit system
-        if color_config.get('unit_dependent', False) and unit_system == 'imperial':
-            ranges = color_config.get('imperial_ranges', color_config['ranges'])
-        else:
-            ranges = color_config['ranges']
-        
         # Find appropriate color based on value
         try:
             numeric_value = float(value)
-            for threshold, color in ranges:
-                if numeric_value <= threshold:
-                    return color
-            return ranges[-1][1]  # Return last color if value exceeds all thresholds
         except (ValueError, TypeError) as e:
             self.logger.warn(f"Error converting value '{value}' to float for {metric_key}: {e}")
             return "black"
 
+        # Choose appropriate table based on unit system
+        table = metric_tables['imperial'] if unit_system == 'imperial' else metric_tables['metric']
+        return self._lookup_color(table, numeric_value)
+
+    def _get_color_tables(self) -> Dict[str, Optional[Dict[str, ColorTable]]]:
+        """Return color tables for the active theme, compiling them on first use."""
+        theme = self.styles.CURRENT_THEME()
+        tables = _COMPILED_COLOR_TABLES.get(theme)
+        if tables is None:
+            tables = self._compile_color_tables(self.styles.METRIC_COLOR_RANGES())
+            _COMPILED_COLOR_TABLES[theme] = tables
+        return tables
+
+    def _compile_color_tables(self, color_ranges: Dict[str, Any]) -> Dict[str, Optional[Dict[str, ColorTable]]]:
+        """Compile theme color ranges into per-unit-system threshold tables.
+        
+        Args:
+            color_ranges: Theme metric color configuration (METRIC_COLOR_RANGES)
+            
+        Returns:
+            Dict mapping metric keys to {'metric': table, 'imperial': table}, or None
+            for metrics whose configuration is malformed
+        """
+        tables: Dict[str, Optional[Dict[str, ColorTable]]] = {}
+        for metric_key, color_config in color_ranges.items():
+            try:
+                metric_table = self._compile_ranges(color_config['ranges'])
+                if color_config.get('unit_dependent', False):
+                    imperial_table = self._compile_ranges(color_config.get('imperial_ranges', color_config['ranges']))
+                else:
+                    imperial_table = metric_table
+                tables[metric_key] = {'metric': metric_table, 'imperial': imperial_table}
+            except (KeyError, TypeError, ValueError) as e:
+                self.logger.warn(f"Invalid color ranges for {metric_key}: {e}")
+                tables[metric_key] = None
+        return tables
+
+    def _compile_ranges(self, ranges: List[Tuple[float, str]]) -> ColorTable:
+        """Split (threshold, color) pairs into parallel threshold and color tuples."""
+        if not ranges:
+            raise ValueError("color ranges cannot be empty")
+        thresholds = tuple(float(threshold) for threshold, _ in ranges)
+        colors = tuple(color for _, color in ranges)
+        return thresholds, colors, list(thresholds) == sorted(thresholds)
+
+    def _lookup_color(self, table: ColorTable, numeric_value: float) -> str:
+        """Return the color of the first threshold at or above the value (last color if none)."""
+        thresholds, colors, thresholds_sorted = table
+        if thresholds_sorted and not math.isnan(numeric_value):
+            index = bisect_left(thresholds, numeric_value)
+            return colors[index] if index < len(colors) else colors[-1]
+
+        # Unordered themes keep first-match semantics
+        for threshold, color in zip(thresholds, colors):
+            if numeric_value <= threshold:
+                return color
+        return colors[-1]
+
+    def get_temperature_color(self, temperature: Optional[float], feels_like: Optional[float], unit_system: str) -> str:
+        """Get color for a temperature display from numeric values.
+        
+        Uses the feels-like difference colors when a feels-like value is shown,
+        otherwise the standard temperature color.
+        
+        Args:
+            temperature: Actual temperature in the display unit system
+            feels_like: Displayed feels-like temperature, or None when not shown
+            unit_system: Current unit system
+            
+        Returns:
+            str: Color name for the temperature display
+        """
+        if temperature is None:
+            return "darkslategray"
+        if feels_like is None or feels_like == temperature:
+            return self.get_metric_color('temperature', temperature, unit_system)
+
+        difference = abs(feels_like - temperature)
+
+        # Use styles surface layer for live theme configuration
+        thresholds = self.styles.TEMPERATURE_THRESHOLDS()
+        threshold_large = thresholds['significant_difference_metric'] if unit_system == 'metric' else thresholds['significant_difference_imperial']
+        difference_colors = self.styles.TEMPERATURE_DIFFERENCE_COLORS()
+
+        if feels_like > temperature:  # Feels warmer
+            return difference_colors['significant_warmer'] if difference >= threshold_large else difference_colors['slight_warmer']
+        return difference_colors['significant_cooler'] if difference >= threshold_large else difference_colors['slight_cooler']
+
     def get_enhanced_temperature_color(self, temp_text: str, unit_system: str) -> str:
         """Get color for enhanced temperature display based on content.
         
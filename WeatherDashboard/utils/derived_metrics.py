@@ -4,10 +4,18 @@ Derived weather metric calculations.
 This module provides functions to calculate derived weather metrics
 from basic weather data including comfort indices and probability estimates.
 All temperature inputs should be in the specified units per function.
+
+Each scalar calculation has a NumPy batch counterpart (``*_batch``) that
+evaluates the same formula in the same operation order over whole arrays,
+so batch results match the scalar results exactly. Logarithms go through
+math.log element-wise, since np.log may round differently in the last bit.
+Not-applicable results (the scalar ``None``) are NaN in batch output.
 """
 
 import math
-from typing import Optional
+from typing import Optional, Dict, Mapping, Sequence, Any
+
+import numpy as np
 
 from WeatherDashboard import config
 
@@ -24,6 +32,10 @@ class DerivedMetricsCalculator:
         # Direct imports for stable utilities
         self.config = config
         self.math = math
+        self.np = np
+
+        # Internal state
+        self._math_log = np.frompyfunc(math.log, 1, 1)
 
     def calculate_heat_index(self, temp_f: float, humidity: float) -> Optional[float]:
         """Calculate heat index using the Rothfusz regression equation.
@@ -185,4 +197,179 @@ class DerivedMetricsCalculator:
         if pressure_diff > PRESSURE_THRESHOLD:
             score -= (pressure_diff - PRESSURE_THRESHOLD) * PRESSURE_PENALTY_FACTOR
         
-        return max(0, min(100, score))
\ No newline at end of file
+        return max(0, min(100, score))
+
+# ================================
+# BATCH (VECTORIZED) CALCULATIONS
+# ================================
+    def _as_float_array(self, values: Any) -> np.ndarray:
+        """Convert a scalar or sequence to a float64 array, mapping None to NaN."""
+        return self.np.asarray(values if values is not None else self.np.nan, dtype=float)
+
+    def _log_batch(self, values: np.ndarray) -> np.ndarray:
+        """Natural log of each value, NaN for non-positive or missing input.
+        
+        Uses math.log per element rather than np.log so results are
+        bit-identical to the scalar calculations.
+        """
+        positive = values > 0
+        with self.np.errstate(invalid='ignore'):
+            logs = self._math_log(self.np.where(positive, values, 1.0)).astype(float)
+        return self.np.where(positive, logs, self.np.nan)
+
+    def calculate_heat_index_batch(self, temp_f: Any, humidity: Any) -> np.ndarray:
+        """Vectorized calculate_heat_index.
+        
+        Args:
+            temp_f: Temperatures in Fahrenheit
+            humidity: Relative humidity percentages (0-100)
+            
+        Returns:
+            Heat index in Fahrenheit, NaN where temperature is below the NWS threshold
+        """
+        temp_f = self._as_float_array(temp_f)
+        humidity = self._as_float_array(humidity)
+
+        temp_f_sq = self.np.float_power(temp_f, 2)
+        humidity_sq = self.np.float_power(humidity, 2)
+
+        hi = -42.379 + 2.04901523 * temp_f + 10.14333127 * humidity
+        hi += -0.22475541 * temp_f * humidity - 6.83783e-3 * temp_f_sq
+        hi += -5.481717e-2 * humidity_sq + 1.22874e-3 * temp_f_sq * humidity
+        hi += 8.5282e-4 * temp_f * humidity_sq - 1.99e-6 * temp_f_sq * humidity_sq
+
+        return self.np.where(temp_f >= self.config.HEAT_INDEX_THRESHOLD_F, hi, self.np.nan)
+
+    def calculate_wind_chill_batch(self, temp_f: Any, wind_mph: Any) -> np.ndarray:
+        """Vectorized calculate_wind_chill.
+        
+        Args:
+            temp_f: Temperatures in Fahrenheit
+            wind_mph: Wind speeds in mph
+            
+        Returns:
+            Wind chill in Fahrenheit, NaN where NWS applicability conditions are not met
+        """
+        temp_f = self._as_float_array(temp_f)
+        wind_mph = self._as_float_array(wind_mph)
+
+        with self.np.errstate(invalid='ignore'):
+            wind_factor = self.np.float_power(wind_mph, 0.16)
+        wc = 35.74 + 0.6215 * temp_f - 35.75 * wind_factor
+        wc += 0.4275 * temp_f * wind_factor
+
+        applicable = (temp_f <= self.config.WIND_CHILL_TEMP_THRESHOLD_F) & (wind_mph >= self.config.WIND_CHILL_SPEED_THRESHOLD_MPH)
+        return self.np.where(applicable, wc, self.np.nan)
+
+    def calculate_dew_point_batch(self, temp_c: Any, humidity: Any) -> np.ndarray:
+        """Vectorized calculate_dew_point.
+        
+        Args:
+            temp_c: Temperatures in Celsius
+            humidity: Relative humidity percentages (0-100)
+            
+        Returns:
+            Dew point in Celsius, NaN where humidity is not positive
+        """
+        temp_c = self._as_float_array(temp_c)
+        humidity = self._as_float_array(humidity)
+
+        a = 17.27
+        b = 237.7
+
+        with self.np.errstate(divide='ignore', invalid='ignore'):
+            log_rh = self._log_batch(humidity / 100.0)
+            alpha = ((a * temp_c) / (b + temp_c)) + log_rh
+            return (b * alpha) / (a - alpha)
+
+    def calculate_precipitation_probability_batch(self, pressure: Any, humidity: Any, conditions: Any) -> np.ndarray:
+        """Vectorized calculate_precipitation_probability.
+        
+        Args:
+            pressure: Atmospheric pressures in hPa (NaN/None means unknown)
+            humidity: Relative humidity percentages (0-100)
+            conditions: Current weather condition descriptions
+            
+        Returns:
+            Estimated precipitation probabilities (0-100%)
+        """
+        pressure = self._as_float_array(pressure)
+        humidity = self._as_float_array(humidity)
+        conditions = self.np.char.lower(self.np.asarray(conditions, dtype=str))
+
+        base_prob = self.np.zeros(self.np.broadcast(pressure, humidity, conditions).shape)
+
+        with self.np.errstate(invalid='ignore'):
+            base_prob += self.np.where(pressure < 1000, (1000 - pressure) * 2, 0.0)
+            base_prob += self.np.where(humidity > 70, (humidity - 70) * 1.5, 0.0)
+
+        is_rain = self.np.zeros(conditions.shape, dtype=bool)
+        for keyword in ['rain', 'drizzle', 'shower', 'thunderstorm']:
+            is_rain |= self.np.char.find(conditions, keyword) >= 0
+        is_cloud = ~is_rain & (self.np.char.find(conditions, 'cloud') >= 0)
+        is_overcast = ~is_rain & ~is_cloud & (self.np.char.find(conditions, 'overcast') >= 0)
+        base_prob += self.np.select([is_rain, is_cloud, is_overcast], [40.0, 15.0, 25.0], 0.0)
+
+        return self.np.minimum(100, self.np.maximum(0, base_prob))
+
+    def calculate_weather_comfort_score_batch(self, temp_c: Any, humidity: Any, wind_speed: Any, pressure: Any) -> np.ndarray:
+        """Vectorized calculate_weather_comfort_score.
+        
+        Args:
+            temp_c: Temperatures in Celsius
+            humidity: Relative humidity percentages (0-100)
+            wind_speed: Wind speeds in m/s
+            pressure: Atmospheric pressures in hPa
+            
+        Returns:
+            Comfort scores (0-100), NaN where any input is missing
+        """
+        temp_c = self._as_float_array(temp_c)
+        humidity = self._as_float_array(humidity)
+        wind_speed = self._as_float_array(wind_speed)
+        pressure = self._as_float_array(pressure)
+
+        score = self.np.full(self.np.broadcast(temp_c, humidity, wind_speed, pressure).shape, 100.0)
+
+        with self.np.errstate(invalid='ignore'):
+            score -= self.np.select([temp_c < 18, temp_c > 24], [(18 - temp_c) * 3, (temp_c - 24) * 3], 0.0)
+            score -= self.np.select([humidity < 40, humidity > 60], [(40 - humidity) * 1.5, (humidity - 60) * 1.5], 0.0)
+            score -= self.np.select([wind_speed > 8, wind_speed < 0.5], [(wind_speed - 8) * 5, 10.0], 0.0)
+            pressure_diff = self.np.abs(pressure - 1013)
+            score -= self.np.where(pressure_diff > 20, (pressure_diff - 20) * 0.5, 0.0)
+
+        missing = self.np.isnan(temp_c) | self.np.isnan(humidity) | self.np.isnan(wind_speed) | self.np.isnan(pressure)
+        return self.np.where(missing, self.np.nan, self.np.maximum(0, self.np.minimum(100, score)))
+
+    def calculate_all_batch(self, columns: Mapping[str, Sequence[Any]]) -> Dict[str, np.ndarray]:
+        """Calculate every derived metric over metric-unit weather columns.
+        
+        Vectorized equivalent of WeatherDataParser._calculate_derived_metrics, using
+        the same defaults for missing columns and returning results in metric units.
+        
+        Args:
+            columns: Mapping of 'temperature' (°C), 'humidity' (%), 'wind_speed' (m/s),
+                'pressure' (hPa) and 'conditions' to equal-length sequences or arrays
+                
+        Returns:
+            Dict[str, np.ndarray]: heat_index, wind_chill, dew_point, precipitation_probability
+                and weather_comfort_score arrays, NaN where not applicable
+        """
+        temp_c = self._as_float_array(columns.get('temperature', 20))
+        humidity = self._as_float_array(columns.get('humidity', 50))
+        wind_speed_ms = self._as_float_array(columns.get('wind_speed', 0))
+        pressure = self._as_float_array(columns.get('pressure', 1013))
+        conditions = columns.get('conditions', '')
+        if not isinstance(conditions, str):
+            conditions = ['' if c is None else c for c in conditions]
+
+        temp_f = (temp_c * 9/5) + 32
+        wind_mph = wind_speed_ms * 2.23694
+
+        return {
+            'heat_index': (self.calculate_heat_index_batch(temp_f, humidity) - 32) * 5/9,
+            'wind_chill': (self.calculate_wind_chill_batch(temp_f, wind_mph) - 32) * 5/9,
+            'dew_point': self.calculate_dew_point_batch(temp_c, humidity),
+            'precipitation_probability': self.calculate_precipitation_probability_batch(pressure, humidity, conditions),
+            'weather_comfort_score': self.calculate_weather_comfort_score_batch(temp_c, humidity, wind_speed_ms, pressure),
+        }
@@ -0,0 +1,240 @@
+"""
+Segment rotation and compressed archival for append-only files.
+
+The active file is rotated into the archive directory when it reaches a
+size or age limit and compressed with gzip into an immutable segment. A JSON
+manifest beside the segments records each segment's time range, sizes and
+any caller-supplied summary, so readers can pick only the segments a query
+needs and stream them without decompressing to disk.
+
+Classes:
+    SegmentArchive: Rotates one active file into gzip segments and indexes them
+"""
+
+from typing import Dict, List, Any, Optional, TextIO
+from pathlib import Path
+from datetime import datetime, timedelta
+import gzip
+import json
+import os
+import shutil
+import threading
+
+from WeatherDashboard import config
+from WeatherDashboard.utils.logger import Logger
+
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class SegmentArchive:
+    """Rotate an append-only file into gzip-compressed segments with a manifest.
+
+    Rotation renames the active file into the archive directory first (so
+    writers immediately start a fresh file), then compresses it. A rename
+    left behind by an interrupted rotation is compressed on the next load.
+    Callers must not append to the active file while ``rotate`` runs (the
+    history writer thread does both).
+
+    Attributes:
+        active_file: File being appended to
+        archive_dir: Directory holding compressed segments and the manifest
+        manifest_file: Segment manifest (<active name>.segments.json)
+        max_bytes: Rotate once the active file reaches this size (0 disables)
+        max_age_days: Rotate once the active file has been in use this long (0 disables)
+    """
+
+    def __init__(self, active_file: Path, archive_dir: Optional[Path] = None,
+                 max_bytes: Optional[int] = None, max_age_days: Optional[float] = None) -> None:
+        """Initialize the archive (settings default to config.ARCHIVE, directory to OUTPUT['csv_backup_dir'])."""
+        # Direct imports for stable utilities
+        self.logger = Logger()
+        self.config = config
+
+        settings = self.config.ARCHIVE
+        self.active_file = Path(active_file)
+        self.archive_dir = Path(archive_dir or self.config.OUTPUT["csv_backup_dir"])
+        self.manifest_file = self.archive_dir / f"{self.active_file.name}.segments.json"
+        self.max_bytes = settings["max_segment_bytes"] if max_bytes is None else max_bytes
+        self.max_age_days = settings["max_segment_age_days"] if max_age_days is None else max_age_days
+
+        # Internal state
+        self._lock = threading.RLock()
+        self._manifest: Optional[Dict[str, Any]] = None
+
+# ================================
+# 1. ROTATION
+# ================================
+    def should_rotate(self, now: Optional[datetime] = None) -> bool:
+        """Return True if the active file has reached its size or age limit."""
+        if not self.active_file.exists():
+            return False
+        size = self.active_file.stat().st_size
+        if not size:
+            return False
+        if self.max_bytes and size >= self.max_bytes:
+            return True
+        if self.max_age_days:
+            now = now or datetime.now()
+            with self._lock:
+                manifest = self._load()
+                if not manifest.get('active_since'):
+                    manifest['active_since'] = now.strftime(TIMESTAMP_FORMAT)  # Age counts from first sight
+                    self._save()
+                    return False
+                active_since = datetime.strptime(manifest['active_since'], TIMESTAMP_FORMAT)
+            return now - active_since >= timedelta(days=self.max_age_days)
+        return False
+
+    def rotate(self, summary: Optional[Dict[str, Any]] = None, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """Move the active file into a compressed segment.
+
+        Args:
+            summary: Optional metadata stored with the segment; 'first_timestamp'
+                and 'last_timestamp' bound the segment for range queries
+                (defaulting to when the file became active and now)
+            now: Optional rotation time (defaults to now)
+
+        Returns:
+            Optional[Dict[str, Any]]: The new segment's manifest entry, or None if there was nothing to rotate
+        """
+        now = now or datetime.now()
+        with self._lock:
+            if not self.active_file.exists() or not self.active_file.stat().st_size:
+                return None
+            manifest = self._load()
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+
+            name = self._segment_name(now)
+            staging = self.archive_dir / f"{name[:-len('.gz')]}.rotating"
+            try:
+                os.replace(self.active_file, staging)
+            except OSError:
+                shutil.move(str(self.active_file), str(staging))  # Archive on another filesystem
+
+            segment = {
+                'first_timestamp': manifest.get('active_since'),
+                'last_timestamp': now.strftime(TIMESTAMP_FORMAT),
+            }
+            segment.update(summary or {})
+            manifest['active_since'] = now.strftime(TIMESTAMP_FORMAT)
+            return self._compress(staging, name, segment)
+
+    def _segment_name(self, now: datetime) -> str:
+        """Return an unused segment file name for a rotation time."""
+        stem, suffix = self.active_file.stem, self.active_file.suffix
+        base = f"{stem}-{now.strftime('%Y%m%d-%H%M%S')}"
+        name, counter = f"{base}{suffix}.gz", 1
+        while (self.archive_dir / name).exists() or (self.archive_dir / f"{name[:-3]}.rotating").exists():
+            name, counter = f"{base}-{counter}{suffix}.gz", counter + 1
+        return name
+
+    def _compress(self, staging: Path, name: str, segment: Dict[str, Any]) -> Dict[str, Any]:
+        """Compress a renamed active file into a segment and record it in the manifest."""
+        target = self.archive_dir / name
+        temp_target = self.archive_dir / f"{name}.tmp"
+        with open(staging, 'rb') as source, gzip.open(temp_target, 'wb') as destination:
+            shutil.copyfileobj(source, destination)
+        os.replace(temp_target, target)
+
+        segment.update({
+            'file': name,
+            'bytes': staging.stat().st_size,
+            'compressed_bytes': target.stat().st_size,
+        })
+        self._load()['segments'].append(segment)
+        self._save()
+        staging.unlink()
+        self.logger.info(f"Archived {self.active_file.name} segment {name} ({segment['bytes']} -> {segment['compressed_bytes']} bytes)")
+        return segment
+
+# ================================
+# 2. READING
+# ================================
+    def segments(self, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return manifest entries for segments overlapping a timestamp range, oldest first.
+
+        Args:
+            start: Optional inclusive lower bound ('YYYY-MM-DD HH:MM:SS' or a prefix)
+            end: Optional inclusive upper bound
+
+        Returns:
+            List[Dict[str, Any]]: Segment entries (with an absolute 'path') in rotation order
+        """
+        with self._lock:
+            entries = [dict(segment) for segment in self._load()['segments']]
+        selected = []
+        for segment in entries:
+            first, last = segment.get('first_timestamp'), segment.get('last_timestamp')
+            if start is not None and last and last < start:
+                continue
+            if end is not None and first and first > end:
+                continue
+            segment['path'] = str(self.archive_dir / segment['file'])
+            selected.append(segment)
+        return selected
+
+    def open_segment(self, segment: Dict[str, Any]) -> TextIO:
+        """Open a segment for streaming text reads (decompressed on the fly)."""
+        return gzip.open(self.archive_dir / segment['file'], 'rt', encoding='utf-8', newline='')
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return segment count and total raw/compressed bytes."""
+        with self._lock:
+            entries = self._load()['segments']
+            return {
+                'segments': len(entries),
+                'bytes': sum(segment.get('bytes') or 0 for segment in entries),
+                'compressed_bytes': sum(segment.get('compressed_bytes') or 0 for segment in entries),
+                'active_since': self._load().get('active_since'),
+            }
+
+# ================================
+# 3. MANIFEST
+# ================================
+    def _load(self) -> Dict[str, Any]:
+        """Load the manifest once, recovering rotations interrupted before compression."""
+        if self._manifest is not None:
+            return self._manifest
+        manifest: Dict[str, Any] = {'segments': [], 'active_since': None}
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    payload = json.load(f)
+                if not isinstance(payload.get('segments'), list):
+                    raise ValueError("missing segment list")
+                manifest.update(payload)
+            except (OSError, ValueError, AttributeError) as e:
+                self.logger.warn(f"Rebuilding unreadable segment manifest {self.manifest_file}: {e}")
+                manifest['segments'] = self._scan_segments()
+        self._manifest = manifest
+
+        pattern = f"{self.active_file.stem}-*.rotating"
+        for staging in sorted(self.archive_dir.glob(pattern)) if self.archive_dir.exists() else []:
+            try:
+                self._compress(staging, f"{staging.name[:-len('.rotating')]}.gz", {'first_timestamp': None, 'last_timestamp': None})
+            except OSError as e:
+                self.logger.error(f"Could not recover interrupted rotation {staging}: {e}")
+        return manifest
+
+    def _scan_segments(self) -> List[Dict[str, Any]]:
+        """List existing segment files without time bounds (used when the manifest is lost)."""
+        if not self.archive_dir.exists():
+            return []
+        pattern = f"{self.active_file.stem}-*{self.active_file.suffix}.gz"
+        return [
+            {'file': path.name, 'first_timestamp': None, 'last_timestamp': None,
+             'bytes': None, 'compressed_bytes': path.stat().st_size}
+            for path in sorted(self.archive_dir.glob(pattern))
+        ]
+
+    def _save(self) -> None:
+        """Atomically write the manifest."""
+        try:
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            temp_file = self.manifest_file.with_suffix('.json.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._manifest, f, indent=2, ensure_ascii=False)
+            os.replace(temp_file, self.manifest_file)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.error(f"Failed to save segment manifest {self.manifest_file}: {e}")
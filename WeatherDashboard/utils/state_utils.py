@@ -13,7 +13,7 @@ Classes:
 """
 
 import tkinter as tk
-from typing import List, Any
+from typing import List, Any, Optional
 
 from WeatherDashboard import config
 
@@ -115,6 +115,22 @@ class StateUtils:
         
         return visible_metrics
     
+    def get_visible_metric_filter(self, state_manager: Any) -> Optional[List[str]]:
+        """Get visible metric keys for filtering, or None when visibility is not tracked.
+        
+        Unlike get_visible_metrics, a state manager without visibility settings
+        yields None (meaning "no filter") rather than an empty list.
+        
+        Args:
+            state_manager: Application state manager instance
+            
+        Returns:
+            Optional[List[str]]: Visible metric keys, or None if visibility is unavailable
+        """
+        if not isinstance(getattr(state_manager, 'visibility', None), dict):
+            return None
+        return self.get_visible_metrics(state_manager)
+
     def set_metric_visibility(self, state_manager: Any, metric_key: str, visible: bool) -> bool:
         """Safely set metric visibility.
         
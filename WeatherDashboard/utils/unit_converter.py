@@ -10,7 +10,7 @@ Classes:
     UnitConverter: Static utility class for weather unit conversions and formatting
 """
 
-from typing import Tuple, Any
+from typing import Tuple, Any, Callable
 
 from WeatherDashboard import config, dialog
 
@@ -98,6 +98,21 @@ class UnitConverter:
             'weather_icon': {'precision': None, 'include_unit': False},
         }
 
+        # Precompiled value formatters - built once instead of per format_value call
+        self._value_formatters = {
+            metric: self._build_value_formatter(spec.get('precision', 1))
+            for metric, spec in self.format_config.items()
+        }
+        self._default_value_formatter = self._build_value_formatter(1)
+
+    @staticmethod
+    def _build_value_formatter(precision: Any) -> Callable[[Any], str]:
+        """Return a formatter applying the given decimal precision (None means plain str)."""
+        if precision is None:
+            return str
+        format_string = f"{{:.{precision}f}}".format
+        return lambda val: format_string(float(val))
+
     def _generic_convert(self, value: float, from_unit: str, to_unit: str, conversion_type: str) -> float:
         """Generic conversion function for all unit types.
         
@@ -230,17 +245,12 @@ class UnitConverter:
         if val is None:
             return "--"
         
-        # Get format configuration for this metric
-        format_spec = self.format_config.get(metric, {'precision': 1, 'include_unit': '{:.1f}'})
+        # Get precompiled formatter for this metric
+        value_formatter = self._value_formatters.get(metric, self._default_value_formatter)
         
         try:
             # Format the value
-            precision = format_spec.get('precision', 1)
-            if precision is None:
-                formatted_val = str(val)
-            else:
-                format_string = f"{{:.{precision}f}}"
-                formatted_val = format_string.format(float(val))
+            formatted_val = value_formatter(val)
             
             # Get unit label
             unit_label = self.get_unit_label(metric, unit_system)
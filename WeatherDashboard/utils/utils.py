@@ -9,6 +9,7 @@ Functions:
     is_fallback: Check if weather data is from fallback source
     format_fallback_status: Format status messages for fallback data
     city_key: Generate consistent city keys for data storage
+    city_display_name: Canonical display name for a city
 """
 
 from typing import Dict, Any
@@ -16,6 +17,10 @@ from typing import Dict, Any
 from WeatherDashboard import config, dialog
 
 from .validation_utils import ValidationUtils
+from .city_index import CityIndex
+
+# One alias index per process so every cache, the history store and the scheduler agree on keys
+_SHARED_CITY_INDEX = CityIndex()
 
 
 class Utils:
@@ -24,6 +29,7 @@ class Utils:
         self.config = config
         self.dialog = dialog
         self.validation_utils = ValidationUtils()
+        self.city_index = _SHARED_CITY_INDEX
 
     def is_fallback(self, data: Dict[str, Any]) -> bool:
         """Check if the data was generated as a fallback."""
@@ -57,6 +63,9 @@ class Utils:
     def city_key(self, name: str) -> str:
         """Generate a normalized key for city name for consistent storage/lookup.
         
+        Aliases and country-qualified variants resolve through the city index,
+        so "NYC", "new york" and "New York, US" share one key.
+        
         Args:
             name: City name
             
@@ -68,5 +77,17 @@ class Utils:
         """
         self.validation_utils.validate_city_name(name)
         
-        normalized = name.strip().title()
-        return normalized.lower().replace(" ", "_")
+        return self.city_index.resolve(name)
+
+    def city_display_name(self, name: str) -> str:
+        """Return the canonical display name for a city (API-reported name when learned).
+        
+        Args:
+            name: City name
+            
+        Returns:
+            str: Display name (e.g., "nyc" -> "New York" once learned)
+        """
+        self.validation_utils.validate_city_name(name)
+        
+        return self.city_index.display_name(name)
@@ -101,11 +101,12 @@ class BaseWidgetManager:
             return self.frames['title']
         return None
     
-    def update_metric_display(self, metrics: Dict[str, str]) -> None:
+    def update_metric_display(self, metrics: Dict[str, str], numeric_values: Optional[Dict[str, Optional[float]]] = None) -> None:
         """Update the metric display widgets with the provided metrics.
 
         Args:
             metrics: Dictionary or data structure containing metric values to display.
+            numeric_values: Optional typed values behind the displayed metrics.
 
         Side Effects:
             Updates the UI to reflect new metric values.
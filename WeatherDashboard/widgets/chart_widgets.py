@@ -15,6 +15,7 @@ from tkinter import ttk
 from typing import List, Any, Optional, Dict
 
 from matplotlib.figure import Figure
+from matplotlib.ticker import MaxNLocator
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 from WeatherDashboard import config, styles
@@ -164,7 +165,8 @@ class ChartWidgets(BaseWidgetManager, IWeatherDashboardWidgets):
 
 
     def update_chart_display(self, x_vals: List[str], y_vals: List[Any], metric_key: str, city: str, unit_system: str,
-                             labels: Optional[List[str]] = None, colors: Optional[List[str]] = None) -> None:
+                             labels: Optional[List[str]] = None, colors: Optional[List[str]] = None,
+                             summary: Optional[str] = None) -> None:
         """Updates the chart display with new data.
         
         Args:
@@ -174,6 +176,7 @@ class ChartWidgets(BaseWidgetManager, IWeatherDashboardWidgets):
             city: City name for chart title
             unit_system: Unit system for axis labeling
             labels: Optional list of custom labels for multiple series (e.g., city names)
+            summary: Optional range summary shown as a second title line
         """
         if not (hasattr(self, 'chart_canvas') and hasattr(self, 'chart_ax') and self.chart_ax is not None):
             self.logger.warn(self.config.ERROR_MESSAGES['config_error'].format(section="chart display", reason="matplotlib setup failed"))
@@ -213,10 +216,13 @@ class ChartWidgets(BaseWidgetManager, IWeatherDashboardWidgets):
             labels = self._format_chart_labels(metric_key, city, unit_system)
 
             # Set chart properties
-            self.chart_ax.set_title(labels['title'], fontsize=12, fontweight='bold')
+            title = f"{labels['title']}\n{summary}" if summary else labels['title']
+            self.chart_ax.set_title(title, fontsize=12, fontweight='bold')
             self.chart_ax.set_xlabel(labels['x_label'], fontsize=10)
             self.chart_ax.set_ylabel(labels['y_label'], fontsize=10)
             self.chart_ax.grid(True, alpha=0.3) # Add grid
+            if len(x_vals) > self.config.CHART['chart_max_x_labels']:
+                self.chart_ax.xaxis.set_major_locator(MaxNLocator(self.config.CHART['chart_max_x_labels']))
 
             # Additional formatting
             self.chart_fig.autofmt_xdate(rotation=self.config.CHART['chart_rotation_degrees'])
@@ -249,15 +249,16 @@ class WeatherDashboardWidgets(BaseWidgetManager, IWeatherDashboardWidgets):
                 return w.get_creation_error()
         return None
 
-    def update_metric_display(self, metrics: Dict[str, str]) -> None:
+    def update_metric_display(self, metrics: Dict[str, str], numeric_values: Optional[Dict[str, Optional[float]]] = None) -> None:
         """Delegate metric display update to metric_widgets."""
         if self.metric_widgets:
-            self.metric_widgets.update_metric_display(metrics)
+            self.metric_widgets.update_metric_display(metrics, numeric_values)
 
-    def update_chart_display(self, x_vals: List[str], y_vals: List[Any], metric_key: str, city: str, unit_system: str) -> None:
+    def update_chart_display(self, x_vals: List[str], y_vals: List[Any], metric_key: str, city: str, unit_system: str,
+                             summary: Optional[str] = None) -> None:
         """Delegate chart display update to chart_widgets."""
         if self.chart_widgets:
-            self.chart_widgets.update_chart_display(x_vals, y_vals, metric_key, city, unit_system)
+            self.chart_widgets.update_chart_display(x_vals, y_vals, metric_key, city, unit_system, summary=summary)
 
     def clear_chart_with_error_message(self) -> None:
         """Delegate chart clearing to chart_widgets."""
@@ -75,6 +75,7 @@ class MetricDisplayWidgets(BaseWidgetManager, IWeatherDashboardWidgets):
 
         # Widget references
         self.metric_labels: Dict[str, Dict[str, ttk.Label]] = {}
+        self.metric_values: Dict[str, Optional[float]] = {}
         self.city_label: Optional[ttk.Label] = None
         self.date_label: Optional[ttk.Label] = None
         self.alert_status_widget: Optional[AlertStatusIndicator] = None
@@ -95,7 +96,7 @@ class MetricDisplayWidgets(BaseWidgetManager, IWeatherDashboardWidgets):
 # ================================  
 # 2. METRIC DISPLAY UPDATES
 # ================================
-    def update_metric_display(self, metric_displays: Dict[str, str]) -> None:
+    def update_metric_display(self, metric_displays: Dict[str, str], numeric_values: Optional[Dict[str, Optional[float]]] = None) -> None:
         """Update metric displays based on visibility settings and formatted data.
 
         Clears existing displays, processes metrics in defined column order,
@@ -104,7 +105,11 @@ class MetricDisplayWidgets(BaseWidgetManager, IWeatherDashboardWidgets):
 
         Args:
             metric_displays: Dictionary of formatted metric data for display
+            numeric_values: Typed values behind the displays, used for color lookups
+                (display text is parsed only for metrics missing here)
         """
+        self.metric_values = dict(numeric_values or {})
+
         layout_config = self.styles.LAYOUT_CONFIG()
         metric_config = layout_config['widget_positions']['metric_display']
         left_col_config = metric_config['left_column']
@@ -269,12 +274,9 @@ class MetricDisplayWidgets(BaseWidgetManager, IWeatherDashboardWidgets):
                 
                 # Handle different text states
                 if current_text and current_text != '--':
-                    raw_value = self.color_utils.extract_numeric_value(current_text)
+                    raw_value = self._get_metric_value(metric_key, current_text)
                     if raw_value is not None:
-                        if metric_key == 'temperature' and 'feels' in current_text:
-                            color = self.color_utils.get_enhanced_temperature_color(current_text, unit_system)
-                        else:
-                            color = self.color_utils.get_metric_color(metric_key, raw_value, unit_system)
+                        color = self._get_metric_display_color(metric_key, current_text, unit_system)
                         
                         # Use the improved color application method
                         self._apply_metric_color(widgets['value'], color, metric_key)
@@ -398,8 +400,8 @@ class MetricDisplayWidgets(BaseWidgetManager, IWeatherDashboardWidgets):
         
         # Special handling for comfort score - show progress bar instead of text
         if metric_key == 'weather_comfort_score' and value_text != '--':
-            # Extract numeric value for progress bar
-            raw_value = self.color_utils.extract_numeric_value(value_text)
+            # Numeric value for progress bar
+            raw_value = self._get_metric_value(metric_key, value_text)
             if raw_value is not None:
                 # Clear the value label and add progress bar
                 widgets['value'].configure(text="")
@@ -425,15 +427,9 @@ class MetricDisplayWidgets(BaseWidgetManager, IWeatherDashboardWidgets):
             # Add color coding based on metric value
             unit_system = self.state.get_current_unit_system()
 
-            # Special color logic for enhanced temperature display
-            if metric_key == 'temperature' and 'feels' in value_text:
-                color = self.color_utils.get_enhanced_temperature_color(value_text, unit_system)
-                # Check alerts for enhanced temperature (use base temperature)
-                raw_value = self.color_utils.extract_numeric_value(value_text)
-            else:
-                # Standard color logic for other metrics
-                raw_value = self.color_utils.extract_numeric_value(value_text)
-                color = self.color_utils.get_metric_color(metric_key, raw_value, unit_system)
+            # Color lookup from typed values (enhanced temperature uses feels-like colors)
+            raw_value = self._get_metric_value(metric_key, value_text)
+            color = self._get_metric_display_color(metric_key, value_text, unit_system)
             
             self._apply_metric_color(widgets['value'], color, metric_key)
 
@@ -446,6 +442,30 @@ class MetricDisplayWidgets(BaseWidgetManager, IWeatherDashboardWidgets):
         # Grid positioning (always executed, uses padx defined at top)
         self.widget_utils.position_widget_pair(self.parent, widgets['label'], widgets['value'], row, label_col, value_col, label_text)
 
+    def _get_metric_value(self, metric_key: str, value_text: str) -> Optional[float]:
+        """Return the typed value behind a metric display, parsing its text only as a fallback."""
+        if metric_key in self.metric_values:
+            return self.metric_values[metric_key]
+        return self.color_utils.extract_numeric_value(value_text)
+
+    def _get_metric_display_color(self, metric_key: str, value_text: str, unit_system: str) -> str:
+        """Determine the display color for a metric from its typed value.
+        
+        Args:
+            metric_key: Weather metric identifier
+            value_text: Displayed text (used for the feels-like indicator and as a parsing fallback)
+            unit_system: Current unit system
+            
+        Returns:
+            str: Color for the metric value widget
+        """
+        if metric_key == 'temperature' and 'feels' in value_text:
+            if 'temperature' in self.metric_values:
+                return self.color_utils.get_temperature_color(
+                    self.metric_values['temperature'], self.metric_values.get('feels_like'), unit_system)
+            return self.color_utils.get_enhanced_temperature_color(value_text, unit_system)
+        return self.color_utils.get_metric_color(metric_key, self._get_metric_value(metric_key, value_text), unit_system)
+
     def _apply_metric_color(self, widget, color, metric_key):
         """Apply color to metric widget with proper TTK style handling.
         
@@ -544,12 +564,9 @@ class MetricDisplayWidgets(BaseWidgetManager, IWeatherDashboardWidgets):
                 unit_system = self.state.get_current_unit_system()
                 
                 if current_text and current_text != '--':
-                    raw_value = self.color_utils.extract_numeric_value(current_text)
+                    raw_value = self._get_metric_value(metric_key, current_text)
                     if raw_value is not None:
-                        if metric_key == 'temperature' and 'feels' in current_text:
-                            color = self.color_utils.get_enhanced_temperature_color(current_text, unit_system)
-                        else:
-                            color = self.color_utils.get_metric_color(metric_key, raw_value, unit_system)
+                        color = self._get_metric_display_color(metric_key, current_text, unit_system)
                         
                         # Use the improved color application method
                         self._apply_metric_color(widgets['value'], color, metric_key)
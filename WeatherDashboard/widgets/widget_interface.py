@@ -23,7 +23,7 @@ class IWeatherDashboardWidgets:
         """Return error message if widget creation failed, else None."""
         raise NotImplementedError
 
-    def update_metric_display(self, metrics: Dict[str, str]) -> None:
+    def update_metric_display(self, metrics: Dict[str, str], numeric_values: Optional[Dict[str, Optional[float]]] = None) -> None:
         """Update metric display widgets."""
         raise NotImplementedError
 
@@ -35,7 +35,8 @@ class IWeatherDashboardWidgets:
         """Update alert display widgets."""
         raise NotImplementedError
 
-    def update_chart_display(self, x_vals: List[str], y_vals: List[Any], metric_key: str, city: str, unit_system: str) -> None:
+    def update_chart_display(self, x_vals: List[str], y_vals: List[Any], metric_key: str, city: str, unit_system: str,
+                             summary: Optional[str] = None) -> None:
         """Update chart display widgets."""
         raise NotImplementedError
 
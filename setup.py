@@ -87,6 +87,7 @@ setup(
     install_requires=[
         "requests>=2.31.0",
         "matplotlib>=3.7.0",
+        "numpy>=1.24.0",
         "python-dotenv>=1.0.0",
     ],
     extras_require={
@@ -0,0 +1,133 @@
+"""
+Unit tests for BackgroundWriter class.
+
+Tests background batched writing including:
+- Text appends flushed in order and drained on close
+- History rows handed to the store in batches
+- Size-based flushing and error reporting
+- Maintenance tasks run in order on the writer thread
+- Late writes after close reported and dropped
+- fsync policy validation
+- fsync policy applied to history stores
+"""
+
+import unittest
+from unittest.mock import Mock
+import tempfile
+import shutil
+import os
+import threading
+
+# Add project root to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from WeatherDashboard.utils.background_writer import BackgroundWriter
+
+
+class TestBackgroundWriter(unittest.TestCase):
+    """Test cases for BackgroundWriter class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'output.txt')
+        self.errors = []
+        self.writer = BackgroundWriter(batch_size=10, flush_interval=5.0, fsync_policy='none', on_error=self.errors.append)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.writer.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_thread_starts_lazily(self):
+        """Test no thread is started until something is written."""
+        self.assertIsNone(self.writer._thread)
+        self.assertTrue(self.writer.flush(timeout=1))
+
+    def test_text_appends_written_in_order_on_flush(self):
+        """Test queued text (including rendered callables) is appended in order."""
+        self.writer.append_text(self.path, "first\n")
+        self.writer.append_text(self.path, lambda: "second\n")
+
+        self.assertTrue(self.writer.flush(timeout=5))
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), "first\nsecond\n")
+
+    def test_rows_batched_into_single_store_call(self):
+        """Test rows for the same store within a batch reach append_many together."""
+        store = Mock()
+        written = []
+        for i in range(3):
+            self.writer.append_rows(store, [('london', {'n': i})], written.append)
+
+        self.writer.close()
+        store.append_many.assert_called_once_with([('london', {'n': 0}), ('london', {'n': 1}), ('london', {'n': 2})])
+        self.assertEqual(written, [1, 1, 1])
+
+    def test_flushes_when_batch_size_reached(self):
+        """Test a full batch is written without waiting for the flush interval."""
+        store = Mock()
+        done = threading.Event()
+        store.append_many.side_effect = lambda rows: done.set()
+
+        for i in range(10):
+            self.writer.append_rows(store, [('london', {'n': i})])
+
+        self.assertTrue(done.wait(2))
+
+    def test_write_errors_reported_not_raised(self):
+        """Test failures on the writer thread go to the error callback."""
+        store = Mock()
+        store.append_many.side_effect = OSError("disk full")
+        self.writer.append_rows(store, [('london', {})])
+        self.writer.append_text(os.path.join(self.temp_dir, 'missing', 'out.txt'), "text")
+
+        self.writer.flush(timeout=5)
+        self.assertEqual(len(self.errors), 2)
+        self.assertIn("disk full", self.errors[0])
+
+    def test_tasks_run_after_earlier_writes(self):
+        """Test queued tasks run on the writer thread once earlier writes are done."""
+        seen = []
+        self.writer.append_text(self.path, "row\n")
+        self.writer.call(lambda: seen.append((os.path.getsize(self.path), threading.current_thread().name)))
+        self.writer.call(lambda: 1 / 0)
+
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertEqual(seen, [(4, 'BackgroundWriter')])
+        self.assertEqual(len(self.errors), 1)
+
+    def test_closed_writer_drops_late_writes(self):
+        """Test writes after close are reported and dropped instead of raised into the caller."""
+        self.writer.close()
+        self.writer.append_text(self.path, "late")
+        self.writer.append_rows(Mock(), [('london', {})])
+
+        self.assertEqual(len(self.errors), 2)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertIsNone(self.writer._thread)
+
+    def test_fsync_policy_applies_to_stores(self):
+        """Test stores are synced after each batch under 'batch' and once on close under 'close'."""
+        for policy, synced_before_close in (('batch', True), ('close', False), ('none', False)):
+            with self.subTest(policy=policy):
+                writer = BackgroundWriter(batch_size=10, flush_interval=5.0, fsync_policy=policy, on_error=self.errors.append)
+                store = Mock()
+                writer.append_rows(store, [('london', {})])
+                self.assertTrue(writer.flush(timeout=5))
+                self.assertEqual(store.sync.called, synced_before_close)
+
+                writer.close()
+                self.assertEqual(store.sync.call_count, 0 if policy == 'none' else 1)
+
+        self.assertEqual(self.errors, [])
+
+    def test_invalid_fsync_policy(self):
+        """Test unknown fsync policies are rejected."""
+        with self.assertRaises(ValueError):
+            BackgroundWriter(fsync_policy='sometimes')
+
+
+if __name__ == '__main__':
+    unittest.main()
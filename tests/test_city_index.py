@@ -0,0 +1,93 @@
+"""
+Unit tests for CityIndex class.
+
+Tests city name canonicalization including:
+- Configured aliases and country-qualified variants
+- Learning aliases from API responses (name, country, id)
+- Keeping same-named cities in different countries apart
+- Persistence of the learned index
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+
+# Add project root to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from WeatherDashboard.utils.city_index import CityIndex
+
+
+class TestCityIndex(unittest.TestCase):
+    """Test cases for CityIndex class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.index_file = os.path.join(self.temp_dir, 'city_index.json')
+        self.index = CityIndex(index_file=self.index_file)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_resolve_plain_names_keep_basic_key(self):
+        """Test unknown cities resolve to the plain key format."""
+        self.assertEqual(self.index.resolve('San Francisco'), 'san_francisco')
+        self.assertEqual(self.index.resolve('Multi  Space  City'), 'multi__space__city')
+
+    def test_resolve_configured_aliases_and_country_variants(self):
+        """Test aliases and country-qualified names share the canonical key."""
+        for name in ['NYC', 'new york', 'New York, US', '  New   York City ']:
+            with self.subTest(name=name):
+                self.assertEqual(self.index.resolve(name), 'new_york')
+
+    def test_learn_from_api_response(self):
+        """Test learned queries resolve to the API city and persist to disk once flushed."""
+        key = self.index.learn('Big Apple', 'New York', 'US', 5128581)
+
+        self.assertEqual(key, 'new_york')
+        self.assertEqual(self.index.resolve('big apple'), 'new_york')
+        self.assertEqual(self.index.display_name('Big Apple'), 'New York')
+        self.assertFalse(os.path.exists(self.index_file))  # Learning never writes on the fetch path
+        self.assertTrue(self.index.dirty)
+
+        self.assertTrue(self.index.flush())
+        self.assertFalse(self.index.dirty)
+        self.assertFalse(self.index.flush())  # Nothing new to write
+        self.assertTrue(os.path.exists(self.index_file))
+
+        reloaded = CityIndex(index_file=self.index_file)
+        self.assertEqual(reloaded.resolve('Big Apple'), 'new_york')
+        self.assertEqual(reloaded.ids['5128581'], 'new_york')
+
+    def test_learn_uses_city_id_over_name(self):
+        """Test a differently named response for a known id maps to the existing key."""
+        self.index.learn('London', 'London', 'GB', 2643743)
+        key = self.index.learn('City Of London', 'City of London', 'GB', 2643743)
+
+        self.assertEqual(key, 'london')
+        self.assertEqual(self.index.resolve('City of London'), 'london')
+
+    def test_same_name_different_country_kept_apart(self):
+        """Test country qualifiers separate same-named cities once learned."""
+        self.index.learn('Paris', 'Paris', 'FR', 2988507)
+        texas_key = self.index.learn('Paris, US', 'Paris', 'US', 4717560)
+
+        self.assertEqual(self.index.resolve('Paris'), 'paris')
+        self.assertEqual(self.index.resolve('Paris, FR'), 'paris')
+        self.assertEqual(texas_key, 'paris,us')
+        self.assertEqual(self.index.resolve('Paris, US'), 'paris,us')
+
+    def test_learn_without_name_does_not_persist(self):
+        """Test responses without a name leave the index untouched."""
+        self.assertEqual(self.index.learn('Springfield', None), 'springfield')
+        self.assertFalse(self.index.dirty)
+        self.assertFalse(self.index.flush())
+        self.assertFalse(os.path.exists(self.index_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,7 +9,7 @@ Tests color determination logic with focus on:
 """
 
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, Mock
 
 # Add project root to path for imports
 import sys
@@ -341,5 +341,47 @@ class TestColorUtils(unittest.TestCase):
                     self.assertIsInstance(result, (float, type(None)))
 
 
+    def test_compiled_table_lookup_matches_linear_scan(self):
+        """Test bisect lookups on compiled tables match first-match linear scanning."""
+        tables = self.color_utils._compile_color_tables(self.mock_color_ranges)
+        ranges = self.mock_color_ranges['temperature']['ranges']
+
+        for value in [-50, -20, -19.9, 0, 5, 14.99, 15, 30, 45, 60]:
+            with self.subTest(value=value):
+                expected = next((color for threshold, color in ranges if value <= threshold), ranges[-1][1])
+                self.assertEqual(self.color_utils._lookup_color(tables['temperature']['metric'], value), expected)
+
+        # Unit-independent metrics share one table across unit systems
+        self.assertIs(tables['humidity']['metric'], tables['humidity']['imperial'])
+
+    def test_compiled_tables_cached_per_theme(self):
+        """Test color tables compile once per theme and mark malformed metrics."""
+        from WeatherDashboard.utils import color_utils as color_utils_module
+
+        mock_styles = Mock()
+        mock_styles.CURRENT_THEME.return_value = 'test_theme'
+        mock_styles.METRIC_COLOR_RANGES.return_value = dict(self.mock_color_ranges, pressure={'ranges': []})
+        self.color_utils.styles = mock_styles
+
+        with patch.dict(color_utils_module._COMPILED_COLOR_TABLES, clear=True):
+            self.assertEqual(self.color_utils.get_metric_color('temperature', 25, 'metric'), '#E67E22')
+            self.assertEqual(self.color_utils.get_metric_color('temperature', 25, 'imperial'), '#3498DB')
+            self.assertEqual(self.color_utils.get_metric_color('pressure', 1013, 'metric'), 'darkslategray')
+            self.assertIn('test_theme', color_utils_module._COMPILED_COLOR_TABLES)
+
+        mock_styles.METRIC_COLOR_RANGES.assert_called_once()
+
+    def test_get_temperature_color_numeric(self):
+        """Test numeric temperature coloring agrees with the text-based version."""
+        for temperature, feels_like in [(20.0, 25.0), (20.0, 21.0), (20.0, 15.0), (20.0, 19.0)]:
+            with self.subTest(temperature=temperature, feels_like=feels_like):
+                arrow = '↑' if feels_like > temperature else '↓'
+                text = f"{temperature:.1f} °C (feels {feels_like:.1f} °C {arrow})"
+                self.assertEqual(
+                    self.color_utils.get_temperature_color(temperature, feels_like, 'metric'),
+                    self.color_utils.get_enhanced_temperature_color(text, 'metric'))
+
+        self.assertEqual(self.color_utils.get_temperature_color(None, 20.0, 'metric'), 'darkslategray')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -339,6 +339,13 @@ class TestWeatherDashboardController(unittest.TestCase):
         # Test that the chart service exists
         self.assertIsNotNone(self.controller._chart_service)
 
+    def test_chart_date_labels_follow_tier(self):
+        """Test daily series are labelled by date and hourly series by date and time."""
+        days = [datetime(2024, 3, day, 14, 30) for day in (1, 2, 3)]
+        hours = [datetime(2024, 3, 1, hour) for hour in (0, 1, 2)]
+        self.assertEqual(self.controller._chart_service._date_label_format(days), "%Y-%m-%d")
+        self.assertEqual(self.controller._chart_service._date_label_format(hours), "%m-%d %H:%M")
+
     def test_error_handler_integration(self):
         """Test integration with error handler for different error types."""
         # Test different error scenarios
@@ -356,6 +363,27 @@ class TestWeatherDashboardController(unittest.TestCase):
                 # The mock returns a Mock object, not a boolean
                 self.assertIsNotNone(result)
 
+    def test_switch_unit_system_without_displayed_city(self):
+        """Test unit switch is a no-op before any city has been displayed."""
+        self.assertFalse(self.controller.switch_unit_system("imperial"))
+        self.mock_data_service.get_cached_city_data.assert_not_called()
+
+    def test_switch_unit_system_renders_from_cache(self):
+        """Test unit switch re-renders from cached data without fetching."""
+        self.controller._validation_service.validate_inputs = Mock(return_value=None)
+        self.controller._alert_service.generate_alerts = Mock(return_value=[])
+        self.controller.update_weather_display("New York", "metric")
+        self.controller._data_service.fetch_data.reset_mock()
+
+        self.mock_data_service.get_cached_city_data.return_value = {"temperature": 77.0, "humidity": 60}
+        self.controller._chart_service.update_chart = Mock()
+
+        self.assertTrue(self.controller.switch_unit_system("imperial"))
+
+        self.mock_data_service.get_cached_city_data.assert_called_once_with("New York", "imperial")
+        self.controller._data_service.fetch_data.assert_not_called()
+        self.controller._chart_service.update_chart.assert_called_once_with(use_cache=True)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -18,11 +18,15 @@ from unittest.mock import Mock, patch, mock_open
 from datetime import datetime, timedelta
 import tempfile
 import os
+from pathlib import Path
+
+import numpy as np
 
 # Add project root to path for imports
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from WeatherDashboard import config
 from WeatherDashboard.core.data_manager import WeatherDataManager
 from WeatherDashboard.services.api_exceptions import WeatherDashboardError
 
@@ -30,7 +34,25 @@ from WeatherDashboard.services.api_exceptions import WeatherDashboardError
 class TestWeatherDataManager(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures."""
+        # Keep the history database, journal, text log and logs out of the package data directory
+        self.temp_dir = tempfile.TemporaryDirectory()
+        data_dir = Path(self.temp_dir.name)
+        for patcher in (
+            patch.dict(config.OUTPUT, {"data_dir": str(data_dir), "log_dir": str(data_dir / "logs"),
+                                       "text_file": str(data_dir / "output.txt"), "csv_dir": str(data_dir / "csv"),
+                                       "csv_backup_dir": str(data_dir / "csv" / "backup")}),
+            patch.dict(config.HISTORY, {"db_file": str(data_dir / "weather_history.db"),
+                                        "journal_file": str(data_dir / "history.journal")}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        (data_dir / "logs").mkdir()
         self.data_manager = WeatherDataManager()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.data_manager.history_service.close()
+        self.temp_dir.cleanup()
         
     @patch('WeatherDashboard.core.data_manager.config')
     def test_convert_units_metric_to_imperial(self, mock_config):
@@ -312,6 +334,88 @@ class TestWeatherDataManager(unittest.TestCase):
             self.assertEqual(result['temperature'], 25)
             self.assertEqual(result['humidity'], 60)
 
+    def test_get_cached_current_converts_canonical_data(self):
+        """Test cached observation is re-served in another unit system without refetching."""
+        with patch.object(self.data_manager, 'api_service') as mock_api:
+            mock_api.fetch_current.return_value = {'temperature': 0.0, 'humidity': 60, 'api_error': 'boom', 'error_type': 'NetworkError'}
+            self.data_manager.fetch_current("TestCity", "metric")
+
+            cached = self.data_manager.get_cached_current("TestCity", "imperial")
+
+            mock_api.fetch_current.assert_called_once()
+        self.assertAlmostEqual(cached['temperature'], 32.0)
+        self.assertEqual(cached['humidity'], 60)
+        self.assertNotIn('api_error', cached)
+        self.assertIsNone(self.data_manager.get_cached_current("OtherCity", "imperial"))
+
+    def test_get_cached_historical(self):
+        """Test cached historical series is reused only for the range it was built for."""
+        with patch.object(self.data_manager, 'history_service') as mock_history:
+            mock_history.get_historical.return_value = [{'temperature': float(i)} for i in range(7)]
+            self.data_manager.get_historical("TestCity", 7)
+
+        self.assertEqual(len(self.data_manager.get_cached_historical("TestCity", 7)), 7)
+        self.assertIsNone(self.data_manager.get_cached_historical("TestCity", 3))  # May come from another tier
+        self.assertIsNone(self.data_manager.get_cached_historical("TestCity", 14))
+
+    def test_canonical_caches_keep_most_recently_used_cities(self):
+        """Test the canonical caches evict the least recently used city past MEMORY['max_cities_stored']."""
+        with patch.dict(config.MEMORY, {"max_cities_stored": 2}), \
+             patch.object(self.data_manager, 'history_service') as mock_history:
+            mock_history.get_historical.return_value = [{'temperature': 1.0}]
+            for city in ("Alpha", "Beta"):
+                self.data_manager.get_historical(city, 7)
+            self.data_manager.get_cached_historical("Alpha", 7)  # Alpha is now the most recently used
+            self.data_manager.get_historical("Gamma", 7)
+
+            self.assertIsNotNone(self.data_manager.get_cached_historical("Alpha", 7))
+            self.assertIsNone(self.data_manager.get_cached_historical("Beta", 7))
+            self.assertIsNotNone(self.data_manager.get_cached_historical("Gamma", 7))
+
+    def test_convert_columns_matches_convert_units(self):
+        """Test vectorized column conversion matches per-entry conversion exactly."""
+        entries = [
+            {'date': datetime(2024, 1, day), 'temperature': 20.0 + day, 'pressure': 1010.0 + day,
+             'wind_speed': 3.5, 'rain': None if day % 2 else 1.2, 'conditions': 'Clear'}
+            for day in range(1, 6)
+        ]
+
+        columns = self.data_manager.convert_columns(self.data_manager.to_columns(entries), "imperial")
+
+        self.assertEqual(columns['conditions'].tolist(), ['Clear'] * 5)
+        for i, entry in enumerate(entries):
+            expected = self.data_manager.convert_units(entry, "imperial")
+            for field in ('temperature', 'pressure', 'wind_speed'):
+                self.assertEqual(columns[field][i], expected[field])
+            if expected['rain'] is None:
+                self.assertTrue(np.isnan(columns['rain'][i]))
+            else:
+                self.assertEqual(columns['rain'][i], expected['rain'])
+
+    def test_imperial_session_stores_metric_history_and_charts_once_converted(self):
+        """Test data fetched in imperial units is stored in metric and charted without double conversion."""
+        from WeatherDashboard.core.data_service import WeatherDataService
+
+        with patch.object(self.data_manager, 'api_service') as mock_api:
+            mock_api.fetch_current.return_value = {'temperature': 25.0, 'pressure': 1013.0, 'humidity': 60,
+                                                   'date': datetime.now() - timedelta(seconds=1)}  # One observation per second is stored
+            displayed = self.data_manager.fetch_current("TestCity", "imperial")
+            mock_api.fetch_current.return_value = {'temperature': 15.0, 'pressure': 1013.0, 'humidity': 60}
+            self.data_manager.fetch_current("TestCity", "metric")  # Unit switch mid-day
+
+        self.assertAlmostEqual(displayed['temperature'], 77.0)
+        self.assertEqual(self.data_manager.get_recent_data("TestCity", 1)[0]['temperature'], 25.0)
+
+        result = WeatherDataService(self.data_manager).get_historical_data("TestCity", 1, "imperial", columnar=True)
+        self.assertEqual(result.data_entries[-1]['gap_filled'], False)
+        self.assertAlmostEqual(result.columns['temperature'][-1], 68.0)  # Mean of 25 °C and 15 °C, in °F
+
+        self.data_manager.history_service.writer.flush()
+        with open(config.OUTPUT['text_file'], encoding='utf-8') as f:
+            text_log = f.read()
+        self.assertIn("Temperature: 77.0 °F", text_log)
+        self.assertIn("Temperature: 15.0 °C", text_log)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
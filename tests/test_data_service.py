@@ -89,4 +89,52 @@ def test_weather_data_service_methods():
     assert hasattr(hist, "data_entries")
     # write_to_log
     log = service.write_to_log("Testville", {"temp": 20}, "metric")
-    assert log.success is True
\ No newline at end of file
+    assert log.success is True
+
+def test_get_historical_data_columnar():
+    class DummyDataManager:
+        def get_historical(self, *a, **kw):
+            return [{"date": datetime(2024, 1, d), "temperature": 10.0 * d} for d in (1, 2)]
+        def to_columns(self, entries):
+            return {"date": [e["date"] for e in entries], "temperature": [e["temperature"] for e in entries]}
+        def convert_columns(self, columns, unit):
+            return {**columns, "temperature": [t * 9 / 5 + 32 for t in columns["temperature"]]}
+        def convert_units(self, d, u):
+            raise AssertionError("columnar path must not convert entry by entry")
+    service = data_service.WeatherDataService(DummyDataManager())
+    hist = service.get_historical_data("Testville", 2, "imperial", columnar=True)
+    assert hist.operation_status == "success"
+    assert hist.columns["temperature"] == [50.0, 68.0]
+    assert hist.processing_time_ms is not None and hist.processing_time_ms >= 0
+
+def test_get_historical_data_columnar_failure_falls_back_to_entries():
+    class DummyDataManager:
+        def get_historical(self, *a, **kw):
+            return [{"date": datetime(2024, 1, d), "temperature": 10.0 * d} for d in (1, 2)]
+        def to_columns(self, entries):
+            raise ValueError("ragged series")
+        def convert_units(self, d, u):
+            return {**d, "temperature": d["temperature"] * 9 / 5 + 32}
+    service = data_service.WeatherDataService(DummyDataManager())
+    hist = service.get_historical_data("Testville", 2, "imperial", columnar=True)
+    assert hist.operation_status == "partial"
+    assert hist.columns is None
+    assert [d["temperature"] for d in hist.data_entries] == [50.0, 68.0]
+
+    DummyDataManager.convert_units = lambda self, d, u: 1 / 0
+    hist = service.get_historical_data("Testville", 2, "imperial", columnar=True)
+    assert hist.operation_status == "failed"
+    assert hist.data_entries == []
+
+def test_get_range_summary():
+    class DummyDataManager:
+        def get_window_aggregates(self, city, start, end, metrics):
+            assert start.hour == 0 and (datetime.now().date() - start.date()).days == 6
+            if city != "Testville":
+                return {}
+            return {"temperature": {"sum": 40.0, "count": 4, "mean": 10.0}}
+        def convert_units(self, d, u):
+            return {k: v * 9 / 5 + 32 for k, v in d.items()}
+    service = data_service.WeatherDataService(DummyDataManager())
+    assert service.get_range_summary("testville", 7, "temperature", "imperial") == {"mean": 50.0, "count": 4}
+    assert service.get_range_summary("Elsewhere", 7, "temperature", "imperial") is None
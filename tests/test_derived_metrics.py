@@ -502,5 +502,71 @@ class TestDerivedMetricsCalculator(unittest.TestCase):
         self.assertLess(pp_result, 30.0)  # Low rain chance
 
 
+    def test_batch_heat_index_and_wind_chill_match_scalar(self):
+        """Test batch heat index and wind chill match scalar results and NWS masks."""
+        temps_f = [40.0, 75.0, 85.0, 95.5, 104.3]
+        humidity = [30.0, 50.0, 60.0, 70.0, 45.0]
+        winds_mph = [15.0, 2.0, 10.0, 5.0, 20.0]
+
+        hi_batch = self.calculator.calculate_heat_index_batch(temps_f, humidity)
+        wc_batch = self.calculator.calculate_wind_chill_batch(temps_f, winds_mph)
+
+        for i, temp in enumerate(temps_f):
+            hi = self.calculator.calculate_heat_index(temp, humidity[i])
+            wc = self.calculator.calculate_wind_chill(temp, winds_mph[i])
+            if hi is None:
+                self.assertTrue(math.isnan(hi_batch[i]))
+            else:
+                self.assertEqual(hi_batch[i], hi)
+            if wc is None:
+                self.assertTrue(math.isnan(wc_batch[i]))
+            else:
+                self.assertEqual(wc_batch[i], wc)
+
+    def test_batch_matches_scalar_exactly(self):
+        """Test calculate_all_batch reproduces every scalar calculation bit for bit."""
+        columns = {
+            'temperature': [-12.5, 3.2, 18.0, 27.4, 33.9, 41.1],
+            'humidity': [85.0, 40.0, 55.0, 72.0, 65.0, 20.0],
+            'wind_speed': [9.5, 4.1, 0.2, 3.3, 12.0, 6.6],
+            'pressure': [985.0, 1002.0, 1013.0, 1040.0, 995.5, 1009.0],
+            'conditions': ['Light Snow', 'Overcast', 'Clear', 'Scattered clouds', 'Thunderstorm', 'Sunny'],
+        }
+        batch = self.calculator.calculate_all_batch(columns)
+
+        for i in range(len(columns['temperature'])):
+            temp_c = columns['temperature'][i]
+            humidity = columns['humidity'][i]
+            wind_ms = columns['wind_speed'][i]
+            pressure = columns['pressure'][i]
+            temp_f = (temp_c * 9/5) + 32
+
+            heat_index = self.calculator.calculate_heat_index(temp_f, humidity)
+            wind_chill = self.calculator.calculate_wind_chill(temp_f, wind_ms * 2.23694)
+            expected_hi = (heat_index - 32) * 5/9 if heat_index is not None else None
+            expected_wc = (wind_chill - 32) * 5/9 if wind_chill is not None else None
+
+            for metric, expected in (('heat_index', expected_hi), ('wind_chill', expected_wc)):
+                if expected is None:
+                    self.assertTrue(math.isnan(batch[metric][i]))
+                else:
+                    self.assertEqual(batch[metric][i], expected)
+
+            self.assertEqual(batch['dew_point'][i], self.calculator.calculate_dew_point(temp_c, humidity))
+            self.assertEqual(batch['precipitation_probability'][i],
+                             self.calculator.calculate_precipitation_probability(pressure, humidity, columns['conditions'][i]))
+            self.assertEqual(batch['weather_comfort_score'][i],
+                             self.calculator.calculate_weather_comfort_score(temp_c, humidity, wind_ms, pressure))
+
+    def test_batch_missing_values_are_nan(self):
+        """Test batch calculations propagate missing inputs as NaN instead of raising."""
+        batch = self.calculator.calculate_all_batch({'temperature': [None, 25.0], 'humidity': [0.0, 50.0]})
+
+        self.assertTrue(math.isnan(batch['dew_point'][0]))
+        self.assertTrue(math.isnan(batch['weather_comfort_score'][0]))
+        self.assertFalse(math.isnan(batch['dew_point'][1]))
+        self.assertEqual(batch['precipitation_probability'][1], 0.0)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+Unit tests for CityHistoryBuffer class.
+
+Tests columnar in-memory history including:
+- Entry round trips through the columns
+- O(1) eviction at capacity with growth up to it
+- Zero-copy, read-only column views across wrap-around
+- Time-window queries for ordered and unordered entries
+- Retention filtering
+- Bulk column loads matching per-entry appends
+- Copy-on-write views unchanged by later mutations
+- Prefix-sum window aggregates across wrap, eviction, retention and bulk loads
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add project root to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from WeatherDashboard.features.history.history_buffer import CityHistoryBuffer
+
+
+class TestCityHistoryBuffer(unittest.TestCase):
+    """Test cases for CityHistoryBuffer class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.base_time = datetime(2024, 1, 1, 12, 0, 0, 123456)
+        self.buffer = CityHistoryBuffer(capacity=50)
+
+    def _fill(self, count, start=0):
+        for i in range(start, start + count):
+            self.buffer.append({'date': self.base_time + timedelta(hours=i), 'temperature': float(i), 'humidity': 50})
+
+    def test_entry_round_trip(self):
+        """Test entries read back with numeric, missing and non-numeric fields intact."""
+        entry = {'date': self.base_time, 'temperature': 21.3, 'humidity': 60, 'pressure': None,
+                 'conditions': 'Rain', 'source': 'simulated', 'visibility': 'n/a'}
+        self.buffer.append(entry)
+
+        self.assertEqual(self.buffer[0], entry)
+        self.assertIsInstance(self.buffer[0]['humidity'], int)
+        self.assertTrue(np.isnan(self.buffer.column('pressure')[0]))
+
+    def test_eviction_at_capacity(self):
+        """Test the buffer grows to its capacity then evicts the oldest entries."""
+        self._fill(130)
+
+        self.assertEqual(len(self.buffer), 50)
+        self.assertEqual(self.buffer[0]['temperature'], 80.0)
+        self.assertEqual(self.buffer[-1]['temperature'], 129.0)
+        self.assertEqual([e['temperature'] for e in self.buffer[-3:]], [127.0, 128.0, 129.0])
+
+    def test_column_views_are_zero_copy_after_wrap(self):
+        """Test columns stay contiguous read-only views once the ring has wrapped."""
+        self._fill(73)
+
+        temperatures = self.buffer.column('temperature')
+        self.assertIsNotNone(temperatures.base)
+        self.assertFalse(temperatures.flags.writeable)
+        np.testing.assert_array_equal(temperatures, np.arange(23.0, 73.0))
+
+        columns = self.buffer.columns(self.base_time + timedelta(hours=70))
+        np.testing.assert_array_equal(columns['temperature'], [70.0, 71.0, 72.0])
+        self.assertTrue(np.shares_memory(columns['temperature'], temperatures))
+
+    def test_unordered_entries_filtered_by_mask(self):
+        """Test time windows are correct when entries arrive out of order."""
+        for i in (5, 1, 9, 3):
+            self.buffer.append({'date': self.base_time + timedelta(hours=i), 'temperature': float(i)})
+
+        since = self.base_time + timedelta(hours=3)
+        self.assertEqual([e['temperature'] for e in self.buffer.entries_since(since)], [5.0, 9.0, 3.0])
+        np.testing.assert_array_equal(self.buffer.columns(since)['temperature'], [5.0, 9.0, 3.0])
+
+    def test_retain_compacts_and_drops_prefix(self):
+        """Test retention keeps order for prefix drops and arbitrary masks."""
+        self._fill(60)
+        self.assertEqual(self.buffer.retain(self.buffer.column('temperature') >= 20), 10)
+        self.assertEqual(self.buffer[0]['temperature'], 20.0)
+
+        self.assertEqual(self.buffer.retain(self.buffer.column('temperature') % 2 == 0), 20)
+        self.assertEqual([e['temperature'] for e in self.buffer][:3], [20.0, 22.0, 24.0])
+        self._fill(1, start=100)
+        self.assertEqual(self.buffer[-1]['temperature'], 100.0)
+
+    def test_extend_matches_appends(self):
+        """Test bulk-loading a snapshot matches appending the same entries one by one, wrap and capacity included."""
+        self._fill(70)
+        source = CityHistoryBuffer(capacity=50)
+        for entry in self.buffer:
+            source.append(entry)
+
+        loaded = CityHistoryBuffer(capacity=50)
+        loaded.append({'date': self.base_time - timedelta(days=1), 'temperature': -1.0})
+        self.assertEqual(loaded.extend(*source.snapshot()), 1)  # The pre-existing entry is evicted
+        self.assertEqual(list(loaded), list(self.buffer))
+        self.assertTrue(loaded.ordered)
+
+        timestamps, columns, extras = source.snapshot()
+        self.assertEqual(loaded.extend(timestamps[:10], {field: column[:10] for field, column in columns.items()}, extras[:10]), 10)
+        self.assertEqual(loaded[-1]['temperature'], 29.0)
+        self.assertFalse(loaded.ordered)  # Reloaded entries are older than the ones they follow
+
+    def test_views_unchanged_by_later_mutations(self):
+        """Test views keep their entries through appends, wrap-around, retention and bulk loads, copying only when needed."""
+        self._fill(40)
+        view = self.buffer.view()
+        temperatures = view.column('temperature')
+
+        self._fill(5, start=40)  # Free slots only: storage still shared
+        self.assertTrue(np.shares_memory(self.buffer.column('temperature'), temperatures))
+
+        self._fill(30, start=45)  # Wraps over the view's entries: storage copied first
+        self.assertFalse(np.shares_memory(self.buffer.column('temperature'), temperatures))
+        np.testing.assert_array_equal(temperatures, np.arange(40.0))
+        self.assertEqual([e['temperature'] for e in view], [float(i) for i in range(40)])
+        self.assertEqual(self.buffer[0]['temperature'], 25.0)
+
+        later = self.buffer.view()
+        expected = list(later)
+        self.buffer.retain(self.buffer.column('temperature') % 2 == 0)
+        self.buffer.extend(*later.snapshot())
+        self.assertEqual(list(later), expected)
+        self.assertLess(later.version, self.buffer.version)
+        self.assertEqual(self.buffer.view().version, self.buffer.version)
+
+    def test_window_totals_match_scan(self):
+        """Test prefix-sum window sums and counts equal a direct scan after every kind of mutation."""
+        rng = np.random.default_rng(3)
+
+        def check():
+            timestamps = self.buffer.timestamps()
+            values = self.buffer.column('temperature')
+            for _ in range(20):
+                lo, hi = sorted(rng.integers(-2, 90, 2))
+                start, end = self.base_time + timedelta(hours=int(lo)), self.base_time + timedelta(hours=int(hi))
+                window = values[(timestamps >= start.timestamp()) & (timestamps < end.timestamp())]
+                total, count = self.buffer.window_totals('temperature', start, end)
+                self.assertAlmostEqual(total, float(np.nansum(window)))
+                self.assertEqual(count, int(np.count_nonzero(~np.isnan(window))))
+
+        for i in range(70):  # Wraps and evicts past capacity 50
+            self.buffer.append({'date': self.base_time + timedelta(hours=i), 'temperature': float(i) if i % 3 else None})
+        check()
+        self.assertEqual(self.buffer.window_totals('temperature'), (float(sum(i for i in range(20, 70) if i % 3)), 33))
+        self.buffer.retain(self.buffer.column('temperature') != 40.0)
+        check()
+        later = CityHistoryBuffer(capacity=50)
+        for i in range(70, 90):
+            later.append({'date': self.base_time + timedelta(hours=i), 'temperature': float(i)})
+        self.buffer.extend(*later.snapshot())
+        check()
+        self.assertEqual(self.buffer.window_mean('temperature', self.base_time + timedelta(hours=88)), 88.5)
+        self.assertIsNone(self.buffer.window_mean('humidity'))
+
+    def test_invalid_capacity(self):
+        """Test non-positive capacities are rejected."""
+        with self.assertRaises(ValueError):
+            CityHistoryBuffer(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Unit tests for HistoryImporter class.
+
+Tests bulk CSV import into persistent history including:
+- Comparison-style datasets mapped to history fields and unit-converted
+- Native weather_data.csv files round-tripping unchanged
+- Skipping files already imported and chunked progress reporting
+- Errors for files that cannot be mapped
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+from datetime import datetime
+
+# Add project root to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from WeatherDashboard.features.history.history_import import HistoryImporter
+from WeatherDashboard.features.history.history_store import SQLiteHistoryStore, to_history_row
+
+
+def simple_key(name):
+    """Key function matching the plain city_key format."""
+    return name.strip().lower().replace(" ", "_")
+
+
+class TestHistoryImporter(unittest.TestCase):
+    """Test cases for HistoryImporter class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = SQLiteHistoryStore(os.path.join(self.temp_dir, 'history.db'))
+        self.importer = HistoryImporter(self.store, simple_key, chunk_size=3)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.store.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, name, text):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def test_comparison_dataset_mapped_and_converted(self):
+        """Test mapped columns are converted from header units and grouped by city."""
+        path = self._write('dataset.csv',
+                           "date,city,avg_temp_F,humidity,wind_mph\n"
+                           "2024-01-01,London,50,80,10\n"
+                           "2024-01-02,London,59,,\n"
+                           "2024-01-01,Paris,32,70,0\n"
+                           "not a date,Paris,40,70,5\n")
+
+        summary = self.importer.import_file(path)
+
+        self.assertEqual(summary['status'], 'imported')
+        self.assertEqual((summary['rows_read'], summary['rows_imported'], summary['rows_skipped']), (4, 3, 1))
+        london = self.store.query_range('london')
+        self.assertEqual([entry['date'] for entry in london], [datetime(2024, 1, 1), datetime(2024, 1, 2)])
+        self.assertAlmostEqual(london[0]['temperature'], 10.0)
+        self.assertAlmostEqual(london[0]['wind_speed'], 4.4704, places=4)
+        self.assertEqual(london[0]['humidity'], 80)
+        self.assertIsNone(london[1]['humidity'])  # Blank cells stay missing
+        self.assertEqual(self.store.get_city_stats()['paris']['row_count'], 1)
+
+        daily = self.store.query_rollups('london', 'daily')
+        self.assertEqual([row['temperature'] for row in daily], [10.0, 15.0])
+
+    def test_default_city_and_missing_date(self):
+        """Test files without a city column need a default city, and files without dates fail."""
+        path = self._write('single.csv', "date,temperature\n01/05/2024,12.5\n")
+        self.assertEqual(self.importer.import_file(path)['status'], 'error')
+
+        summary = self.importer.import_file(path, default_city='Berlin')
+        self.assertEqual(summary['rows_imported'], 1)
+        self.assertEqual(self.store.query_range('berlin')[0]['date'], datetime(2024, 1, 5))
+
+        undated = self._write('undated.csv', "city,temperature\nBerlin,10\n")
+        summary = self.importer.import_file(undated)
+        self.assertEqual(summary['status'], 'error')
+        self.assertIn('no date column', summary['error'])
+
+    def test_native_file_round_trip_and_skip(self):
+        """Test an exported weather_data.csv imports unchanged, once per file version."""
+        source_store = SQLiteHistoryStore(os.path.join(self.temp_dir, 'source.db'))
+        rows = [(simple_key(city), to_history_row(city, {'date': datetime(2024, 1, 1, hour), 'temperature': 20.0 + hour,
+                                                          'humidity': 50, 'conditions': 'Clear'}, 'api'))
+                for hour in range(5) for city in ('New York', 'London')]
+        source_store.append_many(rows)
+        export = os.path.join(self.temp_dir, 'weather_data.csv')
+        source_store.export_csv(export)
+
+        reports = []
+        summary = self.importer.import_file(export, progress=reports.append)
+
+        self.assertEqual(summary['rows_imported'], 10)
+        self.assertEqual([report['rows_read'] for report in reports], [3, 6, 9, 10])
+        self.assertEqual(reports[-1]['bytes_read'], summary['bytes_total'])
+        for key in ('london', 'new_york'):
+            self.assertEqual(self.store.query_range(key), source_store.query_range(key))
+        self.assertEqual(self.store.query_rollups('london', 'hourly'), source_store.query_rollups('london', 'hourly'))
+        self.assertEqual(self.importer.import_file(export)['status'], 'skipped')
+        self.assertEqual(self.store.get_city_stats()['london']['row_count'], 5)
+        source_store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+"""
+Unit tests for HistoryJournal class.
+
+Tests the write-ahead journal for in-memory history including:
+- Entry and columnar snapshot records round-tripping through replay
+- Truncation of torn and corrupt records
+- Compaction replacing entry records with city snapshots
+- Records appended during a compaction carried over into the new journal
+- Group commit of queued records
+- Values that do not round-trip through JSON left out of records
+- Compaction thresholds
+"""
+
+import unittest
+from unittest.mock import patch
+import tempfile
+import shutil
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add project root to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from WeatherDashboard.features.history.history_journal import HistoryJournal
+from WeatherDashboard.features.history.history_buffer import CityHistoryBuffer
+
+
+class TestHistoryJournal(unittest.TestCase):
+    """Test cases for HistoryJournal class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'history.journal')
+        self.journal = HistoryJournal(self.path, fsync=False)
+        self.base_time = datetime(2024, 1, 1, 12, 0, 0)
+        self.entries = [
+            {'date': self.base_time + timedelta(minutes=15 * i), 'temperature': 20.0 + i, 'humidity': 50, 'conditions': 'Clear'}
+            for i in range(5)
+        ]
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.journal.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_entry_records_replay_in_order(self):
+        """Test appended entries replay unchanged and in order."""
+        self.journal.append_many(self.journal.encode('london', entry) for entry in self.entries[:3])
+        self.journal.append_many(self.journal.encode('paris', entry) for entry in self.entries[3:])
+
+        replayed = list(HistoryJournal(self.path).replay())
+        self.assertEqual([kind for kind, _, _ in replayed], ['entry'] * 5)
+        self.assertEqual([key for _, key, _ in replayed], ['london'] * 3 + ['paris'] * 2)
+        self.assertEqual([data for _, _, data in replayed], self.entries)
+
+    def test_torn_and_corrupt_records_truncated(self):
+        """Test replay stops at a torn or corrupt record and cuts the journal back to the last good one."""
+        self.journal.append_many(self.journal.encode('london', entry) for entry in self.entries)
+        good_size = os.path.getsize(self.path)
+        with open(self.path, 'ab') as f:
+            f.write(self.journal.encode('london', self.entries[0])[:-3])  # Torn write
+
+        self.assertEqual(len(list(self.journal.replay())), 5)
+        self.assertEqual(os.path.getsize(self.path), good_size)
+        self.assertEqual(self.journal.entry_count, 5)
+
+        with open(self.path, 'r+b') as f:
+            f.seek(good_size - 2)
+            f.write(b'!!')  # Flip bytes in the last payload
+        self.assertEqual(len(list(self.journal.replay())), 4)
+        self.assertLess(os.path.getsize(self.path), good_size)
+
+        with open(self.path, 'wb') as f:
+            f.write(b'not a journal')
+        self.assertEqual(list(self.journal.replay()), [])
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+    def test_compaction_writes_columnar_snapshots(self):
+        """Test compaction replaces entries with per-city snapshots that reload into identical buffers."""
+        self.journal.append_many(self.journal.encode('london', entry) for entry in self.entries * 3)
+        buffer = CityHistoryBuffer(10)
+        for entry in self.entries:
+            buffer.append(entry)
+
+        self.assertEqual(self.journal.compact([('london',) + buffer.snapshot()]), 5)
+        self.assertEqual(self.journal.entry_count, 5)
+
+        replayed = list(self.journal.replay())
+        self.assertEqual(len(replayed), 1)
+        kind, key, (timestamps, columns, extras) = replayed[0]
+        self.assertEqual((kind, key), ('columns', 'london'))
+        np.testing.assert_array_equal(timestamps, buffer.timestamps())
+
+        restored = CityHistoryBuffer(10)
+        restored.extend(timestamps, columns, extras)
+        self.assertEqual(list(restored), list(buffer))
+
+    def test_appends_during_compaction_carried_over(self):
+        """Test a record appended while compaction takes its snapshots survives the rewrite."""
+        buffer = CityHistoryBuffer(10)
+        for entry in self.entries[:4]:
+            buffer.append(entry)
+
+        def snapshots():
+            self.journal.append_many([self.journal.encode('london', self.entries[4])])  # Stored mid-compaction
+            yield ('london',) + buffer.snapshot()
+
+        self.journal.compact(snapshots())
+        self.assertEqual(self.journal.entry_count, 5)
+
+        replayed = list(HistoryJournal(self.path).replay())
+        self.assertEqual([kind for kind, _, _ in replayed], ['columns', 'entry'])
+        self.assertEqual(replayed[1][2], self.entries[4])
+
+    def test_group_commit(self):
+        """Test queued records reach the file only on commit, in one append, and close commits the rest."""
+        self.assertTrue(self.journal.enqueue([self.journal.encode('london', self.entries[0])]))
+        self.assertFalse(self.journal.enqueue(self.journal.encode('london', entry) for entry in self.entries[1:3]))
+        self.assertEqual(list(HistoryJournal(self.path).replay()), [])
+        self.assertEqual(self.journal.entry_count, 3)
+
+        with patch('os.fsync') as fsync:
+            self.journal.fsync = True
+            self.assertEqual(self.journal.commit(), 3)
+        fsync.assert_called_once()
+        self.assertEqual(self.journal.commit(), 0)
+        self.assertTrue(self.journal.enqueue([self.journal.encode('paris', self.entries[3])]))
+        self.journal.fsync = False
+        self.journal.close()
+        self.assertEqual([data for _, _, data in HistoryJournal(self.path).replay()], self.entries[:4])
+
+    def test_queued_records_carried_into_compaction(self):
+        """Test records queued but not yet committed when a compaction starts end up in the new journal once."""
+        buffer = CityHistoryBuffer(10)
+        for entry in self.entries[:4]:
+            self.journal.enqueue([self.journal.encode('london', entry)])
+            buffer.append(entry)
+
+        def snapshots():
+            self.journal.enqueue([self.journal.encode('london', self.entries[4])])  # Stored mid-compaction
+            yield ('london',) + buffer.snapshot()
+
+        self.journal.compact(snapshots())
+        self.assertEqual(self.journal.commit(), 0)  # Queued records were written by the compaction
+        replayed = list(HistoryJournal(self.path).replay())
+        self.assertEqual([kind for kind, _, _ in replayed], ['columns', 'entry'])
+        self.assertEqual(replayed[1][2], self.entries[4])
+
+    def test_unsupported_values_left_out(self):
+        """Test values that do not round-trip through JSON are skipped, not stringified."""
+        entry = dict(self.entries[0], pressure=np.float64(1013.5), humidity=np.int64(50),
+                     observed=self.base_time, alerts=[object()], provider=None)
+        self.journal.append_many([self.journal.encode('london', entry)])
+
+        (_, _, data), = HistoryJournal(self.path).replay()
+        self.assertEqual(data, {'date': self.base_time, 'temperature': 20.0, 'humidity': 50,
+                                'conditions': 'Clear', 'pressure': 1013.5, 'provider': None})
+        self.assertIs(type(data['humidity']), int)
+
+        buffer = CityHistoryBuffer(10)
+        buffer.append(entry)
+        self.journal.compact([('london',) + buffer.snapshot()])
+        (_, _, (_, _, extras)), = HistoryJournal(self.path).replay()
+        self.assertNotIn('observed', extras[0])
+        self.assertNotIn('alerts', extras[0])
+
+    def test_needs_compaction_thresholds(self):
+        """Test compaction is due only past both the minimum and the live-entry ratio."""
+        with patch.dict(self.journal.config.HISTORY, {'journal_compact_min_records': 10, 'journal_compact_ratio': 2.0}):
+            self.journal.entry_count = 10
+            self.assertFalse(self.journal.needs_compaction(1))
+            self.journal.entry_count = 11
+            self.assertTrue(self.journal.needs_compaction(5))
+            self.assertFalse(self.journal.needs_compaction(6))
+
+
+if __name__ == '__main__':
+    unittest.main()
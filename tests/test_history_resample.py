@@ -0,0 +1,116 @@
+"""
+Unit tests for HistoryResampler class.
+
+Tests resampling onto uniform time grids including:
+- Per-bin aggregations matching a per-bin Python reference on unordered input
+- Gap policies (missing, forward fill, interpolation) on empty bins
+- Fixed grid bounds shared between series and local-midnight daily bins
+- Wall-clock bins given an explicit UTC offset
+- Errors for unknown intervals, aggregations and oversized grids
+"""
+
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+# Add project root to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from WeatherDashboard.features.history.history_resample import HistoryResampler, AGGREGATIONS
+
+
+class TestHistoryResampler(unittest.TestCase):
+    """Test cases for HistoryResampler class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.resampler = HistoryResampler(aggregation='mean', gap_policy='nan')
+        self.base_time = datetime(2024, 3, 1, 0, 0, 0)
+        self.base = self.base_time.timestamp()
+
+    def test_aggregations_match_reference(self):
+        """Test each aggregation equals reducing every hourly bin's samples in Python."""
+        rng = np.random.default_rng(11)
+        offsets = rng.uniform(0, 24 * 3600, 400)
+        values = rng.normal(10.0, 3.0, 400)
+        values[::7] = np.nan
+        timestamps = self.base + offsets  # Unordered on purpose
+
+        reference_bins = {}
+        for offset, value in sorted(zip(offsets, values), key=lambda pair: pair[0]):
+            if not np.isnan(value):
+                reference_bins.setdefault(int(offset // 3600), []).append(value)
+        reducers = {'mean': np.mean, 'sum': sum, 'min': min, 'max': max,
+                    'first': lambda v: v[0], 'last': lambda v: v[-1], 'count': len}
+
+        for aggregation in AGGREGATIONS:
+            with self.subTest(aggregation=aggregation):
+                grid, columns = self.resampler.resample(timestamps, {'temperature': values}, 'hourly', aggregation=aggregation)
+                self.assertEqual(grid[0], self.base)
+                self.assertTrue(np.all(np.diff(grid) == 3600))
+                expected = [reducers[aggregation](reference_bins[hour]) if hour in reference_bins else np.nan
+                            for hour in range(len(grid))]
+                np.testing.assert_allclose(columns['temperature'], expected)
+
+    def test_gap_policies(self):
+        """Test empty bins stay missing, carry the last value forward, or interpolate between neighbours."""
+        timestamps = self.base + np.array([0, 60, 3 * 3600, 4 * 3600 + 120])
+        columns = {'temperature': np.array([1.0, 3.0, 8.0, 4.0]), 'conditions': np.array(['a', 'b', 'c', 'd'], dtype=object)}
+        end = self.base_time + timedelta(hours=6)
+
+        grid, missing = self.resampler.resample(timestamps, columns, 3600, end=end)
+        self.assertEqual(list(missing), ['temperature'])  # Non-numeric columns are skipped
+        np.testing.assert_array_equal(missing['temperature'], [2.0, np.nan, np.nan, 8.0, 4.0, np.nan])
+        _, filled = self.resampler.resample(timestamps, columns, 'hourly', end=end, gap_policy='ffill')
+        np.testing.assert_array_equal(filled['temperature'], [2.0, 2.0, 2.0, 8.0, 4.0, 4.0])
+        _, interpolated = self.resampler.resample(timestamps, columns, 'hourly', end=end, gap_policy='interpolate')
+        np.testing.assert_allclose(interpolated['temperature'], [2.0, 4.0, 6.0, 8.0, 4.0, np.nan])
+        _, counts = self.resampler.resample(timestamps, columns, 'hourly', end=end, aggregation='count', gap_policy='ffill')
+        np.testing.assert_array_equal(counts['temperature'], [2, 0, 0, 1, 1, 0])
+
+    def test_shared_bounds_and_daily_bins(self):
+        """Test series with different sampling share a grid given the same bounds, with daily bins from local midnight."""
+        start, end = self.base_time + timedelta(hours=5), self.base_time + timedelta(days=3)
+        first_grid, first = self.resampler.resample(self.base + np.arange(0, 3 * 86400, 900), {'humidity': np.full(288, 50.0)},
+                                                    'daily', start=start, end=end)
+        second_grid, second = self.resampler.resample(self.base + np.array([86400 + 10.0]), {'humidity': np.array([70.0])},
+                                                      'daily', start=start, end=end)
+
+        np.testing.assert_array_equal(first_grid, second_grid)
+        self.assertEqual([datetime.fromtimestamp(t) for t in first_grid],
+                         [self.base_time + timedelta(days=day) for day in range(3)])
+        np.testing.assert_array_equal(first['humidity'], [50.0, 50.0, 50.0])  # Samples before start are excluded
+        np.testing.assert_array_equal(second['humidity'], [np.nan, 70.0, np.nan])
+        grid, empty = self.resampler.resample(np.empty(0), {}, 'daily')
+        self.assertEqual((grid.size, empty), (0, {}))
+
+    def test_explicit_utc_offset(self):
+        """Test wall-clock seconds with a zero offset bin on their own midnights, whatever the local zone."""
+        start = datetime(2024, 3, 30, tzinfo=timezone.utc)
+        timestamps = start.timestamp() + np.array([1.0, 86400 + 1.0, 86400 + 2.0, 2 * 86400 - 1.0])
+        grid, resampled = self.resampler.resample(timestamps, {'pressure': np.array([1000.0, 1010.0, 1012.0, 1014.0])},
+                                                  'daily', start=start, end=start + timedelta(days=2), utc_offset=0.0)
+
+        np.testing.assert_array_equal(grid, start.timestamp() + np.array([0.0, 86400.0]))
+        np.testing.assert_array_equal(resampled['pressure'], [1000.0, 1012.0])
+
+    def test_invalid_arguments(self):
+        """Test unknown intervals, aggregations, gap policies and oversized grids are rejected."""
+        timestamps, columns = np.array([self.base]), {'temperature': np.array([1.0])}
+        with self.assertRaises(ValueError):
+            self.resampler.resample(timestamps, columns, 'weekly')
+        with self.assertRaises(ValueError):
+            self.resampler.resample(timestamps, columns, 0)
+        with self.assertRaises(ValueError):
+            self.resampler.resample(timestamps, columns, 'hourly', aggregation='median')
+        with self.assertRaises(ValueError):
+            HistoryResampler(gap_policy='backfill')
+        with self.assertRaises(ValueError):
+            self.resampler.resample(timestamps, columns, 1, end=self.base_time + timedelta(days=365))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,13 @@ Tests historical weather data management including:
 - Time-based filtering and sorting
 - Data format conversion
 - Memory management and cleanup
+- Journal replay on restart
+- Concurrent stores, non-blocking reads and cleanup
+- Rolling statistics maintained on store
+- Learned city aliases saved by the background writer
+- Prefix-sum window aggregates
+- Stored tiers resampled onto uniform grids
+- Bulk import of CSV datasets
 - Error handling for file operations
 - Integration with configuration system
 """
@@ -13,8 +20,11 @@ Tests historical weather data management including:
 import unittest
 from unittest.mock import Mock, patch, MagicMock, mock_open
 import json
+import tempfile
 from datetime import datetime, timedelta
+from pathlib import Path
 
+from WeatherDashboard import config
 from WeatherDashboard.features.history.history_service import WeatherHistoryService
 
 
@@ -31,10 +41,29 @@ class TestWeatherHistoryService(unittest.TestCase):
         # Configure mock API service
         self.mock_api_service.fallback = Mock()
         self.mock_api_service.fallback.generate.return_value = []
-        
+
+        # Keep the database, journal, CSV, text log and logs out of the package data directory
+        self.temp_dir = tempfile.TemporaryDirectory()
+        data_dir = Path(self.temp_dir.name)
+        for patcher in (
+            patch.dict(config.OUTPUT, {"data_dir": str(data_dir), "log_dir": str(data_dir / "logs"),
+                                       "text_file": str(data_dir / "output.txt"), "csv_dir": str(data_dir / "csv"),
+                                       "csv_backup_dir": str(data_dir / "csv" / "backup")}),
+            patch.dict(config.HISTORY, {"db_file": str(data_dir / "weather_history.db"),
+                                        "journal_file": str(data_dir / "history.journal")}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        (data_dir / "logs").mkdir()
+
         # Create history service - it doesn't accept constructor parameters
         self.history_service = WeatherHistoryService()
 
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.history_service.close()
+        self.temp_dir.cleanup()
+
     def test_initialization(self):
         """Test WeatherHistoryService initializes correctly."""
         self.assertIsInstance(self.history_service.weather_data, dict)
@@ -163,11 +192,17 @@ class TestWeatherHistoryService(unittest.TestCase):
         csv_content = f"""timestamp,city,temperature,humidity,pressure,wind_speed,wind_direction,conditions,feels_like,temp_min,temp_max,wind_gust,visibility,cloud_cover,rain,snow,uv_index,air_quality_index
 {today},New York,25.0,60,1013,10.0,180.0,Sunny,26.0,20.0,30.0,15.0,10.0,20,0.0,0.0,5.0,50"""
 
-        mock_file = mock_open(read_data=csv_content)
-
-        with patch('builtins.open', mock_file):
-            with patch('pathlib.Path.exists', return_value=True):
+        # The reader seeks backwards from the end of the file, so use a real file
+        import tempfile
+        import shutil
+        temp_dir = tempfile.mkdtemp()
+        try:
+            with open(f"{temp_dir}/weather_data.csv", 'w', encoding='utf-8') as f:
+                f.write(csv_content)
+            with patch.dict(self.history_service.config.OUTPUT, {"csv_dir": temp_dir}):
                 result = self.history_service.get_recent_data_from_csv("New York", 7)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0]['temperature'], 25.0)
@@ -191,15 +226,94 @@ class TestWeatherHistoryService(unittest.TestCase):
         
         self.assertEqual(result, [])
 
+    def test_get_recent_data_from_csv_reads_only_recent_tail(self):
+        """Test the tail reader returns the window in time order across read blocks."""
+        import tempfile
+        import shutil
+        from WeatherDashboard.features.history import history_store
+
+        now = datetime.now().replace(microsecond=0)
+        lines = ["timestamp,city,temperature,humidity,pressure,wind_speed,wind_direction,conditions,feels_like,temp_min,temp_max,wind_gust,visibility,cloud_cover,rain,snow,uv_index,air_quality_index"]
+        for hours_ago in range(24 * 30, -1, -6):
+            timestamp = (now - timedelta(hours=hours_ago)).strftime("%Y-%m-%d %H:%M:%S")
+            for city in ("New York", "London"):
+                lines.append(f"{timestamp},{city},{hours_ago / 10},60,1013,10.0,180.0,Sunny,,,,,,,,,,")
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            with open(f"{temp_dir}/weather_data.csv", 'w', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+            with patch.dict(self.history_service.config.OUTPUT, {"csv_dir": temp_dir}), \
+                 patch.object(history_store, 'TAIL_BLOCK_SIZE', 256):
+                result = self.history_service.get_recent_data_from_csv("New York", 2)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        cutoff = datetime.combine(now.date() - timedelta(days=2), datetime.min.time())
+        dates = [entry['date'] for entry in result]
+        self.assertEqual(dates, sorted(dates))
+        self.assertTrue(all(date >= cutoff for date in dates))
+        self.assertEqual(len(result), sum(1 for line in lines[1:] if line.split(',')[1] == "New York" and line[:19] >= cutoff.strftime("%Y-%m-%d %H:%M:%S")))
+
+    def test_get_recent_data_from_csv_reads_archived_segments(self):
+        """Test the recent window continues into rotated segments and their cities stay listed."""
+        import tempfile
+        import shutil
+        from WeatherDashboard.features.history.history_store import to_history_row
+
+        now = datetime.now().replace(microsecond=0)
+        temp_dir = tempfile.mkdtemp()
+        try:
+            with patch.dict(self.history_service.config.OUTPUT, {"csv_dir": temp_dir}):
+                csv_store = self.history_service._get_csv_store(Path(temp_dir) / "weather_data.csv")
+                older = [(None, to_history_row(city, {'date': now - timedelta(days=1), 'temperature': 10.0}, 'api')) for city in ("New York", "Paris")]
+                csv_store.append_many(older)
+                csv_store.archive.max_bytes = 1
+                csv_store.rotate_if_needed()
+                csv_store.append_many([(None, to_history_row("New York", {'date': now, 'temperature': 20.0}, 'api'))])
+
+                result = self.history_service.get_recent_data_from_csv("New York", 7)
+                cities = self.history_service.get_all_cities_from_csv()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        self.assertEqual([entry['temperature'] for entry in result], [10.0, 20.0])
+        self.assertEqual(sorted(cities), ["New York", "Paris"])
+
+    def test_get_recent_data_from_csv_reads_csv_backend_rows(self):
+        """Test rows written by the CSV history backend read back, including integer fields stored as floats."""
+        now = datetime.now().replace(microsecond=0)
+        with patch.dict(config.HISTORY, {"backend": "csv"}):
+            csv_service = WeatherHistoryService()
+        try:
+            with patch.object(csv_service, '_write_to_text_log'):
+                csv_service.store_current_weather("New York", {"temperature": 21.5, "humidity": 61.0, "pressure": 1012.7, "date": now}, "metric")
+            csv_service.writer.flush()
+            result = csv_service.get_recent_data_from_csv("New York", 7)
+        finally:
+            csv_service.close()
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0]['date'], now)
+        self.assertEqual((result[0]['temperature'], result[0]['humidity'], result[0]['pressure']), (21.5, 61, 1012.7))
+
     def test_get_all_cities_from_csv_success(self):
         """Test getting all cities from CSV file."""
-        mock_file = mock_open(read_data="timestamp,city,temperature\n2023-01-01 12:00:00,New York,25.0\n2023-01-01 12:00:00,London,20.0\n2023-01-01 12:00:00,New York,26.0")
-        
-        with patch('builtins.open', mock_file):
-            with patch('pathlib.Path.exists', return_value=True):
+        import tempfile
+        import shutil
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            with open(f"{temp_dir}/weather_data.csv", 'w', encoding='utf-8') as f:
+                f.write("timestamp,city,temperature\n2023-01-01 12:00:00,New York,25.0\n2023-01-01 12:00:00,London,20.0\n2023-01-01 12:00:00,New York,26.0\n")
+            with patch.dict(self.history_service.config.OUTPUT, {"csv_dir": temp_dir}):
                 result = self.history_service.get_all_cities_from_csv()
+                stats = self.history_service.get_csv_city_stats("NYC")
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
         
         self.assertEqual(set(result), {"New York", "London"})
+        self.assertEqual(stats['row_count'], 2)
 
     def test_get_all_cities_from_csv_file_not_found(self):
         """Test getting all cities from non-existent CSV file."""
@@ -261,16 +375,18 @@ class TestWeatherHistoryService(unittest.TestCase):
     def test_memory_limit_enforcement(self):
         """Test that memory limits are enforced."""
         # Add more data than the limit
-        for i in range(35):  # More than max_entries_per_city (30)
-            weather_data = {
-                "temperature": 20.0 + i,
-                "date": datetime.now() - timedelta(hours=i)
-            }
-            self.history_service.store_current_weather("New York", weather_data, "metric")
+        with patch.dict(self.history_service.config.MEMORY, {"max_entries_per_city": 30}):
+            for i in range(35):  # More than max_entries_per_city (30)
+                weather_data = {
+                    "temperature": 20.0 + i,
+                    "date": datetime.now() - timedelta(hours=i)
+                }
+                self.history_service.store_current_weather("New York", weather_data, "metric")
         
         # Verify only the most recent entries are kept
         city_key = self.history_service.utils.city_key("New York")
         self.assertLessEqual(len(self.history_service.weather_data[city_key]), 30)
+        self.assertEqual(self.history_service.weather_data[city_key][-1]['temperature'], 54.0)
 
     def test_multiple_cities_data_isolation(self):
         """Test that data for different cities is isolated."""
@@ -318,6 +434,401 @@ class TestWeatherHistoryService(unittest.TestCase):
         # rather than expecting it to exceed limits
         self.assertTrue(len(self.history_service.weather_data) > 0)
 
+    def test_memory_counters_and_global_caps(self):
+        """Test running counters track stores and the caps evict the oldest entries and cities."""
+        service = self.history_service
+        base = datetime.now() - timedelta(days=1)
+        with patch.dict(service.config.MEMORY, {"max_total_entries": 10, "max_cities_stored": 2}):
+            for i in range(8):
+                service.store_current_weather("London", {"temperature": 10.0 + i, "date": base + timedelta(hours=i)}, "metric")
+            for i in range(4):
+                service.store_current_weather("Paris", {"temperature": 20.0 + i, "date": base + timedelta(hours=i, minutes=30)}, "metric")
+
+            london, paris = service.utils.city_key("London"), service.utils.city_key("Paris")
+            stats = service.get_memory_stats()
+            self.assertEqual(stats['total_entries'], 10)
+            # The two globally oldest entries went: London 00:00, then Paris 00:30
+            self.assertEqual(service.weather_data[london][0]['temperature'], 11.0)
+            self.assertEqual(service.weather_data[paris][0]['temperature'], 21.0)
+            self.assertEqual(stats['estimated_bytes'], sum(city['estimated_bytes'] for city in stats['cities'].values()))
+
+            service.store_current_weather("Tokyo", {"temperature": 30.0, "date": base}, "metric")
+            self.assertEqual(set(service.weather_data), {paris, service.utils.city_key("Tokyo")})  # London least recently stored
+            self.assertEqual(service.get_memory_stats()['total_entries'], sum(len(data) for data in service.weather_data.values()))
+
+    def test_cleanup_only_touches_cities_with_expired_entries(self):
+        """Test the retention pass skips cities whose oldest entry is within the window."""
+        from WeatherDashboard.features.history.history_buffer import CityHistoryBuffer
+
+        now = datetime.now()
+        self.history_service.store_current_weather("London", {"temperature": 1.0, "date": now - timedelta(days=40)}, "metric")
+        self.history_service.store_current_weather("London", {"temperature": 2.0, "date": now - timedelta(days=1)}, "metric")
+        for city in ("Paris", "Tokyo", "Berlin"):
+            self.history_service.store_current_weather(city, {"temperature": 3.0, "date": now}, "metric")
+
+        with patch.object(CityHistoryBuffer, 'drop_older_than', autospec=True, side_effect=CityHistoryBuffer.drop_older_than) as drop:
+            self.history_service.cleanup_old_data(days_to_keep=30)
+
+        self.assertEqual(drop.call_count, 1)
+        self.assertEqual(len(self.history_service.weather_data[self.history_service.utils.city_key("London")]), 1)
+        self.assertEqual(self.history_service.get_memory_stats()['total_entries'], 4)
+
+
+    def test_history_tier_selection(self):
+        """Test chart spans map to the finest tier their limits and retention allow."""
+        with patch.dict(self.history_service.config.HISTORY, {
+            "retention_days": {"raw": 30, "hourly": 10, "daily": None},
+            "chart_tier_max_days": {"raw": 2, "hourly": 14}
+        }):
+            self.assertEqual(self.history_service.select_history_tier(1), 'raw')
+            self.assertEqual(self.history_service.select_history_tier(7), 'hourly')
+            self.assertEqual(self.history_service.select_history_tier(14), 'daily')  # Hourly retention too short
+            self.assertEqual(self.history_service.select_history_tier(30), 'daily')
+            with self.assertRaises(ValueError):
+                self.history_service.get_tiered_history("London", 7, tier='weekly')
+
+    def test_stored_observations_queryable_from_history_store(self):
+        """Test stored observations are served from the history backend by canonical city."""
+        import tempfile
+        import shutil
+        from WeatherDashboard.features.history.history_store import SQLiteHistoryStore
+
+        temp_dir = tempfile.mkdtemp()
+        self.history_service.history_store = SQLiteHistoryStore(f"{temp_dir}/history.db")
+        try:
+            with patch.object(self.history_service, '_write_to_text_log'):
+                now = datetime.now()
+                self.history_service.store_current_weather("New York", {"temperature": 21.0, "date": now - timedelta(seconds=1)}, "metric")
+                self.history_service.store_current_weather("NYC", {"temperature": 22.0, "date": now}, "metric")
+                self.history_service.store_current_weather("NYC", {"temperature": 23.0, "date": now}, "metric")  # Same observation again
+
+            recent = self.history_service.get_recent_history("new york", 1)
+            self.assertEqual([entry['temperature'] for entry in recent], [21.0, 22.0])
+            self.history_service.writer.flush()
+            self.assertEqual(self.history_service.get_recent_history("new york", 1), recent)
+            self.assertEqual(self.history_service.get_stored_cities(), ["New York"])
+        finally:
+            self.history_service.close()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_reads_include_queued_rows_without_flushing_writer(self):
+        """Test reads merge rows the writer has not stored yet instead of waiting for it."""
+        import threading
+        gate = threading.Event()
+        self.history_service.writer.call(gate.wait)  # Hold the writer thread so later rows stay queued
+        try:
+            with patch.object(self.history_service, '_write_to_text_log'), \
+                 patch.object(self.history_service.writer, 'flush', side_effect=AssertionError("read flushed the writer")):
+                self.history_service.store_current_weather("Oslo", {"temperature": 3.0, "date": datetime.now()}, "metric")
+                raw = self.history_service.get_history_range("Oslo")
+                hourly = self.history_service.get_tiered_history("Oslo", 1, 'hourly')
+                cities = self.history_service.get_stored_cities()
+        finally:
+            gate.set()
+        self.assertEqual([entry['temperature'] for entry in raw], [3.0])
+        self.assertEqual([(entry['temperature'], entry['samples']) for entry in hourly], [(3.0, 1)])
+        self.assertIn("Oslo", cities)
+
+        self.history_service.writer.flush()
+        self.assertEqual(self.history_service.get_history_range("Oslo"), raw)  # Written once, read once
+        self.assertEqual(self.history_service.get_tiered_history("Oslo", 1, 'hourly'), hourly)
+
+    def test_legacy_csv_migrated_on_writer_thread(self):
+        """Test the legacy weather_data.csv is imported by the background writer, not the constructor."""
+        import threading
+        csv_dir = Path(config.OUTPUT["csv_dir"])
+        csv_dir.mkdir(parents=True, exist_ok=True)
+        (csv_dir / config.OUTPUT["csv_filename"]).write_text(
+            "timestamp,city,temperature,source\n2024-01-01 12:00:00,Lima,19.5,api\n", encoding='utf-8')
+        threads = []
+        migrate = WeatherHistoryService._migrate_legacy_csv
+        with patch.object(WeatherHistoryService, '_migrate_legacy_csv',
+                          lambda service: (threads.append(threading.current_thread().name), migrate(service))):
+            service = WeatherHistoryService()
+            try:
+                service.writer.flush()
+                self.assertEqual(threads, ["BackgroundWriter"])
+                self.assertEqual([entry['temperature'] for entry in service.get_history_range("Lima")], [19.5])
+            finally:
+                service.close()
+
+    def test_import_history_from_directory(self):
+        """Test a directory of datasets is bulk-imported under canonical city keys."""
+        import tempfile
+        import shutil
+        from WeatherDashboard.features.history.history_store import SQLiteHistoryStore
+
+        temp_dir = tempfile.mkdtemp()
+        with open(f"{temp_dir}/nyc.csv", 'w', encoding='utf-8') as f:
+            f.write("date,city,temperature\n2024-01-01,NYC,5\n2024-01-02,New York,7\n")
+        self.history_service.history_store = SQLiteHistoryStore(f"{temp_dir}/history.db")
+        try:
+            summaries = self.history_service.import_history(temp_dir)
+            self.assertEqual([summary['rows_imported'] for summary in summaries], [2])
+            stored = self.history_service.history_store.query_range(self.history_service.utils.city_key("New York"))
+            self.assertEqual([entry['temperature'] for entry in stored], [5.0, 7.0])
+        finally:
+            self.history_service.close()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_reads_never_wait_on_city_writers(self):
+        """Test readers get the last published snapshot while a store to the same city is in progress."""
+        import threading
+
+        key = self.history_service.utils.city_key("London")
+        self.history_service.journal = None
+        with patch.object(self.history_service, '_write_to_text_log'), \
+             patch.object(self.history_service, '_store_to_history'):
+            self.history_service.store_current_weather("London", {"temperature": 10.0, "date": datetime.now()})
+            self.assertEqual(len(self.history_service.get_recent_data("London", 1)), 1)
+
+            city_lock = self.history_service._city_lock(key)
+            city_lock.acquire()  # A store to London is in progress
+            writer = threading.Thread(target=self.history_service.store_current_weather,
+                                      args=("London", {"temperature": 11.0, "date": datetime.now()}))
+            try:
+                writer.start()
+                self.assertEqual([entry['temperature'] for entry in self.history_service.get_recent_data("London", 1)], [10.0])
+                self.assertEqual(len(self.history_service.get_recent_columns("London", 1)['temperature']), 1)
+            finally:
+                city_lock.release()
+                writer.join(5)
+            self.assertEqual([entry['temperature'] for entry in self.history_service.get_recent_data("London", 1)], [10.0, 11.0])
+
+    def test_concurrent_stores_reads_and_cleanup_stay_consistent(self):
+        """Test parallel writers, readers and cleanups leave the counters matching the buffers."""
+        import threading
+
+        self.history_service.journal = None
+        cities = ["London", "Paris", "Tokyo", "Berlin", "Madrid"]
+        errors = []
+        now = datetime.now()
+
+        def store(offset):
+            for i in range(200):
+                self.history_service.store_current_weather(cities[(offset + i) % len(cities)],
+                                                           {"temperature": float(i), "date": now - timedelta(days=40 - i % 60)})
+
+        def read():
+            for i in range(300):
+                for city in cities:
+                    self.history_service.get_recent_data(city, 60)
+                    self.history_service.get_recent_columns(city, 60)
+                if i % 50 == 0:
+                    self.history_service.cleanup_old_data()
+                    self.history_service.get_memory_stats()
+
+        def run(target, *args):
+            try:
+                target(*args)
+            except Exception as e:  # Surface failures from worker threads
+                errors.append(e)
+
+        limits = {"max_cities_stored": 4, "max_entries_per_city": 40, "max_total_entries": 120}
+        with patch.dict(self.history_service.config.MEMORY, limits), \
+             patch.object(self.history_service, '_write_to_text_log'), \
+             patch.object(self.history_service, '_store_to_history'):
+            threads = [threading.Thread(target=run, args=(store, offset)) for offset in range(4)]
+            threads += [threading.Thread(target=run, args=(read,)) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(30)
+
+        self.assertEqual(errors, [])
+        stats = self.history_service.get_memory_stats()
+        self.assertEqual(stats['total_entries'], sum(len(data_buffer) for data_buffer in self.history_service.weather_data.values()))
+        self.assertLessEqual(stats['total_entries'], 120)
+        self.assertLessEqual(stats['cities_stored'], 4)
+        for key, data_buffer in self.history_service.weather_data.items():
+            self.assertEqual(list(self.history_service._read_view(key)), list(data_buffer))
+
+    def test_rolling_stats_track_stores(self):
+        """Test rolling statistics follow stored entries and report the change over the window."""
+        now = datetime.now().replace(microsecond=0)
+        self.history_service.journal = None
+        with patch.object(self.history_service, '_write_to_text_log'), \
+             patch.object(self.history_service, '_store_to_history'):
+            for minutes_ago, temperature in ((210, 5.0), (150, 8.0), (90, 12.0), (0, 11.0)):
+                self.history_service.store_current_weather("London", {"temperature": temperature, "humidity": 60, "date": now - timedelta(minutes=minutes_ago)})
+
+        stats = self.history_service.get_rolling_stats("london")
+        self.assertEqual(stats['temperature']['count'], 4)
+        self.assertAlmostEqual(stats['temperature']['mean'], 9.0)
+        self.assertEqual((stats['temperature']['min'], stats['temperature']['max']), (5.0, 12.0))
+        self.assertEqual(stats['temperature']['change'], 3.0)  # 8.0 two and a half hours ago to 11.0 now
+        self.assertEqual(stats['temperature']['range'], 4.0)   # 8.0 to 12.0 within the window
+        self.assertEqual(stats['humidity']['change'], 0.0)
+        self.assertEqual(list(self.history_service.get_rolling_stats("London", "temperature")), ['temperature'])
+        self.assertEqual(self.history_service.get_rolling_stats("Paris"), {})
+
+        self.history_service.cleanup_old_data(days_to_keep=0)  # City leaves memory with its statistics
+        self.assertEqual(self.history_service.get_rolling_stats("London"), {})
+
+    def test_window_aggregates(self):
+        """Test window aggregates cover half-open ranges of stored entries."""
+        now = datetime.now().replace(microsecond=0)
+        self.history_service.journal = None
+        with patch.object(self.history_service, '_write_to_text_log'), \
+             patch.object(self.history_service, '_store_to_history'):
+            for hours_ago, temperature in ((30, 5.0), (20, 8.0), (10, 12.0), (0, 11.0)):
+                self.history_service.store_current_weather("London", {"temperature": temperature, "date": now - timedelta(hours=hours_ago)})
+
+        totals = self.history_service.get_window_aggregates("London", now - timedelta(hours=20), now)
+        self.assertEqual(totals, {'temperature': {'sum': 20.0, 'count': 2, 'mean': 10.0}})
+        everything = self.history_service.get_window_aggregates("london", metrics=['temperature', 'conditions'])
+        self.assertEqual(everything['temperature']['count'], 4)
+        self.assertEqual(self.history_service.get_window_aggregates("Paris"), {})
+
+    def test_learned_city_aliases_saved_by_background_writer(self):
+        """Test aliases learned during a fetch are written by the writer thread after the store, not by the fetch."""
+        from WeatherDashboard.utils.city_index import CityIndex
+
+        index_file = Path(self.temp_dir.name) / "city_index.json"
+        city_index = CityIndex(index_file=str(index_file))
+        self.history_service.journal = None
+        with patch.object(self.history_service.utils, 'city_index', city_index), \
+             patch.object(self.history_service, '_write_to_text_log'), \
+             patch.object(self.history_service, '_store_to_history'):
+            city_index.learn('Big Apple', 'New York', 'US', 5128581)
+            self.assertFalse(index_file.exists())
+
+            self.history_service.store_current_weather("Big Apple", {"temperature": 20.0})
+            self.history_service.writer.flush()
+
+        self.assertFalse(city_index.dirty)
+        self.assertEqual(CityIndex(index_file=str(index_file)).resolve('Big Apple'), 'new_york')
+
+    def test_restart_restores_memory_from_journal(self):
+        """Test a new service rebuilds the same in-memory history from the journal, before and after compaction."""
+        import tempfile
+        import shutil
+        from WeatherDashboard.features.history.history_journal import HistoryJournal
+
+        temp_dir = tempfile.mkdtemp()
+        journal_file = f"{temp_dir}/history.journal"
+        now = datetime.now().replace(microsecond=0)
+        self.history_service.journal = HistoryJournal(journal_file, fsync=False)
+        try:
+            with patch.object(self.history_service, '_write_to_text_log'), \
+                 patch.object(self.history_service, '_store_to_history'):
+                for i in range(6):
+                    self.history_service.store_current_weather("London" if i % 2 else "Paris", {"temperature": 10.0 + i, "date": now - timedelta(hours=6 - i)})
+            self.history_service.writer.flush()  # Journal group commits run on the writer thread
+            expected = {key: list(data_buffer) for key, data_buffer in self.history_service.weather_data.items()}
+
+            restarted = WeatherHistoryService()
+            restarted.journal = HistoryJournal(journal_file, fsync=False)
+            self.assertEqual(restarted.restore_from_journal(), 6)
+            self.assertEqual({key: list(data_buffer) for key, data_buffer in restarted.weather_data.items()}, expected)
+            self.assertEqual(restarted.get_memory_stats()['total_entries'], 6)
+
+            restarted._compact_journal()
+            restarted.journal.append_many([restarted.journal.encode('london', expected['london'][-1])])  # Raced the snapshot
+            compacted = WeatherHistoryService()
+            compacted.journal = HistoryJournal(journal_file, fsync=False)
+            self.assertEqual(compacted.restore_from_journal(), 6)
+            self.assertEqual({key: list(data_buffer) for key, data_buffer in compacted.weather_data.items()}, expected)
+            restarted.close()
+            compacted.close()
+        finally:
+            self.history_service.close()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_get_historical_serves_stored_days_and_flags_gaps(self):
+        """Test charts get stored daily aggregates, with generated data only for missing days."""
+        import tempfile
+        import shutil
+        from WeatherDashboard.features.history.history_store import SQLiteHistoryStore, to_history_row
+
+        temp_dir = tempfile.mkdtemp()
+        self.history_service.history_store = SQLiteHistoryStore(f"{temp_dir}/history.db")
+        today = datetime.combine(datetime.now().date(), datetime.min.time())
+        key = self.history_service.utils.city_key("London")
+        self.history_service.history_store.append_many([
+            (key, to_history_row("London", {"temperature": temp, "date": today - timedelta(days=2, hours=-hour)}, 'api'))
+            for temp, hour in ((10.0, 6), (14.0, 12))
+        ] + [(key, to_history_row("London", {"temperature": 99.0, "date": today - timedelta(days=1)}, 'simulated'))])
+
+        generated = [{"date": today - timedelta(days=4 - i), "temperature": -1.0} for i in range(5)]
+        try:
+            with patch.object(self.history_service.api_service.fallback, 'generate', return_value=generated) as generate, \
+                 patch.object(self.history_service, 'select_history_tier', return_value='daily'):
+                series = self.history_service.get_historical("London", 5)
+        finally:
+            self.history_service.close()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        generate.assert_called_once_with("London", 5)
+        self.assertEqual([entry['date'].date() for entry in series], [(today - timedelta(days=4 - i)).date() for i in range(5)])
+        self.assertEqual([entry['gap_filled'] for entry in series], [True, True, False, True, True])
+        stored_day = series[2]
+        self.assertEqual((stored_day['temperature'], stored_day['temperature_min'], stored_day['temperature_max']), (12.0, 10.0, 14.0))
+        self.assertEqual((stored_day['samples'], stored_day['source']), (2, 'live'))
+        self.assertEqual(series[3]['temperature'], -1.0)  # Only a simulated observation that day: still a gap
+
+    def test_get_historical_routes_short_ranges_to_hourly_tier(self):
+        """Test a range within the hourly chart limit is charted per hour, with interior gaps interpolated."""
+        import tempfile
+        import shutil
+        from WeatherDashboard.features.history.history_store import SQLiteHistoryStore, to_history_row
+
+        temp_dir = tempfile.mkdtemp()
+        self.history_service.history_store = SQLiteHistoryStore(f"{temp_dir}/history.db")
+        today = datetime.combine(datetime.now().date(), datetime.min.time())
+        yesterday = today - timedelta(days=1)
+        key = self.history_service.utils.city_key("London")
+        self.history_service.history_store.append_many([
+            (key, to_history_row("London", {"temperature": temp, "date": yesterday + timedelta(hours=hour, minutes=10)}, 'api'))
+            for temp, hour in ((10.0, 2), (16.0, 5))
+        ])
+        limits = {"raw": 1, "hourly": 14}
+        try:
+            with patch.dict(self.history_service.config.HISTORY, {"chart_tier_max_days": limits}), \
+                 patch.object(self.history_service.api_service.fallback, 'generate') as generate:
+                self.assertEqual(self.history_service.select_history_tier(2), 'hourly')
+                series = self.history_service.get_historical("London", 2)
+                empty = self.history_service.get_historical("Paris", 2)
+        finally:
+            self.history_service.close()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        self.assertEqual(series[0]['date'], yesterday)
+        self.assertTrue(all(b['date'] - a['date'] == timedelta(hours=1) for a, b in zip(series, series[1:])))
+        hours = {entry['date']: entry for entry in series}
+        stored = hours[yesterday + timedelta(hours=2)]
+        self.assertEqual((stored['temperature'], stored['samples'], stored['gap_filled']), (10.0, 1, False))
+        self.assertEqual([hours[yesterday + timedelta(hours=h)].get('temperature') for h in (1, 3, 4, 6)], [None, 12.0, 14.0, None])
+        self.assertTrue(hours[yesterday + timedelta(hours=3)]['gap_filled'])
+        generate.assert_called_once_with("Paris", 2)  # No stored hours at all: generated days, as for daily ranges
+        self.assertTrue(all(entry['gap_filled'] for entry in empty))
+
+    def test_tiered_columns_resample_raw_observations(self):
+        """Test raw observations land on the 15-minute grid with per-bin mean, extremes and counts."""
+        import tempfile
+        import shutil
+        import numpy as np
+        from WeatherDashboard.features.history.history_store import SQLiteHistoryStore, to_history_row
+
+        temp_dir = tempfile.mkdtemp()
+        self.history_service.history_store = SQLiteHistoryStore(f"{temp_dir}/history.db")
+        today = datetime.combine(datetime.now().date(), datetime.min.time())
+        key = self.history_service.utils.city_key("London")
+        self.history_service.history_store.append_many([
+            (key, to_history_row("London", {"temperature": temp, "date": today + timedelta(minutes=minutes)}, source))
+            for temp, minutes, source in ((10.0, 1, 'api'), (14.0, 7, 'api'), (30.0, 9, 'simulated'), (8.0, 40, 'api'))
+        ])
+        try:
+            columns = self.history_service.get_tiered_columns("London", 1, tier='raw', end=today + timedelta(hours=1))
+        finally:
+            self.history_service.close()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        self.assertEqual(list(columns['date']), [today + timedelta(minutes=15 * i) for i in range(4)])
+        np.testing.assert_array_equal(columns['samples'], [2, 0, 1, 0])
+        np.testing.assert_array_equal(columns['temperature'], [12.0, np.nan, 8.0, np.nan])
+        np.testing.assert_array_equal(columns['temperature_min'], [10.0, np.nan, 8.0, np.nan])
+        np.testing.assert_array_equal(columns['temperature_max'], [14.0, np.nan, 8.0, np.nan])
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""
+Unit tests for RollingStats class.
+
+Tests incremental summary statistics including:
+- Welford mean/variance and running min/max matching a full recomputation
+- Time-decayed EWMA across irregular intervals
+- Bulk column merges matching entry-by-entry updates
+- Change over the trailing window kept incrementally, including late arrivals
+"""
+
+import unittest
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add project root to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from WeatherDashboard.features.history.history_stats import RollingStats
+from WeatherDashboard.features.history.history_buffer import CityHistoryBuffer
+
+
+class TestRollingStats(unittest.TestCase):
+    """Test cases for RollingStats class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.base_time = datetime(2024, 1, 1, 12, 0, 0)
+        rng = np.random.default_rng(7)
+        minutes = np.sort(rng.integers(0, 20000, 300))
+        self.entries = [
+            {'date': self.base_time + timedelta(minutes=int(minute)), 'temperature': float(rng.normal(12.0, 4.0)),
+             'humidity': int(rng.integers(30, 95)) if i % 4 else None, 'conditions': 'Clear'}
+            for i, minute in enumerate(minutes)
+        ]
+
+    def test_summary_matches_full_recomputation(self):
+        """Test running aggregates equal statistics computed over all values."""
+        stats = RollingStats(half_life_hours=3)
+        for entry in self.entries:
+            stats.add(entry)
+
+        temperatures = [entry['temperature'] for entry in self.entries]
+        summary = stats.summary()
+        self.assertEqual(set(summary), {'temperature', 'humidity'})
+        self.assertEqual(summary['temperature']['count'], 300)
+        self.assertAlmostEqual(summary['temperature']['mean'], np.mean(temperatures))
+        self.assertAlmostEqual(summary['temperature']['variance'], np.var(temperatures, ddof=1))
+        self.assertEqual((summary['temperature']['min'], summary['temperature']['max']), (min(temperatures), max(temperatures)))
+        self.assertEqual(summary['temperature']['last'], temperatures[-1])
+        self.assertEqual(summary['temperature']['last_time'], self.entries[-1]['date'])
+        self.assertEqual(summary['humidity']['count'], 225)  # Missing values are not counted
+        self.assertEqual(list(stats.summary('temperature')), ['temperature'])
+        self.assertEqual(stats.summary('conditions'), {})
+
+    def test_ewma_decays_with_elapsed_time(self):
+        """Test the EWMA keeps half the previous average after one half-life, whatever the sample count."""
+        stats = RollingStats(half_life_hours=2)
+        stats.add({'date': self.base_time, 'temperature': 10.0})
+        self.assertEqual(stats.summary()['temperature']['ewma'], 10.0)
+
+        stats.add({'date': self.base_time + timedelta(hours=2), 'temperature': 20.0})
+        self.assertAlmostEqual(stats.summary()['temperature']['ewma'], 15.0)
+
+        stats.add({'date': self.base_time + timedelta(hours=1), 'temperature': 100.0})  # Late arrival: no weight
+        self.assertAlmostEqual(stats.summary()['temperature']['ewma'], 15.0)
+        self.assertEqual(stats.summary()['temperature']['last'], 20.0)
+
+    def test_add_columns_matches_entry_updates(self):
+        """Test merging a buffer snapshot gives the same statistics as adding its entries one by one."""
+        sequential, merged = RollingStats(half_life_hours=3), RollingStats(half_life_hours=3)
+        data_buffer = CityHistoryBuffer(capacity=500)
+        for entry in self.entries:
+            sequential.add(entry)
+        for entry in self.entries[:40]:
+            merged.add(entry)
+        for entry in self.entries[40:]:
+            data_buffer.append(entry)
+        timestamps, columns, _ = data_buffer.snapshot()
+        merged.add_columns(timestamps, columns)
+
+        expected, actual = sequential.summary(), merged.summary()
+        self.assertEqual(set(actual), set(expected))
+        for field, field_stats in expected.items():
+            for name, value in field_stats.items():
+                with self.subTest(field=field, name=name):
+                    if isinstance(value, float):
+                        self.assertTrue(math.isclose(actual[field][name], value, rel_tol=1e-9, abs_tol=1e-9))
+                    else:
+                        self.assertEqual(actual[field][name], value)
+
+    def test_change_window_follows_newest_entry(self):
+        """Test 'change' spans the window before the newest entry, with late arrivals placed by time."""
+        stats = RollingStats(half_life_hours=3, change_window_hours=24)
+        stats.add({'date': self.base_time, 'temperature': 10.0})
+        self.assertIsNone(stats.summary()['temperature']['change'])
+
+        stats.add({'date': self.base_time + timedelta(hours=12), 'temperature': 14.0})
+        self.assertEqual(stats.summary()['temperature']['change'], 4.0)
+
+        stats.add({'date': self.base_time + timedelta(hours=30), 'temperature': 11.0})  # First entry leaves the window
+        self.assertEqual(stats.summary()['temperature']['change'], -3.0)
+
+        stats.add({'date': self.base_time + timedelta(hours=4), 'temperature': 99.0})  # Already outside the window
+        stats.add({'date': self.base_time + timedelta(hours=20), 'temperature': 16.0})  # Late, inside it
+        self.assertEqual(stats.summary()['temperature']['change'], -3.0)
+        stats.add({'date': self.base_time + timedelta(hours=37), 'temperature': 13.0})  # Window now starts at hour 13
+        self.assertEqual(stats.summary()['temperature']['change'], -3.0)
+
+    def test_change_window_matches_after_bulk_merge(self):
+        """Test the change window is the same whether entries are added one by one or merged by column."""
+        sequential, merged = RollingStats(change_window_hours=24), RollingStats(change_window_hours=24)
+        data_buffer = CityHistoryBuffer(capacity=500)
+        for entry in self.entries:
+            sequential.add(entry)
+            data_buffer.append(entry)
+        timestamps, columns, _ = data_buffer.snapshot()
+        merged.add_columns(timestamps, columns)
+
+        for field in ('temperature', 'humidity'):
+            with self.subTest(field=field):
+                self.assertAlmostEqual(merged.summary()[field]['change'], sequential.summary()[field]['change'])
+
+
+if __name__ == '__main__':
+    unittest.main()
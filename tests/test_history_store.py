@@ -0,0 +1,319 @@
+"""
+Unit tests for history storage backends.
+
+Tests persistent history storage including:
+- Row flattening and parsing round trips
+- SQLite range queries, streaming and city listing
+- Legacy CSV import (once per file version, changed files adding only new rows) and CSV export
+- Duplicate observations skipped on insert and removed from older databases
+- CSV backend parity with the SQLite backend and fsync on sync()
+- Reverse tail reads and timestamp decoding
+- City manifest incremental updates, catch-up and rebuilds
+- Hourly/daily rollups and per-tier retention
+- Queued rows read alongside stored ones without double counting
+- CSV rotation into archived segments read back transparently
+- Backends checked for the full interface on creation
+"""
+
+import unittest
+import unittest.mock
+import tempfile
+import shutil
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add project root to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from WeatherDashboard.features.history.history_store import (
+    HistoryStore, SQLiteHistoryStore, CSVHistoryStore, CityManifest, PendingHistoryRows, create_history_store, to_history_row,
+    from_history_row, iter_csv_tail, parse_timestamp
+)
+
+
+def simple_key(name):
+    """Key function matching the plain city_key format."""
+    return name.strip().lower().replace(" ", "_")
+
+
+class TestHistoryStore(unittest.TestCase):
+    """Test cases for history storage backends."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = SQLiteHistoryStore(os.path.join(self.temp_dir, 'history.db'), batch_size=4)
+        self.base_time = datetime(2024, 1, 1, 12, 0, 0)
+        self.rows = [
+            (simple_key(city), to_history_row(city, {
+                'date': self.base_time + timedelta(hours=i),
+                'temperature': 20.0 + i,
+                'humidity': 50,
+                'conditions': 'Clear'
+            }, 'api'))
+            for i in range(10) for city in ('New York', 'London')
+        ]
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.store.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_row_round_trip(self):
+        """Test rows parse back into typed weather data."""
+        row = to_history_row('London', {'date': self.base_time, 'temperature': 12.5, 'humidity': 80}, 'simulated')
+        entry = from_history_row({k: '' if v is None else str(v) for k, v in row.items()})
+
+        self.assertEqual(entry['date'], self.base_time)
+        self.assertEqual(entry['temperature'], 12.5)
+        self.assertEqual(entry['humidity'], 80)
+        self.assertIsNone(entry['pressure'])
+        self.assertEqual(entry['source'], 'simulated')
+
+    def test_range_query_and_streaming(self):
+        """Test range queries return one city's rows in order across fetch batches."""
+        self.assertEqual(self.store.append_many(self.rows), 20)
+
+        entries = self.store.query_range('london', self.base_time + timedelta(hours=2), self.base_time + timedelta(hours=7))
+        self.assertEqual([e['temperature'] for e in entries], [22.0, 23.0, 24.0, 25.0, 26.0, 27.0])
+
+        streamed = list(self.store.iter_range('new_york'))
+        self.assertEqual(len(streamed), 10)
+        self.assertEqual(streamed, sorted(streamed, key=lambda e: e['date']))
+
+    def test_list_cities_and_stats(self):
+        """Test city listing comes from the maintained cities table."""
+        self.store.append_many(self.rows)
+
+        self.assertEqual(sorted(self.store.list_cities()), ['London', 'New York'])
+        stats = self.store.get_city_stats()['london']
+        self.assertEqual(stats['row_count'], 10)
+        self.assertEqual(stats['first_timestamp'], '2024-01-01 12:00:00')
+        self.assertEqual(stats['last_timestamp'], '2024-01-01 21:00:00')
+
+    def test_export_import_round_trip(self):
+        """Test exported CSV imports into a fresh store once per file version."""
+        self.store.append_many(self.rows)
+        csv_path = os.path.join(self.temp_dir, 'weather_data.csv')
+        self.assertEqual(self.store.export_csv(csv_path), 20)
+
+        imported_store = SQLiteHistoryStore(os.path.join(self.temp_dir, 'imported.db'))
+        try:
+            self.assertEqual(imported_store.import_csv(csv_path, simple_key), 20)
+            self.assertEqual(imported_store.import_csv(csv_path, simple_key), 0)  # Unchanged file is skipped
+            self.assertEqual(imported_store.query_range('london'), self.store.query_range('london'))
+        finally:
+            imported_store.close()
+
+    def test_changed_file_reimport_adds_only_new_rows(self):
+        """Test re-importing a grown file stores and rolls up each observation once."""
+        csv_path = os.path.join(self.temp_dir, 'weather_data.csv')
+        self.store.append_many(self.rows[:10])
+        self.store.export_csv(csv_path)
+        imported_store = SQLiteHistoryStore(os.path.join(self.temp_dir, 'imported.db'))
+        try:
+            self.assertEqual(imported_store.import_csv(csv_path, simple_key), 10)
+            self.store.append_many(self.rows[10:])
+            self.store.export_csv(csv_path)
+            self.assertEqual(imported_store.import_csv(csv_path, simple_key), 10)  # Only the rows added since
+            self.assertEqual(imported_store.query_range('london'), self.store.query_range('london'))
+            self.assertEqual(imported_store.query_rollups('london', 'daily'), self.store.query_rollups('london', 'daily'))
+            self.assertEqual(imported_store.get_city_stats()['london']['row_count'], 10)
+            self.assertEqual(imported_store.append_columns('london', 'London', np.array(['2024-01-01 12:00:00', '2024-01-02 00:00:00']),
+                                                           {'temperature': np.array([1.0, 2.0])}, 'imported'), 1)
+        finally:
+            imported_store.close()
+
+    def test_duplicates_removed_from_older_databases(self):
+        """Test opening a database from before the unique index drops duplicates and rebuilds rollups."""
+        self.store.append_many(self.rows)
+        self.store._connection.execute("DROP INDEX idx_observations_city_timestamp")
+        self.store._connection.execute("INSERT INTO observations SELECT * FROM observations WHERE city_key = 'london'")
+        self.store._connection.execute("PRAGMA user_version = 2")
+        self.store._connection.commit()
+        self.store.close()
+
+        self.store = SQLiteHistoryStore(os.path.join(self.temp_dir, 'history.db'))
+        self.assertEqual(len(self.store.query_range('london')), 10)
+        self.assertEqual(self.store.query_rollups('london', 'daily')[0]['samples'], 10)
+        self.assertEqual(self.store.append_many(self.rows), 0)
+
+    def test_csv_backend_matches_sqlite(self):
+        """Test the CSV backend answers the same queries as SQLite."""
+        csv_store = CSVHistoryStore(simple_key, os.path.join(self.temp_dir, 'csv', 'weather_data.csv'))
+        csv_store.append_many(self.rows)
+        self.store.append_many(self.rows)
+
+        start = self.base_time + timedelta(hours=3)
+        self.assertEqual(csv_store.query_range('london', start), self.store.query_range('london', start))
+        self.assertEqual(sorted(csv_store.list_cities()), ['London', 'New York'])
+
+    def test_csv_backend_sync_fsyncs_active_file(self):
+        """Test syncing the CSV backend fsyncs its active file (and skips a file not yet written)."""
+        csv_store = CSVHistoryStore(simple_key, os.path.join(self.temp_dir, 'csv', 'weather_data.csv'))
+        with unittest.mock.patch('os.fsync') as fsync:
+            csv_store.sync()
+            fsync.assert_not_called()
+            csv_store.append_many(self.rows)
+            csv_store.sync()
+        fsync.assert_called_once()
+
+    def test_city_manifest_updated_incrementally(self):
+        """Test the CSV backend keeps its manifest in step with appends without rescanning."""
+        csv_store = CSVHistoryStore(simple_key, os.path.join(self.temp_dir, 'csv', 'weather_data.csv'))
+        csv_store.append_many(self.rows[:10])
+        csv_store.append_many(self.rows[10:])
+
+        fresh = CityManifest(csv_store.csv_file, simple_key)
+        with unittest.mock.patch.object(fresh, '_scan', side_effect=AssertionError("manifest was rescanned")):
+            stats = fresh.get_city_stats()
+        self.assertEqual(stats, csv_store.get_city_stats())
+        self.assertEqual(stats['london']['row_count'], 10)
+        self.assertEqual(stats['london']['first_timestamp'], '2024-01-01 12:00:00')
+        self.assertEqual(stats['london']['last_timestamp'], '2024-01-01 21:00:00')
+
+    def test_city_manifest_catches_up_and_rebuilds(self):
+        """Test external appends are caught up and corrupt or rewritten files trigger rebuilds."""
+        csv_store = CSVHistoryStore(simple_key, os.path.join(self.temp_dir, 'csv', 'weather_data.csv'))
+        csv_store.append_many(self.rows[:4])
+        manifest = CityManifest(csv_store.csv_file, simple_key)
+        self.assertEqual(manifest.get('london')['row_count'], 2)
+
+        with open(csv_store.csv_file, 'a', encoding='utf-8') as f:
+            f.write("2024-01-02 00:00:00,Paris,10.0\n")
+        self.assertEqual(manifest.get('paris')['row_count'], 1)
+
+        with open(manifest.manifest_file, 'w', encoding='utf-8') as f:
+            f.write("{not json")
+        self.assertEqual(sorted(CityManifest(csv_store.csv_file, simple_key).list_cities()), ['London', 'New York', 'Paris'])
+
+        with open(csv_store.csv_file, 'w', encoding='utf-8') as f:
+            f.write("timestamp,city,temperature\n2024-02-01 00:00:00,Berlin,1.0\n")
+        self.assertEqual(manifest.list_cities(), ['Berlin'])
+
+    def test_iter_csv_tail_matches_forward_scan(self):
+        """Test tail reads return the same window as a forward scan for any block size."""
+        csv_path = os.path.join(self.temp_dir, 'weather_data.csv')
+        self.store.append_many(self.rows)
+        self.store.export_csv(csv_path)
+        min_timestamp = '2024-01-01 17:00:00'
+
+        import csv
+        with open(csv_path, encoding='utf-8', newline='') as f:
+            expected = [row for row in csv.DictReader(f) if row['timestamp'] >= min_timestamp]
+
+        for block_size in (7, 64, 1024 * 1024):
+            with self.subTest(block_size=block_size):
+                tail = list(iter_csv_tail(csv_path, min_timestamp, block_size))
+                self.assertEqual(list(reversed(tail)), expected)
+
+    def test_parse_timestamp(self):
+        """Test the fixed-format decoder matches strptime and rejects bad input."""
+        self.assertEqual(parse_timestamp('2024-02-29 23:59:58'), datetime(2024, 2, 29, 23, 59, 58))
+        self.assertEqual(parse_timestamp('2024-1-5 1:02:03'), datetime(2024, 1, 5, 1, 2, 3))
+        with self.assertRaises(ValueError):
+            parse_timestamp('2024-02-30 00:00:00')
+        with self.assertRaises(ValueError):
+            parse_timestamp('invalid')
+
+    def test_rollups_maintained_on_insert(self):
+        """Test incremental rollups match a rebuild and the on-read CSV computation."""
+        self.store.append_many(self.rows[:7])
+        self.store.append_many(self.rows[7:])
+
+        hourly = self.store.query_rollups('london', 'hourly')
+        self.assertEqual(len(hourly), 10)
+        self.assertEqual(hourly[0]['date'], self.base_time.replace(microsecond=0))
+        self.assertEqual(hourly[0]['samples'], 1)
+
+        daily = self.store.query_rollups('london', 'daily')
+        self.assertEqual(len(daily), 1)
+        self.assertEqual((daily[0]['temperature_min'], daily[0]['temperature_max']), (20.0, 29.0))
+        self.assertAlmostEqual(daily[0]['temperature'], 24.5)
+        self.assertEqual(daily[0]['samples'], 10)
+
+        self.store._rebuild_rollups()
+        self.assertEqual(self.store.query_rollups('london', 'daily'), daily)
+
+        csv_store = CSVHistoryStore(simple_key, os.path.join(self.temp_dir, 'csv', 'weather_data.csv'))
+        csv_store.append_many(self.rows)
+        start = self.base_time + timedelta(hours=3, minutes=30)
+        self.assertEqual(csv_store.query_rollups('london', 'hourly', start), self.store.query_rollups('london', 'hourly', start))
+
+    def test_pending_rows_fold_into_rollups_exactly_once(self):
+        """Test queued rows are read with the stored ones until written, then from the store alone."""
+        london = [pair for pair in self.rows if pair[0] == 'london']
+        self.store.append_many(london[:6])
+        pending = PendingHistoryRows(lambda: self.store)
+        pending.add(london[6:])
+
+        expected_store = SQLiteHistoryStore(os.path.join(self.temp_dir, 'expected.db'))
+        expected_store.append_many(london)
+        expected = expected_store.query_rollups('london', 'daily')
+        expected_store.close()
+
+        read = lambda: pending.read('london', lambda rows: self.store.query_rollups('london', 'daily', pending=rows))
+        self.assertEqual(read(), expected)
+        self.assertEqual(pending.read(None, len), 4)
+        self.assertEqual(pending.append_many(london[6:]), 4)
+        self.assertEqual(pending.read(None, len), 0)
+        self.assertEqual(read(), expected)
+
+    def test_retention_per_tier(self):
+        """Test retention prunes raw rows and rollups independently."""
+        self.store.append_many(self.rows)
+        now = self.base_time + timedelta(days=2, hours=5)
+
+        deleted = self.store.apply_retention({'raw': 2, 'hourly': None, 'daily': None}, now=now)
+        self.assertEqual(deleted, {'raw': 10})  # Rows before 17:00 two days earlier
+        self.assertEqual(len(self.store.query_range('london')), 5)
+        self.assertEqual(self.store.get_city_stats()['london']['row_count'], 5)
+        self.assertEqual(self.store.get_city_stats()['london']['first_timestamp'], '2024-01-01 17:00:00')
+        self.assertEqual(len(self.store.query_rollups('london', 'hourly')), 10)
+
+        self.store.apply_retention({'raw': None, 'hourly': 1, 'daily': 2}, now=now)
+        self.assertEqual(self.store.query_rollups('london', 'hourly'), [])
+        self.assertEqual(len(self.store.query_rollups('london', 'daily')), 1)  # The day holding the cutoff is kept
+
+        with self.assertRaises(ValueError):
+            self.store.query_rollups('london', 'weekly')
+
+    def test_csv_rotation_keeps_archived_rows_queryable(self):
+        """Test rotated CSV segments still answer range queries, listings and exports."""
+        csv_store = CSVHistoryStore(simple_key, os.path.join(self.temp_dir, 'csv', 'weather_data.csv'))
+        csv_store.archive.max_bytes = 1
+        csv_store.append_many(self.rows[:12])
+        segment = csv_store.rotate_if_needed()
+        csv_store.append_many(self.rows[12:])
+        self.store.append_many(self.rows)
+
+        self.assertEqual(segment['rows'], 12)
+        self.assertEqual(segment['last_timestamp'], '2024-01-01 17:00:00')
+        self.assertEqual(csv_store.manifest.get('london')['row_count'], 4)
+        self.assertEqual(csv_store.get_city_stats(), self.store.get_city_stats())
+        self.assertEqual(sorted(csv_store.list_cities()), ['London', 'New York'])
+        for start in (None, self.base_time + timedelta(hours=3), self.base_time + timedelta(hours=8)):
+            with self.subTest(start=start):
+                self.assertEqual(csv_store.query_range('london', start), self.store.query_range('london', start))
+        self.assertEqual(csv_store.export_csv(os.path.join(self.temp_dir, 'export.csv')), 20)
+
+    def test_create_history_store_unknown_backend(self):
+        """Test unknown backend names are rejected."""
+        with self.assertRaises(ValueError):
+            create_history_store(simple_key, backend='parquet')
+
+    def test_incomplete_backend_rejected_on_creation(self):
+        """Test a backend missing abstract methods cannot be instantiated."""
+        class AppendOnlyStore(HistoryStore):
+            def append_many(self, rows):
+                return 0
+
+        with self.assertRaises(TypeError):
+            AppendOnlyStore()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,7 @@ Tests main window functionality including:
 - Window initialization and setup
 - Widget management and integration
 - Error handling and recovery
+- Unit switches made during a fetch
 - Performance characteristics
 """
 
@@ -155,6 +156,32 @@ class TestMainWindow(unittest.TestCase):
             self.assertEqual(main_window.loading_manager, self.mock_loading_manager)
             self.assertEqual(main_window.async_operations, self.mock_async_operations)
 
+    def test_unit_switch_during_fetch_applied_on_completion(self):
+        """Test a unit switch made while a fetch runs is applied once the fetch completes."""
+        with patch('WeatherDashboard.gui.main_window.WeatherDashboardGUIFrames') as mock_frames, \
+             patch('WeatherDashboard.gui.main_window.WeatherDashboardWidgets'), \
+             patch('WeatherDashboard.gui.main_window.WeatherDashboardController') as mock_controller:
+            mock_frames.return_value.frames = {'main': Mock(), 'status': Mock()}
+            main_window = WeatherDashboardMain(
+                root=self.mock_root,
+                data_manager=self.mock_data_manager,
+                data_service=self.mock_data_service,
+                loading_manager=self.mock_loading_manager,
+                async_operations=self.mock_async_operations,
+                state_manager=self.mock_state_manager
+            )
+            controller = mock_controller.return_value
+
+            main_window._operation_in_progress = True
+            main_window._on_unit_changed()
+            controller.switch_unit_system.assert_not_called()
+
+            main_window._operation_in_progress = False
+            main_window._handle_async_complete(True)
+            controller.switch_unit_system.assert_called_once_with(self.mock_state_manager.get_current_unit_system.return_value)
+            main_window._handle_async_complete(True)
+            controller.switch_unit_system.assert_called_once()  # Applied once
+
     def test_error_handling(self):
         """Test error handling in main window."""
         with patch('WeatherDashboard.gui.main_window.WeatherDashboardGUIFrames') as mock_frames, \
@@ -1,23 +1,344 @@
 """
 Test for WeatherDashboard.features.history.scheduler_service
 
-Covers: WeatherDataScheduler
+Covers: WeatherDataScheduler (status, parallel collection cycles, cycle deadline
+and in-flight protection, non-blocking dispatch, tick overrun policies, staggered heap scheduling of
+watchlist cities, quiet hours and volatility-adaptive intervals, per-city
+retries with backoff), Watchlist (persistence, per-city intervals)
 """
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from WeatherDashboard import config
+from WeatherDashboard.features.history.history_stats import RollingStats
 from WeatherDashboard.features.history.scheduler_service import WeatherDataScheduler
+from WeatherDashboard.features.history.watchlist import Watchlist
+
+
+class DummyHistoryService:
+    def cleanup_old_data(self): pass
+    def get_rolling_stats(self, city, metric=None): return {}
+
+class DummyDataManager:
+    def fetch_current(self, *a, **kw): return {}
+
+class DummyStateManager:
+    city = type("C", (), {"get": lambda self: "Testville"})()
+    unit = type("U", (), {"get": lambda self: "metric"})()
+
+class DummyUIHandler:
+    root = None
+    def update_display(self, *a, **kw): pass
+    def update_scheduler_status(self, *a, **kw): pass
+
+
+def make_scheduler(data_manager=None):
+    return WeatherDataScheduler(DummyHistoryService(), data_manager or DummyDataManager(),
+                                DummyStateManager(), DummyUIHandler())
+
 
 def test_scheduler_methods_and_status():
-    class DummyHistoryService:
-        def cleanup_old_data(self): pass
-    class DummyDataManager:
-        def fetch_current(self, *a, **kw): return {}
-    class DummyStateManager:
-        city = type("C", (), {"get": lambda self: "Testville"})()
-        unit = type("U", (), {"get": lambda self: "metric"})()
-    class DummyUIHandler:
-        root = None
-        def update_display(self, *a, **kw): pass
-        def update_scheduler_status(self, *a, **kw): pass
-    scheduler = WeatherDataScheduler(DummyHistoryService(), DummyDataManager(), DummyStateManager(), DummyUIHandler())
+    scheduler = make_scheduler()
     status = scheduler.get_status_info()
     assert "enabled" in status
-    assert "default_city" in status
\ No newline at end of file
+    assert "default_city" in status
+
+def test_cycle_runs_cities_in_parallel():
+    class SlowDataManager:
+        def fetch_current(self, city, unit, cancel_event=None):
+            time.sleep(0.2)
+            if city == "Nowhere":
+                raise ValueError("unknown city")
+            return {"temperature": 20.0}
+
+    displayed = []
+    scheduler = make_scheduler(SlowDataManager())
+    with patch.object(scheduler, '_update_city_display', side_effect=lambda city, data: displayed.append(city)):
+        record = scheduler._run_collection_cycle({"london": "London", "paris": "Paris", "rome": "Rome", "nowhere": "Nowhere"},
+                                                 display_key="paris")
+
+    assert record['duration_seconds'] < 0.6  # About the slowest city, not the 0.8s sum
+    assert set(record['city_seconds']) == {"London", "Paris", "Rome", "Nowhere"}
+    assert record['failed'] == ["Nowhere"] and record['timed_out'] == []
+    assert displayed == ["Paris"]
+    assert scheduler.error_counts == {"nowhere_errors": 1}
+    assert scheduler.get_status_info()['last_cycle'] is record
+    scheduler._pool.shutdown()
+
+def test_deadline_cancels_and_in_flight_cities_are_skipped():
+    release = threading.Event()
+    cancelled = []
+    class HangingDataManager:
+        def fetch_current(self, city, unit, cancel_event=None):
+            if city == "Slow":
+                release.wait(5)
+                cancelled.append(cancel_event.is_set())
+            return {}
+
+    scheduler = make_scheduler(HangingDataManager())
+    scheduler.cycle_deadline_seconds = 0.2
+    first = scheduler._run_collection_cycle({"slow": "Slow", "fast": "Fast"})
+    second = scheduler._run_collection_cycle({"slow": "Slow", "fast": "Fast"})
+    release.set()
+    scheduler._pool.shutdown(wait=True)
+
+    assert first['timed_out'] == ["Slow"] and list(first['city_seconds']) == ["Fast"]
+    assert second['skipped'] == ["Slow"] and second['timed_out'] == []
+    assert cancelled == [True]  # The abandoned fetch saw its cycle's cancel event
+    assert len(scheduler.cycle_history) == 2
+
+def test_hanging_city_does_not_hold_up_other_cities(tmp_path):
+    release = threading.Event()
+    fetched = []
+    class HangingDataManager:
+        def fetch_current(self, city, unit, cancel_event=None):
+            fetched.append(city)
+            if city == "Hang":
+                release.wait(5)
+            elif city == "Quick" and fetched.count("Quick") == 1:
+                raise ConnectionError("transient")
+            return {}
+    class HeadlessUIHandler:
+        def update_display(self, *a, **kw): pass
+
+    scheduler = WeatherDataScheduler(DummyHistoryService(), HangingDataManager(), DummyStateManager(),
+                                     HeadlessUIHandler(), make_watchlist(tmp_path, [("Hang", 60), ("Quick", 60)]))
+    scheduler.retry_delay_seconds = 0.05
+    scheduler._sync_schedule(datetime.now())
+    for key in list(scheduler._due):
+        scheduler._push(key, datetime.now())  # Everything due now, in one cycle
+    thread = threading.Thread(target=scheduler._scheduler_loop, daemon=True)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 2
+        while fetched.count("Quick") < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        retried_while_hanging = fetched.count("Quick") == 2 and not release.is_set()
+    finally:
+        release.set()
+        scheduler.stop_event.set()
+        scheduler._wakeup.set()
+        thread.join(5)
+        scheduler._pool.shutdown()
+
+    assert retried_while_hanging  # Quick's retry ran while its cycle-mate was still hanging
+    assert scheduler._due[scheduler._city_key("Quick")] > datetime.now() + timedelta(minutes=59)
+
+def test_retry_state_kept_while_timed_out_fetch_in_flight(tmp_path):
+    release = threading.Event()
+    fetched = []
+    class HangOnceDataManager:
+        def fetch_current(self, city, unit, cancel_event=None):
+            fetched.append(city)
+            if city == "Hang" and fetched.count("Hang") == 1:
+                release.wait(5)
+            return {}
+    class HeadlessUIHandler:
+        def update_display(self, *a, **kw): pass
+
+    scheduler = WeatherDataScheduler(DummyHistoryService(), HangOnceDataManager(), DummyStateManager(),
+                                     HeadlessUIHandler(), make_watchlist(tmp_path, [("Hang", 60)]))
+    scheduler.cycle_deadline_seconds = 0.1
+    scheduler.retry_delay_seconds = 0.05
+    scheduler._sync_schedule(datetime.now())
+    key = scheduler._city_key("Hang")
+    scheduler._push(key, datetime.now())
+    thread = threading.Thread(target=scheduler._scheduler_loop, daemon=True)
+    thread.start()
+    try:
+        time.sleep(0.5)  # Timed out, then several retries skipped while the first fetch hangs
+        retries_while_hanging = scheduler._retries.get(key, (0, None))[0]
+        release.set()
+        deadline = time.monotonic() + 2
+        while fetched.count("Hang") < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        time.sleep(0.05)
+    finally:
+        release.set()
+        scheduler.stop_event.set()
+        scheduler._wakeup.set()
+        thread.join(5)
+        scheduler._pool.shutdown()
+
+    assert retries_while_hanging == 1  # Skips neither dropped the retry nor used up attempts
+    assert fetched.count("Hang") == 2 and key not in scheduler._retries
+
+def test_overrun_ticks_skip_or_merge():
+    scheduler = make_scheduler()
+    scheduler.interval_minutes = 15
+    scheduled = datetime(2024, 1, 1, 12, 0)
+
+    assert scheduler._next_tick(scheduled, scheduled + timedelta(minutes=3)) == scheduled + timedelta(minutes=15)
+    assert scheduler._next_tick(scheduled, scheduled + timedelta(minutes=40)) == scheduled + timedelta(minutes=45)
+    assert scheduler.overrun_ticks == 2
+    with patch.dict(config.SCHEDULER, {"overlap_policy": "merge"}):
+        merging = make_scheduler()
+    merging.interval_minutes = 15
+    assert merging._next_tick(scheduled, scheduled + timedelta(minutes=40)) == scheduled + timedelta(minutes=40)
+    assert merging.overrun_ticks == 2
+
+def make_watchlist(tmp_path, cities=()):
+    watchlist = Watchlist(lambda name: name.strip().lower().replace(" ", "_"), str(tmp_path / "watchlist.json"))
+    for city, interval in cities:
+        watchlist.add(city, interval)
+    return watchlist
+
+def test_watchlist_persists_cities_and_intervals(tmp_path):
+    watchlist = make_watchlist(tmp_path, [("London", None), ("Paris", 30)])
+    watchlist.add("paris ", 45)  # Same key: interval updated in place
+    assert not watchlist.remove("Rome")
+    with patch.dict(config.SCHEDULER, {"watchlist_max_cities": 2}):
+        full = make_watchlist(tmp_path)
+        with pytest.raises(ValueError):
+            full.add("Rome")
+    with pytest.raises(ValueError):
+        watchlist.add("Rome", 0)
+
+    assert make_watchlist(tmp_path).items() == [("london", "London", None), ("paris", "paris", 45)]
+    assert watchlist.remove("LONDON") and "London" not in make_watchlist(tmp_path)
+
+def test_new_cities_staggered_evenly_over_interval(tmp_path):
+    cities = [(f"City {i}", 10) for i in range(200)]
+    scheduler = WeatherDataScheduler(DummyHistoryService(), DummyDataManager(), DummyStateManager(),
+                                     DummyUIHandler(), make_watchlist(tmp_path, cities))
+    now = datetime(2024, 1, 1, 12, 0)
+    scheduler._sync_schedule(now)
+
+    watched = sorted(when for key, when in scheduler._due.items() if key.startswith("city_"))
+    gaps = {round((later - earlier).total_seconds(), 3) for earlier, later in zip(watched, watched[1:])}
+    assert gaps == {3.0}  # 600s spread over 200 cities
+    assert now < watched[0] and watched[-1] <= now + timedelta(minutes=10)
+    assert len(scheduler._pop_due(now + timedelta(seconds=30))) == len([w for w in scheduler._due.values() if w <= now + timedelta(seconds=30)])
+
+    scheduler.watchlist.remove("City 5")
+    scheduler.watchlist.add("City 6", 20)
+    before = dict(scheduler._due)
+    scheduler._sync_schedule(now)
+    assert "city_5" not in scheduler._due and scheduler._due["city_6"] != before["city_6"]
+    assert scheduler._due["city_7"] == before["city_7"]  # Unchanged cities keep their slots
+
+def test_watchlist_changes_picked_up_without_restart(tmp_path):
+    fetched = []
+    class RecordingDataManager:
+        def fetch_current(self, city, unit, cancel_event=None):
+            fetched.append(city)
+            return {}
+    class HeadlessUIHandler:
+        def update_display(self, *a, **kw): pass
+
+    scheduler = WeatherDataScheduler(DummyHistoryService(), RecordingDataManager(), DummyStateManager(),
+                                     HeadlessUIHandler(), make_watchlist(tmp_path))
+    scheduler.interval_minutes = 0.005  # 0.3s
+    scheduler.start_scheduler()
+    thread = scheduler.scheduler_thread
+    try:
+        scheduler.add_to_watchlist("Oslo", 0.005)
+        deadline = time.monotonic() + 5
+        while fetched.count("Oslo") < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert fetched.count("Oslo") >= 2 and "Testville" in fetched
+        assert scheduler.scheduler_thread is thread
+    finally:
+        scheduler.stop_scheduler()
+
+def test_intervals_adapt_to_volatility_and_quiet_hours():
+    now = datetime(2024, 1, 1, 12, 0)
+    class StatsHistoryService(DummyHistoryService):
+        observations = []
+        def get_rolling_stats(self, city, metric=None):
+            stats = RollingStats()
+            for m, p, t in sorted(self.observations, reverse=True):
+                stats.add({'date': now - timedelta(minutes=m), 'pressure': p, 'temperature': t})
+            return stats.summary(metric)
+
+    history = StatsHistoryService()
+    scheduler = WeatherDataScheduler(history, DummyDataManager(), DummyStateManager(), DummyUIHandler())
+    scheduler.quiet_hours = {"start": "22:00", "end": "06:00", "interval_multiplier": 2.0}
+    assert [scheduler._in_quiet_hours(now.replace(hour=h, minute=m)) for h, m in ((23, 30), (5, 59), (6, 0), (12, 0))] == [True, True, False, False]
+
+    cases = [
+        ([(300, 990.0, 0.0), (120, 1013.0, 10.0), (60, 1013.2, 10.3), (0, 1013.1, 10.1)], 30.0),  # Stable in the window: back off
+        ([(120, 1013.0, 10.0), (0, 1009.0, 10.5)], 7.5),     # Pressure falling fast
+        ([(120, 1013.0, 10.0), (0, 1013.0, 12.0)], 15.0),    # Moderate swing: base interval
+        ([(0, 1013.0, 36.0)], 7.5),                          # High temperature alert
+        ([(240, 1013.0, 10.0)], 15.0),                       # Nothing recent
+    ]
+    for observations, expected in cases:
+        history.observations = observations
+        assert scheduler._effective_interval("Testville", 15, now) == expected, observations
+    history.observations = []
+    assert scheduler._effective_interval("Testville", 15, now.replace(hour=23)) == 30.0  # Quiet hours
+    history.observations = cases[0][0]
+    assert scheduler._effective_interval("Testville", 90, now) == 120.0  # Capped at max_interval_minutes
+
+    DummyStateManager.unit, metric_unit = type("U", (), {"get": lambda self: "imperial"})(), DummyStateManager.unit
+    try:
+        history.observations = [(120, 1013.0, 10.0), (0, 1013.0, 12.0)]  # Stored in metric whatever the display units
+        assert scheduler._effective_interval("Testville", 15, now) == 15.0
+        history.observations = [(120, 1013.0, 10.0), (0, 1009.0, 10.5)]
+        assert scheduler._effective_interval("Testville", 15, now) == 7.5
+    finally:
+        DummyStateManager.unit = metric_unit
+
+def test_failed_cities_retried_with_backoff_then_resume_grid():
+    scheduler = make_scheduler()
+    now = datetime(2024, 1, 1, 12, 0)
+    scheduler._sync_schedule(now)
+    key = scheduler._city_key("Testville")
+    scheduled = scheduler._due[key]
+    scheduler.adaptive = dict(scheduler.adaptive, enabled=False)
+    scheduler.quiet_hours = {}
+
+    finished = scheduled
+    delays = []
+    for _ in range(scheduler.retry_attempts):
+        scheduler._reschedule({key: scheduler._due[key]}, finished, {"Testville"})
+        delays.append((scheduler._due[key] - finished).total_seconds())
+        finished = scheduler._due[key]
+    assert delays == [60.0, 120.0, 240.0]
+    assert scheduler.get_status_info()['retries_pending'] == 1
+
+    scheduler._reschedule({key: scheduler._due[key]}, finished, {"Testville"})  # Attempts used up
+    assert scheduler._due[key] == scheduled + timedelta(minutes=15) and not scheduler._retries
+    scheduler._reschedule({key: scheduler._due[key]}, scheduler._due[key], {"Testville"})
+    scheduler._reschedule({key: scheduler._due[key]}, scheduler._due[key] + timedelta(seconds=1), set())  # Recovered
+    assert scheduler._due[key] == scheduled + timedelta(minutes=30) and not scheduler._retries
+
+def test_retry_does_not_delay_healthy_cities(tmp_path):
+    fetched = []
+    class FlakyDataManager:
+        def fetch_current(self, city, unit, cancel_event=None):
+            fetched.append(city)
+            if city == "Flaky" and fetched.count("Flaky") <= 2:
+                raise ConnectionError("transient")
+            if city == "Slow":
+                time.sleep(0.3)
+            return {}
+    class HeadlessUIHandler:
+        def update_display(self, *a, **kw): pass
+
+    scheduler = WeatherDataScheduler(DummyHistoryService(), FlakyDataManager(), DummyStateManager(),
+                                     HeadlessUIHandler(), make_watchlist(tmp_path, [("Flaky", 60), ("Slow", 60)]))
+    scheduler.retry_delay_seconds = 0.05
+    scheduler._sync_schedule(datetime.now())
+    for key in list(scheduler._due):
+        scheduler._push(key, datetime.now())  # Everything due now
+    thread = threading.Thread(target=scheduler._scheduler_loop, daemon=True)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 5
+        while fetched.count("Flaky") < 3 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        scheduler.stop_event.set()
+        scheduler._wakeup.set()
+        thread.join(5)
+        scheduler._pool.shutdown()
+
+    assert fetched.count("Flaky") == 3 and fetched.count("Slow") == 1  # Retries never re-fetch healthy cities
+    assert scheduler.error_counts == {} and not scheduler._retries
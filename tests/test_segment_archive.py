@@ -0,0 +1,108 @@
+"""
+Unit tests for SegmentArchive class.
+
+Tests segment rotation and compressed archival including:
+- Size-based rotation into gzip segments with a manifest entry
+- Age-based rotation counted from when the active file was first seen
+- Recovery of rotations interrupted before compression
+- Segment selection by time range
+"""
+
+import unittest
+import tempfile
+import shutil
+import gzip
+import os
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# Add project root to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from WeatherDashboard.utils.segment_archive import SegmentArchive
+
+
+class TestSegmentArchive(unittest.TestCase):
+    """Test cases for SegmentArchive class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.active_file = self.temp_dir / 'output.txt'
+        self.archive_dir = self.temp_dir / 'backup'
+        self.now = datetime(2024, 3, 1, 12, 0, 0)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, text):
+        with open(self.active_file, 'a', encoding='utf-8') as f:
+            f.write(text)
+
+    def test_size_rotation_compresses_and_records_segment(self):
+        """Test a file over the size limit is moved into a gzip segment and indexed."""
+        archive = SegmentArchive(self.active_file, self.archive_dir, max_bytes=100, max_age_days=0)
+        self._write("line\n" * 10)
+        self.assertFalse(archive.should_rotate(self.now))
+
+        self._write("line\n" * 20)
+        self.assertTrue(archive.should_rotate(self.now))
+        segment = archive.rotate({'first_timestamp': '2024-02-01 00:00:00', 'rows': 30}, self.now)
+
+        self.assertFalse(self.active_file.exists())
+        self.assertEqual(segment['file'], 'output-20240301-120000.txt.gz')
+        self.assertEqual(segment['bytes'], 150)
+        self.assertEqual(segment['last_timestamp'], '2024-03-01 12:00:00')
+        with gzip.open(self.archive_dir / segment['file'], 'rt', encoding='utf-8') as f:
+            self.assertEqual(f.read(), "line\n" * 30)
+
+        reloaded = SegmentArchive(self.active_file, self.archive_dir, max_bytes=100, max_age_days=0)
+        self.assertEqual(reloaded.get_stats()['segments'], 1)
+        self.assertEqual(reloaded.segments()[0]['rows'], 30)
+
+    def test_age_rotation_counts_from_first_sight(self):
+        """Test age rotation waits for the limit after the active file is first seen."""
+        archive = SegmentArchive(self.active_file, self.archive_dir, max_bytes=0, max_age_days=7)
+        self._write("line\n")
+
+        self.assertFalse(archive.should_rotate(self.now))
+        self.assertFalse(archive.should_rotate(self.now + timedelta(days=6)))
+        self.assertTrue(archive.should_rotate(self.now + timedelta(days=7)))
+
+        segment = archive.rotate(now=self.now + timedelta(days=7))
+        self.assertEqual(segment['first_timestamp'], '2024-03-01 12:00:00')
+        self.assertIsNone(archive.rotate(now=self.now + timedelta(days=8)))  # Nothing left to rotate
+
+    def test_interrupted_rotation_recovered_on_load(self):
+        """Test a renamed but uncompressed segment is compressed on the next load."""
+        self.archive_dir.mkdir()
+        with open(self.archive_dir / 'output-20240301-120000.rotating', 'w', encoding='utf-8') as f:
+            f.write("pending\n")
+
+        archive = SegmentArchive(self.active_file, self.archive_dir)
+        segments = archive.segments()
+
+        self.assertEqual([segment['file'] for segment in segments], ['output-20240301-120000.gz'])
+        self.assertFalse((self.archive_dir / 'output-20240301-120000.rotating').exists())
+        with archive.open_segment(segments[0]) as f:
+            self.assertEqual(f.read(), "pending\n")
+
+    def test_segments_filtered_by_time_range(self):
+        """Test only segments overlapping the requested range are returned, oldest first."""
+        archive = SegmentArchive(self.active_file, self.archive_dir, max_bytes=1, max_age_days=0)
+        for day in range(3):
+            self._write(f"day {day}\n")
+            archive.rotate({'first_timestamp': f'2024-03-0{day + 1} 00:00:00', 'last_timestamp': f'2024-03-0{day + 1} 23:00:00'},
+                           self.now + timedelta(days=day))
+
+        self.assertEqual(len(archive.segments()), 3)
+        selected = archive.segments('2024-03-02', '2024-03-02 12:00:00')
+        self.assertEqual([segment['first_timestamp'] for segment in selected], ['2024-03-02 00:00:00'])
+        self.assertEqual(len(archive.segments(start='2024-03-02')), 2)
+        self.assertTrue(os.path.exists(selected[0]['path']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -126,6 +126,14 @@ class TestStateUtils(unittest.TestCase):
         result = self.state_utils.get_visible_metrics(state_manager_empty)
         self.assertEqual(result, [])
 
+    def test_get_visible_metric_filter(self):
+        """Test get_visible_metric_filter returns None only when visibility is untracked."""
+        self.assertEqual(sorted(self.state_utils.get_visible_metric_filter(self.state_manager)), ['pressure', 'temperature'])
+
+        state_manager_no_visibility = Mock()
+        del state_manager_no_visibility.visibility
+        self.assertIsNone(self.state_utils.get_visible_metric_filter(state_manager_no_visibility))
+
     def test_get_visible_metrics_all_invisible(self):
         """Test get_visible_metrics when all metrics are invisible."""
         # Set all variables to False
@@ -191,6 +191,12 @@ class TestUtils(unittest.TestCase):
                 result = self.utils.city_key(city_name)
                 self.assertEqual(result, expected_key)
     
+    def test_city_key_resolves_aliases(self):
+        """Test city key maps aliases and country-qualified names to one key."""
+        for city_name in ["NYC", "new york", "New York, US", "New York"]:
+            with self.subTest(city=city_name):
+                self.assertEqual(self.utils.city_key(city_name), "new_york")
+    
     # ================================
     # Integration and edge case tests
     # ================================
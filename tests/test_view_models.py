@@ -20,6 +20,7 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from WeatherDashboard import config
 from WeatherDashboard.core.view_models import WeatherViewModel, WeatherDisplayData, MetricValue
 
 
@@ -324,6 +325,60 @@ class TestWeatherViewModel(unittest.TestCase):
             self.assertIsInstance(result, WeatherDisplayData)
             self.assertEqual(result.city_name, 'New York')
 
+    def test_formatting_is_lazy(self):
+        """Test nothing is formatted until display data is accessed."""
+        with patch.object(self.view_model.unit_converter, 'format_value', wraps=self.view_model.unit_converter.format_value) as mock_format:
+            vm = WeatherViewModel('Lazy City', self.sample_data, 'metric')
+            mock_format.assert_not_called()
+
+            vm.metrics
+            self.assertTrue(mock_format.called)
+
+    def test_visible_metrics_limit_formatting(self):
+        """Test only visible metrics and the enhanced displays they drive are formatted."""
+        vm = WeatherViewModel('New York', self.sample_data, 'metric', visible_metrics=['temperature', 'humidity'])
+
+        self.assertEqual(set(vm.metrics), {'temperature', 'humidity', 'enhanced_temperature'})
+        self.assertEqual(vm.get_metric_value('pressure').value, '--')
+
+    def test_incremental_mode_reformats_only_changed_fields(self):
+        """Test incremental view models reuse formatted strings for unchanged fields."""
+        first = WeatherViewModel('Incremental City', self.sample_data, 'metric', incremental=True)
+        first_metrics = first.metrics
+
+        changed = dict(self.sample_data, humidity=75)
+        with patch.object(first.unit_converter, 'format_value', wraps=first.unit_converter.format_value) as mock_format:
+            second = WeatherViewModel('Incremental City', changed, 'metric', incremental=True)
+            second_metrics = second.metrics
+
+        formatted_keys = [call.args[0] for call in mock_format.call_args_list]
+        self.assertEqual(formatted_keys, ['humidity'])
+        self.assertEqual(second_metrics['humidity'], '75 %')
+        self.assertEqual(second_metrics['temperature'], first_metrics['temperature'])
+
+    def test_incremental_mode_ignores_other_unit_system(self):
+        """Test incremental reuse never crosses unit systems."""
+        WeatherViewModel('Unit City', self.sample_data, 'metric', incremental=True).metrics
+        imperial = WeatherViewModel('Unit City', self.sample_data, 'imperial', incremental=True)
+
+        self.assertEqual(imperial.metrics, WeatherViewModel('Unit City', self.sample_data, 'imperial').metrics)
+
+    def test_incremental_cache_evicts_least_recently_used_city(self):
+        """Test the previous-view-model cache stays within the city limit, keeping recently used cities."""
+        with patch.dict(WeatherViewModel._previous_by_city, clear=True), \
+             patch.dict(config.MEMORY, {'max_cities_stored': 2}):
+            for city in ('Alpha', 'Beta'):
+                WeatherViewModel(city, self.sample_data, 'metric', incremental=True).metrics
+            WeatherViewModel('Alpha', self.sample_data, 'metric', incremental=True).metrics  # Alpha used again
+            WeatherViewModel('Gamma', self.sample_data, 'metric', incremental=True).metrics
+
+            self.assertEqual(list(WeatherViewModel._previous_by_city), ['alpha', 'gamma'])
+
+    def test_numeric_values_follow_visibility(self):
+        """Test typed values are carried for visible metrics alongside display strings."""
+        vm = WeatherViewModel('New York', self.sample_data, 'metric', visible_metrics=['temperature', 'conditions'])
+
+        self.assertEqual(vm.numeric_values, {'temperature': 25.0, 'conditions': None, 'feels_like': 27.0})
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file